@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Report regressions between two pytest-benchmark json files (e.g. from two commits).
+
+Syntax: python compare.py baseline.json current.json [--time-tolerance 0.10] [--rss-tolerance 0.10]
+
+Both the mean wall time and the RSS growth recorded by conftest.py (how far the peak RSS of a benchmark, run alone
+in a fresh process, rose above the RSS at its start) are compared. The exit status is nonzero if any benchmark got slower or needed more
+memory by more than the given relative tolerance.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(filename):
+    with open(filename, "r") as file:
+        data = json.load(file)
+    commit = data.get("commit_info", {}).get("id", "unknown")[:10]
+    benchmarks = {bench["fullname"]: bench for bench in data["benchmarks"]}
+    return commit, benchmarks
+
+
+def rss(bench):
+    """
+    RSS growth of a benchmark in MiB, or its peak RSS where the growth could not be measured
+    """
+    info = bench["extra_info"]
+    return info.get("rss_growth_mb", info.get("peak_rss_mb", 0.0))
+
+
+def relative_change(old, new):
+    if old == 0.0:
+        return 0.0
+    return (new - old) / old
+
+
+def main():
+    parser = argparse.ArgumentParser(description="compare two pytest-benchmark json files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--time-tolerance", type=float, default=0.10,
+                        help="allowed relative increase in mean time (default: 0.10)")
+    parser.add_argument("--rss-tolerance", type=float, default=0.10,
+                        help="allowed relative increase in RSS growth (default: 0.10)")
+    args = parser.parse_args()
+
+    old_commit, old = load(args.baseline)
+    new_commit, new = load(args.current)
+
+    print(f"baseline: {old_commit}    current: {new_commit}")
+    print(f"{'benchmark':<50} {'mean (s)':>22} {'change':>8} {'RSS growth (MiB)':>22} {'change':>8}")
+
+    regressions = []
+    for name in sorted(set(old) & set(new)):
+        old_mean, new_mean = old[name]["stats"]["mean"], new[name]["stats"]["mean"]
+        old_rss, new_rss = rss(old[name]), rss(new[name])
+
+        time_change = relative_change(old_mean, new_mean)
+        rss_change = relative_change(old_rss, new_rss)
+
+        flags = ""
+        if time_change > args.time_tolerance:
+            flags += " TIME"
+        # growths of a few pages are noise, whatever their relative change
+        if rss_change > args.rss_tolerance and new_rss - old_rss > 1.0:
+            flags += " RSS"
+        if flags:
+            regressions.append(name)
+
+        print(f"{name:<50} {old_mean:>10.4f} -> {new_mean:<10.4f} {time_change:>+7.1%} "
+              f"{old_rss:>10.1f} -> {new_rss:<10.1f} {rss_change:>+7.1%}{flags}")
+
+    for name in sorted(set(old) ^ set(new)):
+        print(f"{name:<50} only in {'baseline' if name in old else 'current'}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) found")
+        return 1
+
+    print("\nno regressions found")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
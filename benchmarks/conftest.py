@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Shared cases and fixtures for the pdaggerq benchmark suite.
+
+The cases mirror the CC residual derivations in pq_graph/tests/*_codegen.py so
+the timings track the same workloads the numerical tests exercise.
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import pdaggerq
+
+# fixed derivations; each entry is (projection, label -> spin, label -> ranges)
+CASES = {
+    "ccsd": {
+        "T": ['t1', 't2'],
+        "ops": [['f'], ['v']],
+        "proj": {
+            "rt1": ([['e1(i,a)']],
+                    {'i': 'a', 'a': 'a'},
+                    {'t2': ['all'] * 4, 't1': ['all'] * 2, 'a': ['act'], 'i': ['act']}),
+            "rt2": ([['e2(i,j,b,a)']],
+                    {'i': 'a', 'j': 'b', 'a': 'a', 'b': 'b'},
+                    {'t2': ['all'] * 4, 't1': ['all'] * 2,
+                     'a': ['act'], 'b': ['act'], 'i': ['act'], 'j': ['act']}),
+        },
+        "nocc": 8,
+        "nvirt": 16,
+    },
+    "ccsdt": {
+        "T": ['t1', 't2', 't3'],
+        "ops": [['f'], ['v']],
+        "proj": {
+            "rt1": ([['e1(i,a)']],
+                    {'i': 'a', 'a': 'a'},
+                    {'t3': ['act', 'act', 'all', 'act', 'act', 'all'], 't2': ['all'] * 4, 't1': ['all'] * 2,
+                     'a': ['act'], 'i': ['act']}),
+            "rt2": ([['e2(i,j,b,a)']],
+                    {'i': 'a', 'j': 'b', 'a': 'a', 'b': 'b'},
+                    {'t3': ['act', 'act', 'all', 'act', 'act', 'all'], 't2': ['all'] * 4, 't1': ['all'] * 2,
+                     'a': ['act'], 'b': ['act'], 'i': ['act'], 'j': ['act']}),
+            "rt3": ([['e3(i,j,k,c,b,a)']],
+                    {'i': 'a', 'j': 'a', 'k': 'b', 'a': 'a', 'b': 'a', 'c': 'b'},
+                    {'t3': ['act', 'act', 'all', 'act', 'act', 'all'], 't2': ['all'] * 4, 't1': ['all'] * 2,
+                     'a': ['act'], 'b': ['act'], 'c': ['act'], 'i': ['act'], 'j': ['act'], 'k': ['act']}),
+        },
+        "nocc": 4,
+        "nvirt": 8,
+    },
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-cases", default="ccsd",
+                     help="comma-separated list of cases to benchmark (available: {})".format(", ".join(CASES)))
+    parser.addoption("--no-bench-rss", dest="bench_rss", action="store_false",
+                     help="do not measure the peak RSS of each benchmark in a separate process")
+
+
+def pytest_generate_tests(metafunc):
+    if "case" in metafunc.fixturenames:
+        cases = metafunc.config.getoption("--bench-cases").split(",")
+        for case in cases:
+            if case not in CASES:
+                raise pytest.UsageError(f"unknown benchmark case '{case}'")
+        metafunc.parametrize("case", cases, scope="session")
+
+
+def _status_mb(field):
+    """
+    A memory field of /proc/self/status (e.g. VmRSS or VmHWM) in MiB
+    """
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024.0
+    raise KeyError(field)
+
+
+def reset_peak_rss():
+    """
+    Reset the peak resident set size of this process to its current RSS (Linux only)
+
+    :return: whether the peak was reset
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def measure_rss(item):
+    """
+    Peak RSS of one run of a benchmark's body in a fresh python process, which rebuilds the fixtures the
+    benchmark needs and nothing else. ru_maxrss never goes down and the allocator keeps the memory freed by
+    earlier benchmarks, so measuring in the process that ran them would depend on the order of the tests.
+
+    :return: dict with peak_rss_mb and, where the peak can be reset after the fixtures are built (Linux),
+             rss_growth_mb, the rise of the peak above the RSS at the start of the body
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        result_file = os.path.join(scratch, "rss.json")
+        env = dict(os.environ, PDAGGERQ_BENCH_RSS_FILE=result_file)
+        subprocess.run([sys.executable, "-m", "pytest", item.nodeid, "-q", "-p", "no:cacheprovider",
+                        "--benchmark-disable", "--no-bench-rss",
+                        "--bench-cases=" + item.config.getoption("--bench-cases")],
+                       cwd=str(item.config.rootpath), env=env, capture_output=True, check=False)
+        if not os.path.exists(result_file):
+            return {}
+        with open(result_file) as file:
+            return json.load(file)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """
+    Store the peak RSS of each benchmark (see measure_rss) in the saved json (extra_info)
+    """
+    result_file = os.environ.get("PDAGGERQ_BENCH_RSS_FILE")
+    if result_file is not None:
+        # the fresh process started by measure_rss: only the test body is measured
+        reset = reset_peak_rss()
+        start = _status_mb("VmRSS") if reset else 0.0
+        yield
+        if reset:
+            rss = {"peak_rss_mb": _status_mb("VmHWM"), "rss_growth_mb": _status_mb("VmHWM") - start}
+        else:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            rss = {"peak_rss_mb": peak / 1024.0 ** 2 if sys.platform == "darwin" else peak / 1024.0}
+        with open(result_file, "w") as file:
+            json.dump(rss, file)
+        return
+
+    outcome = yield
+    benchmark = item.funcargs.get("benchmark")
+    if benchmark is None or outcome.excinfo is not None or not item.config.getoption("bench_rss"):
+        return
+    benchmark.extra_info.update(measure_rss(item))
+
+
+def reset_blocking():
+    """
+    Spin and range blocking are tracked by flags shared by every pq_helper; clearing any helper resets them.
+    """
+    pdaggerq.pq_helper("fermi").clear()
+
+
+def new_helper(case, proj_name):
+    pq = pdaggerq.pq_helper("fermi")
+    pq.set_print_level(0)
+    pq.set_left_operators(CASES[case]["proj"][proj_name][0])
+    return pq
+
+
+def derive(pq, case):
+    for op in CASES[case]["ops"]:
+        pq.add_st_operator(1.0, op, CASES[case]["T"])
+    return pq
+
+
+@pytest.fixture(scope="session")
+def derived(case):
+    """
+    Simplified (but unblocked) residual equations for a case
+    """
+    reset_blocking()
+    eqs = {}
+    for proj_name in CASES[case]["proj"]:
+        pq = derive(new_helper(case, proj_name), case)
+        pq.simplify()
+        eqs[proj_name] = pq
+    return eqs
+
+
+def build_graph(eqs, opt_level):
+    graph = pdaggerq.pq_graph({
+        'batched': False,
+        'print_level': 0,
+        'opt_level': opt_level,
+        'nthreads': -1,
+    })
+    for proj_name, eq in eqs.items():
+        graph.add(eq, proj_name)
+    return graph
+
+
+@pytest.fixture(scope="session")
+def residual_function(case, derived):
+    """
+    Compile the fully optimized python residual code for a case into a function
+    """
+    reset_blocking()
+    graph = build_graph(derived, 6)
+    graph.optimize()
+
+    amplitudes = ", ".join(CASES[case]["T"])
+    residuals = ", ".join(CASES[case]["proj"])
+    source = (f"def residuals({amplitudes}, f, eri):\n"
+              f"    tmps_ = {{}}\n"
+              f"{graph.str('python')}\n"
+              f"    return {residuals}\n")
+
+    namespace = {"np": np, "einsum": np.einsum}
+    exec(compile(source, f"<{case} residuals>", "exec"), namespace)
+    return namespace["residuals"]
+
+
+@pytest.fixture(scope="session")
+def synthetic_tensors(case):
+    """
+    Random amplitudes and integral blocks keyed the way the generated code expects
+    """
+    rng = np.random.default_rng(20240101)
+    nocc, nvirt = CASES[case]["nocc"], CASES[case]["nvirt"]
+    dims = {'o': nocc, 'v': nvirt}
+
+    amps = []
+    for t in CASES[case]["T"]:
+        rank = int(t[1:])
+        amps.append(0.01 * rng.standard_normal((nvirt,) * rank + (nocc,) * rank))
+
+    f = {a + b: rng.standard_normal((dims[a], dims[b])) for a in "ov" for b in "ov"}
+    eri = {a + b + c + d: rng.standard_normal((dims[a], dims[b], dims[c], dims[d]))
+           for a in "ov" for b in "ov" for c in "ov" for d in "ov"}
+    return amps, f, eri
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the pq_helper stages: derivation, simplification, blocking and serialization
+"""
+
+import pytest
+
+from conftest import CASES, derive, new_helper, reset_blocking
+
+
+def test_add_st_operator(benchmark, case):
+
+    def setup():
+        reset_blocking()
+        return ([new_helper(case, proj_name) for proj_name in CASES[case]["proj"]],), {}
+
+    def run(helpers):
+        for pq in helpers:
+            derive(pq, case)
+
+    benchmark.pedantic(run, setup=setup, rounds=3)
+
+
+def test_simplify(benchmark, case):
+
+    def setup():
+        reset_blocking()
+        return ([derive(new_helper(case, proj_name), case) for proj_name in CASES[case]["proj"]],), {}
+
+    def run(helpers):
+        for pq in helpers:
+            pq.simplify()
+
+    benchmark.pedantic(run, setup=setup, rounds=3)
+
+
+@pytest.mark.parametrize("blocking", ["spin", "range"])
+def test_block(benchmark, case, derived, blocking):
+    index = 1 if blocking == "spin" else 2
+
+    def run():
+        reset_blocking()
+        for proj_name, pq in derived.items():
+            labels = CASES[case]["proj"][proj_name][index]
+            if blocking == "spin":
+                pq.block_by_spin(labels)
+            else:
+                pq.block_by_range(labels)
+
+    benchmark(run)
+    reset_blocking()
+
+
+def test_save_load(benchmark, derived, tmp_path):
+
+    def run():
+        for proj_name, pq in derived.items():
+            filename = str(tmp_path / f"{proj_name}.bin")
+            pq.save(filename)
+            pq.clone().load(filename)
+
+    reset_blocking()
+    benchmark(run)
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for PQGraph.optimize at every optimization level
+"""
+
+import pytest
+
+from conftest import build_graph, reset_blocking
+
+
+@pytest.mark.parametrize("opt_level", range(7))
+def test_optimize(benchmark, derived, opt_level):
+
+    def setup():
+        reset_blocking()
+        return (build_graph(derived, opt_level),), {}
+
+    benchmark.pedantic(lambda graph: graph.optimize(), setup=setup, rounds=3)
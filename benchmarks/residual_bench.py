@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of one residual evaluation of the generated python code on synthetic tensors
+"""
+
+
+def test_residual_iteration(benchmark, residual_function, synthetic_tensors):
+    amps, f, eri = synthetic_tensors
+    benchmark(residual_function, *amps, f, eri)
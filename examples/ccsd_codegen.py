@@ -1,5 +1,8 @@
+import os
+
 import pdaggerq
 
+from pdaggerq.algebra import einsum_strings
 from pdaggerq.parser import contracted_strings_to_tensor_terms
 
 
@@ -26,9 +29,10 @@ def main():
     energy_terms = pq.strings()
     energy_terms = contracted_strings_to_tensor_terms(energy_terms)
 
-    for my_term in energy_terms:
+    codes = einsum_strings(energy_terms, update_val='energy', workers=os.cpu_count())
+    for my_term, code in zip(energy_terms, codes):
         print("#\t", my_term)
-        print("%s" % (my_term.einsum_string(update_val='energy')))
+        print(code)
         print()
 
     print('return energy')
@@ -56,10 +60,11 @@ def main():
     singles_residual_terms = pq.strings()
     singles_residual_terms = contracted_strings_to_tensor_terms(
         singles_residual_terms)
-    for my_term in singles_residual_terms:
+    codes = einsum_strings(singles_residual_terms, update_val='singles_res',
+                           output_variables=('e', 'm'), workers=os.cpu_count())
+    for my_term, code in zip(singles_residual_terms, codes):
         print("#\t", my_term)
-        print("%s" % (my_term.einsum_string(update_val='singles_res',
-                                    output_variables=('e', 'm'))))
+        print(code)
         print()
 
     print('return singles_res')
@@ -86,10 +91,11 @@ def main():
     # grab list of fully-contracted strings, then print
     doubles_residual_terms = pq.strings()
     doubles_residual_terms = contracted_strings_to_tensor_terms(doubles_residual_terms)
-    for my_term in doubles_residual_terms:
+    codes = einsum_strings(doubles_residual_terms, update_val='doubles_res',
+                           output_variables=('e', 'f', 'm', 'n'), workers=os.cpu_count())
+    for my_term, code in zip(doubles_residual_terms, codes):
         print("#\t", my_term)
-        print("%s" % (my_term.einsum_string(update_val='doubles_res',
-                                    output_variables=('e', 'f', 'm', 'n'))))
+        print(code)
         print()
 
     print('return doubles_res')
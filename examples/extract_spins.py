@@ -67,15 +67,15 @@ def block_by_spin(pq, eqname, ops, eqs):
         print(f"{spins} ->", ", ".join(f"{label} -> {spin}" for label, spin in label_to_spin.items()), flush=True)
     print()
 
-    # create equations for each spin block
-    for spins, label_to_spin in spin_map.items():
+    # create equations for all spin blocks in one pass over the strings
+    spin_cases = pq.block_by_spin_all(list(spin_map.values()))
+    for spins, spin_case in zip(spin_map, spin_cases):
         spin_eqname = eqname if spins == "" else eqname + "_" + spins
-        pq.block_by_spin(label_to_spin)
 
         # store the equation in the dictionary
-        eqs[spin_eqname] = pq.clone()
+        eqs[spin_eqname] = spin_case
 
         # print the fully contracted strings
         print(f"Equation {spin_eqname}:", flush=True)
-        for term in pq.strings():
+        for term in spin_case.strings():
             print(term, flush=True)
\ No newline at end of file
@@ -2,8 +2,11 @@
 # L = <0| (1+L) e(-T) H e(T) |0>
 # dL/dtu = <0| e(-T) H e(T) |u> + <0| L e(-T) H e(T) |u> - <0| L tu e(-T) H e(T) |0>
 
+import os
+
 import pdaggerq
 
+from pdaggerq.algebra import einsum_strings
 from pdaggerq.parser import contracted_strings_to_tensor_terms
 
 
@@ -40,10 +43,11 @@ def main():
     for my_term in doubles_residual_terms:
         print(my_term)
     doubles_residual_terms = contracted_strings_to_tensor_terms(doubles_residual_terms)
-    for my_term in doubles_residual_terms:
+    codes = einsum_strings(doubles_residual_terms, update_val='lambda_two',
+                           output_variables=('m', 'n', 'e', 'f'), workers=os.cpu_count())
+    for my_term, code in zip(doubles_residual_terms, codes):
         print("#\t", my_term)
-        print(my_term.einsum_string(update_val='lambda_two',
-                                    output_variables=('m', 'n', 'e', 'f')))
+        print(code)
         print()
 
 
@@ -2,8 +2,11 @@
 # L = <0| (1+L) e(-T) H e(T) |0>
 # dL/dtu = <0| e(-T) H e(T) |u> + <0| L e(-T) H e(T) |u> - <0| L tu e(-T) H e(T) |0>
 
+import os
+
 import pdaggerq
 
+from pdaggerq.algebra import einsum_strings
 from pdaggerq.parser import contracted_strings_to_tensor_terms
 
 
@@ -39,10 +42,11 @@ def main():
     # grab list of fully-contracted strings, then print
     singles_residual_terms = pq.strings()
     singles_residual_terms = contracted_strings_to_tensor_terms(singles_residual_terms)
-    for my_term in singles_residual_terms:
+    codes = einsum_strings(singles_residual_terms, update_val='lambda_one',
+                           output_variables=('m', 'e'), workers=os.cpu_count())
+    for my_term, code in zip(singles_residual_terms, codes):
         print("#\t", my_term)
-        print(my_term.einsum_string(update_val='lambda_one',
-                                    output_variables=('m', 'e')))
+        print(code)
         print()
 
     pq.clear()
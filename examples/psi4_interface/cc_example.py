@@ -28,6 +28,7 @@ import psi4
 import time
 
 from cc_tools import ccsd
+from cc_tools import ccsd_closed_shell
 from cc_tools import ccsd_t
 from cc_tools import ccsdt
 from cc_tools import ccsdtq
@@ -60,7 +61,7 @@ def main():
 
     # run ccsd
     s1 = time.time()
-    en1 = ccsd(mol, do_eom_ccsd = False, use_spin_orbital_basis = True)
+    en1 = ccsd(mol, do_eom_ccsd = False, use_spin_orbital_basis = True, block_sparse = True)
     e1 = time.time()
     time_1 = e1-s1
 
@@ -89,6 +90,21 @@ def main():
     print(f"Difference in time:                {time_2-time_1: 10.3f}")
     print("")
 
+    s3 = time.time()
+    en3 = ccsd_closed_shell(mol)
+    e3 = time.time()
+    time_3 = e3-s3
+
+    # check ccsd energy against psi4
+    assert np.isclose(en3, -75.019715133639338, rtol=1e-8, atol=1e-8)
+
+    print('    Closed-Shell CCSD Total Energy.............................................PASSED')
+    print('')
+
+    print(f"CCSD energy in closed-shell basis: {en3: 30.20f}")
+    print(f"CCSD time in closed-shell basis:   {time_3: 10.3f}")
+    print("")
+
     # run ccsd(t)
     en = ccsd_t(mol)
 
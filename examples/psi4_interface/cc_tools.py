@@ -38,13 +38,15 @@ from ccsd import ccsd_iterations
 from ccsd import coupled_cluster_energy
 from ccsd import ccsd_iterations_with_spin
 from ccsd import ccsd_energy_with_spin
+from ccsd import ccsd_iterations_closed_shell
+from ccsd import ccsd_energy_closed_shell
 
 # ccsdt iterations
 from ccsdt import ccsdt_iterations
 from ccsdt import ccsdt_iterations_with_spin
 
 # (t)
-from ccsdt import perturbative_triples_correction
+from ccsdt import perturbative_triples_correction_batched
 
 # ccsdyq iterations
 from ccsdtq import ccsdtq_iterations_with_spin
@@ -139,6 +141,209 @@ def spatial_to_spin_orbital_tei(gaa, gab, gbb, n, noa, nob):
 
     return sg
 
+class SpinBlockedTEI:
+    """
+
+    antisymmetrized spin-orbital two-electron integrals that keep only the spin-allowed blocks
+
+    the aaaa, abab, and bbbb spatial blocks from get_integrals_with_spin are stored, and blocks of the
+    spin-orbital tensor are assembled when they are requested. the spin-orbital axes have the same
+    layout as spatial_to_spin_orbital_tei, |oa|ob|va|vb|, so g[o, o, v, v] gives the same array as
+    indexing the dense tensor. blocks are also available by name (g["oovv"]), so the object can be
+    used directly as eri in code generated by pq_graph.
+
+    assembled blocks are kept, so a residual that indexes g[o, o, v, v] many times per iteration
+    assembles it once per run. blocks with more elements than the stored spatial integrals (e.g.,
+    g[v, v, v, v]) are assembled on every use instead, so at most one of them exists at a time.
+    other indices (integers, steps, index arrays) are taken from the smallest contiguous block
+    that covers them, never from the dense tensor.
+
+    """
+
+    def __init__(self, gaa, gab, gbb, n, noa, nob, max_cached_size=None):
+        """
+
+        :param gaa: antisymmetrized two-electron integrals in physicist' notation, alpha-alpha portion
+        :param gab: two-electron integrals in physicist' notation, alpha-beta portion
+        :param gbb: antisymmetrized two-electron integrals in physicist' notation, beta-beta portion
+        :param n: number of spatial orbitals
+        :param noa: number of alpha occupied orbitals
+        :param nob: number of beta occupied orbitals
+        :param max_cached_size: number of elements above which an assembled block is not kept
+                                (default: the number of elements in gaa, gab, and gbb)
+
+        """
+
+        self.gaa = gaa
+        self.gab = gab
+        self.gbb = gbb
+        self.n, self.noa, self.nob = n, noa, nob
+
+        self.shape = (2 * n,) * 4
+        self.ndim = 4
+        self.dtype = np.result_type(gaa, gab, gbb)
+
+        # spin-orbital axis: (first spin orbital, last spin orbital + 1, spin, first spatial orbital)
+        self.segments = [(0, noa, 0, 0), (noa, noa + nob, 1, 0), (noa + nob, n + nob, 0, noa), (n + nob, 2 * n, 1, nob)]
+
+        # occupied, virtual slices of the named blocks
+        self.spaces = {'o': slice(None, noa + nob), 'v': slice(noa + nob, None)}
+
+        # assembled blocks, keyed by the range of spin orbitals on each axis
+        self.max_cached_size = gaa.size + gab.size + gbb.size if max_cached_size is None else max_cached_size
+        self.blocks = {}
+
+    def spin_block(self, spins, p, q, r, s):
+        """
+
+        :param spins: spin of each axis (0 = alpha, 1 = beta)
+        :param p, q, r, s: spatial orbital slices of each axis
+        :return: <p,q||r,s> for these spins, or None if the block vanishes by spin
+
+        """
+        if spins == (0, 0, 0, 0):
+            return self.gaa[p, q, r, s]
+        if spins == (1, 1, 1, 1):
+            return self.gbb[p, q, r, s]
+        # abab block, antisymmetrize on the fly
+        if spins == (0, 1, 0, 1):
+            return self.gab[p, q, r, s]
+        if spins == (0, 1, 1, 0):
+            return -self.gab[p, q, s, r].transpose(0, 1, 3, 2)
+        if spins == (1, 0, 0, 1):
+            return -self.gab[q, p, r, s].transpose(1, 0, 2, 3)
+        if spins == (1, 0, 1, 0):
+            return self.gab[q, p, s, r].transpose(1, 0, 3, 2)
+        return None
+
+    def assemble(self, ranges):
+        """
+
+        :param ranges: (first, last + 1) spin orbital on each axis
+        :return: the contiguous block of the spin-orbital tensor over these ranges
+
+        """
+
+        # pieces of each axis: (spin, slice of the result, spatial orbital slice)
+        pieces = []
+        for start, stop in ranges:
+            axis = []
+            for first, last, spin, offset in self.segments:
+                lo, hi = max(start, first), min(stop, last)
+                if lo < hi:
+                    axis.append((spin, slice(lo - start, hi - start), slice(lo - first + offset, hi - first + offset)))
+            pieces.append(axis)
+
+        block = np.zeros(tuple(stop - start for start, stop in ranges), dtype=self.dtype)
+        for p in pieces[0]:
+            for q in pieces[1]:
+                for r in pieces[2]:
+                    for s in pieces[3]:
+                        value = self.spin_block((p[0], q[0], r[0], s[0]), p[2], q[2], r[2], s[2])
+                        if value is not None:
+                            block[p[1], q[1], r[1], s[1]] = value
+        return block
+
+    def block(self, ranges):
+        """
+
+        :param ranges: (first, last + 1) spin orbital on each axis
+        :return: the assembled block, from the cache if it is small enough to be kept
+
+        """
+        ranges = tuple(ranges)
+        if ranges in self.blocks:
+            return self.blocks[ranges]
+
+        block = self.assemble(ranges)
+        block.flags.writeable = False
+        if block.size <= self.max_cached_size:
+            self.blocks[ranges] = block
+        return block
+
+    def clear(self):
+        """
+
+        drop the assembled blocks
+
+        """
+        self.blocks = {}
+
+    @staticmethod
+    def covering(key, dim):
+        """
+
+        :param key: index along one axis (slice, integer, or array of integers or booleans)
+        :param dim: length of the axis
+        :return: (first, last + 1) of the spin orbitals the index touches, and the same index relative to first
+
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(dim)
+            touched = range(start, stop, step)
+            if len(touched) == 0:
+                return (0, 0), slice(0, 0)
+            lo, hi = min(touched[0], touched[-1]), max(touched[0], touched[-1]) + 1
+            end = touched[-1] - lo + (1 if step > 0 else -1)
+            return (lo, hi), slice(touched[0] - lo, None if end < 0 else end, step)
+
+        if isinstance(key, (int, np.integer)):
+            if not -dim <= key < dim:
+                raise IndexError("index {} is out of bounds for axis with size {}".format(key, dim))
+            key = key % dim
+            return (key, key + 1), 0
+
+        index = np.asarray(key)
+        if index.dtype == bool:
+            index = np.nonzero(index)[0]
+        index = index.astype(np.intp) % dim
+        if index.size == 0:
+            return (0, 0), index
+        lo = int(index.min())
+        return (lo, int(index.max()) + 1), index - lo
+
+    def __getitem__(self, key):
+
+        if isinstance(key, str):
+            key = tuple(self.spaces[space] for space in key)
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is None for k in key):
+            raise IndexError("SpinBlockedTEI does not support np.newaxis")
+        if any(k is Ellipsis for k in key):
+            i = [k is Ellipsis for k in key].index(True)
+            key = key[:i] + (slice(None),) * (self.ndim - len(key) + 1) + key[i + 1:]
+        key = key + (slice(None),) * (self.ndim - len(key))
+        if len(key) != self.ndim:
+            raise IndexError("too many indices for SpinBlockedTEI")
+
+        ranges, relative = zip(*(self.covering(k, dim) for k, dim in zip(key, self.shape)))
+        block = self.block(ranges)
+
+        # four contiguous slices give the whole block
+        if all(isinstance(k, slice) and k == slice(0, stop - start, 1) for k, (start, stop) in zip(relative, ranges)):
+            return block
+        return block[relative]
+
+    def astype(self, dtype, copy=True):
+        """
+
+        :param dtype: dtype of the spatial integrals
+        :param copy: copy the integrals even if they are already in dtype
+        :return: a SpinBlockedTEI whose blocks are assembled in dtype
+
+        """
+        if not copy and np.dtype(dtype) == self.dtype:
+            return self
+        return SpinBlockedTEI(self.gaa.astype(dtype), self.gab.astype(dtype), self.gbb.astype(dtype),
+                              self.n, self.noa, self.nob, self.max_cached_size)
+
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError("a SpinBlockedTEI cannot be viewed as a dense array without a copy")
+        dense = self.assemble([(0, dim) for dim in self.shape])
+        return dense if dtype is None else dense.astype(dtype, copy=False)
+
 def get_integrals_with_spin():
     """
 
@@ -197,11 +402,55 @@ def get_integrals_with_spin():
 
     return noa, nob, nva, nvb, fa, fb, g_aaaa, g_bbbb, g_abab
 
-def get_integrals():
+def get_integrals_closed_shell():
+    """
+
+    get one- and two-electron integrals from psi4, for a closed-shell (rhf) reference
+
+    :return nocc: number of doubly occupied orbitals
+    :return nvirt: number of virtual orbitals
+    :return f: the fock matrix (spatial orbital basis)
+    :return V: coulomb integrals V(pqrs) = <pq|rs> (spatial orbital basis)
+
+    """
+
+    # compute the Hartree-Fock energy and wave function
+    scf_e, wfn = psi4.energy('SCF', return_wfn=True)
+
+    if wfn.nalpha() != wfn.nbeta():
+        raise ValueError("closed-shell integrals require an rhf reference")
+
+    # number of doubly occupied orbitals
+    nocc = wfn.nalpha()
+
+    # number of virtual orbitals
+    nvirt = wfn.nmo() - nocc
+
+    # molecular orbitals (spatial):
+    C = wfn.Ca()
+
+    # use Psi4's MintsHelper to generate integrals
+    mints = psi4.core.MintsHelper(wfn.basisset())
+
+    # build the one-electron integrals
+    H = np.asarray(mints.ao_kinetic()) + np.asarray(mints.ao_potential())
+    H = np.einsum('uj,vi,uv', C, C, H)
+
+    # build the two-electron integrals: V(ijkl) = <ij|kl> = (ik|jl)
+    V = np.einsum('ikjl->ijkl', np.asarray(mints.mo_eri(C, C, C, C)))
+
+    # build the fock matrix: f(pq) = h(pq) + sum_i [ 2 <pi|qi> - <pi|iq> ]
+    o = slice(None, nocc)
+    f = H + 2.0 * np.einsum('piqi->pq', V[:, o, :, o]) - np.einsum('piiq->pq', V[:, o, o, :])
+
+    return nocc, nvirt, f, V
+
+def get_integrals(block_sparse=False):
     """
 
     get one- and two-electron integrals from psi4
 
+    :param block_sparse: keep only the spin-allowed blocks of the two-electron integrals (a SpinBlockedTEI)
     :return nsocc: number of occupied spin-orbitals
     :return nsvirt: number of virtual spin-orbitals
     :return fock: the fock matrix (spin-orbital basis)
@@ -215,7 +464,10 @@ def get_integrals():
     nsvirt = nva + nvb
 
     fock = spatial_to_spin_orbital_oei(fa, fb, (nsocc+nsvirt)//2, noa, nob)
-    gtei = spatial_to_spin_orbital_tei(g_aaaa, g_abab, g_bbbb, (nsocc+nsvirt)//2, noa, nob)
+    if block_sparse:
+        gtei = SpinBlockedTEI(g_aaaa, g_abab, g_bbbb, (nsocc+nsvirt)//2, noa, nob)
+    else:
+        gtei = spatial_to_spin_orbital_tei(g_aaaa, g_abab, g_bbbb, (nsocc+nsvirt)//2, noa, nob)
 
     return nsocc, nsvirt, fock, gtei
 
@@ -297,7 +549,52 @@ def ccsd_with_spin(mol):
 
     return cc_energy + nuclear_repulsion_energy
 
-def ccsd(mol, do_eom_ccsd = False, use_spin_orbital_basis = True):
+def ccsd_closed_shell(mol):
+    """
+
+    run ccsd, with equations spin-adapted for a closed-shell reference
+
+    :param mol: a psi4 molecule
+    :return cc_energy: the total ccsd energy
+
+    """
+
+    nocc, nvirt, f, V = get_integrals_closed_shell()
+
+    # occupied, virtual slices
+    n = np.newaxis
+    o = slice(None, nocc)
+    v = slice(nocc, None)
+
+    # orbital energies
+    eps = np.diag(f).copy()
+
+    # energy denominators
+    e_abij = 1 / (-eps[v, n, n, n] - eps[n, v, n, n] + eps[n, n, o, n] + eps[n, n, n, o])
+    e_ai = 1 / (-eps[v, n] + eps[n, o])
+
+    # hartree-fock energy
+    hf_energy = ( 2.0 * einsum('ii', f[o, o])
+                - 2.0 * einsum('ijij', V[o, o, o, o])
+                + 1.0 * einsum('ijji', V[o, o, o, o]) )
+
+    nuclear_repulsion_energy = mol.nuclear_repulsion_energy()
+
+    t1 = np.zeros((nvirt, nocc))
+    t2 = np.zeros((nvirt, nvirt, nocc, nocc))
+    t1, t2 = ccsd_iterations_closed_shell(t1, t2, f, V, o, v, e_ai, e_abij,
+                      hf_energy, e_convergence=1e-10, r_convergence=1e-10, diis_size=8, diis_start_cycle=4)
+
+    cc_energy = ccsd_energy_closed_shell(t1, t2, f, V, o, v)
+
+    print("")
+    print("    CCSD Correlation Energy: {: 20.12f}".format(cc_energy - hf_energy))
+    print("    CCSD Total Energy:       {: 20.12f}".format(cc_energy + nuclear_repulsion_energy))
+    print("")
+
+    return cc_energy + nuclear_repulsion_energy
+
+def ccsd(mol, do_eom_ccsd = False, use_spin_orbital_basis = True, precision = None, block_sparse = False):
     """
 
     run ccsd
@@ -305,6 +602,8 @@ def ccsd(mol, do_eom_ccsd = False, use_spin_orbital_basis = True):
     :param mol: a psi4 molecule
     :param do_eom_ccsd: do run eom-ccsd? default false
     :param use_spin_orbital_basis: do use spin-obital basis? default false
+    :param precision: a pdaggerq.precision.MixedPrecision policy for the residuals (spin-orbital basis only). default float64
+    :param block_sparse: keep only the spin-allowed blocks of the two-electron integrals (spin-orbital basis only). default false
     :return cc_energy: the total ccsd energy
 
     """
@@ -312,7 +611,7 @@ def ccsd(mol, do_eom_ccsd = False, use_spin_orbital_basis = True):
     if not use_spin_orbital_basis : 
         return ccsd_with_spin(mol)
 
-    nsocc, nsvirt, fock, tei = get_integrals()
+    nsocc, nsvirt, fock, tei = get_integrals(block_sparse)
     
     # occupied, virtual slices
     n = np.newaxis
@@ -336,7 +635,8 @@ def ccsd(mol, do_eom_ccsd = False, use_spin_orbital_basis = True):
     t1 = np.zeros((nsvirt, nsocc))
     t2 = np.zeros((nsvirt, nsvirt, nsocc, nsocc))
     t1, t2 = ccsd_iterations(t1, t2, fock, tei, o, v, e_ai, e_abij,
-                      hf_energy, e_convergence=1e-10, r_convergence=1e-10, diis_size=8, diis_start_cycle=4)
+                      hf_energy, e_convergence=1e-10, r_convergence=1e-10, diis_size=8, diis_start_cycle=4,
+                      precision=precision)
 
     cc_energy = coupled_cluster_energy(t1, t2, fock, tei, o, v)
 
@@ -506,10 +806,8 @@ def ccsd_t(mol):
 
     cc_energy = coupled_cluster_energy(t1, t2, fock, tei, o, v)
 
-    # triples 
-    t3 = np.zeros((nsvirt, nsvirt, nsvirt, nsocc, nsocc, nsocc))
-    e_abcijk = 1 / (-eps[v, n, n, n, n, n] - eps[n, v, n, n, n, n] - eps[n, n, v, n, n, n] + eps[n, n, n, o, n, n] + eps[n, n, n, n, o, n] + eps[n, n, n, n, n, o])
-    et = perturbative_triples_correction(t1, t2, t3, fock, tei, o, v, e_abcijk)
+    # triples, one block of occupied orbitals at a time
+    et = perturbative_triples_correction_batched(t1, t2, fock, tei, o, v, block_size=1)
 
     nuclear_repulsion_energy = mol.nuclear_repulsion_energy()
 
@@ -629,12 +927,15 @@ def ccsdt_with_spin(mol):
 
     return cc_energy + nuclear_repulsion_energy
 
-def ccsdt(mol, use_spin_orbital_basis = True):
+def ccsdt(mol, use_spin_orbital_basis = True, packed = False, precision = None):
     """
 
     run ccsdt
 
     :param mol: a psi4 molecule
+    :param packed: keep t3 and its DIIS history in packed storage (spin-orbital basis only;
+                   see ccsdt_iterations)
+    :param precision: a pdaggerq.precision.MixedPrecision policy for the residuals (spin-orbital basis only). default float64
     :return cc_energy: the total ccsdt energy
 
     """
@@ -666,8 +967,12 @@ def ccsdt(mol, use_spin_orbital_basis = True):
     t1 = np.zeros((nsvirt, nsocc))
     t2 = np.zeros((nsvirt, nsvirt, nsocc, nsocc))
     t3 = np.zeros((nsvirt, nsvirt, nsvirt, nsocc, nsocc, nsocc))
+    if packed:
+        from pdaggerq.packing import pack
+        t3, e_abcijk = pack(t3), pack(e_abcijk)
     t1, t2, t3 = ccsdt_iterations(t1, t2, t3, fock, tei, o, v, e_ai, e_abij, e_abcijk,
-                      hf_energy, e_convergence=1e-10, r_convergence=1e-10, diis_size=8, diis_start_cycle=4)
+                      hf_energy, e_convergence=1e-10, r_convergence=1e-10, diis_size=8, diis_start_cycle=4,
+                      packed=packed, precision=precision)
 
     #t1, t2 = ccsd_iterations(t1, t2, fock, tei, o, v, e_ai, e_abij,
     #                  hf_energy, e_convergence=1e-10, r_convergence=1e-10, diis_size=8, diis_start_cycle=4)
@@ -319,7 +319,7 @@ def ccsd_iterations_with_spin(t1_aa, t1_bb, t2_aaaa, t2_bbbb, t2_abab, f_aa, f_b
     return t1_aa, t1_bb, t2_aaaa, t2_bbbb, t2_abab
 
 def ccsd_iterations(t1, t2, fock, g, o, v, e_ai, e_abij, hf_energy, max_iter=500, 
-        e_convergence=1e-8,r_convergence=1e-8,diis_size=None, diis_start_cycle=4):
+        e_convergence=1e-8,r_convergence=1e-8,diis_size=None, diis_start_cycle=4, precision=None):
            
 
     # initialize diis if diis_size is not None
@@ -331,6 +331,10 @@ def ccsd_iterations(t1, t2, fock, g, o, v, e_ai, e_abij, hf_energy, max_iter=500
         t1_dim = t1.size
         old_vec = np.hstack((t1.flatten(), t2.flatten()))
 
+    # residuals are evaluated in the precision of the policy (a pdaggerq.precision.MixedPrecision;
+    # float64 throughout by default); the amplitudes, energies, and diis vectors stay in float64
+    fock_p, g_p = (fock, g) if precision is None else precision.cast(fock, g)
+
     fock_e_ai = np.reciprocal(e_ai)
     fock_e_abij = np.reciprocal(e_abij)
     old_energy = coupled_cluster_energy(t1, t2, fock, g, o, v)
@@ -341,10 +345,16 @@ def ccsd_iterations(t1, t2, fock, g, o, v, e_ai, e_abij, hf_energy, max_iter=500
     print("     Iter               Energy                 |dE|                 |dT|")
     for idx in range(max_iter):
 
-        residual_singles = ccsd_singles_residual(t1, t2, fock, g, o, v)
-        residual_doubles = ccsd_doubles_residual(t1, t2, fock, g, o, v)
+        t1_p, t2_p = (t1, t2) if precision is None else precision.cast(t1, t2)
+        residual_singles = ccsd_singles_residual(t1_p, t2_p, fock_p, g_p, o, v)
+        residual_doubles = ccsd_doubles_residual(t1_p, t2_p, fock_p, g_p, o, v)
 
         res_norm = np.linalg.norm(residual_singles) + np.linalg.norm(residual_doubles)
+        if precision is not None and precision.update(res_norm):
+            print("    switching to {} residuals".format(precision.dtype))
+            fock_p, g_p = precision.cast(fock, g)
+            if diis_size is not None:
+                diis_update.reset()
 
         singles_res = residual_singles + fock_e_ai * t1
         doubles_res = residual_doubles + fock_e_abij * t2
@@ -367,7 +377,7 @@ def ccsd_iterations(t1, t2, fock, g, o, v, e_ai, e_abij, hf_energy, max_iter=500
         delta_e = np.abs(old_energy - current_energy)
 
         print("    {: 5d} {: 20.12f} {: 20.12f} {: 20.12f}".format(idx, current_energy - hf_energy, delta_e, res_norm))
-        if delta_e < e_convergence and res_norm < r_convergence:
+        if delta_e < e_convergence and res_norm < r_convergence and (precision is None or precision.high_precision):
             # assign t1 and t2 variables for future use before breaking
             t1 = new_singles
             t2 = new_doubles
@@ -385,6 +395,75 @@ def ccsd_iterations(t1, t2, fock, g, o, v, e_ai, e_abij, hf_energy, max_iter=500
     return t1, t2
 
 
+def ccsd_iterations_closed_shell(t1, t2, f, V, o, v, e_ai, e_abij, hf_energy, max_iter=500, 
+        e_convergence=1e-8,r_convergence=1e-8,diis_size=None, diis_start_cycle=4):
+           
+
+    # t1 and t2 are the aa and abab blocks of the amplitudes for a closed-shell reference;
+    # V holds the coulomb integrals <pq|rs> over spatial orbitals
+
+    # initialize diis if diis_size is not None
+    # else normal scf iterate
+
+    if diis_size is not None:
+        from diis import DIIS
+        diis_update = DIIS(diis_size, start_iter=diis_start_cycle)
+        t1_dim = t1.size
+        old_vec = np.hstack((t1.flatten(), t2.flatten()))
+
+    fock_e_ai = np.reciprocal(e_ai)
+    fock_e_abij = np.reciprocal(e_abij)
+    old_energy = ccsd_energy_closed_shell(t1, t2, f, V, o, v)
+
+    print("")
+    print("    ==> CCSD amplitude equations <==")
+    print("")
+    print("     Iter               Energy                 |dE|                 |dT|")
+    for idx in range(max_iter):
+
+        residual_singles = ccsd_t1_closed_shell_residual(t1, t2, f, V, o, v)
+        residual_doubles = ccsd_t2_closed_shell_residual(t1, t2, f, V, o, v)
+
+        res_norm = np.linalg.norm(residual_singles) + np.linalg.norm(residual_doubles)
+
+        singles_res = residual_singles + fock_e_ai * t1
+        doubles_res = residual_doubles + fock_e_abij * t2
+
+        new_singles = singles_res * e_ai
+        new_doubles = doubles_res * e_abij
+
+        # diis update
+        if diis_size is not None:
+            vectorized_iterate = np.hstack(
+                (new_singles.flatten(), new_doubles.flatten()))
+            error_vec = old_vec - vectorized_iterate
+            new_vectorized_iterate = diis_update.compute_new_vec(vectorized_iterate,
+                                                                 error_vec)
+            new_singles = new_vectorized_iterate[:t1_dim].reshape(t1.shape)
+            new_doubles = new_vectorized_iterate[t1_dim:].reshape(t2.shape)
+            old_vec = new_vectorized_iterate
+
+        current_energy = ccsd_energy_closed_shell(new_singles, new_doubles, f, V, o, v)
+        delta_e = np.abs(old_energy - current_energy)
+
+        print("    {: 5d} {: 20.12f} {: 20.12f} {: 20.12f}".format(idx, current_energy - hf_energy, delta_e, res_norm))
+        if delta_e < e_convergence and res_norm < r_convergence:
+            # assign t1 and t2 variables for future use before breaking
+            t1 = new_singles
+            t2 = new_doubles
+            break
+        else:
+            # assign t1 and t2 and old_energy for next iteration
+            t1 = new_singles
+            t2 = new_doubles
+            old_energy = current_energy
+
+    else:
+        raise ValueError("CCSD iterations did not converge")
+
+
+    return t1, t2
+
 def ccsd_energy_with_spin(t1_aa, t1_bb, t2_aaaa, t2_bbbb, t2_abab, f_aa, f_bb, g_aaaa, g_bbbb, g_abab, oa, ob, va, vb):
 
     #    < 0 | e(-T) H e(T) | 0> :
@@ -1325,3 +1404,413 @@ def ccsd_t2_abab_residual(t1_aa, t1_bb, t2_aaaa, t2_bbbb, t2_abab, f_aa, f_bb, g
 
     return doubles_res
 
+def ccsd_energy_closed_shell(t1, t2, f, V, o, v):
+
+    #    < 0 | e(-T) H e(T) | 0> :
+
+    #	  2.0000 f(i,i)
+    energy  =  2.000000000000000 * einsum('ii', f[o, o])
+
+    #	  2.0000 f(i,a)*t1(a,i)
+    energy +=  2.000000000000000 * einsum('ia,ai', f[o, v], t1)
+
+    #	 -2.0000 <j,i|j,i>
+    energy += -2.000000000000000 * einsum('jiji', V[o, o, o, o])
+
+    #	  1.0000 <j,i|i,j>
+    energy +=  1.000000000000000 * einsum('jiij', V[o, o, o, o])
+
+    #	  2.0000 <j,i|a,b>*t2(a,b,j,i)
+    energy +=  2.000000000000000 * einsum('jiab,abji', V[o, o, v, v], t2)
+
+    #	 -1.0000 <j,i|b,a>*t2(a,b,j,i)
+    energy += -1.000000000000000 * einsum('jiba,abji', V[o, o, v, v], t2)
+
+    #	 -1.0000 <j,i|a,b>*t1(a,i)*t1(b,j)
+    energy += -1.000000000000000 * einsum('jiab,ai,bj', V[o, o, v, v], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  2.0000 <j,i|b,a>*t1(a,i)*t1(b,j)
+    energy +=  2.000000000000000 * einsum('jiba,ai,bj', V[o, o, v, v], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    return energy
+
+def ccsd_t1_closed_shell_residual(t1, t2, f, V, o, v):
+
+    #    < 0 | m* e e(-T) H e(T) | 0> :
+
+    #	  1.0000 f(e,m)
+    singles_res  =  1.000000000000000 * einsum('em->em', f[v, o])
+
+    #	 -1.0000 f(i,m)*t1(e,i)
+    singles_res += -1.000000000000000 * einsum('im,ei->em', f[o, o], t1)
+
+    #	  1.0000 f(e,a)*t1(a,m)
+    singles_res +=  1.000000000000000 * einsum('ea,am->em', f[v, v], t1)
+
+    #	 -1.0000 f(i,a)*t2(a,e,m,i)
+    singles_res += -1.000000000000000 * einsum('ia,aemi->em', f[o, v], t2)
+
+    #	  2.0000 f(i,a)*t2(a,e,i,m)
+    singles_res +=  2.000000000000000 * einsum('ia,aeim->em', f[o, v], t2)
+
+    #	 -1.0000 f(i,a)*t1(a,m)*t1(e,i)
+    singles_res += -1.000000000000000 * einsum('ia,am,ei->em', f[o, v], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  2.0000 <i,e|a,m>*t1(a,i)
+    singles_res +=  2.000000000000000 * einsum('ieam,ai->em', V[o, v, v, o], t1)
+
+    #	 -1.0000 <i,e|m,a>*t1(a,i)
+    singles_res += -1.000000000000000 * einsum('iema,ai->em', V[o, v, o, v], t1)
+
+    #	 -2.0000 <j,i|a,m>*t2(a,e,j,i)
+    singles_res += -2.000000000000000 * einsum('jiam,aeji->em', V[o, o, v, o], t2)
+
+    #	  1.0000 <j,i|m,a>*t2(a,e,j,i)
+    singles_res +=  1.000000000000000 * einsum('jima,aeji->em', V[o, o, o, v], t2)
+
+    #	 -1.0000 <i,e|a,b>*t2(a,b,m,i)
+    singles_res += -1.000000000000000 * einsum('ieab,abmi->em', V[o, v, v, v], t2)
+
+    #	  2.0000 <i,e|b,a>*t2(a,b,m,i)
+    singles_res +=  2.000000000000000 * einsum('ieba,abmi->em', V[o, v, v, v], t2)
+
+    #	  1.0000 <j,i|a,b>*t1(a,i)*t2(b,e,m,j)
+    singles_res +=  1.000000000000000 * einsum('jiab,ai,bemj->em', V[o, o, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <j,i|b,a>*t1(a,i)*t2(b,e,m,j)
+    singles_res += -2.000000000000000 * einsum('jiba,ai,bemj->em', V[o, o, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <j,i|a,b>*t1(a,i)*t2(b,e,j,m)
+    singles_res += -2.000000000000000 * einsum('jiab,ai,bejm->em', V[o, o, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  4.0000 <j,i|b,a>*t1(a,i)*t2(b,e,j,m)
+    singles_res +=  4.000000000000000 * einsum('jiba,ai,bejm->em', V[o, o, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t1(a,m)*t2(b,e,j,i)
+    singles_res +=  1.000000000000000 * einsum('jiab,am,beji->em', V[o, o, v, v], t1, t2, optimize=['einsum_path', (0, 2), (0, 1)])
+
+    #	 -2.0000 <j,i|b,a>*t1(a,m)*t2(b,e,j,i)
+    singles_res += -2.000000000000000 * einsum('jiba,am,beji->em', V[o, o, v, v], t1, t2, optimize=['einsum_path', (0, 2), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t2(a,b,m,j)*t1(e,i)
+    singles_res +=  1.000000000000000 * einsum('jiab,abmj,ei->em', V[o, o, v, v], t2, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <j,i|b,a>*t2(a,b,m,j)*t1(e,i)
+    singles_res += -2.000000000000000 * einsum('jiba,abmj,ei->em', V[o, o, v, v], t2, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|a,m>*t1(a,i)*t1(e,j)
+    singles_res +=  1.000000000000000 * einsum('jiam,ai,ej->em', V[o, o, v, o], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <j,i|m,a>*t1(a,i)*t1(e,j)
+    singles_res += -2.000000000000000 * einsum('jima,ai,ej->em', V[o, o, o, v], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  2.0000 <i,e|a,b>*t1(a,i)*t1(b,m)
+    singles_res +=  2.000000000000000 * einsum('ieab,ai,bm->em', V[o, v, v, v], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <i,e|b,a>*t1(a,i)*t1(b,m)
+    singles_res += -1.000000000000000 * einsum('ieba,ai,bm->em', V[o, v, v, v], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t1(a,i)*t1(b,m)*t1(e,j)
+    singles_res +=  1.000000000000000 * einsum('jiab,ai,bm,ej->em', V[o, o, v, v], t1, t1, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	 -2.0000 <j,i|b,a>*t1(a,i)*t1(b,m)*t1(e,j)
+    singles_res += -2.000000000000000 * einsum('jiba,ai,bm,ej->em', V[o, o, v, v], t1, t1, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    return singles_res
+
+def ccsd_t2_closed_shell_residual(t1, t2, f, V, o, v):
+
+    #    < 0 | m* n* f e e(-T) H e(T) | 0> :
+
+    #	 -1.0000 f(i,n)*t2(e,f,m,i)
+    doubles_res  = -1.000000000000000 * einsum('in,efmi->efmn', f[o, o], t2)
+
+    #	 -1.0000 f(i,m)*t2(e,f,i,n)
+    doubles_res += -1.000000000000000 * einsum('im,efin->efmn', f[o, o], t2)
+
+    #	  1.0000 f(e,a)*t2(a,f,m,n)
+    doubles_res +=  1.000000000000000 * einsum('ea,afmn->efmn', f[v, v], t2)
+
+    #	  1.0000 f(f,a)*t2(e,a,m,n)
+    doubles_res +=  1.000000000000000 * einsum('fa,eamn->efmn', f[v, v], t2)
+
+    #	 -1.0000 f(i,a)*t1(a,n)*t2(e,f,m,i)
+    doubles_res += -1.000000000000000 * einsum('ia,an,efmi->efmn', f[o, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 f(i,a)*t1(a,m)*t2(e,f,i,n)
+    doubles_res += -1.000000000000000 * einsum('ia,am,efin->efmn', f[o, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 f(i,a)*t2(a,f,m,n)*t1(e,i)
+    doubles_res += -1.000000000000000 * einsum('ia,afmn,ei->efmn', f[o, v], t2, t1, optimize=['einsum_path', (0, 2), (0, 1)])
+
+    #	 -1.0000 f(i,a)*t2(e,a,m,n)*t1(f,i)
+    doubles_res += -1.000000000000000 * einsum('ia,eamn,fi->efmn', f[o, v], t2, t1, optimize=['einsum_path', (0, 2), (0, 1)])
+
+    #	  1.0000 <e,f|m,n>
+    doubles_res +=  1.000000000000000 * einsum('efmn->efmn', V[v, v, o, o])
+
+    #	 -1.0000 <e,i|m,n>*t1(f,i)
+    doubles_res += -1.000000000000000 * einsum('eimn,fi->efmn', V[v, o, o, o], t1)
+
+    #	 -1.0000 <i,f|m,n>*t1(e,i)
+    doubles_res += -1.000000000000000 * einsum('ifmn,ei->efmn', V[o, v, o, o], t1)
+
+    #	  1.0000 <e,f|a,n>*t1(a,m)
+    doubles_res +=  1.000000000000000 * einsum('efan,am->efmn', V[v, v, v, o], t1)
+
+    #	  1.0000 <e,f|m,a>*t1(a,n)
+    doubles_res +=  1.000000000000000 * einsum('efma,an->efmn', V[v, v, o, v], t1)
+
+    #	  1.0000 <j,i|m,n>*t2(e,f,j,i)
+    doubles_res +=  1.000000000000000 * einsum('jimn,efji->efmn', V[o, o, o, o], t2)
+
+    #	 -1.0000 <e,i|a,n>*t2(a,f,m,i)
+    doubles_res += -1.000000000000000 * einsum('eian,afmi->efmn', V[v, o, v, o], t2)
+
+    #	 -1.0000 <i,f|a,n>*t2(a,e,m,i)
+    doubles_res += -1.000000000000000 * einsum('ifan,aemi->efmn', V[o, v, v, o], t2)
+
+    #	  2.0000 <i,f|a,n>*t2(a,e,i,m)
+    doubles_res +=  2.000000000000000 * einsum('ifan,aeim->efmn', V[o, v, v, o], t2)
+
+    #	 -1.0000 <i,f|n,a>*t2(e,a,m,i)
+    doubles_res += -1.000000000000000 * einsum('ifna,eami->efmn', V[o, v, o, v], t2)
+
+    #	  2.0000 <i,e|a,m>*t2(a,f,i,n)
+    doubles_res +=  2.000000000000000 * einsum('ieam,afin->efmn', V[o, v, v, o], t2)
+
+    #	 -1.0000 <i,e|m,a>*t2(a,f,i,n)
+    doubles_res += -1.000000000000000 * einsum('iema,afin->efmn', V[o, v, o, v], t2)
+
+    #	 -1.0000 <e,i|m,a>*t2(a,f,n,i)
+    doubles_res += -1.000000000000000 * einsum('eima,afni->efmn', V[v, o, o, v], t2)
+
+    #	 -1.0000 <i,f|m,a>*t2(e,a,i,n)
+    doubles_res += -1.000000000000000 * einsum('ifma,eain->efmn', V[o, v, o, v], t2)
+
+    #	  1.0000 <e,f|a,b>*t2(a,b,m,n)
+    doubles_res +=  1.000000000000000 * einsum('efab,abmn->efmn', V[v, v, v, v], t2)
+
+    #	 -2.0000 <i,j|a,n>*t1(a,i)*t2(e,f,m,j)
+    doubles_res += -2.000000000000000 * einsum('ijan,ai,efmj->efmn', V[o, o, v, o], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|a,n>*t1(a,i)*t2(e,f,m,j)
+    doubles_res +=  1.000000000000000 * einsum('jian,ai,efmj->efmn', V[o, o, v, o], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|a,m>*t1(a,i)*t2(e,f,j,n)
+    doubles_res +=  1.000000000000000 * einsum('jiam,ai,efjn->efmn', V[o, o, v, o], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <j,i|m,a>*t1(a,i)*t2(e,f,j,n)
+    doubles_res += -2.000000000000000 * einsum('jima,ai,efjn->efmn', V[o, o, o, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|a,n>*t1(a,m)*t2(e,f,j,i)
+    doubles_res +=  1.000000000000000 * einsum('jian,am,efji->efmn', V[o, o, v, o], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|m,a>*t1(a,n)*t2(e,f,j,i)
+    doubles_res +=  1.000000000000000 * einsum('jima,an,efji->efmn', V[o, o, o, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <i,j|a,n>*t2(a,f,m,j)*t1(e,i)
+    doubles_res +=  1.000000000000000 * einsum('ijan,afmj,ei->efmn', V[o, o, v, o], t2, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|a,n>*t2(a,e,m,j)*t1(f,i)
+    doubles_res +=  1.000000000000000 * einsum('jian,aemj,fi->efmn', V[o, o, v, o], t2, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <j,i|a,n>*t2(a,e,j,m)*t1(f,i)
+    doubles_res += -2.000000000000000 * einsum('jian,aejm,fi->efmn', V[o, o, v, o], t2, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|n,a>*t2(e,a,m,j)*t1(f,i)
+    doubles_res +=  1.000000000000000 * einsum('jina,eamj,fi->efmn', V[o, o, o, v], t2, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <j,i|a,m>*t2(a,f,j,n)*t1(e,i)
+    doubles_res += -2.000000000000000 * einsum('jiam,afjn,ei->efmn', V[o, o, v, o], t2, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|m,a>*t2(a,f,j,n)*t1(e,i)
+    doubles_res +=  1.000000000000000 * einsum('jima,afjn,ei->efmn', V[o, o, o, v], t2, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <i,j|m,a>*t2(a,f,n,j)*t1(e,i)
+    doubles_res +=  1.000000000000000 * einsum('ijma,afnj,ei->efmn', V[o, o, o, v], t2, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|m,a>*t2(e,a,j,n)*t1(f,i)
+    doubles_res +=  1.000000000000000 * einsum('jima,eajn,fi->efmn', V[o, o, o, v], t2, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  2.0000 <i,e|a,b>*t1(a,i)*t2(b,f,m,n)
+    doubles_res +=  2.000000000000000 * einsum('ieab,ai,bfmn->efmn', V[o, v, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <i,e|b,a>*t1(a,i)*t2(b,f,m,n)
+    doubles_res += -1.000000000000000 * einsum('ieba,ai,bfmn->efmn', V[o, v, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  2.0000 <i,f|a,b>*t1(a,i)*t2(e,b,m,n)
+    doubles_res +=  2.000000000000000 * einsum('ifab,ai,ebmn->efmn', V[o, v, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <i,f|b,a>*t1(a,i)*t2(e,b,m,n)
+    doubles_res += -1.000000000000000 * einsum('ifba,ai,ebmn->efmn', V[o, v, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <e,i|b,a>*t1(a,n)*t2(b,f,m,i)
+    doubles_res += -1.000000000000000 * einsum('eiba,an,bfmi->efmn', V[v, o, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <i,f|b,a>*t1(a,n)*t2(b,e,m,i)
+    doubles_res += -1.000000000000000 * einsum('ifba,an,bemi->efmn', V[o, v, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  2.0000 <i,f|b,a>*t1(a,n)*t2(b,e,i,m)
+    doubles_res +=  2.000000000000000 * einsum('ifba,an,beim->efmn', V[o, v, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <i,f|a,b>*t1(a,n)*t2(e,b,m,i)
+    doubles_res += -1.000000000000000 * einsum('ifab,an,ebmi->efmn', V[o, v, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <i,e|a,b>*t1(a,m)*t2(b,f,i,n)
+    doubles_res += -1.000000000000000 * einsum('ieab,am,bfin->efmn', V[o, v, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  2.0000 <i,e|b,a>*t1(a,m)*t2(b,f,i,n)
+    doubles_res +=  2.000000000000000 * einsum('ieba,am,bfin->efmn', V[o, v, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <e,i|a,b>*t1(a,m)*t2(b,f,n,i)
+    doubles_res += -1.000000000000000 * einsum('eiab,am,bfni->efmn', V[v, o, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <i,f|a,b>*t1(a,m)*t2(e,b,i,n)
+    doubles_res += -1.000000000000000 * einsum('ifab,am,ebin->efmn', V[o, v, v, v], t1, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <e,i|a,b>*t2(a,b,m,n)*t1(f,i)
+    doubles_res += -1.000000000000000 * einsum('eiab,abmn,fi->efmn', V[v, o, v, v], t2, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <i,f|a,b>*t2(a,b,m,n)*t1(e,i)
+    doubles_res += -1.000000000000000 * einsum('ifab,abmn,ei->efmn', V[o, v, v, v], t2, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <i,j|m,n>*t1(e,i)*t1(f,j)
+    doubles_res +=  1.000000000000000 * einsum('ijmn,ei,fj->efmn', V[o, o, o, o], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <e,i|a,n>*t1(a,m)*t1(f,i)
+    doubles_res += -1.000000000000000 * einsum('eian,am,fi->efmn', V[v, o, v, o], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <i,f|a,n>*t1(a,m)*t1(e,i)
+    doubles_res += -1.000000000000000 * einsum('ifan,am,ei->efmn', V[o, v, v, o], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <e,i|m,a>*t1(a,n)*t1(f,i)
+    doubles_res += -1.000000000000000 * einsum('eima,an,fi->efmn', V[v, o, o, v], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 <i,f|m,a>*t1(a,n)*t1(e,i)
+    doubles_res += -1.000000000000000 * einsum('ifma,an,ei->efmn', V[o, v, o, v], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <e,f|b,a>*t1(a,n)*t1(b,m)
+    doubles_res +=  1.000000000000000 * einsum('efba,an,bm->efmn', V[v, v, v, v], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <i,j|a,b>*t2(a,b,i,n)*t2(e,f,m,j)
+    doubles_res += -2.000000000000000 * einsum('ijab,abin,efmj->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|b,a>*t2(a,b,n,i)*t2(e,f,m,j)
+    doubles_res +=  1.000000000000000 * einsum('jiba,abni,efmj->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <j,i|a,b>*t2(a,b,m,i)*t2(e,f,j,n)
+    doubles_res += -2.000000000000000 * einsum('jiab,abmi,efjn->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|b,a>*t2(a,b,m,i)*t2(e,f,j,n)
+    doubles_res +=  1.000000000000000 * einsum('jiba,abmi,efjn->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t2(a,b,m,n)*t2(e,f,j,i)
+    doubles_res +=  1.000000000000000 * einsum('jiab,abmn,efji->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <j,i|a,b>*t2(a,e,j,i)*t2(b,f,m,n)
+    doubles_res += -2.000000000000000 * einsum('jiab,aeji,bfmn->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|b,a>*t2(a,e,j,i)*t2(b,f,m,n)
+    doubles_res +=  1.000000000000000 * einsum('jiba,aeji,bfmn->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <i,j|b,a>*t2(e,a,i,n)*t2(b,f,m,j)
+    doubles_res +=  1.000000000000000 * einsum('ijba,eain,bfmj->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t2(a,e,m,i)*t2(b,f,j,n)
+    doubles_res +=  1.000000000000000 * einsum('jiab,aemi,bfjn->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <j,i|b,a>*t2(a,e,m,i)*t2(b,f,j,n)
+    doubles_res += -2.000000000000000 * einsum('jiba,aemi,bfjn->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <j,i|a,b>*t2(a,e,i,m)*t2(b,f,j,n)
+    doubles_res += -2.000000000000000 * einsum('jiab,aeim,bfjn->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  4.0000 <j,i|b,a>*t2(a,e,i,m)*t2(b,f,j,n)
+    doubles_res +=  4.000000000000000 * einsum('jiba,aeim,bfjn->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <i,j|a,b>*t2(a,e,m,i)*t2(b,f,n,j)
+    doubles_res +=  1.000000000000000 * einsum('ijab,aemi,bfnj->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <i,j|a,b>*t2(a,e,i,m)*t2(b,f,n,j)
+    doubles_res += -2.000000000000000 * einsum('ijab,aeim,bfnj->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t2(e,a,m,i)*t2(b,f,n,j)
+    doubles_res +=  1.000000000000000 * einsum('jiab,eami,bfnj->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -2.0000 <j,i|b,a>*t2(e,a,m,n)*t2(b,f,j,i)
+    doubles_res += -2.000000000000000 * einsum('jiba,eamn,bfji->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 2), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t2(e,a,m,n)*t2(b,f,j,i)
+    doubles_res +=  1.000000000000000 * einsum('jiab,eamn,bfji->efmn', V[o, o, v, v], t2, t2, optimize=['einsum_path', (0, 2), (0, 1)])
+
+    #	 -2.0000 <i,j|a,b>*t1(a,i)*t1(b,n)*t2(e,f,m,j)
+    doubles_res += -2.000000000000000 * einsum('ijab,ai,bn,efmj->efmn', V[o, o, v, v], t1, t1, t2, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t1(a,i)*t1(b,n)*t2(e,f,m,j)
+    doubles_res +=  1.000000000000000 * einsum('jiab,ai,bn,efmj->efmn', V[o, o, v, v], t1, t1, t2, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t1(a,i)*t1(b,m)*t2(e,f,j,n)
+    doubles_res +=  1.000000000000000 * einsum('jiab,ai,bm,efjn->efmn', V[o, o, v, v], t1, t1, t2, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	 -2.0000 <j,i|b,a>*t1(a,i)*t1(b,m)*t2(e,f,j,n)
+    doubles_res += -2.000000000000000 * einsum('jiba,ai,bm,efjn->efmn', V[o, o, v, v], t1, t1, t2, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t1(a,i)*t2(b,f,m,n)*t1(e,j)
+    doubles_res +=  1.000000000000000 * einsum('jiab,ai,bfmn,ej->efmn', V[o, o, v, v], t1, t2, t1, optimize=['einsum_path', (0, 1), (1, 2), (0, 1)])
+
+    #	 -2.0000 <j,i|b,a>*t1(a,i)*t2(b,f,m,n)*t1(e,j)
+    doubles_res += -2.000000000000000 * einsum('jiba,ai,bfmn,ej->efmn', V[o, o, v, v], t1, t2, t1, optimize=['einsum_path', (0, 1), (1, 2), (0, 1)])
+
+    #	 -2.0000 <i,j|a,b>*t1(a,i)*t2(e,b,m,n)*t1(f,j)
+    doubles_res += -2.000000000000000 * einsum('ijab,ai,ebmn,fj->efmn', V[o, o, v, v], t1, t2, t1, optimize=['einsum_path', (0, 1), (1, 2), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t1(a,i)*t2(e,b,m,n)*t1(f,j)
+    doubles_res +=  1.000000000000000 * einsum('jiab,ai,ebmn,fj->efmn', V[o, o, v, v], t1, t2, t1, optimize=['einsum_path', (0, 1), (1, 2), (0, 1)])
+
+    #	  1.0000 <j,i|b,a>*t1(a,n)*t1(b,m)*t2(e,f,j,i)
+    doubles_res +=  1.000000000000000 * einsum('jiba,an,bm,efji->efmn', V[o, o, v, v], t1, t1, t2, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	  1.0000 <i,j|b,a>*t1(a,n)*t2(b,f,m,j)*t1(e,i)
+    doubles_res +=  1.000000000000000 * einsum('ijba,an,bfmj,ei->efmn', V[o, o, v, v], t1, t2, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	  1.0000 <j,i|b,a>*t1(a,n)*t2(b,e,m,j)*t1(f,i)
+    doubles_res +=  1.000000000000000 * einsum('jiba,an,bemj,fi->efmn', V[o, o, v, v], t1, t2, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	 -2.0000 <j,i|b,a>*t1(a,n)*t2(b,e,j,m)*t1(f,i)
+    doubles_res += -2.000000000000000 * einsum('jiba,an,bejm,fi->efmn', V[o, o, v, v], t1, t2, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t1(a,n)*t2(e,b,m,j)*t1(f,i)
+    doubles_res +=  1.000000000000000 * einsum('jiab,an,ebmj,fi->efmn', V[o, o, v, v], t1, t2, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t1(a,m)*t2(b,f,j,n)*t1(e,i)
+    doubles_res +=  1.000000000000000 * einsum('jiab,am,bfjn,ei->efmn', V[o, o, v, v], t1, t2, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	 -2.0000 <j,i|b,a>*t1(a,m)*t2(b,f,j,n)*t1(e,i)
+    doubles_res += -2.000000000000000 * einsum('jiba,am,bfjn,ei->efmn', V[o, o, v, v], t1, t2, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	  1.0000 <i,j|a,b>*t1(a,m)*t2(b,f,n,j)*t1(e,i)
+    doubles_res +=  1.000000000000000 * einsum('ijab,am,bfnj,ei->efmn', V[o, o, v, v], t1, t2, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	  1.0000 <j,i|a,b>*t1(a,m)*t2(e,b,j,n)*t1(f,i)
+    doubles_res +=  1.000000000000000 * einsum('jiab,am,ebjn,fi->efmn', V[o, o, v, v], t1, t2, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	  1.0000 <i,j|a,b>*t2(a,b,m,n)*t1(e,i)*t1(f,j)
+    doubles_res +=  1.000000000000000 * einsum('ijab,abmn,ei,fj->efmn', V[o, o, v, v], t2, t1, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	  1.0000 <i,j|a,n>*t1(a,m)*t1(e,i)*t1(f,j)
+    doubles_res +=  1.000000000000000 * einsum('ijan,am,ei,fj->efmn', V[o, o, v, o], t1, t1, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	  1.0000 <i,j|m,a>*t1(a,n)*t1(e,i)*t1(f,j)
+    doubles_res +=  1.000000000000000 * einsum('ijma,an,ei,fj->efmn', V[o, o, o, v], t1, t1, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	 -1.0000 <e,i|b,a>*t1(a,n)*t1(b,m)*t1(f,i)
+    doubles_res += -1.000000000000000 * einsum('eiba,an,bm,fi->efmn', V[v, o, v, v], t1, t1, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	 -1.0000 <i,f|b,a>*t1(a,n)*t1(b,m)*t1(e,i)
+    doubles_res += -1.000000000000000 * einsum('ifba,an,bm,ei->efmn', V[o, v, v, v], t1, t1, t1, optimize=['einsum_path', (0, 1), (0, 2), (0, 1)])
+
+    #	  1.0000 <i,j|b,a>*t1(a,n)*t1(b,m)*t1(e,i)*t1(f,j)
+    doubles_res +=  1.000000000000000 * einsum('ijba,an,bm,ei,fj->efmn', V[o, o, v, v], t1, t1, t1, t1, optimize=['einsum_path', (0, 1), (0, 3), (0, 2), (0, 1)])
+
+    return doubles_res
@@ -1041,8 +1041,25 @@ def ccsdt_iterations_with_spin(t1_aa, t1_bb, t2_aaaa, t2_bbbb, t2_abab,
     return t1_aa, t1_bb, t2_aaaa, t2_bbbb, t2_abab, t3_aaaaaa, t3_aabaab, t3_abbabb, t3_bbbbbb
 
 def ccsdt_iterations(t1, t2, t3, fock, g, o, v, e_ai, e_abij, e_abcijk, hf_energy, max_iter=100, 
-        e_convergence=1e-8,r_convergence=1e-8,diis_size=None, diis_start_cycle=4):
-           
+        e_convergence=1e-8,r_convergence=1e-8,diis_size=None, diis_start_cycle=4, packed=False, precision=None):
+    """
+    solve the spin-orbital CCSDT amplitude equations
+
+    :param packed: keep t3, the triples denominators, and the triples part of the DIIS vectors
+                   packed (pdaggerq.packing). t3 is unpacked once per iteration and the triples
+                   residual is packed as soon as it is made, so only what is kept between
+                   iterations shrinks; each residual evaluation still works on full arrays.
+                   DIIS counts each unique triples element once, so the iterations can take a
+                   slightly different path to the same solution
+    :param precision: pdaggerq.precision.MixedPrecision policy for the residuals (default: float64).
+                      the amplitudes, energies, and DIIS vectors stay in float64
+    :return t1, t2, t3: converged amplitudes (t3 as a full array)
+    """
+
+    if packed:
+        from pdaggerq.packing import PackedTensor, pack
+        t3 = t3 if isinstance(t3, PackedTensor) else pack(t3)
+        e_abcijk = e_abcijk if isinstance(e_abcijk, PackedTensor) else pack(e_abcijk)
 
     # initialize diis if diis_size is not None
     # else normal scf iterate
@@ -1056,8 +1073,12 @@ def ccsdt_iterations(t1, t2, t3, fock, g, o, v, e_ai, e_abij, e_abcijk, hf_energ
 
     fock_e_ai = np.reciprocal(e_ai)
     fock_e_abij = np.reciprocal(e_abij)
-    fock_e_abcijk = np.reciprocal(e_abcijk)
+    if packed:
+        fock_e_abcijk = PackedTensor(np.reciprocal(e_abcijk.data), e_abcijk.shape, e_abcijk.upper)
+    else:
+        fock_e_abcijk = np.reciprocal(e_abcijk)
     old_energy = coupled_cluster_energy(t1, t2, fock, g, o, v)
+    fock_p, g_p = (fock, g) if precision is None else precision.cast(fock, g)
 
     print("")
     print("    ==> CCSDT amplitude equations <==")
@@ -1065,19 +1086,38 @@ def ccsdt_iterations(t1, t2, t3, fock, g, o, v, e_ai, e_abij, e_abcijk, hf_energ
     print("     Iter               Energy                 |dE|                 |dT|")
     for idx in range(max_iter):
 
-        residual_singles = ccsdt_singles_residual(t1, t2, t3, fock, g, o, v)
-        residual_doubles = ccsdt_doubles_residual(t1, t2, t3, fock, g, o, v)
-        residual_triples = ccsdt_triples_residual(t1, t2, t3, fock, g, o, v)
+        # one full copy of t3 per iteration
+        t3_full = t3.unpack() if packed else t3
+        if precision is None:
+            t1_p, t2_p, t3_p = t1, t2, t3_full
+        else:
+            t1_p, t2_p, t3_p = precision.cast(t1, t2, t3_full)
+        del t3_full
+
+        residual_singles = ccsdt_singles_residual(t1_p, t2_p, t3_p, fock_p, g_p, o, v)
+        residual_doubles = ccsdt_doubles_residual(t1_p, t2_p, t3_p, fock_p, g_p, o, v)
+        residual_triples = ccsdt_triples_residual(t1_p, t2_p, t3_p, fock_p, g_p, o, v)
+        del t3_p
 
         res_norm = np.linalg.norm(residual_singles) + np.linalg.norm(residual_doubles) + np.linalg.norm(residual_triples)
+        if precision is not None and precision.update(res_norm):
+            print("    switching to {} residuals".format(precision.dtype))
+            fock_p, g_p = precision.cast(fock, g)
+            if diis_size is not None:
+                diis_update.reset()
+
+        if packed:
+            residual_triples = pack(residual_triples)
 
         singles_res = residual_singles + fock_e_ai * t1
         doubles_res = residual_doubles + fock_e_abij * t2
         triples_res = residual_triples + fock_e_abcijk * t3
+        del residual_triples
 
         new_singles = singles_res * e_ai
         new_doubles = doubles_res * e_abij
         new_triples = triples_res * e_abcijk
+        del triples_res
 
         # diis update
         if diis_size is not None:
@@ -1088,7 +1128,10 @@ def ccsdt_iterations(t1, t2, t3, fock, g, o, v, e_ai, e_abij, e_abcijk, hf_energ
                                                                  error_vec)
             new_singles = new_vectorized_iterate[:t1_dim].reshape(t1.shape)
             new_doubles = new_vectorized_iterate[t1_dim:t1_dim+t2_dim].reshape(t2.shape)
-            new_triples = new_vectorized_iterate[t1_dim+t2_dim:].reshape(t3.shape)
+            if packed:
+                new_triples = PackedTensor(new_vectorized_iterate[t1_dim+t2_dim:].reshape(t3.data.shape), t3.shape, t3.upper)
+            else:
+                new_triples = new_vectorized_iterate[t1_dim+t2_dim:].reshape(t3.shape)
             old_vec = new_vectorized_iterate
 
         current_energy = coupled_cluster_energy(new_singles, new_doubles, fock, g, o, v)
@@ -1102,13 +1145,13 @@ def ccsdt_iterations(t1, t2, t3, fock, g, o, v, e_ai, e_abij, e_abcijk, hf_energ
         t3 = new_triples
         old_energy = current_energy
 
-        if delta_e < e_convergence and res_norm < r_convergence:
+        if delta_e < e_convergence and res_norm < r_convergence and (precision is None or precision.high_precision):
             break
 
     else:
         raise ValueError("CCSD iterations did not converge")
 
-    return t1, t2, t3
+    return t1, t2, t3.unpack() if packed else t3
 
 #    < 0 | i* j* k* c b a e(-T) H e(T) | 0> :
 #
@@ -1255,6 +1298,131 @@ def perturbative_triples_correction(t1, t2, t3, fock, g, o, v, e_abcijk):
 
     return et
 
+def perturbative_triples_block(t1, t2, g, o, v, eps, occ):
+    """
+
+    evaluate the (T) correction from the triples t3(a,b,c,i,j,k) with i in one block of occupied orbitals.
+    the amplitudes of the block are built from the perturbative triples residual (with t3 = 0) and contracted 
+    right away, so only a block of t3 is in memory
+
+    :param t1: CCSD singles amplitudes
+    :param t2: CCSD doubles amplitudes
+    :param g: two-electron integrals
+    :param o: occupied orbitals slice
+    :param v: virtual orbitals slice
+    :param eps: orbital energies
+    :param occ: slice of the occupied orbitals in the block
+
+    :return energy: the contribution of the block to the (T) correction
+
+    """
+
+    n = np.newaxis
+
+    g_ovoo = g[o, v, o, o]
+    g_vvvo = g[v, v, v, o]
+    t2_i = t2[:, :, occ, :]
+
+    # contractions go to GEMM through tensordot. permutation operators that keep i in the block are applied in place
+    # as transposes; those that move i are evaluated as separate contractions
+    def contract(string, *tensors):
+        return einsum(string, *tensors, optimize=True)
+
+    ab = (1, 0, 2, 3, 4, 5)
+    bc = (0, 2, 1, 3, 4, 5)
+    jk = (0, 1, 2, 3, 5, 4)
+
+    #        -1.0000 P(i,j)*P(a,b)<l,a||j,k>*t2(b,c,i,l)
+    contracted_intermediate = -1.0 * contract('lajk,bcil->abcijk', g_ovoo, t2_i)
+    contracted_intermediate += contract('laik,bcjl->abcijk', g_ovoo[:, :, occ, :], t2)
+    triples_res = contracted_intermediate - contracted_intermediate.transpose(ab)
+
+    #        -1.0000 P(a,b)<l,a||i,j>*t2(b,c,k,l)
+    contracted_intermediate = -1.0 * contract('laij,bckl->abcijk', g_ovoo[:, :, occ, :], t2)
+    triples_res += contracted_intermediate
+    triples_res -= contracted_intermediate.transpose(ab)
+
+    #        -1.0000 P(i,j)<l,c||j,k>*t2(a,b,i,l)
+    triples_res -= contract('lcjk,abil->abcijk', g_ovoo, t2_i)
+    triples_res += contract('lcik,abjl->abcijk', g_ovoo[:, :, occ, :], t2)
+
+    #        -1.0000 <l,c||i,j>*t2(a,b,k,l)
+    triples_res -= contract('lcij,abkl->abcijk', g_ovoo[:, :, occ, :], t2)
+
+    #        -1.0000 P(j,k)*P(b,c)<a,b||d,k>*t2(d,c,i,j)
+    contracted_intermediate = -1.0 * contract('abdk,dcij->abcijk', g_vvvo, t2_i)
+    contracted_intermediate -= contracted_intermediate.transpose(jk)
+    triples_res += contracted_intermediate
+    triples_res -= contracted_intermediate.transpose(bc)
+
+    #        -1.0000 P(b,c)<a,b||d,i>*t2(d,c,j,k)
+    contracted_intermediate = -1.0 * contract('abdi,dcjk->abcijk', g_vvvo[:, :, :, occ], t2)
+    triples_res += contracted_intermediate
+    triples_res -= contracted_intermediate.transpose(bc)
+
+    #        -1.0000 P(j,k)<b,c||d,k>*t2(d,a,i,j)
+    contracted_intermediate = -1.0 * contract('bcdk,daij->abcijk', g_vvvo, t2_i)
+    triples_res += contracted_intermediate
+    triples_res -= contracted_intermediate.transpose(jk)
+
+    #        -1.0000 <b,c||d,i>*t2(d,a,j,k)
+    triples_res -= contract('bcdi,dajk->abcijk', g_vvvo[:, :, :, occ], t2)
+
+    # t3 = triples_res / D(abcijk)
+    e_v = eps[v]
+    e_o = eps[o]
+    triples_res /= (-e_v[:, n, n, n, n, n] - e_v[n, :, n, n, n, n] - e_v[n, n, :, n, n, n]
+                    + e_o[occ][n, n, n, :, n, n] + e_o[n, n, n, n, :, n] + e_o[n, n, n, n, n, :])
+    t3 = triples_res
+
+    l1 = t1.transpose(1, 0)[occ]
+    l2 = t2.transpose(2, 3, 0, 1)[occ]
+
+    #         0.2500 <k,j||b,c>*l1(i,a)*t3(b,c,a,i,k,j)
+    energy =  0.250000000000000 * einsum('kjbc,ia,bcaikj', g[o, o, v, v], l1, t3, optimize=['einsum_path', (0, 2), (0, 1)])
+
+    #         0.2500 <l,k||c,j>*l2(i,j,b,a)*t3(c,b,a,i,l,k)
+    energy +=  0.250000000000000 * einsum('lkcj,ijba,cbailk', g[o, o, v, o], l2, t3, optimize=['einsum_path', (0, 2), (0, 1)])
+
+    #         0.2500 <k,b||c,d>*l2(i,j,b,a)*t3(c,d,a,i,j,k)
+    energy +=  0.250000000000000 * einsum('kbcd,ijba,cdaijk', g[o, v, v, v], l2, t3, optimize=['einsum_path', (0, 2), (0, 1)])
+
+    return energy
+
+def perturbative_triples_correction_batched(t1, t2, fock, g, o, v, block_size=1, nthreads=1):
+    """
+
+    evaluate the (T) correction to CCSD energy in blocks of the first occupied index of t3, 
+    without storing the full triples amplitudes. memory per block is ~ 2 * block_size * o^2 v^3
+
+    :param t1: CCSD singles amplitudes
+    :param t2: CCSD doubles amplitudes
+    :param fock: fock matrix (semicanonical orbitals are assumed for the energy denominators)
+    :param g: two-electron integrals
+    :param o: occupied orbitals slice
+    :param v: virtual orbitals slice
+    :param block_size: number of occupied orbitals i per block
+    :param nthreads: number of blocks evaluated at the same time
+
+    :return et: the perurbative triples correction to the ccsd energy, (t)
+
+    """
+
+    eps = np.diagonal(fock).copy()
+    nocc = t1.shape[1]
+    blocks = [slice(start, min(start + block_size, nocc)) for start in range(0, nocc, block_size)]
+
+    def block_energy(occ):
+        return perturbative_triples_block(t1, t2, g, o, v, eps, occ)
+
+    if nthreads > 1:
+        # numpy releases the GIL in its BLAS calls
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=nthreads) as pool:
+            return sum(pool.map(block_energy, blocks))
+
+    return sum(block_energy(occ) for occ in blocks)
+
 
 def ccsdt_t1_aa_residual(t1_aa, t1_bb, t2_aaaa, t2_bbbb, t2_abab, t3_aaaaaa, t3_aabaab, t3_abbabb, t3_bbbbbb, f_aa, f_bb, g_aaaa, g_bbbb, g_abab, oa, ob, va, vb):
 
@@ -37,6 +37,14 @@ class DIIS:
         self.start_iter = start_iter
         self.iter_idx = 0
 
+    def reset(self):
+        """
+        Forget the stored iterates and errors, e.g. once the residuals switch to a
+        higher precision and the older vectors are no longer accurate enough
+        """
+        self.error_vecs = []
+        self.prev_vecs = []
+
     def compute_new_vec(self, iterate, error):
         """
         Compute a DIIS update.  Only perform diis update after start_vecs
@@ -1,5 +1,8 @@
+import os
+
 import pdaggerq
 
+from pdaggerq.algebra import einsum_strings
 from pdaggerq.parser import contracted_strings_to_tensor_terms
 
 def main():
@@ -51,9 +54,10 @@ def main():
     energy_terms = pq.strings()
     energy_terms = contracted_strings_to_tensor_terms(energy_terms)
 
-    for my_term in energy_terms:
+    codes = einsum_strings(energy_terms, update_val='energy', workers=os.cpu_count())
+    for my_term, code in zip(energy_terms, codes):
         print("#\t", my_term)
-        print("%s" % (my_term.einsum_string(update_val='energy')))
+        print(code)
         print()
 
     print('return energy')
@@ -107,10 +111,11 @@ def main():
     # grab list of fully-contracted strings, then print
     terms = pq.strings()
     terms = contracted_strings_to_tensor_terms(terms)
-    for my_term in terms:
+    codes = einsum_strings(terms, update_val='singles_res',
+                           output_variables=('e', 'm'), workers=os.cpu_count())
+    for my_term, code in zip(terms, codes):
         print("#\t", my_term)
-        print("%s" % (my_term.einsum_string(update_val='singles_res',
-                                    output_variables=('e', 'm'))))
+        print(code)
         print()
 
     print('return singles_res')
@@ -162,10 +167,11 @@ def main():
     # grab list of fully-contracted strings, then print
     terms = pq.strings()
     terms = contracted_strings_to_tensor_terms(terms)
-    for my_term in terms:
+    codes = einsum_strings(terms, update_val='doubles_res',
+                           output_variables=('e', 'f', 'm', 'n'), workers=os.cpu_count())
+    for my_term, code in zip(terms, codes):
         print("#\t", my_term)
-        print("%s" % (my_term.einsum_string(update_val='doubles_res',
-                                    output_variables=('e', 'f', 'm', 'n'))))
+        print(code)
         print()
 
     print('return doubles_res')
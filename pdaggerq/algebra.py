@@ -16,18 +16,129 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from typing import Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Tuple
 import copy
-import numpy as np
+import itertools
+
+# default o/v dimensions (a fake system) used to rank contraction orderings
+from pdaggerq.config import nocc, nvirt, nocca, noccb, nvirta, nvirtb
+
+DEFAULT_DIMS = {'o': nocc, 'v': nvirt,
+                'oa': nocca, 'ob': noccb, 'va': nvirta, 'vb': nvirtb}
+
+
+def _flop_count(idx_contract, inner, num_terms, sizes):
+    cost = 1
+    for idx in idx_contract:
+        cost *= sizes[idx]
+    op_factor = max(1, num_terms - 1)
+    if inner:
+        op_factor += 1
+    return cost * op_factor
+
+
+def _tensor_size(indices, sizes):
+    size = 1
+    for idx in indices:
+        size *= sizes[idx]
+    return size
+
+
+# contraction paths found so far, keyed on (subscripts, sizes)
+_EINSUM_PATHS = {}
+
+
+def einsum_path(subscripts: str, sizes: Tuple[Tuple[str, int], ...]):
+    """
+    Optimal pairwise contraction order for an einsum expression, found without
+    building any tensors
+
+    This follows np.einsum_path(..., optimize='optimal') (exhaustive search over
+    pair contractions, intermediates no larger than the largest input / output),
+    but works only on the subscripts and the size of each index, so the
+    result can be cached on (subscripts, sizes).
+
+    :param subscripts: einsum subscripts, e.g. 'ijab,ai,bj' or 'ijab,ai->jb'
+    :param sizes: sorted tuple of (index, dimension) pairs
+    :return: path in the form accepted by einsum's optimize argument
+    """
+    path = _EINSUM_PATHS.get((subscripts, sizes))
+    if path is None:
+        path = _EINSUM_PATHS[(subscripts, sizes)] = _search_einsum_path(subscripts, sizes)
+    return path
+
+
+def _search_einsum_path(subscripts, sizes):
+    size_of = dict(sizes)
+    if '->' in subscripts:
+        inputs, output = subscripts.split('->')
+    else:
+        # implicit output: indices that appear exactly once
+        inputs = subscripts
+        flat = subscripts.replace(',', '')
+        output = ''.join(sorted(xx for xx in set(flat) if flat.count(xx) == 1))
+    input_list = inputs.split(',')
+    input_sets = [set(xx) for xx in input_list]
+    output_set = set(output)
+
+    num_inputs = len(input_list)
+    if num_inputs <= 2 or set(inputs.replace(',', '')) == output_set:
+        return ['einsum_path', tuple(range(num_inputs))]
+
+    memory_limit = max(_tensor_size(xx, size_of) for xx in input_list + [output])
+
+    # (cost, path, remaining index sets) for every ordering still in play
+    full_results = [(0, [], input_sets)]
+    for iteration in range(num_inputs - 1):
+        iter_results = []
+        for cost, positions, remaining in full_results:
+            for con in itertools.combinations(range(num_inputs - iteration), 2):
+                idx_contract = set()
+                idx_remain = output_set.copy()
+                new_sets = []
+                for pos, value in enumerate(remaining):
+                    if pos in con:
+                        idx_contract |= value
+                    else:
+                        new_sets.append(value)
+                        idx_remain |= value
+                new_result = idx_remain & idx_contract
+                if _tensor_size(new_result, size_of) > memory_limit:
+                    continue
+                idx_removed = idx_contract - new_result
+                new_sets.append(new_result)
+                total_cost = cost + _flop_count(idx_contract, idx_removed, 2, size_of)
+                iter_results.append((total_cost, positions + [con], new_sets))
+
+        if not iter_results:
+            # nothing fits in memory; contract whatever is left in one go
+            path = min(full_results, key=lambda xx: xx[0])[1]
+            return ['einsum_path'] + path + [tuple(range(num_inputs - iteration))]
+        full_results = iter_results
+
+    return ['einsum_path'] + min(full_results, key=lambda xx: xx[0])[1]
+
+
+def _immutable(self, *args):
+    raise AttributeError("{} objects are immutable".format(type(self).__name__))
+
+
+def _rebuild(cls, kwargs):
+    """unpickle BaseTerms and TensorTermActions through their constructors"""
+    return cls(**kwargs)
 
-# This imports fake values of all these quantities (zero tensors) so
-# we can build the optimal tensor contraction orderings
-# NOTE: THESE ARE PROTECTED VARIABLE NAMES FOR THIS MODULE
-from pdaggerq.config import *
 
 class Index:
+    """
+    Indices are interned: Index('i', 'occ') always returns the same object, so
+    comparing two indices is an identity check.
+    """
+
+    __slots__ = ('name', 'support', '_hash')
+    _interned = {}
 
-    def __init__(self, name: str, support: str):
+    def __new__(cls, name: str, support: str):
         """
         Generate an index that acts on a particular space
 
@@ -37,13 +148,36 @@ class Index:
         :param name: how the index shows up
         :param support: where the index ranges. Options: occ,virt,all
         """
-        self.name = name
-        self.support = support
+        index = cls._interned.get((name, support))
+        if index is None:
+            index = super().__new__(cls)
+            object.__setattr__(index, 'name', name)
+            object.__setattr__(index, 'support', support)
+            object.__setattr__(index, '_hash', hash((name, support)))
+            cls._interned[(name, support)] = index
+        return index
+
+    __setattr__ = _immutable
+    __delattr__ = _immutable
+
+    def __reduce__(self):
+        return Index, (self.name, self.support)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __repr__(self):
         return "{}".format(self.name)
 
+    def __hash__(self):
+        return self._hash
+
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Index):
             raise TypeError("Can't compare non Index object to Index")
         return other.name == self.name and other.support == self.support
@@ -66,10 +200,25 @@ class BaseTerm:
                      is `_bb`. etc.  Always start string with an underscore unless empty.
     """
 
+    __slots__ = ('name', 'spin', 'indices', '_hash')
+
     def __init__(self, *, indices: Tuple[Index, ...], name: str, spin: str):
-        self.spin = spin
-        self.name = name
-        self.indices = indices
+        object.__setattr__(self, 'spin', spin)
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'indices', tuple(indices))
+        object.__setattr__(self, '_hash', hash((name, spin, self.indices)))
+
+    __setattr__ = _immutable
+    __delattr__ = _immutable
+
+    def __reduce__(self):
+        return _rebuild, (type(self), {'indices': self.indices, 'name': self.name, 'spin': self.spin})
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __repr__(self):
         return "{}".format(self.name) + "{}".format(self.spin) + "(" + ",".join(
@@ -79,15 +228,14 @@ class BaseTerm:
         return self.__repr__()
 
     def __hash__(self):
-        return hash(self.__repr__())
+        return self._hash
 
     def __mul__(self, other):
         # what about numpy floats  and such?
         if isinstance(other, BaseTerm):
-            return TensorTerm((copy.deepcopy(self), other))
+            return TensorTerm((self, other))
         elif isinstance(other, TensorTerm):
-            self_copy = copy.deepcopy(self)
-            return other.__mul__(self_copy)
+            return other.__mul__(self)
         else:
             raise NotImplementedError
 
@@ -95,16 +243,12 @@ class BaseTerm:
         return self.__mul__(other)
 
     def __eq__(self, other):
-        name_equality = other.name == self.name
-        if len(self.indices) == len(other.indices):
-            index_equal = all([self.indices[xx] == other.indices[xx] for xx in
-                               range(len(self.indices))])
-            return name_equality and index_equal
-        else:
-            return False
-
-    def __ne__(self, other):
-        return not self.__eq__(other)
+        if self is other:
+            return True
+        if not isinstance(other, BaseTerm):
+            return NotImplemented
+        return self._hash == other._hash and other.name == self.name and \
+            other.spin == self.spin and other.indices == self.indices
 
 
 class TensorTermAction:
@@ -117,10 +261,25 @@ class TensorTermAction:
     minimize contraction work.
     """
 
+    __slots__ = ('name', 'spin', 'indices', '_hash')
+
     def __init__(self, *, indices: Tuple[Index, ...], name: str, spin: str):
-        self.name = name
-        self.spin = spin
-        self.indices = indices
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'spin', spin)
+        object.__setattr__(self, 'indices', tuple(indices))
+        object.__setattr__(self, '_hash', hash((name, spin, self.indices)))
+
+    __setattr__ = _immutable
+    __delattr__ = _immutable
+
+    def __reduce__(self):
+        return _rebuild, (type(self), {'indices': self.indices, 'name': self.name, 'spin': self.spin})
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __repr__(self):
         return "{}".format(self.name) + "{}".format(self.spin) + "(" + ",".join(
@@ -130,19 +289,15 @@ class TensorTermAction:
         return self.__repr__()
 
     def __hash__(self):
-        return hash(self.__repr__())
+        return self._hash
 
     def __eq__(self, other):
-        name_equality = other.name == self.name
-        if len(self.indices) == len(other.indices):
-            index_equal = all([self.indices[xx] == other.indices[xx] for xx in
-                               range(len(self.indices))])
-            return name_equality and index_equal
-        else:
-            return False
-
-    def __ne__(self, other):
-        return not self.__eq__(other)
+        if self is other:
+            return True
+        if not isinstance(other, TensorTermAction):
+            return NotImplemented
+        return self._hash == other._hash and other.name == self.name and \
+            other.spin == self.spin and other.indices == self.indices
 
 
 class TensorTerm:
@@ -150,17 +305,43 @@ class TensorTerm:
     collection  of BaseTerms that can be translated to a einsnum contraction
     """
 
+    __slots__ = ('base_terms', 'coefficient', 'actions', '_hash')
+
     def __init__(self, base_terms: Tuple[BaseTerm, ...], coefficient=1.0,
                  permutation_ops=None):
-        self.base_terms = base_terms
-        self.coefficient = coefficient
+        object.__setattr__(self, 'base_terms', tuple(base_terms))
+        object.__setattr__(self, 'coefficient', coefficient)
         if permutation_ops is not None:
             if len(permutation_ops) == 0:
-                self.actions = None
+                object.__setattr__(self, 'actions', None)
             else:
-                self.actions = permutation_ops
+                object.__setattr__(self, 'actions', tuple(permutation_ops))
         else:
-            self.actions = None
+            object.__setattr__(self, 'actions', None)
+        object.__setattr__(self, '_hash', hash((coefficient, self.base_terms, self.actions)))
+
+    __setattr__ = _immutable
+    __delattr__ = _immutable
+
+    def __reduce__(self):
+        return TensorTerm, (self.base_terms, self.coefficient, self.actions)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, TensorTerm):
+            return NotImplemented
+        return self._hash == other._hash and other.coefficient == self.coefficient and \
+            other.base_terms == self.base_terms and other.actions == self.actions
 
     def __repr__(self):
         if self.actions is None:
@@ -172,12 +353,12 @@ class TensorTerm:
                 xx.__repr__() for xx in self.base_terms)
 
     def __mul__(self, other):
-        self_copy = copy.deepcopy(self)
+        # the base terms are immutable, so the product shares them with this term
         if isinstance(other, (int, float, complex)):
-            self_copy.coefficient *= other
+            return TensorTerm(self.base_terms, self.coefficient * other, self.actions)
         elif isinstance(other, BaseTerm):
-            self_copy.base_terms = self_copy.base_terms + (other,)
-        return self_copy
+            return TensorTerm(self.base_terms + (other,), self.coefficient, self.actions)
+        return self
 
     def __rmul__(self, other):
         return self.__mul__(other)
@@ -188,11 +369,29 @@ class TensorTerm:
                       virtual=['a', 'b', 'c', 'd', 'e', 'f', 'A', 'B', 'C', 'D', 'E', 'F'],
                       occ_char=None,
                       virt_char=None,
-                      optimize=True):
+                      optimize=True,
+                      dims: Dict[str, int] = None,
+                      packed=False):
+        """
+        Generate the numpy einsum code for this term
+
+        :param dims: size of each orbital space used to choose the contraction
+                     order ('o', 'v', and optionally the spin blocks 'oa',
+                     'ob', 'va', 'vb'). Defaults to DEFAULT_DIMS.
+        :param packed: accumulate update_val as a PackedTensor with pdaggerq.packing.pack,
+                       which keeps only the unique elements of an antisymmetric residual;
+                       permutation operators become pack() calls on the permuted indices.
+                       Each term is still contracted on full arrays, so pass the amplitudes
+                       unpacked (once per residual evaluation): this saves storage, not
+                       work or peak memory
+        """
         einsum_out_strings = ""
         einsum_tensors = []
         tensor_out_idx = []
         einsum_strings = []
+        index_sizes = {}
+        if dims is None:
+            dims = DEFAULT_DIMS
         if occ_char is None:
             # in our code this will be a slice. o = slice(None, nocc)
             occ_char = 'o'
@@ -200,12 +399,15 @@ class TensorTerm:
             virt_char = 'v'  # v = slice(nocc, None)
 
         # these are integrals, RDMs, etc. that require explicit slicing in einsum
-        tensors_with_slices = ['h', 'g', 'f', 'kd', 'd1', 'd2', 'd3', 'd4']
+        tensors_with_slices = ['h', 'g', 'V', 'f', 'kd', 'd1', 'd2', 'd3', 'd4']
         # these are amplitudes, having fixed shape and do not require explicit slicing
         tensors_amps  = ['t'+str(i) for i in range(1,5)]
         tensors_amps += ['r'+str(i) for i in range(0,5)]
         tensors_amps += ['l'+str(i) for i in range(0,5)]
 
+        if packed and any(bt.spin != '' for bt in self.base_terms):
+            raise NotImplementedError("packed storage is only implemented for spin-orbital tensors")
+
         for bt in self.base_terms:
             tensor_index_ranges = [] # 'o', 'v', or ':'
             # parse indices and process them
@@ -228,6 +430,15 @@ class TensorTerm:
 
                     tensor_index_ranges.append(idx_str)
 
+                # size of this index for contraction ordering
+                spin = bt.spin[idx_loc+1] if bt.spin != '' else ''
+                if idx_type in occupied:
+                    index_sizes[idx_type] = dims.get('o' + spin, dims['o'])
+                elif idx_type in virtual:
+                    index_sizes[idx_type] = dims.get('v' + spin, dims['v'])
+                else:
+                    index_sizes[idx_type] = dims.get('o' + spin, dims['o']) + dims.get('v' + spin, dims['v'])
+
                 # add current index to einsum output indices
                 if output_variables is not None:
                     if idx_type in output_variables:
@@ -253,23 +464,20 @@ class TensorTerm:
         teinsum_string = "= {: 5.15f} * einsum(\'".format(self.coefficient)
 
         if len(einsum_strings) > 2 and optimize:
-            einsum_path_string = "np.einsum_path(\'".format(self.coefficient)
-            einsum_path_string += ",".join(
-                einsum_strings) + einsum_out_strings + "\', " + ", ".join(
-                einsum_tensors) + ", optimize=\'optimal\')"
-            # TODO: this still introduce a bug when optimizing expressions with r1/l1 in it
-            # Alternatively use "optimize=True" everywhere, but it will be recomputing the
-            # optimal path in every iteration, making it more expensive in the long run.
-            einsum_optimal_path = eval(einsum_path_string)
-            # print(einsum_optimal_path[1])
+            # the path is fixed here so einsum doesn't search for it on every call
+            einsum_optimal_path = einsum_path(
+                ",".join(einsum_strings) + einsum_out_strings,
+                tuple(sorted(index_sizes.items())))
             teinsum_string += ",".join(
                 einsum_strings) + einsum_out_strings + "\', " + ", ".join(
                 einsum_tensors) + ", optimize={})".format(
-                einsum_optimal_path[0])
+                einsum_optimal_path)
         else:
             teinsum_string += ",".join(
                 einsum_strings) + einsum_out_strings + "\', " + ", ".join(
                 einsum_tensors) + ")"
+        if packed and self.actions is None:
+            teinsum_string = "= pack(" + teinsum_string[1:].strip() + ")"
         if update_val is not None and self.actions is None:
             teinsum_string = update_val + " " + '+' + teinsum_string
 
@@ -318,7 +526,12 @@ class TensorTerm:
             for ots in outstrings:
                 new_string = ""
                 new_string += '{: 5.5f} * '.format(ots[0])
-                if tuple(ots[1]) == tuple(original_out):
+                if packed and tuple(ots[1]) == tuple(original_out):
+                    new_string += 'pack(contracted_intermediate)'
+                elif packed:
+                    new_string += 'pack(contracted_intermediate, \'{}->{}\') '.format(
+                        ''.join(original_out), "".join(ots[1]))
+                elif tuple(ots[1]) == tuple(original_out):
                     new_string += 'contracted_intermediate'
                 else:
                     new_string += 'einsum(\'{}->{}\', contracted_intermediate) '.format(
@@ -327,108 +540,196 @@ class TensorTerm:
             teinsum_string += " + ".join(update_val_line)
         return teinsum_string
 
+def _seed_einsum_paths(paths):
+    _EINSUM_PATHS.update(paths)
+
+
+def _einsum_strings_chunk(terms, update_val, kwargs):
+    """einsum code for a chunk of terms and the contraction paths found on the way"""
+    num_known = len(_EINSUM_PATHS)
+    strings = [term.einsum_string(update_val, **kwargs) for term in terms]
+    return strings, dict(itertools.islice(_EINSUM_PATHS.items(), num_known, None))
+
+
+def einsum_strings(terms, update_val, workers=1, **kwargs):
+    """
+    Generate the numpy einsum code for a list of terms
+
+    With more than one worker, contiguous chunks of the terms are sent to a
+    pool of processes. Every worker starts from the contraction paths this
+    process already knows and keeps the paths it finds for its later chunks.
+    The new paths are merged back here, so later calls reuse them. The code
+    is returned in the order of the terms and is the same as with one worker.
+
+    :param terms: TensorTerms
+    :param update_val: variable that the terms are accumulated into
+    :param workers: number of processes (default: 1, generate in this process)
+    :param kwargs: other arguments of TensorTerm.einsum_string
+    :return: list of einsum code strings, one per term
+    """
+    terms = list(terms)
+    if workers <= 1 or len(terms) <= 1:
+        return [term.einsum_string(update_val, **kwargs) for term in terms]
+
+    # a few chunks per worker balance the load
+    chunksize = -(-len(terms) // (4 * workers))
+    chunks = [terms[start:start + chunksize] for start in range(0, len(terms), chunksize)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_seed_einsum_paths,
+                             initargs=(dict(_EINSUM_PATHS),)) as pool:
+        results = list(pool.map(_einsum_strings_chunk, chunks,
+                                itertools.repeat(update_val), itertools.repeat(kwargs)))
+
+    strings = []
+    for chunk_strings, paths in results:
+        _EINSUM_PATHS.update(paths)
+        strings += chunk_strings
+    return strings
+
+
 class Right0amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=(), name='r0', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class Right1amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='r1', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class Right2amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='r2', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class Right3amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='r3', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class Right4amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='r4', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class Left0amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=(), name='l0', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class Left1amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='l1', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class Left2amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='l2', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class Left3amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='l3', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class Left4amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='l4', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class D1(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='d1', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class D2(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='d2', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class D3(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='d3', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class D4(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='d4', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class T1amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='t1', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class T2amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='t2', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class T3amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='t3', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class T4amps(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='t4', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class OneBody(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='h', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class FockMat(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='f', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class TwoBody(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='g', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
@@ -436,8 +737,25 @@ class TwoBody(BaseTerm):
         return "<{},{}||{},{}>{}".format(self.indices[0], self.indices[1],
                                        self.indices[2], self.indices[3], self.spin)
 
+class SpatialTwoBody(BaseTerm):
+    """
+    Coulomb integrals <pq|rs> over the spatial orbitals of a closed-shell reference
+    (see pq_helper.set_closed_shell)
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *, indices=Tuple[Index, ...], name='V', spin=''):
+        super().__init__(indices=indices, name=name, spin=spin)
+
+    def __repr__(self):
+        return "<{},{}|{},{}>{}".format(self.indices[0], self.indices[1],
+                                      self.indices[2], self.indices[3], self.spin)
+
 class Delta(BaseTerm):
 
+    __slots__ = ()
+
     def __init__(self, *, indices=Tuple[Index, ...], name='kd', spin=''):
         super().__init__(indices=indices, name=name, spin=spin)
 
@@ -446,20 +764,28 @@ class Delta(BaseTerm):
 
 class ContractionPermuter(TensorTermAction):
 
+    __slots__ = ()
+
     def __init__(self, *, spin='', indices=Tuple[Index, ...], name='P'):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class ContractionPairPermuter6(TensorTermAction):
 
+    __slots__ = ()
+
     def __init__(self, *, spin='', indices=Tuple[Index, ...], name='PP6'):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class ContractionPairPermuter2(TensorTermAction):
 
+    __slots__ = ()
+
     def __init__(self, *, spin='', indices=Tuple[Index, ...], name='PP2'):
         super().__init__(indices=indices, name=name, spin=spin)
 
 class ContractionPairPermuter3(TensorTermAction):
 
+    __slots__ = ()
+
     def __init__(self, *, spin='', indices=Tuple[Index, ...], name='PP3'):
         super().__init__(indices=indices, name=name, spin=spin)
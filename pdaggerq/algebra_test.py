@@ -17,8 +17,11 @@
 #   limitations under the License.
 
 from pdaggerq.algebra import (BaseTerm, Index, TensorTerm, T1amps, T2amps,
-                              TwoBody, OneBody)
+                              TwoBody, OneBody, einsum_path, einsum_strings)
+from pdaggerq import algebra
+import pickle
 import numpy as np
+import pytest
 
 
 def test_index():
@@ -37,6 +40,12 @@ def test_index():
 
     assert i_idx != iv_idx
 
+    # indices are interned and immutable
+    assert Index('i', 'occ') is i_idx
+    assert pickle.loads(pickle.dumps(i_idx)) is i_idx
+    with pytest.raises(AttributeError):
+        i_idx.name = 'j'
+
 
 def test_baseterm():
     term = BaseTerm(indices=(Index('i', 'occ'), Index('j', 'occ')),
@@ -55,6 +64,29 @@ def test_baseterm():
     assert term2 == term2
     assert term2 != term
 
+    # the product shares the base terms instead of copying them
+    assert (term * term2).base_terms[0] is term
+
+
+def test_hash_and_immutability():
+    i, a = Index('i', 'occ'), Index('a', 'virt')
+    t1 = T1amps(indices=(a, i))
+    t1_aa = T1amps(indices=(a, i), spin='_aa')
+    f = BaseTerm(indices=(i, a), name='f', spin='')
+    assert hash(t1) == hash(T1amps(indices=(a, i)))
+    assert t1 != t1_aa
+    assert len({t1, T1amps(indices=(a, i)), t1_aa}) == 2
+
+    term = TensorTerm(base_terms=(f, t1), coefficient=0.5)
+    assert len({term, TensorTerm(base_terms=(f, t1), coefficient=0.5), 2 * term}) == 2
+    with pytest.raises(AttributeError):
+        term.coefficient = 1.0
+    with pytest.raises(AttributeError):
+        t1.name = 't2'
+
+    copy = pickle.loads(pickle.dumps(term))
+    assert copy == term and isinstance(copy.base_terms[1], T1amps)
+
 
 def test_tensorterm():
     hij = BaseTerm(indices=(Index('i', 'occ'), Index('j', 'occ')),
@@ -110,3 +142,41 @@ def test_preset_tensor_terms():
     assert test_term.name == 'g'
     test_term = OneBody(indices=(i, j))
     assert test_term.name == 'h'
+
+
+def test_einsum_path():
+    sizes = {'i': 3, 'j': 3, 'k': 3, 'a': 5, 'b': 5, 'c': 5}
+    for subscripts in ['ijab,ai,bj', 'kjbc,ci,ak->abij', 'jkbc,ai,bj,ck',
+                       'ijab,ackj,bi->ck', 'ia,jb,kc,ijac->kb']:
+        chars = sorted(set(subscripts.replace(',', '').split('->')[0]))
+        operands = [np.zeros(tuple(sizes[xx] for xx in term))
+                    for term in subscripts.split('->')[0].split(',')]
+        path = einsum_path(subscripts, tuple((xx, sizes[xx]) for xx in chars))
+        assert path == np.einsum_path(subscripts, *operands, optimize='optimal')[0]
+
+
+def test_einsum_string_dims():
+    i, j, a, b = Index('i', 'occ'), Index('j', 'occ'), Index('a', 'virt'), \
+                 Index('b', 'virt')
+    term = TensorTerm(base_terms=(TwoBody(indices=(j, i, a, b)),
+                                  T1amps(indices=(a, i)),
+                                  T1amps(indices=(b, j))))
+    code = term.einsum_string(update_val='energy', dims={'o': 10, 'v': 100})
+    assert "einsum('jiab,ai,bj', g[o, o, v, v], t1, t1, optimize=['einsum_path', (0, 1), (0, 1)])" in code
+
+
+def test_einsum_strings_workers():
+    i, j, k = Index('i', 'occ'), Index('j', 'occ'), Index('k', 'occ')
+    a, b, c = Index('a', 'virt'), Index('b', 'virt'), Index('c', 'virt')
+    terms = [TensorTerm(base_terms=(TwoBody(indices=(k, j, c, b)), T1amps(indices=(c, i)),
+                                    T2amps(indices=(a, b, k, j))), coefficient=0.5),
+             TensorTerm(base_terms=(TwoBody(indices=(k, j, c, b)), T1amps(indices=(c, k)),
+                                    T1amps(indices=(b, j)), T1amps(indices=(a, i)))),
+             TensorTerm(base_terms=(OneBody(indices=(k, i)), T1amps(indices=(a, k))), coefficient=-1.0)] * 3
+
+    algebra._EINSUM_PATHS.clear()
+    codes = einsum_strings(terms, 'singles_res', workers=2, output_variables=('a', 'i'))
+    assert codes == [term.einsum_string('singles_res', output_variables=('a', 'i')) for term in terms]
+
+    # the paths found by the workers are kept in this process
+    assert len(algebra._EINSUM_PATHS) == 2
@@ -10,6 +10,8 @@ replacement_mapping = {
 
 # anything["0011_Loovv"](anything) => anything(anything).block(TAManager.toBlockRange("ccll"))
 def replace_block_strings_active(input_string):
+    if '"](' not in input_string:
+        return input_string
 
     pattern = re.compile(r'([^ ]+)\["([01]{1,4}_L?([ov]{1,4}))"\](\([^)]+\))')
 
@@ -26,6 +28,8 @@ def replace_block_strings_active(input_string):
 
 # eri["oovv"](ijab) => conj(eri["vvoo"](abij))
 def replace_conj_strings_option1(input_string):
+    if 'eri["' not in input_string:
+        return input_string
 
     pattern = re.compile(r'eri\["(oovv|oovo|vovv)"\]\("([a-o]),([a-o]),([a-o]),([a-o])"\)')
 
@@ -38,6 +42,8 @@ def replace_conj_strings_option1(input_string):
 
 # eri["oovv_0011"](ijab) => conj(eri["vvoo_1100"](abij))
 def replace_conj_strings_option1_active(input_string):
+    if 'eri["' not in input_string:
+        return input_string
 
     pattern = re.compile(r'eri\["([01]{4})_(oovv|oovo|vovv)"\]\("([a-o]),([a-o]),([a-o]),([a-o])"\)')
 
@@ -50,6 +56,8 @@ def replace_conj_strings_option1_active(input_string):
 
 # tmps_["123_Loovv"].~TArrayD => TAmanager.free("oovv", std::move(tmps_["123_Loovv"]))
 def replace_free_strings(input_string):
+    if '~TArrayD' not in input_string:
+        return input_string
 
     pattern = re.compile(r'(tmps_?\["[0-9perm]+_([ovL]+)"\]).~TArrayD\(\);')
 
@@ -64,6 +72,8 @@ def replace_free_strings(input_string):
 
 # tmps_["Loovv_0011_123"].~TArrayD => TAmanager.free("ccll", std::move(tmps_["Loovv_0011_123"]))
 def replace_free_strings_active(input_string):
+    if '~TArrayD' not in input_string:
+        return input_string
 
     pattern = re.compile(r'(tmps_\["[0-9]+_([01]+)_([ovL]+)"\]).~TArrayD\(\);')
 
@@ -79,40 +89,92 @@ def replace_free_strings_active(input_string):
 # (reused_)tmps_["123_Loovv"] = anything 
 # => 
 # (reused_)tmps_.emplace(std::make_pair("123_Loovv"), TAmamager.malloc<MatsT>("oovv"); original line
-def add_malloc_strings(input_string):
-    tmp_pattern = re.compile(r'((\s*reused_|\s*tmps_)\["([0-9]+)_([ovL]+)"\]\(".*"\) *= [^;]+;)')
+def add_malloc_strings(lines):
+    tmp_pattern = re.compile(r'(\s*)(reused_|tmps_)\["([0-9]+)_([ovL]+)"\]\(".*"\) *= [^;]+;')
 
-    def replace_tmp_match(match):
-        line, tmps, index, vo = match.groups()
-        vo = re.sub(r'L','',vo) # remove the L
+    def malloc(match):
+        tmps, index, vo = match.group(2, 3, 4)
+        vo = vo.replace('L', '') # remove the L
         replaced_value = vo #''.join(replacement_mapping.get(ch + bit, ch) for ch, bit in zip(vo, ae))
-        return f'{tmps}.emplace(std::make_pair("{index}_{replaced_value}", TAmanager.malloc<MatsT>("{replaced_value}")));{line}'
-    
-    result = tmp_pattern.sub(replace_tmp_match, input_string)
-    return result
+        return f'{tmps}.emplace(std::make_pair("{index}_{replaced_value}", TAmanager.malloc<MatsT>("{replaced_value}")));'
+
+    return _add_mallocs(lines, tmp_pattern, malloc)
 
 # (reuse)tmps_["Loovv_0011_123"] = anything 
 # => 
 # (reuse)tmps_.emplace(std::make_pair("Loovv_0011_123"), TAmamager.malloc<MatsT>("ccll"); original line
-def add_malloc_strings_active(input_string):
-    tmp_pattern = re.compile(r'((\s*reused_|\s*tmps_)\["([0-9]+)_([01]+)_([ovL]+)"\]\(".*"\) *= [^;]+;)')
+def add_malloc_strings_active(lines):
+    tmp_pattern = re.compile(r'(\s*)(reused_|tmps_)\["([0-9]+)_([01]+)_([ovL]+)"\]\(".*"\) *= [^;]+;')
 
-    def replace_tmp_match(match):
-        line, tmps, index, ae, vo = match.groups()
-        vo = re.sub(r'L','',vo) # remove the L
+    def malloc(match):
+        tmps, index, ae, vo = match.group(2, 3, 4, 5)
+        vo = vo.replace('L', '') # remove the L
         replaced_value = ''.join(replacement_mapping.get(ch + bit, ch) for ch, bit in zip(vo, ae))
-        return f'{tmps}.emplace(std::make_pair("{index}_{replaced_value}", TAmanager.malloc<MatsT>("{replaced_value}")));{line}'
-    
-    result = tmp_pattern.sub(replace_tmp_match, input_string)
-    return result
+        return f'{tmps}.emplace(std::make_pair("{index}_{replaced_value}", TAmanager.malloc<MatsT>("{replaced_value}")));'
+
+    return _add_mallocs(lines, tmp_pattern, malloc)
+
+# the malloc is preceded and followed by the whitespace in front of the statement. for a statement
+# that starts a line, this runs back to the end of the last statement (blank lines included)
+def _add_mallocs(lines, tmp_pattern, malloc):
+    before = '' # whitespace between the last statement and the current line
+    for line in lines:
+        if not line.strip():
+            before += line + '\n'
+            yield line
+            continue
+
+        def replace_tmp_match(match):
+            space = match.group(1)
+            if match.start() == 0:
+                return space + malloc(match) + before + match.group(0)
+            return space + malloc(match) + match.group(0)
+
+        if 'tmps_' in line or 'reused_' in line:
+            yield from tmp_pattern.sub(replace_tmp_match, line).split('\n')
+        else:
+            yield line
+        before = line[len(line.rstrip()):] + '\n'
 
 # anything dot anything => anything dot anything; TA::get_default_world().gop.fence()
-def add_fence_lines(input_string):
-    result = re.sub(r'(\s*.*dot.*)(;\s*)',r'\1.get()\2TA::get_default_world().gop.fence();\n    ', input_string)
-    return result
+# the fence goes after the whitespace that follows the statement, and the next statement is indented by four spaces
+def add_fence_lines(lines):
+    fence = 'TA::get_default_world().gop.fence();'
+    held = [] # statement waiting for its fence, and the blank lines after it
+    for line in lines:
+        if held:
+            if not line.strip():
+                held.append(line)
+                continue
+            yield from held
+            held = []
+            statement = line.lstrip()
+            yield line[:len(line) - len(statement)] + fence
+            line = '    ' + statement
+
+        while True:
+            semicolon = line.rfind(';')
+            if semicolon < 0 or 'dot' not in line[:semicolon]:
+                yield line
+                break
+            rest = line[semicolon + 1:]
+            statement = rest.lstrip()
+            line = line[:semicolon] + '.get();' + rest[:len(rest) - len(statement)]
+            if not statement:
+                held.append(line)
+                break
+            yield line + fence
+            line = '    ' + statement
+
+    if held:
+        yield from held[:-1]
+        yield held[-1] + fence
+        yield '    '
 
 # (reuse_)tmps_["123_Loovv"] => (reuse_)tmps_["123_ccll"]
 def replace_tmp_spaces(input_string):
+    if 'tmps_' not in input_string and 'reused_' not in input_string:
+        return input_string
     pattern = re.compile(r'(reused_|tmps_)\["([0-9]+)_([ovL]+)"\]')
 
     def replace_match(match):
@@ -126,6 +188,8 @@ def replace_tmp_spaces(input_string):
 
 # (reused_)tmps_["Loovv_0011_123"] => (reused_)tmps_["ccll_123"]
 def replace_tmp_spaces_active(input_string):
+    if 'tmps_' not in input_string and 'reused_' not in input_string:
+        return input_string
     pattern = re.compile(r'(reused_|tmps_)\["([0-9]+)_([01]+)_([ovL]+)"\]')
 
     def replace_match(match):
@@ -168,36 +232,43 @@ def add_destructor_active(input_string, class_name):
     return input_string + text
 
 # remove lines defining scalars, i.e. containing 'scalar =', 'scalar +=' etc
-def remove_scalar_lines(input_string):
-    output = ""
-    pattern = "scalar.*="
-    for line in input_string.split('\n'):
-        if not re.search(pattern, line):
-            output += line + '\n'
-    return output
+def remove_scalar_lines(lines):
+    pattern = re.compile("scalar.*=")
+    for line in lines:
+        if not pattern.search(line):
+            yield line
+    yield ''
 
 # make sure the first equation in each LHS object uses =, not +=
 # this assumes sigmaR variable name looks like sigmaR2 sigmaR3 sigmaR4
-def first_LHS_direct_equal(input_string):
-    LHSs  = re.findall(r'^(?!.*//).*sigmaR1[^ \(]+',input_string, re.M) # not commented out, sigmaR1 until eg.("a,i") 
-    LHSs += re.findall(r'^(?!.*//).*sigmaR2[^ \(]+',input_string, re.M)
-    LHSs += re.findall(r'^(?!.*//).*sigmaR3[^ \(]+',input_string, re.M)
-    LHSs += re.findall(r'^(?!.*//).*sigmaR4[^ \(]+',input_string, re.M)
-    LHSs += re.findall(r'tmps_\["[^\]]*?_[^\]]*?"\]',input_string) # each tmp should start from an equal sign
-    LHSs = list(set(LHSs))
-    lines = input_string.split('\n')
-    for LHS in LHSs:
-        LHS = LHS.replace(r'[','\[')
-        LHS = LHS.replace(r']','\]')
-        for i, line in enumerate(lines):
-            if re.search(LHS, line):
-            #if re.search(LHS, line) and not re.search('\/\/', line):
-                line = line.replace(r'+=','=')
-                lines[i] = line.replace(r'-= ','= -')
-                break
-
-    return '\n'.join(lines)
-
+def first_LHS_direct_equal(lines):
+    sigma_patterns = [re.compile(r'(?!.*//).*sigmaR' + str(i) + r'[^ \(]+') for i in range(1, 5)] # not commented out, sigmaR1 until eg.("a,i")
+    tmps_pattern = re.compile(r'tmps_\["[^\]]*?_[^\]]*?"\]') # each tmp should start from an equal sign
+
+    sigma_LHSs = set()
+    for line in lines:
+        if 'sigmaR' in line:
+            for pattern in sigma_patterns:
+                match = pattern.match(line)
+                if match:
+                    sigma_LHSs.add(match.group(0))
+    sigma_LHSs = [re.compile(LHS.replace(r'[', '\\[').replace(r']', '\\]')) for LHS in sigma_LHSs]
+
+    seen_tmps = set()
+    for line in lines:
+        first = False
+        for LHS in [LHS for LHS in sigma_LHSs if LHS.search(line)]:
+            sigma_LHSs.remove(LHS)
+            first = True
+        if 'tmps_' in line:
+            for LHS in tmps_pattern.findall(line):
+                if LHS not in seen_tmps:
+                    seen_tmps.add(LHS)
+                    first = True
+        if first:
+            line = line.replace(r'+=','=')
+            line = line.replace(r'-= ','= -')
+        yield line
 
 # gather all lines containing reuse_tmps_.emplace and put in the function initReuseTmps
 def extract_malloc_reusetmps(input_string, class_name):
@@ -315,77 +386,111 @@ def add_constructor(output_content, class_name):
 
     return text + output_content
 
-def to_chronus_string(input_content, class_name="REPLACEME", is_eom=True, is_active=False):
+# pq_graph banners => function headers of the ChronusQ class. a banner takes the blank lines after it,
+# and the end of the shared operators also the blank lines before it
+def replace_banners(lines, class_name, is_eom):
+    text = '\n'.join(lines)
+    banners = []
+    chop = re.compile("/+ Scalars /+\s*\n").search(text) # chop off area not needed, function definitions
+    if chop:
+        banners.append((re.compile(r'/+ Scalars /+\s*$'), '\n\n', False))
+        banners.append((re.compile(r'/+ End of Scalars /+\s*$'), '\n\n', False))
+    if re.compile("/+ Shared  Operators /+\s*\n").search(text):
+        banners.append((re.compile(r'/+ Shared  Operators /+\s*$'), '  void '+class_name+'<MatsT,IntsT>::formEOMIntermediates() {\n\n    TAManager &TAmanager = TAManager::get();\n\n', False))
+        banners.append((re.compile(r'^\s*/+ End of Shared Operators /+\s*$'), '\n\n  }\n\n', True))
+    if re.compile("/+ Evaluate Equations /+\s*\n").search(text):
+        if is_eom:
+            banners.append((re.compile(r'/+ Evaluate Equations /+\s*$'), '  void '+class_name+'<MatsT,IntsT>::buildSigma(const EOMCCSDVector<MatsT> &V, EOMCCSDVector<MatsT> &HV, EOMCCEigenVecType vecType) const {\n\n    TAManager &TAmanager = TAManager::get();\n\n', False))
+        else:
+            banners.append((re.compile(r'/+ Evaluate Equations /+\s*$'), '  void '+class_name+'<MatsT,IntsT>::updateT() {//TODO: fill in variable names\n\n    TAManager &TAmanager = TAManager::get();\n\n', False))
+
+    output = []
+    header = None # end of the last header, continued by the next line that is not blank
+    for i, line in enumerate(lines):
+        if header is not None:
+            if not line.strip() and i < len(lines) - 1:
+                continue
+            line = header + line
+            header = None
+
+        for pattern, replacement, takes_blank_before in banners:
+            match = pattern.search(line) if ' /' in line and i < len(lines) - 1 else None
+            if not match:
+                continue
+            if takes_blank_before:
+                if not output:
+                    continue
+                while len(output) > 1 and not output[-1].strip():
+                    output.pop()
+                parts = replacement.split('\n')
+                output[-1] += parts[0]
+                parts = parts[1:]
+            else:
+                prefix = line[:match.start()]
+                if chop and pattern is banners[0][0]:
+                    output.clear() # drop everything before the first scalars
+                    prefix = ''
+                    chop = None
+                parts = (prefix + replacement).split('\n')
+            output.extend(parts[:-1])
+            header = parts[-1]
+            break
+        else:
+            output.append(line)
 
-    #print(input_content)
-    # code
-    output_content = re.sub(r'}',r'  }', input_content)
+    if header is not None:
+        output.append(header)
+    return output
 
-    # chop off area not needed,  function definitions
-    match = re.compile("/+ Scalars /+\s*\n").search(output_content)
-    if match:
-        output_content = match.group(0) + output_content[match.end():]
-        output_content = re.sub(r'/+ Scalars /+\s*\n','\n\n', output_content)
-        output_content = re.sub(r'/+ End of Scalars /+\s*\n','\n\n', output_content)
+# name changes of pq_graph tensors => members of the ChronusQ class
+name_mapping = {
+    'f["oo"]': 'this->fockMatrix_ta["oo"]',
+    'f["ov"]': 'this->fockMatrix_ta["ov"]',
+    'f["vo"]': 'this->fockMatrix_ta["vo"]',
+    'f["vv"]': 'this->fockMatrix_ta["vv"]',
+    't1': 'this->T1_',
+    't2': 'this->T2_',
+    't3': 'this->T3_',
+    'r1': 'R1',
+    'r2': 'R2',
+    'r3': 'R3',
+    'r4': 'R4',
+    **{f'eri["{block}"]': f'this->antiSymMoints["{block}"]' for block in ['oooo', 'vooo', 'vvoo', 'vovo', 'vovv', 'vvvo', 'vvvv']},
+    **{f'eri_{block}': f'this->antiSymMoints["{block}"]' for block in ['oooo', 'vooo', 'vvoo', 'vovo', 'vovv', 'vvvo', 'vvvv']},
+    'Id': 'this->Id',
+}
+name_pattern = re.compile('|'.join(re.escape(name) for name in name_mapping))
 
-    match = re.compile("/+ Shared  Operators /+\s*\n").search(output_content)
-    if match:
-        output_content = re.sub(r'/+ Shared  Operators /+\s*\n','  void '+class_name+'<MatsT,IntsT>::formEOMIntermediates() {\n\n    TAManager &TAmanager = TAManager::get();\n\n', output_content)
-        output_content = re.sub(r'\n\s*/+ End of Shared Operators /+\s*\n','\n\n  }\n\n', output_content)
+def to_chronus_string(input_content, class_name="REPLACEME", is_eom=True, is_active=False):
 
-    match = re.compile("/+ Evaluate Equations /+\s*\n").search(output_content)
-    if match:
-        if is_eom:
-            output_content = re.sub(r'/+ Evaluate Equations /+\s*\n','  void '+class_name+'<MatsT,IntsT>::buildSigma(const EOMCCSDVector<MatsT> &V, EOMCCSDVector<MatsT> &HV, EOMCCEigenVecType vecType) const {\n\n    TAManager &TAmanager = TAManager::get();\n\n', output_content)
-        else:
-            output_content = re.sub(r'/+ Evaluate Equations /+\s*\n','  void '+class_name+'<MatsT,IntsT>::updateT() {//TODO: fill in variable names\n\n    TAManager &TAmanager = TAManager::get();\n\n', output_content)
+    #print(input_content)
+    # each statement of the code goes through all rewrites below in a single pass over its lines
+    lines = [line.replace('}', '  }') for line in input_content.split('\n')]
+    lines = replace_banners(lines, class_name, is_eom)
 
     if is_active:
-        output_content = re.sub(r't1\["(..)"\]',r't1["\1_vo"]' ,output_content) # must happen before block replacement
-        output_content = re.sub(r't2\["(....)"\]',r't2["\1_vvoo"]' ,output_content) # must happen before block replacement
-        output_content = replace_conj_strings_option1_active(output_content) # must happen before the block replacement
-        output_content = replace_block_strings_active(output_content)
-        output_content = re.sub(r't1_vo',r't1' ,output_content) # must happen before block replacement
-        output_content = re.sub(r't2_vvoo',r't2' ,output_content) # must happen before block replacement
-        output_content = replace_free_strings_active(output_content)
-        output_content = first_LHS_direct_equal(output_content) #must happen after remove_scalar_lines, before add_tenser_definition and add_malloc
-        output_content = add_malloc_strings_active(output_content)
-        output_content = replace_tmp_spaces_active(output_content) # must happen after replace free and add_malloc
+        t1_pattern = re.compile(r't1\["(..)"\]')
+        t2_pattern = re.compile(r't2\["(....)"\]')
+        def rewrite(line):
+            if 't1["' in line:
+                line = t1_pattern.sub(r't1["\1_vo"]', line) # must happen before block replacement
+            if 't2["' in line:
+                line = t2_pattern.sub(r't2["\1_vvoo"]', line) # must happen before block replacement
+            line = replace_conj_strings_option1_active(line) # must happen before the block replacement
+            line = replace_block_strings_active(line)
+            line = line.replace('t1_vo', 't1') # must happen after block replacement
+            line = line.replace('t2_vvoo', 't2') # must happen after block replacement
+            return replace_free_strings_active(line)
+        lines = first_LHS_direct_equal([rewrite(line) for line in lines]) # before add_tenser_definition and add_malloc
+        lines = add_malloc_strings_active(lines)
+        lines = (replace_tmp_spaces_active(line) for line in lines) # must happen after replace free and add_malloc
     else:
-        output_content = replace_conj_strings_option1(output_content) # must happen before the block replacement
-        output_content = replace_free_strings(output_content)
-        output_content = first_LHS_direct_equal(output_content) #must happen after remove_scalar_lines, before add_tenser_definition and add_malloc
-        output_content = add_malloc_strings(output_content)
-        output_content = replace_tmp_spaces(output_content) # must happen after replace free and add_malloc
-    output_content = remove_scalar_lines(output_content)
-    output_content = add_fence_lines(output_content)
-    output_content = re.sub(r'f\["oo"\]','this->fockMatrix_ta["oo"]', output_content)
-    output_content = re.sub(r'f\["ov"\]','this->fockMatrix_ta["ov"]', output_content)
-    output_content = re.sub(r'f\["vo"\]','this->fockMatrix_ta["vo"]', output_content)
-    output_content = re.sub(r'f\["vv"\]','this->fockMatrix_ta["vv"]', output_content)
-
-    output_content = re.sub(r't1','this->T1_', output_content)
-    output_content = re.sub(r't2','this->T2_', output_content)
-    output_content = re.sub(r't3','this->T3_', output_content)
-    output_content = re.sub(r'r1','R1', output_content)
-    output_content = re.sub(r'r2','R2', output_content)
-    output_content = re.sub(r'r3','R3', output_content)
-    output_content = re.sub(r'r4','R4', output_content)
-    output_content = re.sub(r'eri\["oooo"\]','this->antiSymMoints["oooo"]', output_content)
-    output_content = re.sub(r'eri\["vooo"\]','this->antiSymMoints["vooo"]', output_content)
-    output_content = re.sub(r'eri\["vvoo"\]','this->antiSymMoints["vvoo"]', output_content)
-    output_content = re.sub(r'eri\["vovo"\]','this->antiSymMoints["vovo"]', output_content)
-    output_content = re.sub(r'eri\["vovv"\]','this->antiSymMoints["vovv"]', output_content)
-    output_content = re.sub(r'eri\["vvvo"\]','this->antiSymMoints["vvvo"]', output_content)
-    output_content = re.sub(r'eri\["vvvv"\]','this->antiSymMoints["vvvv"]', output_content)
-    output_content = re.sub(r'eri_oooo','this->antiSymMoints["oooo"]', output_content)
-    output_content = re.sub(r'eri_vooo','this->antiSymMoints["vooo"]', output_content)
-    output_content = re.sub(r'eri_vvoo','this->antiSymMoints["vvoo"]', output_content)
-    output_content = re.sub(r'eri_vovo','this->antiSymMoints["vovo"]', output_content)
-    output_content = re.sub(r'eri_vovv','this->antiSymMoints["vovv"]', output_content)
-    output_content = re.sub(r'eri_vvvo','this->antiSymMoints["vvvo"]', output_content)
-    output_content = re.sub(r'eri_vvvv','this->antiSymMoints["vvvv"]', output_content)
-    output_content = re.sub(r'Id','this->Id', output_content)
+        lines = first_LHS_direct_equal([replace_free_strings(replace_conj_strings_option1(line)) for line in lines])
+        lines = add_malloc_strings(lines)
+        lines = (replace_tmp_spaces(line) for line in lines) # must happen after replace free and add_malloc
+    lines = remove_scalar_lines(lines)
+    lines = add_fence_lines(lines)
+    output_content = '\n'.join(name_pattern.sub(lambda match: name_mapping[match.group(0)], line) for line in lines)
 
     # re-organize reusetmps mallocs into a new function
     match = re.compile("r'\s*reused_.emplace[^;]+;'").search(output_content)
@@ -402,7 +507,7 @@ def to_chronus_string(input_content, class_name="REPLACEME", is_eom=True, is_act
         output_content += '  }\n\n'
 
     # names of derived classes
-    output_content = re.sub(r'void','template <typename MatsT, typename IntsT>\n  void', output_content)
+    output_content = output_content.replace('void', 'template <typename MatsT, typename IntsT>\n  void')
     output_content = re.sub(r'##+','', output_content)
 
     # namespace
@@ -413,4 +518,3 @@ def to_chronus_string(input_content, class_name="REPLACEME", is_eom=True, is_act
     output_content = output_content + "\n\n////// End of ChronusQ generated code //////\n"
     print(output_content)
     return output_content
-    
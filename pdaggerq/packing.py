@@ -0,0 +1,195 @@
+#
+# pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
+# Copyright (C) 2020 A. Eugene DePrince III
+#
+# This file is part of the pdaggerq package.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""
+Permutationally packed storage of antisymmetric amplitudes and residuals.
+
+A spin-orbital amplitude such as t3(a,b,c,i,j,k) is antisymmetric within its
+upper (a,b,c) and lower (i,j,k) indices, so only the elements with a<b<c and
+i<j<k are unique. A PackedTensor keeps those elements as a 2D array with one
+row per upper combination and one column per lower combination, which is 36x
+smaller than the full array for t3 and 576x smaller for t4.
+
+Only storage is reduced: amplitudes, residuals, and DIIS vectors kept between
+iterations. Contractions still run on full arrays, so a driver unpacks each
+packed amplitude once per residual evaluation and packs the residuals it
+gets back, as ccsdt_iterations(..., packed=True) in
+examples/psi4_interface/ccsdt.py does:
+
+    t3_full = t3.unpack()                          # one full copy per iteration
+    triples_res = pack(ccsdt_triples_residual(t1, t2, t3_full, f, g, o, v))
+    del t3_full
+    t3 = (triples_res + fock_e_abcijk * t3) * pack(e_abcijk)
+
+Code generated with TensorTerm.einsum_string(..., packed=True) accumulates a
+residual with pack() directly, gathering the unique elements of each term (and
+of each of its index permutations) without building the permuted copies.
+A PackedTensor can also be passed to einsum as it is, but then every
+contraction unpacks it again.
+"""
+
+from functools import lru_cache
+from itertools import combinations, permutations
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def _combinations(dim, rank):
+    """
+    Ordered index combinations p < q < ... of one group of indices
+
+    :param dim: range of each index
+    :param rank: number of indices in the group
+    :return: array of shape (number of combinations, rank)
+    """
+    return np.array(list(combinations(range(dim), rank)), dtype=np.intp).reshape(-1, rank)
+
+
+def _parity(order):
+    """
+    :param order: permutation of range(len(order))
+    :return: +1 for an even permutation and -1 for an odd one
+    """
+    order, sign = list(order), 1
+    for i in range(len(order)):
+        while order[i] != i:
+            j = order[i]
+            order[i], order[j] = order[j], order[i]
+            sign = -sign
+    return sign
+
+
+def _unique(shape, upper):
+    """
+    Index arrays that pick the unique elements of a tensor as a 2D array
+
+    :param shape: shape of the full tensor
+    :param upper: number of upper (leading) indices
+    :return: tuple of index arrays, one per axis
+    """
+    rows = _combinations(shape[0], upper)
+    cols = _combinations(shape[-1], len(shape) - upper)
+    return tuple(rows[:, k][:, None] for k in range(upper)) + \
+        tuple(cols[:, k][None, :] for k in range(len(shape) - upper))
+
+
+class PackedTensor:
+
+    def __init__(self, data, shape, upper=None):
+        """
+        The unique elements of a tensor that is antisymmetric within its upper and its lower indices
+
+        :param data: unique elements, shape (upper combinations, lower combinations)
+        :param shape: shape of the full tensor
+        :param upper: number of upper (leading) indices (default: half of them)
+        """
+        self.data = data
+        self.shape = tuple(shape)
+        self.upper = len(self.shape) // 2 if upper is None else upper
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return self.data.size
+
+    def unpack(self, dtype=None):
+        """
+        :param dtype: dtype of the full tensor (default: that of the packed elements)
+        :return: the full antisymmetric tensor, built anew on every call and not kept
+        """
+        rows = _combinations(self.shape[0], self.upper)
+        cols = _combinations(self.shape[-1], self.ndim - self.upper)
+        full = np.zeros(self.shape, dtype=self.data.dtype if dtype is None else dtype)
+        for upper in permutations(range(rows.shape[1])):
+            for lower in permutations(range(cols.shape[1])):
+                index = tuple(rows[:, k][:, None] for k in upper) + tuple(cols[:, k][None, :] for k in lower)
+                full[index] = _parity(upper) * _parity(lower) * self.data
+        return full
+
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError("a PackedTensor cannot be viewed as a full array without a copy")
+        return self.unpack(dtype)
+
+    def copy(self):
+        return PackedTensor(self.data.copy(), self.shape, self.upper)
+
+    def flatten(self):
+        return self.data.flatten()
+
+    def _check(self, other):
+        if self.shape != other.shape or self.upper != other.upper:
+            raise ValueError("cannot combine packed tensors of shapes {} and {}".format(self.shape, other.shape))
+
+    def __iadd__(self, other):
+        self._check(other)
+        self.data += other.data
+        return self
+
+    def __isub__(self, other):
+        self._check(other)
+        self.data -= other.data
+        return self
+
+    def __add__(self, other):
+        self._check(other)
+        return PackedTensor(self.data + other.data, self.shape, self.upper)
+
+    def __sub__(self, other):
+        self._check(other)
+        return PackedTensor(self.data - other.data, self.shape, self.upper)
+
+    def __neg__(self):
+        return PackedTensor(-self.data, self.shape, self.upper)
+
+    def __mul__(self, other):
+        if isinstance(other, PackedTensor):
+            # elementwise, e.g. with packed energy denominators
+            self._check(other)
+            return PackedTensor(self.data * other.data, self.shape, self.upper)
+        return PackedTensor(other * self.data, self.shape, self.upper)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar):
+        return PackedTensor(self.data / scalar, self.shape, self.upper)
+
+
+def pack(tensor, permutation=None, upper=None):
+    """
+    Gather the unique elements (p < q < ... within the upper and within the lower indices) of a tensor
+
+    :param tensor: full tensor
+    :param permutation: optional einsum-style index permutation (e.g. 'abcijk->bacijk') applied before packing,
+                        so pack(x, 'abcijk->bacijk') == pack(einsum('abcijk->bacijk', x)) without the permuted copy
+    :param upper: number of upper (leading) indices (default: half of them)
+    :return: PackedTensor
+    """
+    tensor = np.asarray(tensor)
+    if upper is None:
+        upper = tensor.ndim // 2
+
+    if permutation is not None:
+        source, target = permutation.replace(' ', '').split('->')
+        tensor = tensor.transpose([source.index(label) for label in target])
+
+    return PackedTensor(tensor[_unique(tensor.shape, upper)], tensor.shape, upper)
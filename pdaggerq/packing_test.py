@@ -0,0 +1,145 @@
+#
+# pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
+# Copyright (C) 2020 A. Eugene DePrince III
+#
+# This file is part of the pdaggerq package.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import importlib
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from itertools import permutations
+
+import numpy as np
+from numpy import einsum
+
+import pdaggerq
+from pdaggerq.packing import PackedTensor, pack
+from pdaggerq.parser import contracted_strings_to_tensor_terms
+
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples', 'psi4_interface')
+
+
+@contextmanager
+def psi4_interface():
+    """import drivers from examples/psi4_interface, without leaving them (or their ccsd, diis, ...) in sys.modules"""
+    sys.path.insert(0, EXAMPLES)
+    before = set(sys.modules)
+    try:
+        yield
+    finally:
+        sys.path.remove(EXAMPLES)
+        for added in set(sys.modules) - before:
+            del sys.modules[added]
+
+
+def antisymmetric(rng, nupper, nlower, shape):
+    """random tensor that is antisymmetric within its upper and within its lower indices"""
+    tensor = rng.standard_normal(shape)
+    result = np.zeros(shape)
+    for upper in permutations(range(nupper)):
+        for lower in permutations(range(nlower)):
+            sign = np.linalg.det(np.eye(nupper)[list(upper)]) * np.linalg.det(np.eye(nlower)[list(lower)])
+            result += sign * tensor.transpose(list(upper) + [nupper + k for k in lower])
+    return result
+
+
+def test_pack_unpack():
+    rng = np.random.default_rng(11)
+    t3 = antisymmetric(rng, 3, 3, (6, 6, 6, 4, 4, 4))
+
+    packed = pack(t3)
+    assert packed.data.shape == (20, 4)
+    assert np.allclose(packed.unpack(), t3)
+    assert np.allclose(np.asarray(2.0 * packed - packed), t3)
+
+    # unpacking for a contraction leaves only the unique elements behind
+    assert np.asarray(packed, dtype=np.float32).dtype == np.float32
+    assert sorted(vars(packed)) == ['data', 'shape', 'upper']
+
+    # packing a permuted copy is the same as gathering the permuted elements
+    assert np.allclose(pack(t3, 'abcijk->bacjik').data, pack(einsum('abcijk->bacjik', t3)).data)
+
+
+def test_packed_ccsdt_doubles():
+    pq = pdaggerq.pq_helper('fermi')
+    pq.set_print_level(0)
+    pq.set_left_operators([['e2(i,j,b,a)']])
+    pq.add_st_operator(1.0, ['f'], ['t1', 't2', 't3'])
+    pq.add_st_operator(1.0, ['v'], ['t1', 't2', 't3'])
+    pq.simplify()
+    terms = contracted_strings_to_tensor_terms(pq.strings())
+    pq.clear()
+
+    no, nv = 4, 5
+    rng = np.random.default_rng(3)
+    o, v = slice(None, no), slice(no, None)
+    f = rng.standard_normal((no + nv, no + nv))
+    g = antisymmetric(rng, 2, 2, (no + nv,) * 4)
+    t1 = rng.standard_normal((nv, no))
+    t2 = antisymmetric(rng, 2, 2, (nv, nv, no, no))
+    t3 = antisymmetric(rng, 3, 3, (nv, nv, nv, no, no, no))
+
+    def residual(packed):
+        scope = {'einsum': einsum, 'pack': pack, 'f': f, 'g': g, 'o': o, 'v': v,
+                 't1': t1, 't2': pack(t2) if packed else t2, 't3': pack(t3) if packed else t3,
+                 'doubles_res': pack(np.zeros((nv, nv, no, no))) if packed else np.zeros((nv, nv, no, no))}
+        for term in terms:
+            exec(term.einsum_string(update_val='doubles_res', output_variables=('a', 'b', 'i', 'j'),
+                                    packed=packed), scope)
+        return scope['doubles_res']
+
+    packed = residual(True)
+    assert isinstance(packed, PackedTensor)
+    assert np.allclose(packed.data, pack(residual(False)).data)
+
+
+def test_packed_ccsdt_iterations():
+    # a model hamiltonian that is weakly correlated enough to converge in a few iterations
+    no, nv = 3, 5
+    rng = np.random.default_rng(5)
+    eps = np.concatenate([np.linspace(-1.2, -0.8, no), np.linspace(0.6, 1.4, nv)])
+    f = np.diag(eps)
+    g = antisymmetric(rng, 2, 2, (no + nv,) * 4)
+    g = 0.02 * (g + g.transpose(2, 3, 0, 1))
+    o, v, n = slice(None, no), slice(no, None), np.newaxis
+    e_ai = 1 / (-eps[v, n] + eps[n, o])
+    e_abij = 1 / (-eps[v, n, n, n] - eps[n, v, n, n] + eps[n, n, o, n] + eps[n, n, n, o])
+    e_abcijk = 1 / (-eps[v, n, n, n, n, n] - eps[n, v, n, n, n, n] - eps[n, n, v, n, n, n]
+                    + eps[n, n, n, o, n, n] + eps[n, n, n, n, o, n] + eps[n, n, n, n, n, o])
+
+    def solve(packed):
+        t1, t2, t3 = np.zeros((nv, no)), np.zeros((nv, nv, no, no)), np.zeros((nv, nv, nv, no, no, no))
+        denominators = pack(e_abcijk) if packed else e_abcijk
+        tracemalloc.start()
+        t1, t2, t3 = ccsdt.ccsdt_iterations(t1, t2, pack(t3) if packed else t3, f, g, o, v, e_ai, e_abij,
+                                            denominators, 0.0, e_convergence=1e-6, r_convergence=1e-6,
+                                            diis_size=4, diis_start_cycle=1, packed=packed)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return ccsdt.coupled_cluster_energy(t1, t2, f, g, o, v), t3, peak
+
+    with psi4_interface():
+        ccsdt = importlib.import_module('ccsdt')
+        energy, t3, peak = solve(False)
+        packed_energy, packed_t3, packed_peak = solve(True)
+
+    assert abs(packed_energy - energy) < 1e-6
+    assert np.allclose(packed_t3, t3, atol=1e-5)
+
+    # t3 and its DIIS history are 10x smaller; the residual evaluation itself still needs full arrays
+    assert packed_peak < 0.6 * peak
@@ -14,8 +14,11 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import os
 import re
-from pdaggerq.algebra import (OneBody, TwoBody, T1amps, T2amps, T3amps, T4amps,
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pdaggerq.algebra import (OneBody, TwoBody, SpatialTwoBody, T1amps, T2amps, T3amps, T4amps,
                               Index, TensorTerm, D1, D2, D3, D4,
                               Delta, Left0amps, Left1amps,
                               Left2amps, Left3amps, Left4amps, Right0amps,
@@ -25,50 +28,72 @@ from pdaggerq.algebra import (OneBody, TwoBody, T1amps, T2amps, T3amps, T4amps,
                               ContractionPairPermuter2, TensorTermAction, )
 from pdaggerq.config import OCC_INDICES, VIRT_INDICES
 
+# new operators should be added here
+TENSOR_MAP = {
+    'g' : TwoBody,
+    'h' : OneBody,
+    'f' : FockMat,
+    'd1' : D1,
+    'd2' : D2,
+    'd3' : D3,
+    'd4' : D4,
+    't1' : T1amps,
+    't2' : T2amps,
+    't3' : T3amps,
+    't4' : T4amps,
+    'r0' : Right0amps,
+    'r1' : Right1amps,
+    'r2' : Right2amps,
+    'r3' : Right3amps,
+    'r4' : Right4amps,
+    'l0' : Left0amps,
+    'l1' : Left1amps,
+    'l2' : Left2amps,
+    'l3' : Left3amps,
+    'l4' : Left4amps,
+    'd' : Delta,
+    'p' : ContractionPermuter,
+    'pp2' : ContractionPairPermuter2,
+    'pp3' : ContractionPairPermuter3,
+    'pp6' : ContractionPairPermuter6,
+}
+
+# strip operator names, indices, and spin using regex
+
+# spin_pattern for operator ranks 1-4 looks like '[...]_[ab]...[ab]([...])'
+SPIN_PATTERN = re.compile('_[ab]{2,8}')
+
+# indices pattern looks like '[...]([a-zA-Z],...,[a-zA-Z])'
+# with ChatGPT's help:
+# (?<=\() : Positive lookbehind to match ( but not include it in the result.
+# [^)]+   : Match one or more characters that are not a closing parenthesis ).
+# (?=\))  : Positive lookahead to match ) but not include it in the result.
+IDX_PATTERN = re.compile(r'(?<=\()[^)]+(?=\))')
+
+# lists with more terms than this are parsed in chunks by a pool of processes
+PARALLEL_THRESHOLD = 10 ** 5
+
+_OCC_SET = frozenset(OCC_INDICES)
+
 
 def string_to_baseterm(term_string, occ_idx=OCC_INDICES, virt_idx=VIRT_INDICES):
+    """
+    Parse one tensor token of a pdaggerq string, e.g. 't2(a,b,i,j)' or '<j,i||a,b>_abab'
 
-    # new operators should be added here
-    tensor_map = {
-        'g' : TwoBody,
-        'h' : OneBody,
-        'f' : FockMat,
-        'd1' : D1,
-        'd2' : D2,
-        'd3' : D3,
-        'd4' : D4,
-        't1' : T1amps,
-        't2' : T2amps,
-        't3' : T3amps,
-        't4' : T4amps,
-        'r0' : Right0amps,
-        'r1' : Right1amps,
-        'r2' : Right2amps,
-        'r3' : Right3amps,
-        'r4' : Right4amps,
-        'l0' : Left0amps,
-        'l1' : Left1amps,
-        'l2' : Left2amps,
-        'l3' : Left3amps,
-        'l4' : Left4amps,
-        'd' : Delta,
-        'p' : ContractionPermuter,
-        'pp2' : ContractionPairPermuter2,
-        'pp3' : ContractionPairPermuter3,
-        'pp6' : ContractionPairPermuter6,
-    }
-
-    # strip operator names, indices, and spin using regex
-
-    # spin_pattern for operator ranks 1-4 looks like '[...]_[ab]...[ab]([...])'
-    spin_pattern = re.compile('_[ab]{2,8}')
-
-    # indices pattern looks like '[...]([a-zA-Z],...,[a-zA-Z])'
-    # with ChatGPT's help:
-    # (?<=\() : Positive lookbehind to match ( but not include it in the result.
-    # [^)]+   : Match one or more characters that are not a closing parenthesis ).
-    # (?=\))  : Positive lookahead to match ) but not include it in the result.
-    idx_pattern  = re.compile('(?<=\()[^)]+(?=\))')
+    Tokens repeat many times in a list of strings, so each one is parsed once and the
+    resulting BaseTerm is shared by every term it appears in. Do not modify it.
+
+    :param term_string: the token
+    :param occ_idx: labels of occupied indices; all other labels are virtual
+    :param virt_idx: labels of virtual indices (unused, kept for compatibility)
+    :return: BaseTerm or TensorTermAction
+    """
+    occ_set = _OCC_SET if occ_idx is OCC_INDICES else frozenset(occ_idx)
+    return _parse_token(term_string, occ_set)
+
+
+@lru_cache(maxsize=2 ** 16)
+def _parse_token(term_string, occ_idx):
 
     if "||" in term_string:
         # special case for ERI, which is printed as <x,x||x,x>_[spin]
@@ -80,10 +105,16 @@ def string_to_baseterm(term_string, occ_idx=OCC_INDICES, virt_idx=VIRT_INDICES):
         idx = [Index(xx, 'occ') if xx in occ_idx
                else Index(xx, 'virt') for xx in tmp[0].split(',')]
         return TwoBody(indices=tuple(idx), spin=spin)
+    elif term_string.startswith('<'):
+        # coulomb integrals of a closed-shell reference are printed as <x,x|x,x>
+        index_string = term_string.replace('<', '').replace('>', '').replace('|', ',')
+        idx = [Index(xx, 'occ') if xx in occ_idx
+               else Index(xx, 'virt') for xx in index_string.split(',')]
+        return SpatialTwoBody(indices=tuple(idx))
     else:
         # all other operators will be of the form 'op_spin([idx])'
         # first, extract and strip the spin
-        term_spin = spin_pattern.findall(term_string)
+        term_spin = SPIN_PATTERN.findall(term_string)
         if len(term_spin)==0:
             spin = ''
         else:
@@ -92,7 +123,7 @@ def string_to_baseterm(term_string, occ_idx=OCC_INDICES, virt_idx=VIRT_INDICES):
             term_string = term_string.replace(spin,'')
 
         # next, extract indices
-        idx = idx_pattern.findall(term_string)[0]
+        idx = IDX_PATTERN.findall(term_string)[0]
         # remove '([idx])' to obtain 'op'
         term_string = term_string.replace(f'({idx})','')
         idx = [Index(xx, 'occ') if xx in occ_idx
@@ -101,22 +132,13 @@ def string_to_baseterm(term_string, occ_idx=OCC_INDICES, virt_idx=VIRT_INDICES):
         # check if operator is allowed
         # make operator label lowercase from this point on
         term_string = term_string.lower()
-        if term_string in tensor_map.keys():
-            return tensor_map[term_string](indices=tuple(idx), spin=spin)
+        if term_string in TENSOR_MAP.keys():
+            return TENSOR_MAP[term_string](indices=tuple(idx), spin=spin)
         else:
             raise TypeError(f"Operator {term_string} not recognized")
 
 
-def contracted_strings_to_tensor_terms(pdaggerq_list_of_strings):
-    """
-    Take the output from pdaggerq.fully_contracted_strings() or
-    pdaggerq.fully_contracted_strings_with_spin() and generate
-    TensorTerms
-
-    :param pdaggerq_list_of_strings: List[List[str]] where the first item is
-                                     always a float.
-    :return: List of algebra.TensorTerms
-    """
+def _strings_to_tensor_terms(pdaggerq_list_of_strings):
     tensor_terms = []
     for pq_string in pdaggerq_list_of_strings:
         coeff = float(pq_string[0])
@@ -135,6 +157,35 @@ def contracted_strings_to_tensor_terms(pdaggerq_list_of_strings):
     return tensor_terms
 
 
+def contracted_strings_to_tensor_terms(pdaggerq_list_of_strings, processes=None):
+    """
+    Take the output from pdaggerq.fully_contracted_strings() or
+    pdaggerq.fully_contracted_strings_with_spin() and generate
+    TensorTerms
+
+    :param pdaggerq_list_of_strings: List[List[str]] where the first item is
+                                     always a float.
+    :param processes: number of processes used for lists longer than
+                      PARALLEL_THRESHOLD terms (default: all cores). 1 parses
+                      every list in this process.
+    :return: List of algebra.TensorTerms
+    """
+    pdaggerq_list_of_strings = list(pdaggerq_list_of_strings)
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes > 1 and len(pdaggerq_list_of_strings) > PARALLEL_THRESHOLD:
+        # a few chunks per process balance the load; the results come back in input order
+        chunksize = -(-len(pdaggerq_list_of_strings) // (4 * processes))
+        chunks = [pdaggerq_list_of_strings[start:start + chunksize]
+                  for start in range(0, len(pdaggerq_list_of_strings), chunksize)]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            return [term for chunk in pool.map(_strings_to_tensor_terms, chunks)
+                    for term in chunk]
+
+    return _strings_to_tensor_terms(pdaggerq_list_of_strings)
+
+
 def vacuum_normal_ordered_strings_to_tensor_terms(pdaggerq_list_of_strings):
     """
     Take the output of a normal ordering in pdaggerq and produce tensor terms
@@ -41,4 +41,21 @@ def test_parse_strings_to_tensor():
    eterm3 = TensorTerm(base_terms=(g_ijab, t2_abij), coefficient=-0.25)
    assert eterm1.__repr__() == energy_tensor_terms[0].__repr__()
    assert eterm2.__repr__() == energy_tensor_terms[1].__repr__()
-   assert eterm3.__repr__() == energy_tensor_terms[3].__repr__()
\ No newline at end of file
+   assert eterm3.__repr__() == energy_tensor_terms[3].__repr__()
+
+def test_token_cache_and_chunked_parsing(monkeypatch):
+   from pdaggerq import parser
+
+   strings = [['-0.250000', '<j,i||a,b>_abab', 't2_abab(a,b,j,i)'],
+              ['+1.000000', 'P(i,j)', 'f_aa(k,j)', 't2_aaaa(a,b,i,k)'],
+              ['-0.250000', '<j,i||a,b>_abab', 't2_abab(a,b,j,i)']] * 20
+   serial = contracted_strings_to_tensor_terms(strings, processes=1)
+
+   # repeated tokens are parsed once and shared
+   assert serial[0].base_terms[0] is serial[2].base_terms[0]
+   assert serial[1].actions[0].name == 'P'
+
+   # the chunked path returns the same terms in input order
+   monkeypatch.setattr(parser, 'PARALLEL_THRESHOLD', 10)
+   chunked = contracted_strings_to_tensor_terms(strings, processes=2)
+   assert [repr(xx) for xx in chunked] == [repr(xx) for xx in serial]
@@ -270,69 +270,206 @@ void reorder_four_spins(amplitudes & amps, int i1, int i2, int i3, int i4, int &
 
 }
 
-// add spin labels to a string
-bool add_spins(const std::shared_ptr<pq_string>& in, std::vector<std::shared_ptr<pq_string> > &list) {
-
-    if ( in->skip ) return true;
+// spin conservation rule for one amplitude or integral. slots hold the index of an unlabeled
+// (summed) label or one of the fixed spins below; kind is 0 (n_a and n_b equal on both sides),
+// 1 (left side has at least as many of each spin), or -1 (left side has at most as many)
+struct spin_constraint {
+    static constexpr int fixed_a = -1;
+    static constexpr int fixed_b = -2;
+
+    std::vector<int> left;
+    std::vector<int> right;
+    int kind = 0;
+
+    // can the unassigned slots still be chosen so that the rule holds?
+    bool feasible(const std::vector<char> & spins) const {
+
+        int left_a = 0, left_b = 0, left_free = 0;
+        for (int slot : left) {
+            char spin = slot == fixed_a ? 'a' : slot == fixed_b ? 'b' : spins[slot];
+            if ( spin == 'a' )      left_a++;
+            else if ( spin == 'b' ) left_b++;
+            else                    left_free++;
+        }
+        int right_a = 0, right_b = 0, right_free = 0;
+        for (int slot : right) {
+            char spin = slot == fixed_a ? 'a' : slot == fixed_b ? 'b' : spins[slot];
+            if ( spin == 'a' )      right_a++;
+            else if ( spin == 'b' ) right_b++;
+            else                    right_free++;
+        }
 
-    bool all_spins_added = false;
+        // at most four labels on either side, so just try every split of the free slots
+        for (int x = 0; x <= left_free; x++) {
+            int na_left = left_a + x;
+            int nb_left = left_b + left_free - x;
+            for (int y = 0; y <= right_free; y++) {
+                int na_right = right_a + y;
+                int nb_right = right_b + right_free - y;
+                if ( kind == 0 && na_left == na_right && nb_left == nb_right ) return true;
+                if ( kind > 0  && na_left >= na_right && nb_left >= nb_right ) return true;
+                if ( kind < 0  && na_left <= na_right && nb_left <= nb_right ) return true;
+            }
+        }
+        return false;
+    }
+};
+
+// call found with every assignment of spins to the unlabeled labels of a string that conserves
+// spin in each amplitude and integral. spins are fixed one label at a time, and a partial
+// assignment is abandoned as soon as any tensor can no longer conserve spin. assignments come
+// out in the same order as labeling the first unlabeled label of the amplitudes, then of the
+// integrals, as "a" and then as "b". labels in fixed_labels that occur in the tensors are not
+// searched over: they come first in the assignment, and each entry of fixed_spins (one spin per
+// label in fixed_labels) gives them their spins, one entry after the other
+void enumerate_spins(const std::shared_ptr<pq_string>& in, const spin_assignment_callback &found,
+                     const std::vector<std::string> &fixed_labels, const std::vector<std::vector<char> > &fixed_spins) {
+
+    if ( in->skip ) return;
+
+    // unlabeled labels, in order of first appearance
+    std::vector<std::string> free_labels;
+    std::vector<size_t> fixed_positions;
+    for (size_t k = 0; k < fixed_labels.size(); k++) {
+        const std::string & label = fixed_labels[k];
+        if ( in->index_in_anywhere(label) > index_in_deltas(label, in->deltas) ) {
+            free_labels.push_back(label);
+            fixed_positions.push_back(k);
+        }
+    }
+    size_t n_fixed = free_labels.size();
+    auto slot_of = [&free_labels](const std::string & label, const std::string & spin) {
+        if ( spin == "a" ) return spin_constraint::fixed_a;
+        if ( spin == "b" ) return spin_constraint::fixed_b;
+        auto it = std::find(free_labels.begin(), free_labels.end(), label);
+        if ( it != free_labels.end() ) return (int)(it - free_labels.begin());
+        free_labels.push_back(label);
+        return (int)free_labels.size() - 1;
+    };
+
+    std::vector<spin_constraint> constraints;
 
     // amplitudes
     for (auto &amp_pair : in->amps) {
-        char type = amp_pair.first;
-        std::vector<amplitudes> & amps = amp_pair.second;
-        for (auto & amp : amps) {
-            for (size_t k = 0; k < amp.labels.size(); k++) {
-                if ( amp.spin_labels[k].empty() ) {
+        for (auto & amp : amp_pair.second) {
+            spin_constraint rule;
+            for (size_t l = 0; l < amp.n_create; l++) {
+                rule.left.push_back(slot_of(amp.labels[l], amp.spin_labels[l]));
+            }
+            for (size_t l = 0; l < amp.n_annihilate; l++) {
+                rule.right.push_back(slot_of(amp.labels[l + amp.n_create], amp.spin_labels[l + amp.n_create]));
+            }
+            // labels beyond the creators and annihilators still need spins
+            for (size_t l = amp.n_create + amp.n_annihilate; l < amp.labels.size(); l++) {
+                slot_of(amp.labels[l], amp.spin_labels[l]);
+            }
+            if ( amp.n_create > amp.n_annihilate )      rule.kind = 1;
+            else if ( amp.n_create < amp.n_annihilate ) rule.kind = -1;
+            constraints.push_back(rule);
+        }
+    }
 
-                    std::shared_ptr<pq_string> sa (new pq_string(in->vacuum));
-                    std::shared_ptr<pq_string> sb (new pq_string(in->vacuum));
+    // integrals
+    for (auto &ints_pair : in->ints) {
+        for (auto & integral : ints_pair.second) {
+            size_t order = integral.labels.size() / 2;
+            spin_constraint rule;
+            for (size_t l = 0; l < order; l++) {
+                rule.left.push_back(slot_of(integral.labels[l], integral.spin_labels[l]));
+                rule.right.push_back(slot_of(integral.labels[l + order], integral.spin_labels[l + order]));
+            }
+            for (size_t l = 2 * order; l < integral.labels.size(); l++) {
+                slot_of(integral.labels[l], integral.spin_labels[l]);
+            }
+            constraints.push_back(rule);
+        }
+    }
 
-                    sa->copy(in.get());
-                    sb->copy(in.get());
+    // rules on labels that already have spins are never revisited below, so every rule must be
+    // satisfiable before any label is assigned
+    std::vector<char> spins(free_labels.size(), '\0');
+    for (const spin_constraint & rule : constraints) {
+        if ( !rule.feasible(spins) ) return;
+    }
 
-                    sa->set_spin_everywhere(amp.labels[k], "a");
-                    sb->set_spin_everywhere(amp.labels[k], "b");
+    // nothing to label
+    if ( free_labels.empty() ) {
+        found(free_labels, spins);
+        return;
+    }
 
-                    list.push_back(sa);
-                    list.push_back(sb);
-                    return false;
-                }
+    // the rules each label takes part in
+    std::vector<std::vector<size_t>> rules_for_label(free_labels.size());
+    for (size_t c = 0; c < constraints.size(); c++) {
+        for (const auto * side : {&constraints[c].left, &constraints[c].right}) {
+            for (int slot : *side) {
+                if ( slot < 0 ) continue;
+                auto & rules = rules_for_label[slot];
+                if ( rules.empty() || rules.back() != c ) rules.push_back(c);
             }
         }
     }
 
-    // integrals
-    for (auto &ints_pair : in->ints) {
-        const std::string &type = ints_pair.first;
-        std::vector<integrals> & ints = ints_pair.second;
-        for (auto & integral : ints) {
-            for (size_t k = 0; k < integral.labels.size(); k++) {
-                if ( integral.spin_labels[k].empty() ) {
+    // depth-first search over the labels; '\0' marks a label without a spin yet
+    std::function<void(size_t)> assign = [&](size_t depth) {
 
-                    std::shared_ptr<pq_string> sa (new pq_string(in->vacuum));
-                    std::shared_ptr<pq_string> sb (new pq_string(in->vacuum));
+        if ( depth == free_labels.size() ) {
+            found(free_labels, spins);
+            return;
+        }
 
-                    sa->copy(in.get());
-                    sb->copy(in.get());
+        for (char spin : {'a', 'b'}) {
+            spins[depth] = spin;
+            bool valid = true;
+            for (size_t c : rules_for_label[depth]) {
+                if ( !constraints[c].feasible(spins) ) { valid = false; break; }
+            }
+            if ( valid ) assign(depth + 1);
+        }
+        spins[depth] = '\0';
+    };
 
-                    sa->set_spin_everywhere(integral.labels[k], "a");
-                    sb->set_spin_everywhere(integral.labels[k], "b");
+    if ( fixed_labels.empty() ) {
+        assign(0);
+        return;
+    }
 
-                    list.push_back(sa);
-                    list.push_back(sb);
-                    return false;
-                }
-            }
+    // search the other labels once for each different choice of spins for the fixed ones
+    std::vector<std::vector<char> > tried;
+    for (const std::vector<char> & choice : fixed_spins) {
+        std::vector<char> prefix;
+        for (size_t k : fixed_positions) prefix.push_back(choice[k]);
+        if ( std::find(tried.begin(), tried.end(), prefix) != tried.end() ) continue;
+        tried.push_back(prefix);
+
+        std::copy(prefix.begin(), prefix.end(), spins.begin());
+        bool valid = true;
+        for (const spin_constraint & rule : constraints) {
+            if ( !rule.feasible(spins) ) { valid = false; break; }
         }
+        if ( valid ) assign(n_fixed);
     }
+}
 
-    // must be done.
-    return true;
+// copy a string and give its unlabeled labels the spins of one assignment
+std::shared_ptr<pq_string> copy_with_spins(const std::shared_ptr<pq_string>& in, const std::vector<std::string> &labels, const std::vector<char> &spins) {
+    std::shared_ptr<pq_string> newguy (new pq_string(in->vacuum));
+    newguy->copy(in.get());
+    for (size_t k = 0; k < labels.size(); k++) {
+        newguy->set_spin_everywhere(labels[k], spins[k] == 'a' ? "a" : "b");
+    }
+    return newguy;
 }
 
-// expand sums to include spin and zero terms where appropriate
-void spin_blocking(const std::shared_ptr<pq_string>& in, std::vector<std::shared_ptr<pq_string> > &spin_blocked, const std::unordered_map<std::string, std::string> &spin_map) {
+// add spin labels to a string: only spin-conserving assignments are ever copied
+void add_spins(const std::shared_ptr<pq_string>& in, std::vector<std::shared_ptr<pq_string> > &list) {
+    enumerate_spins(in, [&](const std::vector<std::string> &labels, const std::vector<char> &spins) {
+        list.push_back(labels.empty() ? in : copy_with_spins(in, labels, spins));
+    });
+}
+
+// stop if the spin map is missing any of the non-summed labels of a string or has an invalid spin
+void check_spin_map(const std::shared_ptr<pq_string>& in, const std::unordered_map<std::string, std::string> &spin_map) {
 
     // check if spin map is missing any of the non-summed spin labels
 
@@ -397,6 +534,11 @@ void spin_blocking(const std::shared_ptr<pq_string>& in, std::vector<std::shared
         }
     }
 
+}
+
+// copy a string, set its non-summed spins, and expand permutations that mix labels of different spin
+std::vector<std::shared_ptr<pq_string> > expand_spin_permutations(const std::shared_ptr<pq_string>& in, const std::unordered_map<std::string, std::string> &spin_map) {
+
     // non-summed spin labels
     in->non_summed_spin_labels = spin_map;
 
@@ -974,129 +1116,20 @@ void spin_blocking(const std::shared_ptr<pq_string>& in, std::vector<std::shared
         }
     }
 
-    // now, expand sums 
+    return tmp;
+}
 
-    bool done_adding_spins = false;
-    do {
-        std::vector< std::shared_ptr<pq_string> > list;
-        done_adding_spins = true;
-        for (std::shared_ptr<pq_string> & pq_str : tmp) {
-            bool am_i_done = add_spins(pq_str, list);
-            if ( !am_i_done ) done_adding_spins = false;
-        }
-        if ( !done_adding_spins ) {
-            tmp.clear();
-            for (std::shared_ptr<pq_string> & pq_str : list) {
-                if ( !pq_str->skip ) {
-                    tmp.push_back(pq_str);
-                }
-            }
-        }
-    }while(!done_adding_spins);
+// drop spin-blocked strings with mismatched delta functions, put the spins of the rest in
+// standard order (abba -> -abab, etc.), and keep them
+void standardize_spin_blocks(const std::shared_ptr<pq_string>& in, std::vector<std::shared_ptr<pq_string> > &tmp, std::vector<std::shared_ptr<pq_string> > &spin_blocked) {
 
-    // kill terms that have mismatched spin 
+    // kill terms that have mismatched spin in delta functions
     for (auto & pq_str : tmp) {
 
         if ( pq_str->skip ) continue;
 
         bool killit = false;
 
-        // amplitudes
-        for (auto &amp_pair : pq_str->amps) {
-            char type = amp_pair.first;
-            std::vector<amplitudes> & amps = amp_pair.second;
-            for (auto & amp : amps) {
-
-                size_t n_create_a = 0;
-                size_t n_create_b = 0;
-
-                for (size_t l = 0; l < amp.n_create; l++) {
-                    if (amp.spin_labels[l] == "a" ) {
-                        n_create_a++;
-                    }else {
-                        n_create_b++;
-                    }
-                }
-
-                size_t n_annihilate_a = 0;
-                size_t n_annihilate_b = 0;
-
-                for (size_t l = 0; l < amp.n_annihilate; l++) {
-                    if (amp.spin_labels[l + amp.n_create] == "a" ) {
-                        n_annihilate_a++;
-                    }else {
-                        n_annihilate_b++;
-                    }
-                }
-
-                // particle conserving excitations:
-                if (amp.n_create == amp.n_annihilate) {
-                    if (n_create_a != n_annihilate_a || n_create_b != n_annihilate_b ) {
-                        killit = true;
-                        break;
-                    }
-                // particle non-conserving excitations:
-                }else if (amp.n_create > amp.n_annihilate) {
-                    if (n_create_a < n_annihilate_a || n_create_b < n_annihilate_b ) {
-                        killit = true;
-                        break;
-                    }
-                // particle non-conserving excitations:
-                }else if (amp.n_create < amp.n_annihilate) {
-                    if (n_create_a > n_annihilate_a || n_create_b > n_annihilate_b ) {
-                        killit = true;
-                        break;
-                    }
-                }
-
-            }
-            if ( killit ) break;
-        }
-        if ( killit ) {
-            pq_str->skip = true;
-            continue;
-        }
-
-        killit = false;
-
-        // integrals
-        for (auto &ints_pair : pq_str->ints) {
-            const std::string &type = ints_pair.first;
-            std::vector<integrals> & ints = ints_pair.second;
-            for (auto & integral : ints) {
-                size_t order = integral.labels.size() / 2;
-
-                int left_a = 0;
-                int left_b = 0;
-                int right_a = 0;
-                int right_b = 0;
-                for (size_t l = 0; l < order; l++) {
-                    if (integral.spin_labels[l] == "a" ) {
-                        left_a++;
-                    }else {
-                        left_b++;
-                    }
-                    if (integral.spin_labels[l + order] == "a" ) {
-                        right_a++;
-                    }else {
-                        right_b++;
-                    }
-                }
-                if (left_a != right_a || left_b != right_b ) {
-                    killit = true;
-                    break;
-                }
-
-            }
-            if ( killit ) break;
-        }
-        if ( killit ) {
-            pq_str->skip = true;
-            continue;
-        }
-
-        killit = false;
-
         // delta functions 
         for (size_t j = 0; j < in->deltas.size(); j++) {
             if (pq_str->deltas[j].spin_labels[0] != pq_str->deltas[j].spin_labels[1] ) {
@@ -1271,4 +1304,378 @@ void spin_blocking(const std::shared_ptr<pq_string>& in, std::vector<std::shared
     tmp.clear();
 }
 
+// expand sums to include spin and zero terms where appropriate
+void spin_blocking(const std::shared_ptr<pq_string>& in, std::vector<std::shared_ptr<pq_string> > &spin_blocked, const std::unordered_map<std::string, std::string> &spin_map) {
+
+    check_spin_map(in, spin_map);
+
+    std::vector< std::shared_ptr<pq_string> > tmp = expand_spin_permutations(in, spin_map);
+
+    // now, expand sums over spin, keeping only the assignments that conserve spin in every
+    // amplitude and integral
+    std::vector< std::shared_ptr<pq_string> > list;
+    for (std::shared_ptr<pq_string> & pq_str : tmp) {
+        add_spins(pq_str, list);
+    }
+
+    standardize_spin_blocks(in, list, spin_blocked);
+}
+
+// spin_blocking for several spin maps at once. the permutation expansion only depends on
+// which permuted labels have equal spins, so maps that agree on that share one expansion.
+// each expanded string then has its spin rules set up once, the summed labels are searched
+// once for each map's spins of the non-summed labels, and every assignment is sent to the
+// maps whose spins it matches. a non-summed label that the expansion moved out of the tensors
+// and into the delta functions is not enumerated, so it takes its spin from the map, as it
+// does in spin_blocking
+void spin_blocking_all(const std::shared_ptr<pq_string>& in, std::vector<std::vector<std::shared_ptr<pq_string> > > &spin_blocked, const std::vector<std::unordered_map<std::string, std::string> > &spin_maps) {
+
+    spin_blocked.assign(spin_maps.size(), {});
+
+    for (const auto & spin_map : spin_maps) {
+        check_spin_map(in, spin_map);
+    }
+
+    // every label some map fixes
+    std::vector<std::string> all_labels;
+    for (const auto & spin_map : spin_maps) {
+        for (const auto & item : spin_map) {
+            if ( std::find(all_labels.begin(), all_labels.end(), item.first) == all_labels.end() ) {
+                all_labels.push_back(item.first);
+            }
+        }
+    }
+
+    // which labels a map fixes, and which permutations expand_spin_permutations will expand for it
+    auto expansion_pattern = [&in, &all_labels](const std::unordered_map<std::string, std::string> &spin_map) {
+        auto spin = [&spin_map](const std::string & label) {
+            auto it = spin_map.find(label);
+            return it == spin_map.end() ? std::string() : it->second;
+        };
+        std::vector<bool> pattern;
+        for (const std::string & label : all_labels) {
+            pattern.push_back( spin_map.count(label) > 0 );
+        }
+        for (size_t j = 0; j < in->permutations.size() / 2; j++) {
+            pattern.push_back( spin(in->permutations[2*j]) == spin(in->permutations[2*j+1]) );
+        }
+        for (const auto * paired : {&in->paired_permutations_3, &in->paired_permutations_6}) {
+            for (size_t j = 0; j < paired->size() / 6; j++) {
+                std::string spin1 = spin((*paired)[6*j]);
+                std::string spin2 = spin((*paired)[6*j+2]);
+                std::string spin3 = spin((*paired)[6*j+4]);
+                pattern.push_back( spin1 == spin2 );
+                pattern.push_back( spin2 == spin3 );
+            }
+        }
+        return pattern;
+    };
+
+    // group the maps by expansion
+    std::vector<std::vector<bool> > patterns;
+    std::vector<std::vector<size_t> > groups;
+    for (size_t m = 0; m < spin_maps.size(); m++) {
+        std::vector<bool> pattern = expansion_pattern(spin_maps[m]);
+        auto it = std::find(patterns.begin(), patterns.end(), pattern);
+        if ( it == patterns.end() ) {
+            patterns.push_back(pattern);
+            groups.push_back({m});
+        }else {
+            groups[it - patterns.begin()].push_back(m);
+        }
+    }
+
+    for (const std::vector<size_t> & group : groups) {
+
+        // nothing to share
+        if ( group.size() == 1 ) {
+            spin_blocking(in, spin_blocked[group[0]], spin_maps[group[0]]);
+            continue;
+        }
+
+        std::vector< std::shared_ptr<pq_string> > tmp = expand_spin_permutations(in, spin_maps[group[0]]);
+
+        // the labels fixed by the maps are not searched over; each map gives them their spins
+        std::vector<std::string> fixed_labels;
+        for (const auto & item : spin_maps[group[0]]) fixed_labels.push_back(item.first);
+        std::sort(fixed_labels.begin(), fixed_labels.end());
+
+        std::vector<std::vector<char> > fixed_spins;
+        for (size_t m : group) {
+            std::vector<char> choice;
+            for (const std::string & label : fixed_labels) choice.push_back(spin_maps[m].at(label)[0]);
+            fixed_spins.push_back(choice);
+        }
+
+        std::vector<std::vector< std::shared_ptr<pq_string> > > lists(group.size());
+        for (std::shared_ptr<pq_string> & pq_str : tmp) {
+
+            if ( pq_str->skip ) continue;
+
+            // the same string with no spins at all
+            std::shared_ptr<pq_string> unlabeled = std::make_shared<pq_string>(*pq_str);
+            unlabeled->non_summed_spin_labels.clear();
+            unlabeled->reset_spin_labels();
+
+            enumerate_spins(unlabeled, [&](const std::vector<std::string> &labels, const std::vector<char> &spins) {
+
+                for (size_t g = 0; g < group.size(); g++) {
+                    const std::unordered_map<std::string, std::string> & spin_map = spin_maps[group[g]];
+                    bool matches = true;
+                    for (size_t k = 0; k < labels.size(); k++) {
+                        auto it = spin_map.find(labels[k]);
+                        if ( it != spin_map.end() && it->second[0] != spins[k] ) {
+                            matches = false;
+                            break;
+                        }
+                    }
+                    if ( !matches ) continue;
+
+                    // one sweep over the labels: enumerated spins first, then those of the map
+                    auto spin_of = [&](const std::string & label) -> std::string {
+                        auto it = std::find(labels.begin(), labels.end(), label);
+                        if ( it != labels.end() ) return spins[it - labels.begin()] == 'a' ? "a" : "b";
+                        auto fixed = spin_map.find(label);
+                        return fixed == spin_map.end() ? "" : fixed->second;
+                    };
+
+                    std::shared_ptr<pq_string> newguy = std::make_shared<pq_string>(*unlabeled);
+                    for (auto & amps_pair : newguy->amps) {
+                        for (amplitudes & amp : amps_pair.second) {
+                            for (size_t k = 0; k < amp.labels.size(); k++) amp.spin_labels[k] = spin_of(amp.labels[k]);
+                        }
+                    }
+                    for (auto & ints_pair : newguy->ints) {
+                        for (integrals & integral : ints_pair.second) {
+                            for (size_t k = 0; k < integral.labels.size(); k++) integral.spin_labels[k] = spin_of(integral.labels[k]);
+                        }
+                    }
+                    for (delta_functions & delta : newguy->deltas) {
+                        for (size_t k = 0; k < delta.labels.size(); k++) delta.spin_labels[k] = spin_of(delta.labels[k]);
+                    }
+
+                    newguy->non_summed_spin_labels = pq_str->non_summed_spin_labels;
+                    for (const auto & item : spin_map) {
+                        newguy->non_summed_spin_labels[item.first] = item.second;
+                    }
+                    lists[g].push_back(newguy);
+                }
+            }, fixed_labels, fixed_spins);
+        }
+
+        for (size_t g = 0; g < group.size(); g++) {
+            standardize_spin_blocks(in, lists[g], spin_blocked[group[g]]);
+        }
+    }
+}
+
+// spins of a one- or two-body tensor -> the ways its creators (first half of the labels) pair
+// with annihilators (second half) of the same spin. 0 pairs them in order and 1 swaps the last
+// two annihilators, which changes the sign
+static std::vector<int> closed_shell_pairings(const std::vector<std::string> & spins) {
+
+    std::vector<int> pairings;
+    if ( spins.size() == 2 ) {
+        if ( spins[0] == spins[1] ) pairings.push_back(0);
+    }else if ( spins.size() == 4 ) {
+        if ( spins[0] == spins[2] && spins[1] == spins[3] ) pairings.push_back(0);
+        if ( spins[0] == spins[3] && spins[1] == spins[2] ) pairings.push_back(1);
+    }
+    return pairings;
+}
+
+// key that is the same for spatial strings that differ only by the names of summed labels or by
+// swapping both pairs of labels in two-body tensors, X(p,q,r,s) = X(q,p,s,r)
+static std::string closed_shell_key(const pq_string & in) {
+
+    // summed labels appear twice, non-summed labels once
+    std::map<std::string, int> count;
+    for (const auto &amps_pair : in.amps) {
+        for (const amplitudes & amp : amps_pair.second) {
+            for (const std::string & label : amp.labels) count[label]++;
+        }
+    }
+    for (const auto &ints_pair : in.ints) {
+        for (const integrals & integral : ints_pair.second) {
+            for (const std::string & label : integral.labels) count[label]++;
+        }
+    }
+    for (const delta_functions & delta : in.deltas) {
+        for (const std::string & label : delta.labels) count[label]++;
+    }
+    std::vector<std::string> occ, vir;
+    for (const auto & item : count) {
+        if ( item.second != 2 ) continue;
+        if ( is_occ(item.first) ) occ.push_back(item.first);
+        else vir.push_back(item.first);
+    }
+
+    // factors that do not depend on the names of summed labels
+    std::string fixed;
+    for (const auto * labels : {&in.permutations, &in.paired_permutations_2, &in.paired_permutations_3, &in.paired_permutations_6}) {
+        for (const std::string & label : *labels) fixed += label + " ";
+        fixed += "| ";
+    }
+    for (bool is_bdag : in.is_boson_dagger) fixed += is_bdag ? "B* " : "B ";
+    if ( in.has_w0 ) fixed += "w0 ";
+
+    auto canonical = [](tensor & t, const std::unordered_map<std::string, std::string> & relabel) {
+        for (std::string & label : t.labels) {
+            auto it = relabel.find(label);
+            if ( it != relabel.end() ) label = it->second;
+        }
+        if ( t.labels.size() == 4 ) {
+            std::vector<std::string> swapped {t.labels[1], t.labels[0], t.labels[3], t.labels[2]};
+            if ( swapped < t.labels ) t.labels = swapped;
+        }
+    };
+
+    // smallest key over all renamings of the summed labels (within each space)
+    std::string best;
+    std::vector<std::string> occ_names = occ, vir_names = vir;
+    do {
+        do {
+            std::unordered_map<std::string, std::string> relabel;
+            for (size_t i = 0; i < occ.size(); i++) relabel[occ[i]] = occ_names[i];
+            for (size_t i = 0; i < vir.size(); i++) relabel[vir[i]] = vir_names[i];
+
+            std::vector<std::string> factors;
+            for (const auto &amps_pair : in.amps) {
+                for (amplitudes amp : amps_pair.second) {
+                    canonical(amp, relabel);
+                    factors.push_back(amp.to_string_with_spin(amps_pair.first));
+                }
+            }
+            for (const auto &ints_pair : in.ints) {
+                for (integrals integral : ints_pair.second) {
+                    canonical(integral, relabel);
+                    factors.push_back(integral.to_string_with_spin(ints_pair.first));
+                }
+            }
+            for (delta_functions delta : in.deltas) {
+                canonical(delta, relabel);
+                factors.push_back(delta.to_string_with_spin());
+            }
+            std::sort(factors.begin(), factors.end());
+
+            std::string key = fixed;
+            for (const std::string & factor : factors) key += factor + " ";
+            if ( best.empty() || key < best ) best = key;
+
+        } while ( std::next_permutation(vir_names.begin(), vir_names.end()) );
+    } while ( std::next_permutation(occ_names.begin(), occ_names.end()) );
+
+    return best;
+}
+
+// rewrite spin-blocked strings in terms of the spatial orbitals of a closed-shell reference, for
+// which alpha and beta orbitals are the same. each spin block of a tensor is a sum over the
+// spin-conserving ways to pair its creators and annihilators:
+//
+//     X_aa(p,q) = X_bb(p,q) = X(p,q)
+//     X_abab(p,q,r,s) = X(p,q,r,s)
+//     X_aaaa(p,q,r,s) = X_bbbb(p,q,r,s) = X(p,q,r,s) - X(p,q,s,r)
+//
+// where X is the spatial tensor (the abab block of two-body amplitudes, or the coulomb integrals
+// <pq|rs> for eri). strings that become the same are then combined, which sums over the spins
+// of the summed labels.
+void spin_adapt_closed_shell(std::vector<std::shared_ptr<pq_string> > &spin_blocked) {
+
+    std::vector<std::shared_ptr<pq_string> > adapted;
+    std::unordered_map<std::string, size_t> string_map;
+
+    for (const std::shared_ptr<pq_string> & in : spin_blocked) {
+
+        if ( in->skip ) continue;
+
+        std::vector<std::shared_ptr<pq_string> > list { std::make_shared<pq_string>(*in) };
+
+        // replace one tensor in every string of list by its spatial form(s)
+        auto expand = [&list](const std::function<tensor & (pq_string &)> & get) {
+            std::vector<std::shared_ptr<pq_string> > expanded;
+            for (const std::shared_ptr<pq_string> & pq_str : list) {
+                tensor & t = get(*pq_str);
+                std::vector<int> pairings = closed_shell_pairings(t.spin_labels);
+                for (int pairing : pairings) {
+                    std::shared_ptr<pq_string> newguy = pairing == pairings.back() ? pq_str : std::make_shared<pq_string>(*pq_str);
+                    tensor & new_t = get(*newguy);
+                    if ( pairing == 1 ) {
+                        std::swap(new_t.labels[2], new_t.labels[3]);
+                        newguy->sign *= -1;
+                    }
+                    new_t.spin_labels.clear();
+                    expanded.push_back(newguy);
+                }
+            }
+            list = expanded;
+        };
+
+        for (auto &amps_pair : in->amps) {
+            char type = amps_pair.first;
+            for (size_t k = 0; k < amps_pair.second.size(); k++) {
+                const amplitudes & amp = amps_pair.second[k];
+                if ( amp.n_create != amp.n_annihilate || amp.n_create > 2 ) {
+                    printf("\n");
+                    printf("    error: closed-shell spin adaptation only works for one- and two-body amplitudes that conserve particle number\n");
+                    printf("\n");
+                    exit(1);
+                }
+                if ( amp.n_create == 0 ) {
+                    for (std::shared_ptr<pq_string> & pq_str : list) pq_str->amps[type][k].spin_labels.clear();
+                    continue;
+                }
+                expand([type, k](pq_string & pq_str) -> tensor & { return pq_str.amps[type][k]; });
+            }
+        }
+
+        for (auto &ints_pair : in->ints) {
+            const std::string & type = ints_pair.first;
+            if ( type == "two_body" || type == "occ_repulsion" ) {
+                printf("\n");
+                printf("    error: closed-shell spin adaptation does not work for integrals of type %s\n", type.c_str());
+                printf("\n");
+                exit(1);
+            }
+            for (size_t k = 0; k < ints_pair.second.size(); k++) {
+                expand([type, k](pq_string & pq_str) -> tensor & { return pq_str.ints[type][k]; });
+            }
+        }
+
+        for (size_t k = 0; k < in->deltas.size(); k++) {
+            expand([k](pq_string & pq_str) -> tensor & { return pq_str.deltas[k]; });
+        }
+
+        for (std::shared_ptr<pq_string> & pq_str : list) {
+
+            // antisymmetrized integrals become coulomb integrals
+            auto eri = pq_str->ints.find("eri");
+            if ( eri != pq_str->ints.end() ) {
+                std::vector<integrals> & spatial = pq_str->ints["spatial_eri"];
+                spatial.insert(spatial.end(), eri->second.begin(), eri->second.end());
+                pq_str->ints.erase("eri");
+            }
+
+            // combine strings that are the same up to the names of summed labels
+            std::string key = closed_shell_key(*pq_str);
+
+            auto it = string_map.find(key);
+            if ( it == string_map.end() ) {
+                string_map[key] = adapted.size();
+                adapted.push_back(pq_str);
+                continue;
+            }
+            std::shared_ptr<pq_string> & existing = adapted[it->second];
+            double combined_factor = existing->factor * existing->sign + pq_str->factor * pq_str->sign;
+            existing->factor = fabs(combined_factor);
+            existing->sign = combined_factor < 0.0 ? -1 : 1;
+        }
+    }
+
+    spin_blocked.clear();
+    for (std::shared_ptr<pq_string> & pq_str : adapted) {
+        if ( fabs(pq_str->factor) < 1e-12 ) continue;
+        spin_blocked.push_back(pq_str);
+    }
+}
+
 } // End namespaces
@@ -32,18 +32,49 @@
 #include<cstring>
 #include<cmath>
 #include<sstream>
+#include<functional>
+#include<map>
+#include<unordered_map>
 
 #include "pq_tensor.h"
 #include "pq_string.h"
 
 namespace pdaggerq {
 
-/// add spin labels to a string
-bool add_spins(const std::shared_ptr<pq_string>& in, std::vector<std::shared_ptr<pq_string> > &list);
+/// called with the unlabeled labels of a string and one spin ('a' or 'b') for each
+typedef std::function<void(const std::vector<std::string> &, const std::vector<char> &)> spin_assignment_callback;
+
+/// call found with every spin-conserving assignment of spins to the unlabeled labels of a string.
+/// the labels in fixed_labels (if they occur in the tensors) are not searched over but take their
+/// spins from each entry of fixed_spins in turn
+void enumerate_spins(const std::shared_ptr<pq_string>& in, const spin_assignment_callback &found,
+                     const std::vector<std::string> &fixed_labels = {}, const std::vector<std::vector<char> > &fixed_spins = {});
+
+/// copy a string and give its unlabeled labels the spins of one assignment
+std::shared_ptr<pq_string> copy_with_spins(const std::shared_ptr<pq_string>& in, const std::vector<std::string> &labels, const std::vector<char> &spins);
+
+/// add spin labels to a string: append every spin-conserving assignment of its unlabeled labels to list
+void add_spins(const std::shared_ptr<pq_string>& in, std::vector<std::shared_ptr<pq_string> > &list);
+
+/// stop if the spin map is missing any of the non-summed labels of a string or has an invalid spin
+void check_spin_map(const std::shared_ptr<pq_string>& in, const std::unordered_map<std::string, std::string> &spin_map);
+
+/// copy a string, set its non-summed spins, and expand permutations that mix labels of different spin
+std::vector<std::shared_ptr<pq_string> > expand_spin_permutations(const std::shared_ptr<pq_string>& in, const std::unordered_map<std::string, std::string> &spin_map);
+
+/// drop spin-blocked strings with mismatched delta functions, standardize the spin order of the rest, and keep them
+void standardize_spin_blocks(const std::shared_ptr<pq_string>& in, std::vector<std::shared_ptr<pq_string> > &tmp, std::vector<std::shared_ptr<pq_string> > &spin_blocked);
 
 /// expand sums to include spin and zero terms where appropriate
 void spin_blocking(const std::shared_ptr<pq_string>& in, std::vector<std::shared_ptr<pq_string> > &spin_blocked, const std::unordered_map<std::string, std::string> &spin_map);
 
+/// spin_blocking for several spin maps, with the blocked strings for each map in its own list.
+/// each string is expanded and has its spins enumerated once, not once per map
+void spin_blocking_all(const std::shared_ptr<pq_string>& in, std::vector<std::vector<std::shared_ptr<pq_string> > > &spin_blocked, const std::vector<std::unordered_map<std::string, std::string> > &spin_maps);
+
+/// rewrite spin-blocked strings in terms of the spatial orbitals of a closed-shell reference and combine like terms
+void spin_adapt_closed_shell(std::vector<std::shared_ptr<pq_string> > &spin_blocked);
+
 /// reorder three spin labels as aab or abb
 void reorder_three_spins(amplitudes & amps, int i1, int i2, int i3, int & sign);
 
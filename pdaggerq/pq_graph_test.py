@@ -0,0 +1,283 @@
+#
+# pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
+# Copyright (C) 2020 A. Eugene DePrince III
+#
+# This file is part of the pdaggerq package.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+import re
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+import pdaggerq
+
+
+def ccsd_graph(options):
+    graph = pdaggerq.pq_graph(options)
+    for name, proj in [('singles_resid', [['e1(i,a)']]), ('doubles_resid', [['e2(i,j,b,a)']])]:
+        pq = pdaggerq.pq_helper('fermi')
+        pq.set_print_level(0)
+        pq.set_left_operators(proj)
+        pq.add_st_operator(1.0, ['f'], ['t1', 't2'])
+        pq.add_st_operator(1.0, ['v'], ['t1', 't2'])
+        pq.simplify()
+        graph.add(pq, name, ['a', 'b', 'i', 'j'])
+    return graph
+
+
+def test_save_load(tmp_path):
+    checkpoint = str(tmp_path / "ccsd.graph")
+    graph = ccsd_graph({'print_level': 0, 'checkpoint': checkpoint, 'checkpoint_interval': 0})
+
+    # keep the first checkpoint (written after reordering)
+    reordered = tmp_path / "reordered.graph"
+    def copy_first(pass_name, stats):
+        if (tmp_path / "ccsd.graph").exists() and not reordered.exists():
+            shutil.copy(checkpoint, reordered)
+    graph.set_stats_callback(copy_first)
+    graph.optimize()
+    code = graph.str("python")
+
+    # the final checkpoint holds the optimized equations
+    loaded = pdaggerq.pq_graph({'print_level': 0})
+    loaded.load(checkpoint)
+    assert loaded.str("python") == code
+
+    # an interrupted run picks up after its last completed pass and ends where an uninterrupted run does
+    uninterrupted = ccsd_graph({'print_level': 0})
+    uninterrupted.optimize()
+
+    resumed = pdaggerq.pq_graph({'print_level': 0})
+    resumed.load(str(reordered))
+    resumed.optimize()
+    assert resumed.str("python") == uninterrupted.str("python")
+
+
+def test_stats():
+    graph = ccsd_graph({'print_level': 0})
+    passes = []
+    graph.set_stats_callback(lambda pass_name, stats: passes.append((pass_name, stats['terms'])))
+    graph.optimize()
+    graph.set_stats_callback(None)
+    stats = graph.stats()
+
+    # one report per pass, the last one for the whole optimization
+    names = [name for name, _ in passes]
+    assert names[0] == 'reorder' and names[-1] == 'optimize' and names.count('optimize') == 1
+    for name in ['reorder', 'merge', 'fusion', 'prune']:
+        assert names.count(name) == stats['calls'][name] > 0
+    assert passes[-1][1] == stats['terms']
+
+    assert stats['calls']['build'] == 2  # one per equation added
+    assert all(time >= 0.0 for time in stats['time'].values()) and stats['time']['total'] > 0.0
+    # some of the substituted intermediates are fused or pruned again
+    assert stats['substitutions'] >= sum(stats['temps'].values()) > 0
+    assert stats['candidates_evaluated'] >= stats['substitutions']
+    assert stats['contractions'] > 0
+
+
+def test_merge_terms():
+    def comments(merge):
+        # the spin-blocked ccsd doubles hold terms that differ only by the names of their summed indices
+        pdaggerq.pq_helper('fermi').clear()
+        pq = pdaggerq.pq_helper('fermi')
+        pq.set_print_level(0)
+        pq.set_left_operators([['e2(i,j,b,a)']])
+        pq.add_st_operator(1.0, ['f'], ['t1', 't2'])
+        pq.add_st_operator(1.0, ['v'], ['t1', 't2'])
+        pq.simplify()
+        pq.block_by_spin({'i': 'a', 'j': 'b', 'a': 'a', 'b': 'b'})
+
+        graph = pdaggerq.pq_graph({'print_level': 0, 'opt_level': 5})
+        graph.add(pq, 'r', ['a', 'b', 'i', 'j'])
+        graph.reorder()
+        if merge:
+            graph.merge()
+        code = graph.str("python")
+        pdaggerq.pq_helper('fermi').clear()
+
+        # the source of every printed term, followed by the sources of the terms merged into it
+        lines = [line.strip() for line in code.splitlines() if re.match(r'\s*# r |\s*#   \+=', line)]
+        return [line.split('=', 1)[1].strip() if line.startswith('# r') else line[1:].strip() for line in lines], \
+            graph.stats()
+
+    def relabeled(term):
+        # number the summed indices in order of appearance
+        names = {}
+        return re.sub(r'\b[c-hk-z]\b', lambda label: names.setdefault(label.group(0), str(len(names))), term)
+
+    terms, _ = comments(False)
+    merged, stats = comments(True)
+    assert len(terms) == 101
+    assert stats['terms'] == 86 and stats['terms_merged'] == 15
+
+    # every term is merged into the first one that is equal up to relabeling, and the terms keep that order
+    classes = {}
+    for term in terms:
+        classes.setdefault(relabeled(term), []).append(term)
+    expected = []
+    for first, *others in classes.values():
+        expected += [first] + ['+= ' + term for term in others]
+    assert merged == expected
+
+
+def test_clone_is_independent():
+    graph = ccsd_graph({'print_level': 0})
+    code = graph.str("python")
+
+    # the clone shares the vertices of graph, so optimizing it must leave graph unchanged
+    copy = graph.clone()
+    copy.optimize()
+
+    assert graph.str("python") == code
+    assert copy.str("python") != code
+
+
+def test_order_cache(tmp_path):
+    cache = str(tmp_path / "orders.cache")
+
+    # ties between equally good orders are broken by name, which follows the print type
+    first = ccsd_graph({'print_level': 0, 'cache': cache})
+    first.str("python")
+    first.optimize()
+    code = first.str("python")
+    misses = first.stats()['order_cache']['misses']
+
+    # drop the orders in memory; a later run reads every order from the file
+    pdaggerq.pq_graph({'print_level': 0, 'cache_size': 0})
+    second = ccsd_graph({'print_level': 0, 'cache_size': 100000, 'cache': cache})
+    second.optimize()
+    assert second.stats()['order_cache']['misses'] == misses
+    assert second.str("python") == code
+
+    pdaggerq.pq_graph({'print_level': 0, 'cache': ''})
+
+
+def test_batch_density():
+    batched = ccsd_graph({'print_level': 0, 'density_fitting': True, 'batch_density': True})
+    batched.optimize()
+    batched_code = batched.str("python")
+
+    # the option belongs to the graph it was given to
+    unbatched = ccsd_graph({'print_level': 0, 'density_fitting': True})
+    unbatched.optimize()
+    unbatched_code = unbatched.str("python")
+    assert 'q_batch_' in batched_code and 'q_batch_' not in unbatched_code
+    assert batched.str("python") == batched_code
+
+    no, nv, naux = 3, 4, 7
+    rng = np.random.default_rng(3)
+    def random_tensor(spaces):
+        return rng.standard_normal(tuple({'o': no, 'v': nv, 'Q': naux}[space] for space in spaces))
+    inputs = {'t1': random_tensor('vo'), 't2': random_tensor('vvoo'),
+              'f': {block: random_tensor(block) for block in sorted(set(re.findall(r'f\["(\w+)"\]', batched_code)))},
+              'B': {block: random_tensor(block) for block in sorted(set(re.findall(r'B\["(\w+)"\]', batched_code)))}}
+
+    def evaluate(code, q_batch):
+        scope = {'np': np, 'einsum': np.einsum, 'tmps_': {}, 'scalars_': {}, 'reused_': {}, 'q_batch_': q_batch,
+                 **inputs}
+        exec("def evaluate_equations():\n" + code + "\n    return locals()\n", scope)
+        residuals = scope['evaluate_equations']()
+        return [residuals['singles_resid'], residuals['doubles_resid']]
+
+    # batches that do and do not divide the auxiliary dimension, and one batch for all of it
+    reference = evaluate(unbatched_code, None)
+    for q_batch in [1, 2, naux + 1]:
+        for residual, expected in zip(evaluate(batched_code, q_batch), reference):
+            assert np.allclose(residual, expected)
+
+
+def test_native_runtime_is_scoped():
+    graph = ccsd_graph({'print_level': 0})
+    graph.optimize()
+    cpp_code = graph.str("c++")
+
+    # the native output only changes the print that asked for it
+    native_code = graph.str("native")
+    assert 'pq_runtime.hpp' in native_code and 'pq_runtime.hpp' not in cpp_code
+    assert graph.str("c++") == cpp_code
+
+
+def test_native_runtime(tmp_path):
+    compiler = shutil.which("g++") or shutil.which("c++")
+    if compiler is None:
+        pytest.skip("no C++ compiler")
+
+    graph = ccsd_graph({'print_level': 0})
+    graph.optimize()
+    python_code = graph.str("python")
+    native_code = graph.str("native")
+
+    # random inputs; the residuals only have to agree between the two outputs
+    no, nv = 3, 4
+    rng = np.random.default_rng(7)
+    def random_tensor(spaces):
+        return rng.standard_normal(tuple(no if space == 'o' else nv for space in spaces))
+    inputs = {'t1': random_tensor('vo'), 't2': random_tensor('vvoo'),
+              'f': {block: random_tensor(block) for block in sorted(set(re.findall(r'f\["(\w+)"\]', python_code)))},
+              'eri': {block: random_tensor(block) for block in sorted(set(re.findall(r'eri\["(\w+)"\]', python_code)))}}
+
+    # the python output is the indented body of a function
+    scope = {'np': np, 'einsum': np.einsum, 'tmps_': {}, 'scalars_': {}, 'reused_': {}, **inputs}
+    exec("def evaluate_equations():\n" + python_code + "\n    return locals()\n", scope)
+    residuals = scope['evaluate_equations']()
+
+    # driver: read the inputs, call the generated function, and write the residuals
+    driver = ['#include <fstream>',
+              'Tensor read(const char *file, std::vector<size_t> shape) {',
+              '    Tensor tensor(shape);',
+              '    std::ifstream(file, std::ios::binary).read((char *) tensor.data(), tensor.size() * sizeof(double));',
+              '    return tensor;',
+              '}',
+              'void write(const char *file, const Tensor &tensor) {',
+              '    std::ofstream(file, std::ios::binary).write((const char *) tensor.data(), tensor.size() * sizeof(double));',
+              '}',
+              'int main() {',
+              '    tensor_map f, eri;',
+              '    Tensor singles_resid, doubles_resid;']
+    def add_input(name, array):
+        path = str(tmp_path / (name.replace('"', '').replace('[', '_').replace(']', '') + '.bin'))
+        array.tofile(path)
+        driver.append(f'    {name} = read("{path}", {{{", ".join(map(str, array.shape))}}});')
+    driver.append('    Tensor t1, t2;')
+    add_input('t1', inputs['t1'])
+    add_input('t2', inputs['t2'])
+    for base in ['f', 'eri']:
+        for block, array in inputs[base].items():
+            add_input(f'{base}["{block}"]', array)
+    arguments = re.search(r'void evaluate_equations\((.*)\) \{', native_code).group(1)
+    driver.append('    evaluate_equations(' + ', '.join(arg.split('&')[-1] for arg in arguments.split(', ')) + ');')
+    for name in ['singles_resid', 'doubles_resid']:
+        driver.append(f'    write("{tmp_path / (name + ".bin")}", {name});')
+    driver.append('}')
+
+    source = tmp_path / "ccsd.cc"
+    source.write_text(native_code + "\n".join(driver) + "\n")
+    runtime = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'pq_graph', 'runtime')
+    binary = str(tmp_path / "ccsd")
+    build = [compiler, '-std=c++17', '-O2', '-I', runtime, str(source), '-o', binary]
+
+    # use CBLAS if it links; otherwise the runtime's own loops
+    if subprocess.run(build + ['-lopenblas'], capture_output=True).returncode != 0:
+        result = subprocess.run(build + ['-DPQ_RUNTIME_NO_BLAS'], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+    subprocess.run([binary], check=True)
+
+    for name in ['singles_resid', 'doubles_resid']:
+        native = np.fromfile(str(tmp_path / (name + ".bin"))).reshape(residuals[name].shape)
+        assert np.allclose(native, residuals[name])
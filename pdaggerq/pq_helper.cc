@@ -48,6 +48,25 @@ namespace pdaggerq {
 
 std::vector<int> empty_list = {};
 
+// timings and counters of a pq_helper as a python dictionary
+py::dict stats_to_dict(const pq_helper & pq) {
+    const pq_helper_stats & stats = pq.get_stats();
+
+    py::dict time, calls;
+    for (const auto & [phase, timer] : stats.timers) {
+        time[phase.c_str()]  = (double)timer.get_runtime();
+        calls[phase.c_str()] = timer.count();
+    }
+
+    return py::dict("time"_a = time,
+                    "calls"_a = calls,
+                    "strings_created"_a = stats.strings_created,
+                    "rearrangement_steps"_a = stats.rearrangement_steps,
+                    "terms_cancelled"_a = stats.terms_cancelled,
+                    "peak_terms"_a = stats.peak_terms,
+                    "terms"_a = pq.get_ordered_strings(false).size());
+}
+
 void export_pq_helper(py::module& m) {
     py::class_<pdaggerq::pq_helper, std::shared_ptr<pdaggerq::pq_helper> >(m, "pq_helper")
         .def(py::init< std::string >())
@@ -60,11 +79,24 @@ void export_pq_helper(py::module& m) {
         .def("get_right_operators_type", &pq_helper::get_right_operators_type)
         .def("get_left_operators_type", &pq_helper::get_left_operators_type)
         .def("set_find_paired_permutations", &pq_helper::set_find_paired_permutations)
+        .def("set_closed_shell", &pq_helper::set_closed_shell)
         .def("simplify", &pq_helper::simplify)
         .def("clear", &pq_helper::clear)
         .def("clone", &pq_helper::clone)
         .def("save", &pq_helper::serialize)
         .def("load", &pq_helper::deserialize)
+        .def("stats", [](const pq_helper& self) { return stats_to_dict(self); })
+        .def("set_stats_callback",
+            [](pq_helper& self, const py::object & callback) {
+                if ( callback.is_none() ) {
+                    self.set_stats_callback(nullptr);
+                    return;
+                }
+                self.set_stats_callback([callback](const std::string & phase, const pq_helper & pq) {
+                    callback(phase, stats_to_dict(pq));
+                });
+            },
+            py::arg("callback") = py::none() )
         .def("set_use_rdms",
             [](pq_helper& self, const bool & do_use_rdms, const std::vector<int> & ignore_cumulant) {
                 return self.set_use_rdms(do_use_rdms, ignore_cumulant);
@@ -108,6 +140,11 @@ void export_pq_helper(py::module& m) {
                 self.block_by_spin(spin_labels);
             },
             py::arg("spin_labels") = std::unordered_map<std::string, std::string>() )
+        .def("block_by_spin_all",
+            [](pq_helper& self, const std::vector<std::unordered_map<std::string, std::string> > &spin_labels) {
+                return self.block_by_spin_all(spin_labels);
+            },
+            py::arg("spin_labels") )
         .def("block_by_range",
             [](pq_helper& self, const std::unordered_map<std::string, std::vector<std::string> > &label_ranges) {
                 self.block_by_range(label_ranges);
@@ -173,6 +210,9 @@ pq_helper::pq_helper(const std::string &vacuum_type)
     // by default, do not look for paired permutations (until parsers catch up)
     find_paired_permutations = false;
 
+    // spin blocking does not assume a closed-shell reference by default
+    closed_shell = false;
+
     /// right operators type (EE, IP, EA)
     right_operators_type = "EE";
 
@@ -193,18 +233,21 @@ pq_helper::pq_helper(const pq_helper &other) {
     this->right_operators_type      = other.right_operators_type;
     this->left_operators_type       = other.left_operators_type;
     this->find_paired_permutations  = other.find_paired_permutations;
+    this->closed_shell              = other.closed_shell;
+    this->is_unitary_cc             = other.is_unitary_cc;
 
-    // deep copy pointers to pq_strings
-    ordered.clear();
-    ordered.reserve(other.ordered.size());
-    for (const std::shared_ptr<pq_string> & pq_str : other.ordered) {
-        this->ordered.push_back(std::make_shared<pq_string>(*pq_str));
-    }
+    // share pq_strings with other; they are copied when either pq_helper modifies them (see detach_strings)
+    this->ordered                   = other.ordered;
+    this->ordered_blocked           = other.ordered_blocked;
+}
 
-    ordered_blocked.clear();
-    ordered_blocked.reserve(other.ordered_blocked.size());
-    for (const std::shared_ptr<pq_string> & pq_str : other.ordered_blocked) {
-        this->ordered_blocked.push_back(std::make_shared<pq_string>(*pq_str));
+void pq_helper::detach_strings() {
+    for (auto * strings : {&ordered, &ordered_blocked}) {
+        for (std::shared_ptr<pq_string> & pq_str : *strings) {
+            if ( pq_str.use_count() > 1 ) {
+                pq_str = std::make_shared<pq_string>(*pq_str);
+            }
+        }
     }
 }
 
@@ -225,6 +268,10 @@ void pq_helper::set_find_paired_permutations(bool do_find_paired_permutations) {
     find_paired_permutations = do_find_paired_permutations;
 }
 
+void pq_helper::set_closed_shell(bool is_closed_shell) {
+    closed_shell = is_closed_shell;
+}
+
 void pq_helper::set_print_level(int level) {
     print_level = level;
 }
@@ -281,19 +328,26 @@ void pq_helper::add_anticommutator(double factor,
                                const std::vector<std::string> &op0,
                                const std::vector<std::string> &op1){
 
+    add_phase phase(*this);
+
     add_operator_product(factor, concatinate_operators({op0, op1}) );
     add_operator_product(factor, concatinate_operators({op1, op0}) );
 
+    phase.finish();
 }
 
 void pq_helper::add_commutator(double factor,
                                const std::vector<std::string> &op0,
                                const std::vector<std::string> &op1){
 
+    add_phase phase(*this);
+
     std::vector<pq_operator_terms> ops = get_commutator_terms(factor, op0, op1);
     for (auto op : ops){
         add_operator_product(op.factor, op.operators);
     }
+
+    phase.finish();
 }
 
 std::vector<pq_operator_terms> pq_helper::get_commutator_terms(double factor,
@@ -313,11 +367,14 @@ void pq_helper::add_double_commutator(double factor,
                                       const std::vector<std::string> &op1,
                                       const std::vector<std::string> &op2){
 
+    add_phase phase(*this);
+
     std::vector<pq_operator_terms> ops = get_double_commutator_terms(factor, op0, op1, op2);
     for (auto op : ops){
         add_operator_product(op.factor, op.operators);
     }
 
+    phase.finish();
 }
 
 std::vector<pq_operator_terms> pq_helper::get_double_commutator_terms(double factor,
@@ -341,11 +398,14 @@ void pq_helper::add_triple_commutator(double factor,
                                         const std::vector<std::string> &op2,
                                         const std::vector<std::string> &op3){
 
+    add_phase phase(*this);
+
     std::vector<pq_operator_terms> ops = get_triple_commutator_terms(factor, op0, op1, op2, op3);
     for (auto op : ops){
         add_operator_product(op.factor, op.operators);
     }
 
+    phase.finish();
 }
 
 std::vector<pq_operator_terms> pq_helper::get_triple_commutator_terms(double factor,
@@ -375,10 +435,14 @@ void pq_helper::add_quadruple_commutator(double factor,
                                            const std::vector<std::string> &op3,
                                            const std::vector<std::string> &op4){
 
+    add_phase phase(*this);
+
     std::vector<pq_operator_terms> ops = get_quadruple_commutator_terms(factor, op0, op1, op2, op3, op4);
     for (auto op : ops){
         add_operator_product(op.factor, op.operators);
     }
+
+    phase.finish();
 }
 
 std::vector<pq_operator_terms> pq_helper::get_quadruple_commutator_terms(double factor,
@@ -413,6 +477,11 @@ std::vector<pq_operator_terms> pq_helper::get_quadruple_commutator_terms(double
 // add a string of operators
 void pq_helper::add_operator_product(double factor, std::vector<std::string>  in){
 
+    add_phase phase(*this);
+
+    // new strings can be combined with existing ones
+    detach_strings();
+
     // check if there is a fluctuation potential operator 
     // that needs to be split into multiple terms
 
@@ -501,7 +570,8 @@ void pq_helper::add_operator_product(double factor, std::vector<std::string>  in
             in.push_back(tmp_in[i]);
         }
         add_operator_product(factor, in);
-        
+
+        phase.finish();
         return;
     }
 
@@ -563,6 +633,8 @@ void pq_helper::add_operator_product(double factor, std::vector<std::string>  in
             in[count][1] = 'd';
             add_operator_product(-factor, in);
         }
+
+        phase.finish();
         return;
     }
 
@@ -1159,17 +1231,59 @@ void pq_helper::add_operator_product(double factor, std::vector<std::string>  in
                 newguy->sign *= -1;
             }
 
+            size_t n_strings = ordered.size();
             if (vacuum == "TRUE") {
-                add_new_string_true_vacuum(newguy, ordered, print_level, find_paired_permutations);
+                stats.rearrangement_steps += add_new_string_true_vacuum(newguy, ordered, print_level, find_paired_permutations);
             } else {
-                add_new_string_fermi_vacuum(newguy, ordered, print_level, find_paired_permutations, occ_label_count, vir_label_count);
+                stats.rearrangement_steps += add_new_string_fermi_vacuum(newguy, ordered, print_level, find_paired_permutations, occ_label_count, vir_label_count);
+            }
+            if ( ordered.size() > n_strings ) {
+                stats.strings_created += ordered.size() - n_strings;
             }
         }
     }
+
+    phase.finish();
+}
+
+pq_helper::add_phase::add_phase(pq_helper & pq) : pq(pq) {
+    if ( pq.add_depth++ == 0 ) {
+        pq.stats.timers["add"].start();
+    }
+}
+
+pq_helper::add_phase::~add_phase() {
+    // finish() has already stopped the timer unless the call left early
+    Timer & timer = pq.stats.timers["add"];
+    if ( --pq.add_depth == 0 && timer.running() ) {
+        timer.stop();
+    }
+}
+
+void pq_helper::add_phase::finish() {
+    if ( pq.add_depth == 1 ) {
+        pq.stats.timers["add"].stop();
+        pq.finish_phase("add");
+    }
+}
+
+void pq_helper::finish_phase(const std::string & phase) {
+
+    stats.peak_terms = std::max(stats.peak_terms, ordered.size());
+    stats.peak_terms = std::max(stats.peak_terms, ordered_blocked.size());
+
+    if ( stats_callback ) {
+        stats_callback(phase, *this);
+    }
 }
 
 void pq_helper::simplify() {
 
+    Timer & timer = stats.timers["simplify"];
+    timer.start();
+
+    detach_strings();
+
     // eliminate strings based on delta functions and use delta functions to alter integral / amplitude labels
     for (std::shared_ptr<pq_string> & pq_str : ordered) {
 
@@ -1233,12 +1347,31 @@ void pq_helper::simplify() {
     cumulant_expansion(ordered, ignore_cumulant_rdms);
 
     // try to cancel similar terms
+    auto count_strings = [this]() {
+        return std::count_if(ordered.begin(), ordered.end(), [](const std::shared_ptr<pq_string> & pq_str) {
+            return !pq_str->skip;
+        });
+    };
+    size_t n_strings = count_strings();
+    stats.peak_terms = std::max(stats.peak_terms, ordered.size());
+
     cleanup(ordered, find_paired_permutations);
 
+    size_t n_remaining = count_strings();
+    if ( n_strings > n_remaining ) {
+        stats.terms_cancelled += n_strings - n_remaining;
+    }
+
+    timer.stop();
+    finish_phase("simplify");
 }
 
 // block labels by orbital spaces
 void pq_helper::block_by_range(const std::unordered_map<std::string, std::vector<std::string>> &label_ranges) {
+    Timer & timer = stats.timers["block_by_range"];
+    timer.start();
+
+    detach_strings();
     ordered_blocked.clear();
 
     // add ranges to labels
@@ -1261,10 +1394,17 @@ void pq_helper::block_by_range(const std::unordered_map<std::string, std::vector
             ordered_blocked.push_back(op);
         }
     }
+
+    timer.stop();
+    finish_phase("block_by_range");
 }
 
 // block labels by spin
 void pq_helper::block_by_spin(const std::unordered_map<std::string, std::string> &spin_labels) {
+    Timer & timer = stats.timers["block_by_spin"];
+    timer.start();
+
+    detach_strings();
     ordered_blocked.clear();
 
     // perform spin tracing
@@ -1285,6 +1425,61 @@ void pq_helper::block_by_spin(const std::unordered_map<std::string, std::string>
             ordered_blocked.push_back(tmp_pq_str);
         }
     }
+
+    if ( closed_shell ) {
+        spin_adapt_closed_shell(ordered_blocked);
+    }
+
+    timer.stop();
+    finish_phase("block_by_spin");
+}
+
+// block labels by spin for several spin cases
+std::vector<pq_helper> pq_helper::block_by_spin_all(const std::vector<std::unordered_map<std::string, std::string> > &spin_labels) {
+    Timer & timer = stats.timers["block_by_spin"];
+    timer.start();
+
+    detach_strings();
+
+    // perform spin tracing
+    pq_string::is_spin_blocked = true;
+    if ( pq_string::is_range_blocked ) {
+        printf("\n");
+        printf("    error: cannot simultaneously block by spin and by range\n");
+        printf("\n");
+        exit(1);
+    }
+
+    std::vector<pq_helper> cases;
+    cases.reserve(spin_labels.size());
+    for (size_t i = 0; i < spin_labels.size(); i++) {
+        cases.emplace_back(vacuum);
+        cases.back().print_level = print_level;
+        cases.back().closed_shell = closed_shell;
+    }
+
+    for (std::shared_ptr<pq_string> & pq_str : ordered) {
+        if (!pq_str->symbol.empty()) continue;
+        if (!pq_str->is_boson_dagger.empty()) continue;
+        std::vector<std::vector<std::shared_ptr<pq_string> > > tmp_ordered;
+        spin_blocking_all(pq_str, tmp_ordered, spin_labels);
+        for (size_t i = 0; i < spin_labels.size(); i++) {
+            for (const std::shared_ptr<pq_string> & tmp_pq_str : tmp_ordered[i]) {
+                cases[i].ordered_blocked.push_back(tmp_pq_str);
+            }
+        }
+    }
+
+    if ( closed_shell ) {
+        for (pq_helper & spin_case : cases) {
+            spin_adapt_closed_shell(spin_case.ordered_blocked);
+        }
+    }
+
+    timer.stop();
+    finish_phase("block_by_spin");
+
+    return cases;
 }
 
 std::vector<std::vector<std::string> > pq_helper::strings() const {
@@ -1315,11 +1510,14 @@ void pq_helper::add_st_operator(double factor, const std::vector<std::string> &t
                                                const std::vector<std::string> &ops,
                                                bool do_operators_commute = true){
 
+    add_phase phase(*this);
+
     std::vector<pq_operator_terms> st_ops = get_st_operator_terms(factor, targets, ops, do_operators_commute);
     for (auto op : st_ops){
         add_operator_product(op.factor, op.operators);
     }
 
+    phase.finish();
 }
 
 std::vector<pq_operator_terms> pq_helper::get_st_operator_terms(double factor, const std::vector<std::string> &targets,const std::vector<std::string> &ops, bool do_operators_commute = true){
@@ -24,7 +24,11 @@
 #ifndef PQ_HELPER_H
 #define PQ_HELPER_H
 
+#include <functional>
+#include <map>
+
 #include "pq_string.h"
+#include "pq_timer.h"
 
 namespace pdaggerq {
 
@@ -40,6 +44,32 @@ class pq_operator_terms {
     std::vector<std::string> operators;
 };
 
+/**
+ *
+ * timings and counters describing the work done by a pq_helper
+ *
+ */
+struct pq_helper_stats {
+
+    /// wall time of each phase ("add", "simplify", "block_by_spin", "block_by_range"). "add" covers one
+    /// public add_* call (add_st_operator, add_commutator, add_operator_product, ...), however many operator
+    /// products it expands into
+    std::map<std::string, Timer> timers;
+
+    /// number of normal-ordered strings added to the list of strings
+    size_t strings_created = 0;
+
+    /// number of rearrangement steps while bringing strings to normal order: one per string not yet in normal
+    /// order per pass, each of which swaps one pair of fermion operators, one pair of boson operators, or both
+    size_t rearrangement_steps = 0;
+
+    /// number of strings removed by cleanup (cancellation or consolidation of permutations) during simplify
+    size_t terms_cancelled = 0;
+
+    /// largest number of strings held at once
+    size_t peak_terms = 0;
+};
+
 class pq_helper {
 
   public:
@@ -91,7 +121,8 @@ class pq_helper {
 
     /**
      *
-     * clone the pq_helper object (calls copy constructor and moves the result)
+     * clone the pq_helper object (calls copy constructor and moves the result).
+     * the strings are shared with the original until either one modifies them
      *
      */
     pq_helper clone() const { return pq_helper(*this); }
@@ -198,6 +229,17 @@ class pq_helper {
      */
     void set_find_paired_permutations(bool do_find_paired_permutations);
 
+    /**
+     *
+     * set whether spin blocking assumes a closed-shell reference. if so, spin-blocked strings are
+     * rewritten in terms of spatial orbitals (t2(a,b,i,j) is the abab block, and <p,q|r,s> are
+     * coulomb integrals), so only the unique spin blocks (e.g., aa and abab) need to be evaluated
+     *
+     * @param is_closed_shell: true/false
+     *
+     */
+    void set_closed_shell(bool is_closed_shell);
+
     /**
      *
      * set print level 
@@ -410,6 +452,19 @@ class pq_helper {
      */
     void block_by_spin(const std::unordered_map<std::string, std::string> &spin_labels);
 
+    /**
+     *
+     * block strings by spin for several spin cases in one pass over the strings. each case
+     * gets exactly the strings block_by_spin would give for its map. the blocked strings of
+     * this pq_helper are left as they are
+     *
+     * @param spin_labels: one map of non-summed labels to spins per case
+     * @return one pq_helper per case holding only that case's blocked strings (no operators
+     *         or unblocked strings are copied), which can be passed directly to pq_graph.add
+     *
+     */
+    std::vector<pq_helper> block_by_spin_all(const std::vector<std::unordered_map<std::string, std::string> > &spin_labels);
+
     /**
      *
      * this function is used to block strings by label ranges
@@ -443,6 +498,25 @@ class pq_helper {
      */
     void deserialize(const std::string & filename);
 
+    /**
+     *
+     * get timings and counters for the work done by this pq_helper
+     *
+     */
+    const pq_helper_stats & get_stats() const { return stats; }
+
+    /**
+     *
+     * set a function to be called with the name of a phase and this pq_helper whenever a phase completes.
+     * the callback is called once per public call (an add_* method, simplify, or a block_by_* method)
+     *
+     * @param callback: the function to call (an empty function disables the callback)
+     *
+     */
+    void set_stats_callback(std::function<void(const std::string &, const pq_helper &)> callback) {
+        stats_callback = std::move(callback);
+    }
+
     /** 
      * 
      * is the cluster operator antihermitian for ucc?
@@ -530,6 +604,70 @@ private:
      */
     bool find_paired_permutations;
 
+    /**
+     *
+     * should spin blocking assume a closed-shell reference (and use spatial orbitals)?
+     *
+     */
+    bool closed_shell;
+
+    /**
+     *
+     * timings and counters (not copied by clone)
+     *
+     */
+    pq_helper_stats stats;
+
+    /**
+     *
+     * function called when a phase completes
+     *
+     */
+    std::function<void(const std::string &, const pq_helper &)> stats_callback;
+
+    /**
+     *
+     * update the peak term count and call the stats callback at the end of a phase
+     *
+     * @param phase: the name of the phase
+     *
+     */
+    void finish_phase(const std::string & phase);
+
+    /**
+     *
+     * number of add_* calls in progress. add_* methods call each other, so only the outermost one
+     * times and reports the "add" phase
+     *
+     */
+    int add_depth = 0;
+
+    /**
+     *
+     * scope of an add_* call: starts the "add" timer in the outermost call and stops it when that call
+     * leaves, even by an exception
+     *
+     */
+    class add_phase {
+      public:
+        explicit add_phase(pq_helper & pq);
+        ~add_phase();
+
+        /// report the "add" phase if this is the outermost add_* call
+        void finish();
+
+      private:
+        pq_helper & pq;
+    };
+
+    /**
+     *
+     * copies of a pq_helper share their strings until one of them changes them. make private
+     * copies of any shared strings before they are modified in place.
+     *
+     */
+    void detach_strings();
+
 };
 
 }
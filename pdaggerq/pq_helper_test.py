@@ -0,0 +1,164 @@
+#
+# pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
+# Copyright (C) 2020 A. Eugene DePrince III
+#
+# This file is part of the pdaggerq package.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import itertools
+
+import pdaggerq
+
+
+def ccsd_doubles():
+    pdaggerq.pq_helper("fermi").clear()
+    pq = pdaggerq.pq_helper("fermi")
+    pq.set_print_level(0)
+    pq.set_left_operators([['e2(i,j,b,a)']])
+    pq.add_st_operator(1.0, ['f'], ['t1', 't2'])
+    pq.add_st_operator(1.0, ['v'], ['t1', 't2'])
+    pq.simplify()
+    return pq
+
+
+def test_block_by_spin_all():
+    pq = ccsd_doubles()
+    spin_maps = [{'i': i, 'j': j, 'a': a, 'b': b} for i, j, a, b in ["aaaa", "abab", "bbbb", "abba"]]
+
+    expected = []
+    for spin_map in spin_maps:
+        pq.block_by_spin(spin_map)
+        expected.append(pq.strings())
+
+    spin_blocks = pq.block_by_spin_all(spin_maps)
+    assert [spin_block.strings() for spin_block in spin_blocks] == expected
+
+    # the blocks go straight into pq_graph
+    graph = pdaggerq.pq_graph({'print_level': 0, 'opt_level': 1})
+    for spins, spin_block in zip(["aaaa", "abab", "bbbb", "abba"], spin_blocks):
+        graph.add(spin_block, "rt2_" + spins)
+    assert "rt2_abab" in graph.str("python")
+
+    # spin blocking is tracked by flags shared by every pq_helper
+    pdaggerq.pq_helper("fermi").clear()
+
+
+def test_block_by_spin_all_permuted_deltas():
+    # the permutations of these terms move the fixed labels between delta functions and tensors
+    pdaggerq.pq_helper("fermi").clear()
+    pq = pdaggerq.pq_helper("fermi")
+    pq.set_print_level(0)
+    pq.set_left_operators([['l2']])
+    pq.set_right_operators([['r2']])
+    pq.add_st_operator(1.0, ['e2(i,j,a,k)'], ['t1'])
+    pq.simplify()
+    spin_maps = [{'i': i, 'j': j, 'a': a, 'k': k} for i, j, a, k in itertools.product("ab", repeat=4)]
+
+    expected = []
+    for spin_map in spin_maps:
+        pq.block_by_spin(spin_map)
+        expected.append(pq.strings())
+
+    spin_blocks = pq.block_by_spin_all(spin_maps)
+    assert [spin_block.strings() for spin_block in spin_blocks] == expected
+    baab = expected[spin_maps.index({'i': 'b', 'j': 'a', 'a': 'a', 'k': 'b'})]
+    assert len(baab) == 20
+    assert ['+0.250', 'd_bb(i,k)', 'r2_aaaa(b,c,m,l)', 't1_aa(a,j)', 'l2_aaaa(m,l,b,c)'] in baab
+
+    # the blocked strings of pq itself are left alone
+    assert pq.strings() == expected[-1]
+
+    pdaggerq.pq_helper("fermi").clear()
+
+
+def test_clone_is_independent():
+    pq = ccsd_doubles()
+    strings = pq.strings()
+
+    # the clone shares the strings of pq until one of them changes them
+    copy = pq.clone()
+    copy.add_st_operator(1.0, ['v'], ['t2'])
+    copy.simplify()
+    copy.block_by_spin({'i': 'a', 'j': 'b', 'a': 'a', 'b': 'b'})
+    pdaggerq.pq_helper("fermi").clear()
+
+    assert pq.strings() == strings
+    assert copy.strings() != strings
+
+
+def test_closed_shell_energy():
+    pdaggerq.pq_helper("fermi").clear()
+    pq = pdaggerq.pq_helper("fermi")
+    pq.set_print_level(0)
+    pq.add_st_operator(1.0, ['f'], ['t1', 't2'])
+    pq.add_st_operator(1.0, ['v'], ['t1', 't2'])
+    pq.simplify()
+
+    # the alpha and beta blocks of a closed-shell reference collapse onto spatial orbitals
+    pq.set_closed_shell(True)
+    pq.block_by_spin({})
+    strings = pq.strings()
+    pdaggerq.pq_helper("fermi").clear()
+
+    assert len(strings) == 8
+    assert ['+2.00', 'f(i,i)'] in strings
+    assert ['+2.00', '<j,i|a,b>', 't2(a,b,j,i)'] in strings
+    assert ['-1.00', '<j,i|b,a>', 't2(a,b,j,i)'] in strings
+
+
+def test_closed_shell_block_by_spin_all():
+    pq = ccsd_doubles()
+    pq.set_closed_shell(True)
+    spin_map = {'i': 'a', 'j': 'b', 'a': 'a', 'b': 'b'}
+
+    pq.block_by_spin(spin_map)
+    expected = pq.strings()
+    strings = [spin_block.strings() for spin_block in pq.block_by_spin_all([spin_map])]
+    pdaggerq.pq_helper("fermi").clear()
+
+    assert strings == [expected]
+
+
+def test_stats():
+    pdaggerq.pq_helper("fermi").clear()
+    pq = pdaggerq.pq_helper("fermi")
+    pq.set_print_level(0)
+    phases = []
+    pq.set_stats_callback(lambda phase, stats: phases.append((phase, stats['terms'])))
+
+    # one report per public call, however many operator products add_st_operator expands into
+    pq.set_left_operators([['e2(i,j,b,a)']])
+    pq.add_st_operator(1.0, ['f'], ['t1', 't2'])
+    pq.add_st_operator(1.0, ['v'], ['t1', 't2'])
+    pq.add_commutator(1.0, ['f'], ['t2'])
+    pq.simplify()
+    pq.block_by_spin({'i': 'a', 'j': 'b', 'a': 'a', 'b': 'b'})
+    pq.set_stats_callback(None)
+    pq.add_operator_product(1.0, ['f'])
+    strings = pq.strings()
+    pdaggerq.pq_helper("fermi").clear()
+
+    assert [phase for phase, _ in phases] == ['add', 'add', 'add', 'simplify', 'block_by_spin']
+    assert phases[0][1] < phases[1][1] < phases[2][1] and phases[3][1] < phases[2][1]
+
+    stats = pq.stats()
+    assert stats['calls'] == {'add': 4, 'simplify': 1, 'block_by_spin': 1}
+    assert set(stats['time']) == set(stats['calls'])
+    assert all(time > 0.0 for time in stats['time'].values())
+
+    # the counters add up: every string created is either cancelled by simplify or kept
+    assert stats['peak_terms'] == phases[2][1] <= stats['strings_created']
+    assert stats['terms_cancelled'] == phases[2][1] - phases[3][1]
+    assert stats['rearrangement_steps'] > stats['strings_created']
+    assert len(strings) > 0
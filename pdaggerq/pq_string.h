@@ -195,7 +195,7 @@ class pq_string
      *
      */
     static inline
-    std::string integral_types[] {"fock", "core", "two_body", "eri", "d+", "d-", "occ_repulsion"};
+    std::string integral_types[] {"fock", "core", "two_body", "eri", "d+", "d-", "occ_repulsion", "spatial_eri"};
 
     /**
      *
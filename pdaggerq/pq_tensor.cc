@@ -311,6 +311,17 @@ void integrals::print(const std::string &symbol) const {
         printf("%s", labels[3].c_str());
         printf(">");
         printf(" ");
+    }else if (symbol == "spatial_eri" ) {
+        printf("<");
+        printf("%s", labels[0].c_str());
+        printf(",");
+        printf("%s", labels[1].c_str());
+        printf("|");
+        printf("%s", labels[2].c_str());
+        printf(",");
+        printf("%s", labels[3].c_str());
+        printf(">");
+        printf(" ");
     }else if ( symbol == "core") {
         printf("h(");
         printf("%s", labels[0].c_str());
@@ -380,6 +391,16 @@ std::string integrals::to_string(const std::string &symbol) const {
             + ","
             + labels[3]
             + ">";
+    }else if ( symbol == "spatial_eri" ) {
+        val = "<"
+            + labels[0]
+            + ","
+            + labels[1]
+            + "|"
+            + labels[2]
+            + ","
+            + labels[3]
+            + ">";
     }else if ( symbol == "core") {
         val = "h("
             + labels[0]
@@ -488,9 +509,12 @@ std::string integrals::to_string_with_spin(const std::string &symbol) const {
 
     std::string val;
 
-    std::string spin = "_";
-    for (const std::string & spin_label : spin_labels) {
-        spin += spin_label;
+    std::string spin;
+    if ( !spin_labels.empty() ) {
+        spin = "_";
+        for (const std::string & spin_label : spin_labels) {
+            spin += spin_label;
+        }
     }
 
     if ( symbol == "two_body") {
@@ -513,6 +537,16 @@ std::string integrals::to_string_with_spin(const std::string &symbol) const {
             + ","
             + labels[3]
             + ">" + spin;
+    }else if ( symbol == "spatial_eri" ) {
+        val = "<"
+            + labels[0]
+            + ","
+            + labels[1]
+            + "|"
+            + labels[2]
+            + ","
+            + labels[3]
+            + ">" + spin;
     }else if ( symbol == "core") {
         val = "h" + spin + "("
             + labels[0]
@@ -646,9 +680,12 @@ std::string delta_functions::to_string_with_spin() const {
 
     std::string val;
 
-    std::string spin = "_";
-    for (const std::string & spin_label : spin_labels) {
-        spin += spin_label;
+    std::string spin;
+    if ( !spin_labels.empty() ) {
+        spin = "_";
+        for (const std::string & spin_label : spin_labels) {
+            spin += spin_label;
+        }
     }
 
     val = "d" + spin + "("
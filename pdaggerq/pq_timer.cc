@@ -1,6 +1,6 @@
 //
 // pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
-// Filename: timer.cc
+// Filename: pq_timer.cc
 // Copyright (C) 2020 A. Eugene DePrince III
 //
 // Author: A. Eugene DePrince III <adeprince@fsu.edu>
@@ -21,7 +21,7 @@
 //  limitations under the License.
 //
 
-#include "../include/timer.h"
+#include "pq_timer.h"
 // include omp only if defined
 #ifdef _OPENMP
 #include <omp.h>
@@ -1,6 +1,6 @@
 //
 // pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
-// Filename: timer.h
+// Filename: pq_timer.h
 // Copyright (C) 2020 A. Eugene DePrince III
 //
 // Author: A. Eugene DePrince III <adeprince@fsu.edu>
@@ -21,8 +21,8 @@
 //  limitations under the License.
 //
 
-#ifndef PQ_GRAPH_TIMER_H
-#define PQ_GRAPH_TIMER_H
+#ifndef PQ_TIMER_H
+#define PQ_TIMER_H
 #include <string>
 #include <sstream>
 
@@ -79,6 +79,11 @@ namespace pdaggerq {
          */
         size_t count() const { return count_; }
 
+        /**
+         * @brief return whether the timer is running
+         */
+        bool running() const { return running_; }
+
         /**
          * Get runtime_ as double
          */
@@ -133,4 +138,4 @@ namespace pdaggerq {
 }
 
 
-#endif //PQ_GRAPH_TIMER_H
+#endif //PQ_TIMER_H
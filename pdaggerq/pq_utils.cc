@@ -1513,7 +1513,7 @@ void gobble_deltas(std::shared_ptr<pq_string> &in) {
 }
 
 // bring a new string to normal order and add to list of normal ordered strings (fermi vacuum)
-void add_new_string_true_vacuum(const std::shared_ptr<pq_string> &in, std::vector<std::shared_ptr<pq_string> > &ordered, int print_level, bool find_paired_permutations){
+size_t add_new_string_true_vacuum(const std::shared_ptr<pq_string> &in, std::vector<std::shared_ptr<pq_string> > &ordered, int print_level, bool find_paired_permutations){
 
     if ( in->factor < 0.0 ) {
         in->sign *= -1;
@@ -1542,13 +1542,17 @@ void add_new_string_true_vacuum(const std::shared_ptr<pq_string> &in, std::vecto
     std::vector< std::shared_ptr<pq_string> > tmp;
     tmp.push_back(in);
 
+    size_t n_steps = 0;
     bool done_rearranging = false;
     do { 
         std::vector< std::shared_ptr<pq_string> > list;
         done_rearranging = true;
         for (const std::shared_ptr<pq_string> & pq_str : tmp) {
             bool am_i_done = swap_operators_true_vacuum(pq_str, list);
-            if ( !am_i_done ) done_rearranging = false;
+            if ( !am_i_done ) {
+                done_rearranging = false;
+                n_steps++;
+            }
         }
         tmp.clear();
         for (const std::shared_ptr<pq_string> & pq_str : list) {
@@ -1566,6 +1570,8 @@ void add_new_string_true_vacuum(const std::shared_ptr<pq_string> &in, std::vecto
 
     // try to cancel similar terms
     cleanup(ordered, find_paired_permutations);
+
+    return n_steps;
 }
 
 // expand general labels, p -> o, v
@@ -1610,7 +1616,7 @@ bool expand_general_labels(const std::shared_ptr<pq_string> & in, std::vector<st
 }
 
 // bring a new string to normal order and add to list of normal ordered strings (fermi vacuum)
-void add_new_string_fermi_vacuum(const std::shared_ptr<pq_string> &in, std::vector<std::shared_ptr<pq_string> > &ordered, int print_level, bool find_paired_permutations, int occ_label_count, int vir_label_count){
+size_t add_new_string_fermi_vacuum(const std::shared_ptr<pq_string> &in, std::vector<std::shared_ptr<pq_string> > &ordered, int print_level, bool find_paired_permutations, int occ_label_count, int vir_label_count){
         
     // if normal order is defined with respect to the fermi vacuum, we must
     // check here if the input string contains any general-index operators
@@ -1673,8 +1679,9 @@ void add_new_string_fermi_vacuum(const std::shared_ptr<pq_string> &in, std::vect
     // at this point, we've expanded all of the general labels
     // and are ready to bring the strings to normal order
 
+    size_t n_steps = 0;
     std::vector< std::shared_ptr<pq_string> > new_strings[mystrings.size()];
-    #pragma omp parallel for schedule(dynamic) default(none) shared(mystrings, new_strings) firstprivate(print_level)
+    #pragma omp parallel for schedule(dynamic) default(none) shared(mystrings, new_strings) firstprivate(print_level) reduction(+:n_steps)
     for (size_t k = 0; k < mystrings.size(); k++) {
         const std::shared_ptr<pq_string>& mystring = mystrings[k];
 
@@ -1718,7 +1725,10 @@ void add_new_string_fermi_vacuum(const std::shared_ptr<pq_string> &in, std::vect
             done_rearranging = true;
             for (const std::shared_ptr<pq_string> & pq_str : tmp) {
                 bool am_i_done = swap_operators_fermi_vacuum(pq_str, list);
-                if ( !am_i_done ) done_rearranging = false;
+                if ( !am_i_done ) {
+                    done_rearranging = false;
+                    n_steps++;
+                }
             }
             tmp.clear();
             for (std::shared_ptr<pq_string> & pq_str : list) {
@@ -1738,6 +1748,8 @@ void add_new_string_fermi_vacuum(const std::shared_ptr<pq_string> &in, std::vect
             ordered.push_back(pq_str);
         }
     }
+
+    return n_steps;
 }
 
 } // End namespaces
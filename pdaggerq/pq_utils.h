@@ -133,11 +133,11 @@ void gobble_deltas(std::shared_ptr<pq_string> &in);
 /// replace internal labels with conventional ones (o1 -> i, etc.)
 void use_conventional_labels(std::shared_ptr<pq_string> &in);
 
-// bring a new string to normal order and add to list of normal ordered strings (fermi vacuum)
-void add_new_string_true_vacuum(const std::shared_ptr<pq_string> &in, std::vector<std::shared_ptr<pq_string> > &ordered, int print_level, bool find_paired_permutations);
+// bring a new string to normal order and add to list of normal ordered strings (true vacuum); returns the number of rearrangement steps
+size_t add_new_string_true_vacuum(const std::shared_ptr<pq_string> &in, std::vector<std::shared_ptr<pq_string> > &ordered, int print_level, bool find_paired_permutations);
 
-// bring a new string to normal order and add to list of normal ordered strings (fermi vacuum)
-void add_new_string_fermi_vacuum(const std::shared_ptr<pq_string> &in, std::vector<std::shared_ptr<pq_string> > &ordered, int print_level, bool find_paired_permutations, int occ_label_count, int vir_label_count);
+// bring a new string to normal order and add to list of normal ordered strings (fermi vacuum); returns the number of rearrangement steps
+size_t add_new_string_fermi_vacuum(const std::shared_ptr<pq_string> &in, std::vector<std::shared_ptr<pq_string> > &ordered, int print_level, bool find_paired_permutations, int occ_label_count, int vir_label_count);
 
 /// concatinate a list of operators (a list of strings) into a single list
 std::vector<std::string> concatinate_operators(const std::vector<std::vector<std::string>> &ops);
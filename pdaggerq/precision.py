@@ -0,0 +1,106 @@
+#
+# pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
+# Copyright (C) 2020 A. Eugene DePrince III
+#
+# This file is part of the pdaggerq package.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""
+Mixed-precision iterations for generated codes.
+
+The einsum code printed by pdaggerq and pq_graph computes in the precision of
+its inputs. MixedPrecision decides that precision for each iteration: the
+residuals are evaluated in float32 until the residual norm drops below a
+threshold and in float64 from then on. The iteration drivers keep the
+amplitudes, energies, and DIIS vectors in float64 and only hand cast copies to
+the residual functions, e.g.
+
+    precision = MixedPrecision(threshold=1e-4)
+    f_low, g_low = precision.cast(fock, g)
+    for idx in range(max_iter):
+        t1_low, t2_low = precision.cast(t1, t2)
+        singles_res = ccsd_singles_residual(t1_low, t2_low, f_low, g_low, o, v)
+        ...
+        if precision.update(res_norm):
+            f_low, g_low = precision.cast(fock, g)
+            diis.reset()
+        if converged and precision.high_precision:
+            break
+
+This is the only implementation. The spin-orbital CCSD and CCSDT drivers in
+examples/psi4_interface (ccsd_iterations, ccsdt_iterations) and
+pq_graph/examples/full_cc_codes (kernel) take a policy through their
+precision argument and never import this module themselves, so they still run
+in float64 without pdaggerq installed.
+"""
+
+import numpy as np
+
+
+class MixedPrecision:
+
+    def __init__(self, threshold=None, low=np.float32, high=np.float64):
+        """
+        Precision policy for coupled-cluster iterations
+
+        :param threshold: residual norm below which the residuals are evaluated in the high precision.
+                          None (default) uses the high precision from the first iteration.
+        :param low: dtype of the early iterations (default: float32)
+        :param high: dtype of the final iterations (default: float64)
+        """
+        self.threshold = threshold
+        self.low = np.dtype(low)
+        self.high = np.dtype(high)
+        self.dtype = self.high if threshold is None else self.low
+
+    @property
+    def high_precision(self):
+        """whether the residuals are evaluated in the high precision (required before convergence)"""
+        return self.dtype == self.high
+
+    def update(self, residual_norm):
+        """
+        Switch to the high precision once the residual norm is below the threshold
+
+        :param residual_norm: norm of the residuals of this iteration
+        :return: True if this call switched the precision (cast the integrals again)
+        """
+        if self.high_precision or residual_norm >= self.threshold:
+            return False
+        self.dtype = self.high
+        return True
+
+    def cast(self, *tensors):
+        """
+        Copies of tensors in the current precision. Arrays already in that precision are returned as they are,
+        dictionaries of blocks (pq_graph inputs such as eri["oovv"]) are cast block by block, other containers
+        with a floating-point dtype and an astype method are cast with it, and other objects (scalars, slices)
+        are left alone.
+
+        :param tensors: arrays or dictionaries of arrays
+        :return: the cast tensor, or a tuple of them for more than one
+        """
+        cast = tuple(self._cast(tensor) for tensor in tensors)
+        return cast[0] if len(cast) == 1 else cast
+
+    def _cast(self, tensor):
+        if isinstance(tensor, dict):
+            return {key: self._cast(value) for key, value in tensor.items()}
+        if isinstance(tensor, np.ndarray) and np.issubdtype(tensor.dtype, np.floating):
+            return tensor.astype(self.dtype, copy=False)
+        # other containers of floating-point blocks that know how to cast themselves
+        if not isinstance(tensor, np.generic) and hasattr(tensor, 'astype') \
+                and np.issubdtype(getattr(tensor, 'dtype', object), np.floating):
+            return tensor.astype(self.dtype, copy=False)
+        return tensor
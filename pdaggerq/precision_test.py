@@ -0,0 +1,209 @@
+#
+# pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
+# Copyright (C) 2020 A. Eugene DePrince III
+#
+# This file is part of the pdaggerq package.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import importlib
+import os
+import re
+import sys
+from contextlib import contextmanager
+from itertools import permutations
+
+import numpy as np
+
+import pdaggerq
+from pdaggerq.precision import MixedPrecision
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+@contextmanager
+def examples(directory):
+    """import drivers from an example directory, without leaving them (or their ccsd, diis, ...) in sys.modules"""
+    path = os.path.join(ROOT, directory)
+    sys.path.insert(0, path)
+    before = set(sys.modules)
+    try:
+        yield
+    finally:
+        sys.path.remove(path)
+        for added in set(sys.modules) - before:
+            del sys.modules[added]
+
+
+def model_hamiltonian(no=3, nv=5):
+    """diagonal fock matrix and weak antisymmetric two-electron integrals, with the cc energy denominators"""
+    rng = np.random.default_rng(5)
+    eps = np.concatenate([np.linspace(-1.2, -0.8, no), np.linspace(0.6, 1.4, nv)])
+    g = np.zeros((no + nv,) * 4)
+    tensor = rng.standard_normal(g.shape)
+    for upper in permutations(range(2)):
+        for lower in permutations(range(2)):
+            sign = (-1) ** (upper[0] + lower[0])
+            g += sign * tensor.transpose(list(upper) + [2 + k for k in lower])
+    g = 0.02 * (g + g.transpose(2, 3, 0, 1))
+    o, v, n = slice(None, no), slice(no, None), np.newaxis
+    e_ai = 1 / (-eps[v, n] + eps[n, o])
+    e_abij = 1 / (-eps[v, n, n, n] - eps[n, v, n, n] + eps[n, n, o, n] + eps[n, n, n, o])
+    e_abcijk = 1 / (-eps[v, n, n, n, n, n] - eps[n, v, n, n, n, n] - eps[n, n, v, n, n, n]
+                    + eps[n, n, n, o, n, n] + eps[n, n, n, n, o, n] + eps[n, n, n, n, n, o])
+    return np.diag(eps), g, o, v, e_ai, e_abij, e_abcijk
+
+
+def test_switch():
+    precision = MixedPrecision(threshold=1e-3)
+    assert precision.dtype == np.float32 and not precision.high_precision
+
+    assert not precision.update(1.0)
+    assert precision.update(1e-4)
+    assert precision.high_precision
+    assert not precision.update(1e-6)
+
+    # float64 from the start without a threshold
+    assert MixedPrecision().high_precision
+
+
+def test_cast():
+    precision = MixedPrecision(threshold=1e-3)
+    t1 = np.ones((3, 2))
+    eri = {'oovv': np.ones((2, 2, 3, 3)), 'vvoo': np.ones((3, 3, 2, 2))}
+
+    t1_low, eri_low = precision.cast(t1, eri)
+    assert t1_low.dtype == np.float32
+    assert all(block.dtype == np.float32 for block in eri_low.values())
+    assert precision.cast(slice(None, 2)) == slice(None, 2)
+
+    # containers that cast themselves
+    class Blocks:
+        dtype = np.dtype(np.float64)
+
+        def astype(self, dtype, copy=True):
+            blocks = Blocks()
+            blocks.dtype = np.dtype(dtype)
+            return blocks
+
+    assert precision.cast(Blocks()).dtype == np.float32
+
+    # arrays already in the current precision are not copied
+    precision.update(0.0)
+    assert precision.cast(t1) is t1
+
+
+def test_pq_graph_code_follows_dtype():
+    graph = pdaggerq.pq_graph({'print_level': 0})
+    pq = pdaggerq.pq_helper('fermi')
+    pq.set_print_level(0)
+    pq.set_left_operators([['e2(i,j,b,a)']])
+    pq.add_st_operator(1.0, ['f'], ['t1', 't2'])
+    pq.add_st_operator(1.0, ['v'], ['t1', 't2'])
+    pq.simplify()
+    graph.add(pq, 'doubles_resid', ['a', 'b', 'i', 'j'])
+    graph.optimize()
+    code = graph.str("python")
+
+    no, nv = 3, 4
+    rng = np.random.default_rng(1)
+    def random_tensor(spaces):
+        return 0.1 * rng.standard_normal(tuple(no if space == 'o' else nv for space in spaces))
+    inputs = {'t1': random_tensor('vo'), 't2': random_tensor('vvoo'),
+              'f': {block: random_tensor(block) for block in set(re.findall(r'f\["(\w+)"\]', code))},
+              'eri': {block: random_tensor(block) for block in set(re.findall(r'eri\["(\w+)"\]', code))}}
+
+    def evaluate(precision):
+        scope = {'np': np, 'einsum': np.einsum, 'tmps_': {}, 'scalars_': {}, 'reused_': {}}
+        scope.update(zip(inputs, precision.cast(*inputs.values())))
+        exec("def evaluate_equations():\n" + code + "\n    return locals()\n", scope)
+        return scope['evaluate_equations']()['doubles_resid']
+
+    low, high = evaluate(MixedPrecision(threshold=1e-3)), evaluate(MixedPrecision())
+    assert low.dtype == np.float32 and high.dtype == np.float64
+    assert np.allclose(low, high, atol=1e-5)
+
+
+def test_diis_reset():
+    with examples(os.path.join('examples', 'psi4_interface')):
+        from diis import DIIS
+        rng = np.random.default_rng(3)
+        diis = DIIS(4, start_iter=0)
+        for k in range(3):
+            diis.compute_new_vec(rng.standard_normal(4), rng.standard_normal(4))
+        diis.reset()
+        assert diis.error_vecs == [] and diis.prev_vecs == []
+
+        # the first vector after a reset is extrapolated from itself only
+        iterate = rng.standard_normal(4)
+        assert np.allclose(diis.compute_new_vec(iterate, rng.standard_normal(4)), iterate)
+
+
+def test_psi4_interface_drivers():
+    fock, g, o, v, e_ai, e_abij, e_abcijk = model_hamiltonian()
+    no, nv = e_ai.shape[1], e_ai.shape[0]
+
+    def ccsd(precision):
+        t1, t2 = ccsd_driver.ccsd_iterations(np.zeros((nv, no)), np.zeros((nv, nv, no, no)), fock, g, o, v,
+                                             e_ai, e_abij, 0.0, e_convergence=1e-10, r_convergence=1e-10,
+                                             diis_size=4, diis_start_cycle=1, precision=precision)
+        return ccsd_driver.coupled_cluster_energy(t1, t2, fock, g, o, v)
+
+    def ccsdt(precision, packed):
+        t3 = np.zeros((nv, nv, nv, no, no, no))
+        denominators = e_abcijk
+        if packed:
+            t3, denominators = pack(t3), pack(e_abcijk)
+        t1, t2, t3 = ccsdt_driver.ccsdt_iterations(np.zeros((nv, no)), np.zeros((nv, nv, no, no)), t3, fock, g,
+                                                   o, v, e_ai, e_abij, denominators, 0.0, e_convergence=1e-8,
+                                                   r_convergence=1e-8, diis_size=4, diis_start_cycle=1,
+                                                   packed=packed, precision=precision)
+        return ccsdt_driver.coupled_cluster_energy(t1, t2, fock, g, o, v), t3
+
+    with examples(os.path.join('examples', 'psi4_interface')):
+        from pdaggerq.packing import pack
+        ccsd_driver = importlib.import_module('ccsd')
+        ccsdt_driver = importlib.import_module('ccsdt')
+
+        precision = MixedPrecision(threshold=1e-4)
+        energy, mixed_energy = ccsd(None), ccsd(precision)
+        assert precision.high_precision
+        assert abs(mixed_energy - energy) < 1e-10
+
+        energy, t3 = ccsdt(None, False)
+        for packed in (False, True):
+            precision = MixedPrecision(threshold=1e-4)
+            mixed_energy, mixed_t3 = ccsdt(precision, packed)
+            assert precision.high_precision
+            assert abs(mixed_energy - energy) < 1e-8
+            assert np.allclose(mixed_t3, t3, atol=1e-7)
+
+
+def test_full_cc_codes_kernel():
+    fock, g, o, v, e_ai, e_abij, _ = model_hamiltonian()
+    no, nv = e_ai.shape[1], e_ai.shape[0]
+
+    with examples(os.path.join('pq_graph', 'examples', 'full_cc_codes')):
+        ccsd = importlib.import_module('ccsd')
+
+        def solve(precision):
+            t1, t2 = ccsd.kernel(np.zeros((nv, no)), np.zeros((nv, nv, no, no)), fock, g, o, v, e_ai, e_abij,
+                                 stopping_eps=1e-10, diis_size=4, diis_start_cycle=1, precision=precision)
+            return ccsd.ccsd_energy(t1, t2, fock, g, o, v)
+
+        precision = MixedPrecision(threshold=1e-4)
+        energy, mixed_energy = solve(None), solve(precision)
+
+    assert precision.high_precision
+    assert abs(mixed_energy - energy) < 1e-9
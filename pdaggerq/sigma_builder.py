@@ -0,0 +1,201 @@
+#
+# pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
+# Copyright (C) 2020 A. Eugene DePrince III
+#
+# This file is part of the pdaggerq package.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""
+Run pq_graph sigma-vector code on blocks of trial vectors.
+
+The python code printed by pq_graph with 'use_trial_index' and 'separate_sigma'
+has three parts: scalars, shared operators (reused_, which do not depend on the
+trial vectors), and the sigma equations, where every trial vector and sigma
+vector carries a leading index over the trial vectors. SigmaBuilder compiles
+the first two parts into a function that is called once per Davidson
+macro-iteration and the last part into a function that is called for each
+block of trial vectors, e.g.
+
+    builder = SigmaBuilder(graph.str("python"), trial=['r1', 'r2'],
+                           sigma=['sigmar1', 'sigmar2'])
+    builder.update(t1=t1, t2=t2, f=f, eri=eri, Id=Id)
+    sigma = builder(r1=r1_block, r2=r2_block)  # r1_block[k, a, i], ...
+"""
+
+import re
+
+import numpy as np
+
+DECLARATION = re.compile(r'^## initialize -> (\w+)')
+SHARED_LHS = re.compile(r'^(scalars_|reused_)\["(\w+)"\]')
+SHARED_USE = re.compile(r'(scalars_|reused_)\["(\w+)"\]')
+
+
+def split_sections(code):
+    """
+    Split python code from pq_graph into its declarations, shared statements
+    (scalars and reused intermediates), and the sigma equations
+
+    :param code: output of PQGraph.str("python")
+    :return: (names, shared statements, equation lines)
+    """
+    names, shared, equations = [], [], []
+    section = None
+    for line in code.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("#####"):
+            if "End of" in stripped:
+                section = None
+            elif "Scalars" in stripped or "Shared" in stripped:
+                section = "shared"
+            elif "Evaluate Equations" in stripped:
+                section = "equations"
+            continue
+
+        match = DECLARATION.match(stripped)
+        if match:
+            if match.group(1) not in names:
+                names.append(match.group(1))
+        elif section == "shared":
+            if stripped and not stripped.startswith("#"):
+                shared.append(stripped)
+        elif section == "equations":
+            equations.append(line)
+
+    return names, shared, equations
+
+
+def order_shared(statements):
+    """
+    Order shared statements so that every scalar or intermediate is complete
+    before it is read. pq_graph prints the scalars before the reused
+    intermediates even when a scalar is built from one of them.
+
+    :param statements: statements from the scalar and shared operator sections
+    :return: statements in an order that can be executed
+    """
+    # group the statements by the quantity they build, keeping their order. Helper
+    # lines (permutation temporaries) go with the next statement, deletions with the last one.
+    groups, pending, last = {}, [], None
+    for statement in statements:
+        match = SHARED_LHS.match(statement)
+        if match is None:
+            if statement.startswith("del ") and last is not None:
+                groups[last].append(statement)
+            else:
+                pending.append(statement)
+            continue
+        last = match.groups()
+        groups.setdefault(last, []).extend(pending + [statement])
+        pending = []
+    if pending:
+        if last is None:
+            raise ValueError("no scalars or shared operators found among: {}".format(pending))
+        groups[last].extend(pending)
+
+    depends = {}
+    for key, group in groups.items():
+        uses = set()
+        for statement in group:
+            uses.update(SHARED_USE.findall(statement))
+        depends[key] = (uses & set(groups)) - {key}
+
+    ordered, done = [], set()
+
+    def visit(key, path):
+        if key in done:
+            return
+        if key in path:
+            raise ValueError(f"circular dependency between shared operators at {key[0]}[\"{key[1]}\"]")
+        for dep in sorted(depends[key]):
+            visit(dep, path | {key})
+        done.add(key)
+        ordered.extend(groups[key])
+
+    for key in groups:
+        visit(key, frozenset())
+    return ordered
+
+
+class SigmaBuilder:
+
+    def __init__(self, code, trial, sigma, namespace=None):
+        """
+        Compile the python code of a sigma-vector build from pq_graph
+
+        :param code: output of PQGraph.str("python"), generated with 'use_trial_index'
+        :param trial: names of the trial vectors (e.g. ['r1', 'r2'])
+        :param sigma: names of the sigma vectors (e.g. ['sigmar1', 'sigmar2'])
+        :param namespace: extra globals for the generated code (np and einsum are provided)
+        """
+        names, shared, equations = split_sections(code)
+
+        self.trial = list(trial)
+        self.sigma = list(sigma)
+        self.inputs = [name for name in names
+                       if name not in self.trial and name not in self.sigma
+                       and name not in ('tmps', 'perm_tmps')]
+
+        shared_source = "def shared({}):\n".format(", ".join(self.inputs))
+        shared_source += "    scalars_ = {}\n    reused_ = {}\n"
+        for statement in order_shared(shared):
+            shared_source += "    " + statement + "\n"
+        shared_source += "    return scalars_, reused_\n"
+
+        sigma_source = "def sigma({}):\n".format(", ".join(self.inputs + self.trial + ['scalars_', 'reused_']))
+        sigma_source += "    tmps_ = {}\n"
+        sigma_source += "\n".join(equations) + "\n"
+        sigma_source += "    return {}\n".format(", ".join(self.sigma) + ("," if len(self.sigma) == 1 else ""))
+
+        self.namespace = {"np": np, "einsum": np.einsum}
+        if namespace is not None:
+            self.namespace.update(namespace)
+        exec(compile(shared_source, "<pq_graph shared operators>", "exec"), self.namespace)
+        exec(compile(sigma_source, "<pq_graph sigma equations>", "exec"), self.namespace)
+
+        self.tensors = None
+        self.scalars = None
+        self.reused = None
+
+    def update(self, **tensors):
+        """
+        Build the scalars and shared intermediates, which do not depend on the
+        trial vectors. Call once per macro-iteration (or whenever the
+        amplitudes or integrals change).
+
+        :param tensors: every input of the generated code except the trial vectors
+        """
+        missing = [name for name in self.inputs if name not in tensors]
+        if missing:
+            raise ValueError("missing tensors for the sigma build: {}".format(", ".join(missing)))
+
+        self.tensors = [tensors[name] for name in self.inputs]
+        self.scalars, self.reused = self.namespace["shared"](*self.tensors)
+
+    def __call__(self, **trial):
+        """
+        Evaluate the sigma vectors for a block of trial vectors in one pass
+
+        :param trial: trial vectors, each with the block of k vectors as its leading dimension
+        :return: dictionary of sigma vectors, each with the same leading dimension
+        """
+        if self.tensors is None:
+            raise RuntimeError("SigmaBuilder.update() must be called before building sigma vectors")
+
+        missing = [name for name in self.trial if name not in trial]
+        if missing:
+            raise ValueError("missing trial vectors: {}".format(", ".join(missing)))
+
+        args = self.tensors + [trial[name] for name in self.trial] + [self.scalars, self.reused]
+        return dict(zip(self.sigma, self.namespace["sigma"](*args)))
@@ -0,0 +1,120 @@
+#
+# pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
+# Copyright (C) 2020 A. Eugene DePrince III
+#
+# This file is part of the pdaggerq package.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import numpy as np
+
+import pdaggerq
+from pdaggerq.sigma_builder import SigmaBuilder, order_shared
+
+
+def sigma_code(separate_sigma):
+    graph = pdaggerq.pq_graph({'print_level': 0, 'opt_level': 6,
+                               'use_trial_index': True, 'separate_sigma': separate_sigma})
+    for name, proj, order in [('sigmar1', [['e1(i,a)']], ['a', 'i']),
+                              ('sigmar2', [['e2(i,j,b,a)']], ['a', 'b', 'i', 'j'])]:
+        pq = pdaggerq.pq_helper('fermi')
+        pq.set_print_level(0)
+        pq.set_left_operators(proj)
+        pq.set_right_operators([['r1'], ['r2']])
+        pq.add_st_operator(1.0, ['f'], ['t2'])
+        pq.add_st_operator(1.0, ['v'], ['t2'])
+        pq.simplify()
+        graph.add(pq, name, order)
+    graph.optimize()
+    return graph.str("python")
+
+
+def test_order_shared():
+    statements = ['scalars_["1"]  = 1.00 * np.einsum(\'ia,ai->\',reused_["2_ov"],t1)',
+                  'reused_["2_ov"]  = 1.00 * np.einsum(\'jiba,bj->ia\',eri["oovv"],t1)',
+                  'reused_["2_ov"] += f["ov"]']
+    assert order_shared(statements) == statements[1:] + statements[:1]
+
+
+def test_sigma_block():
+    o, v, k = 3, 5, 4
+    dims = {'o': o, 'v': v}
+    rng = np.random.default_rng(7)
+
+    tensors = {
+        't2': 0.1 * rng.standard_normal((v, v, o, o)),
+        'f': {a + b: rng.standard_normal((dims[a], dims[b])) for a in "ov" for b in "ov"},
+        'eri': {a + b + c + d: rng.standard_normal((dims[a], dims[b], dims[c], dims[d]))
+                for a in "ov" for b in "ov" for c in "ov" for d in "ov"},
+        'Id': {'oo': np.eye(o), 'vv': np.eye(v)},
+    }
+    r1 = rng.standard_normal((k, v, o))
+    r2 = rng.standard_normal((k, v, v, o, o))
+
+    builder = SigmaBuilder(sigma_code(True), trial=['r1', 'r2'], sigma=['sigmar1', 'sigmar2'])
+    builder.update(**{name: tensors[name] for name in builder.inputs})
+    block = builder(r1=r1, r2=r2)
+
+    # same equations without hoisting the shared intermediates
+    direct = SigmaBuilder(sigma_code(False), trial=['r1', 'r2'], sigma=['sigmar1', 'sigmar2'])
+    direct.update(**{name: tensors[name] for name in direct.inputs})
+    reference = direct(r1=r1, r2=r2)
+
+    for name in ['sigmar1', 'sigmar2']:
+        assert block[name].shape[0] == k
+        assert np.allclose(block[name], reference[name])
+
+    # one vector at a time
+    for root in range(k):
+        single = builder(r1=r1[root:root + 1], r2=r2[root:root + 1])
+        for name in ['sigmar1', 'sigmar2']:
+            assert np.allclose(single[name][0], block[name][root])
+
+
+def einsum_calls(code):
+    """subscripts of every np.einsum call in code and whether it passes optimize='optimal'"""
+    calls = []
+    for start in [index for index in range(len(code)) if code.startswith("np.einsum('", index)]:
+        subscripts = code[start + len("np.einsum('"):].split("'", 1)[0]
+        depth, end = 0, start + len("np.einsum")
+        for end in range(end, len(code)):
+            depth += {'(': 1, ')': -1}.get(code[end], 0)
+            if depth == 0:
+                break
+        calls.append((subscripts, code[:end].endswith("optimize='optimal'")))
+    return calls
+
+
+def test_trial_index_output():
+    # pairwise contractions use optimize='optimal' (tensordot over the block) exactly when they carry the trial index
+    pairwise = [(subscripts, optimal) for subscripts, optimal in einsum_calls(sigma_code(True))
+                if subscripts.split('->')[0].count(',') == 1]
+    assert any(optimal for _, optimal in pairwise) and not all(optimal for _, optimal in pairwise)
+    for subscripts, optimal in pairwise:
+        assert optimal == ('R' in subscripts.split('->')[0])
+
+    # without a trial index, pairwise contractions stay plain einsums
+    graph = pdaggerq.pq_graph({'print_level': 0, 'opt_level': 6, 'use_trial_index': False, 'separate_sigma': False})
+    pq = pdaggerq.pq_helper('fermi')
+    pq.set_print_level(0)
+    pq.set_left_operators([['e1(i,a)']])
+    pq.set_right_operators([['r1'], ['r2']])
+    pq.add_st_operator(1.0, ['f'], ['t2'])
+    pq.add_st_operator(1.0, ['v'], ['t2'])
+    pq.simplify()
+    graph.add(pq, 'sigmar1', ['a', 'i'])
+    graph.optimize()
+    calls = einsum_calls(graph.str("python"))
+    assert calls
+    for subscripts, optimal in calls:
+        assert optimal == (subscripts.split('->')[0].count(',') > 1)
@@ -0,0 +1,334 @@
+#
+# pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
+# Copyright (C) 2020 A. Eugene DePrince III
+#
+# This file is part of the pdaggerq package.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""
+Run pq_graph python code on tensors blocked by point-group symmetry.
+
+An IrrepTensor stores only the blocks of a tensor whose irreps multiply to
+its symmetry (the totally symmetric irrep for integrals, amplitudes, and
+residuals), one NumPy array per block. The einsum in this module loops over
+the irrep combinations that are allowed for every operand and contracts
+those blocks only, so the python code printed by pq_graph runs unchanged
+with the namespace from irrep_namespace(), e.g.
+
+    irreps = {'o': occ_irreps, 'v': vir_irreps}  # irrep of each orbital
+    t1 = IrrepTensor.from_dense(t1, "vo", irreps)
+    f = from_blocks(f, irreps)                   # {"oo": array, "ov": array, ...}
+    scope = {**irrep_namespace(), 't1': t1, 'f': f, ...}
+    exec(graph.str("python"), scope)
+
+Irreps are numbered in Cotton order, so the direct product of two irreps is
+the bitwise XOR of their numbers (D2h and its subgroups).
+"""
+
+from functools import reduce
+from itertools import product
+
+import numpy as np
+
+
+def _orbitals(irreps, space, irrep):
+    """
+    Indices of the orbitals of one irrep within a space
+
+    :param irreps: irrep of each orbital in each space
+    :param space: orbital space (e.g. 'o' or 'v')
+    :param irrep: irrep number
+    :return: array of orbital indices
+    """
+    return np.flatnonzero(np.asarray(irreps[space]) == irrep)
+
+
+class IrrepTensor:
+
+    def __init__(self, spaces, irreps, symmetry=0, blocks=None):
+        """
+        A tensor stored as the symmetry-allowed blocks of its irreps
+
+        :param spaces: orbital space of each index (e.g. "vvoo")
+        :param irreps: dictionary of the irrep of each orbital in each space
+        :param symmetry: irrep of the tensor (default: 0, totally symmetric)
+        :param blocks: dictionary of blocks keyed by the irrep of each index; missing blocks are zero
+        """
+        missing = [space for space in set(spaces) if space not in irreps]
+        if missing:
+            raise ValueError("no irreps given for orbital space(s): {}".format(", ".join(sorted(missing))))
+
+        self.spaces = spaces
+        self.irreps = irreps
+        self.symmetry = symmetry
+        self.blocks = {} if blocks is None else blocks
+
+    @property
+    def ndim(self):
+        return len(self.spaces)
+
+    @property
+    def shape(self):
+        return tuple(len(self.irreps[space]) for space in self.spaces)
+
+    def allowed(self):
+        """
+        Irrep combinations of the blocks that may be nonzero
+
+        :return: list of tuples with the irrep of each index
+        """
+        present = [sorted(set(np.asarray(self.irreps[space]).tolist())) for space in self.spaces]
+        return [key for key in product(*present) if reduce(lambda x, y: x ^ y, key, 0) == self.symmetry]
+
+    @classmethod
+    def from_dense(cls, array, spaces, irreps, symmetry=0):
+        """
+        Keep the symmetry-allowed blocks of a dense tensor
+
+        :param array: dense tensor
+        :param spaces: orbital space of each index
+        :param irreps: dictionary of the irrep of each orbital in each space
+        :param symmetry: irrep of the tensor (default: 0)
+        :return: IrrepTensor; elements in forbidden blocks are dropped
+        """
+        array = np.asarray(array)
+        tensor = cls(spaces, irreps, symmetry)
+        if array.shape != tensor.shape:
+            raise ValueError("tensor of shape {} does not match spaces '{}' of shape {}".format(
+                array.shape, spaces, tensor.shape))
+
+        for key in tensor.allowed():
+            index = np.ix_(*[_orbitals(irreps, space, irrep) for space, irrep in zip(spaces, key)])
+            tensor.blocks[key] = array[index].copy()
+        return tensor
+
+    @classmethod
+    def zeros(cls, spaces, irreps, symmetry=0, dtype=np.float64):
+        """
+        An IrrepTensor with every allowed block set to zero
+
+        :param spaces: orbital space of each index
+        :param irreps: dictionary of the irrep of each orbital in each space
+        :param symmetry: irrep of the tensor (default: 0)
+        :param dtype: dtype of the blocks (default: float64)
+        :return: IrrepTensor
+        """
+        tensor = cls(spaces, irreps, symmetry)
+        for key in tensor.allowed():
+            shape = tuple(len(_orbitals(irreps, space, irrep)) for space, irrep in zip(spaces, key))
+            tensor.blocks[key] = np.zeros(shape, dtype=dtype)
+        return tensor
+
+    def to_dense(self, dtype=None):
+        """
+        :param dtype: dtype of the dense tensor (default: the common dtype of the blocks, float64 without blocks)
+        :return: the dense tensor, with zeros in the forbidden blocks
+        """
+        if dtype is None:
+            dtype = np.result_type(*self.blocks.values()) if self.blocks else np.float64
+        array = np.zeros(self.shape, dtype=dtype)
+        for key, block in self.blocks.items():
+            index = np.ix_(*[_orbitals(self.irreps, space, irrep) for space, irrep in zip(self.spaces, key)])
+            array[index] = block
+        return array
+
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError("an IrrepTensor cannot be viewed as a dense array without a copy")
+        return self.to_dense(dtype)
+
+    def copy(self):
+        return IrrepTensor(self.spaces, self.irreps, self.symmetry,
+                           {key: block.copy() for key, block in self.blocks.items()})
+
+    def _check(self, other):
+        if self.spaces != other.spaces or self.symmetry != other.symmetry:
+            raise ValueError("cannot combine IrrepTensors with spaces '{}' (irrep {}) and '{}' (irrep {})".format(
+                self.spaces, self.symmetry, other.spaces, other.symmetry))
+
+    def __iadd__(self, other):
+        self._check(other)
+        for key, block in other.blocks.items():
+            if key in self.blocks:
+                self.blocks[key] = self.blocks[key] + block
+            else:
+                self.blocks[key] = block.copy()
+        return self
+
+    def __isub__(self, other):
+        self._check(other)
+        for key, block in other.blocks.items():
+            if key in self.blocks:
+                self.blocks[key] = self.blocks[key] - block
+            else:
+                self.blocks[key] = -block
+        return self
+
+    def __add__(self, other):
+        result = self.copy()
+        result += other
+        return result
+
+    def __sub__(self, other):
+        result = self.copy()
+        result -= other
+        return result
+
+    def __neg__(self):
+        return -1.0 * self
+
+    def __mul__(self, other):
+        if isinstance(other, IrrepTensor):
+            # elementwise; a block missing from either tensor is zero
+            self._check(other)
+            blocks = {key: block * other.blocks[key] for key, block in self.blocks.items() if key in other.blocks}
+        else:
+            blocks = {key: other * block for key, block in self.blocks.items()}
+        return IrrepTensor(self.spaces, self.irreps, self.symmetry, blocks)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar):
+        return self * (1.0 / scalar)
+
+
+def einsum(subscripts, *operands, **kwargs):
+    """
+    numpy.einsum over IrrepTensors. Every irrep combination that is allowed
+    for all operands is contracted with numpy.einsum and accumulated into the
+    matching block of the result; forbidden combinations are never visited.
+    More than two operands are contracted pairwise. Operands that are not
+    IrrepTensors go straight to numpy.einsum.
+
+    :param subscripts: einsum subscripts with an explicit output ('...->...')
+    :param operands: IrrepTensors
+    :param kwargs: passed to numpy.einsum for each block; with more than two operands,
+                   optimize picks the order of the pairwise contractions instead
+    :return: IrrepTensor, or a float for a full contraction
+    """
+    if not any(isinstance(operand, IrrepTensor) for operand in operands):
+        return np.einsum(subscripts, *operands, **kwargs)
+    if not all(isinstance(operand, IrrepTensor) for operand in operands):
+        raise TypeError("cannot contract IrrepTensors with dense tensors: '{}'".format(subscripts))
+
+    subscripts = subscripts.replace(' ', '')
+    if '->' not in subscripts:
+        raise ValueError("einsum over IrrepTensors needs an explicit output: '{}'".format(subscripts))
+    inputs, output = subscripts.split('->')
+    inputs = inputs.split(',')
+    if len(inputs) != len(operands):
+        raise ValueError("'{}' names {} operands but {} were given".format(subscripts, len(inputs), len(operands)))
+
+    # orbital space of each label
+    spaces = {}
+    for labels, operand in zip(inputs, operands):
+        if len(labels) != operand.ndim:
+            raise ValueError("'{}' does not match an operand with spaces '{}'".format(labels, operand.spaces))
+        for label, space in zip(labels, operand.spaces):
+            if spaces.setdefault(label, space) != space:
+                raise ValueError("index '{}' of '{}' is in spaces '{}' and '{}'".format(
+                    label, subscripts, spaces[label], space))
+
+    # contract more than two operands pairwise, in the order numpy picks for the dense shapes,
+    # so the irrep combinations of each pair are visited once instead of for every other operand
+    if len(operands) > 2:
+        shapes = [np.broadcast_to(0.0, operand.shape) for operand in operands]
+        path = np.einsum_path(subscripts, *shapes, optimize=kwargs.get('optimize') or 'greedy')[0]
+        pending = list(zip(inputs, operands))
+        for pair in path[1:]:
+            contracted = [pending.pop(position) for position in sorted(pair, reverse=True)]
+            remaining = output + ''.join(labels for labels, operand in pending)
+            if pending:
+                labels = ''.join(dict.fromkeys(label for labels, operand in contracted
+                                               for label in labels if label in remaining))
+            else:
+                labels = output
+            intermediate = einsum(','.join(labels for labels, operand in contracted) + '->' + labels,
+                                  *[operand for labels, operand in contracted])
+            if pending and not labels:
+                # keep a scalar intermediate as a rank-0 tensor so the positions in the path stay valid
+                intermediate = IrrepTensor('', operands[0].irreps, 0, {(): np.array(intermediate)})
+            pending.append((labels, intermediate))
+        return pending[0][1]
+
+    # group the blocks of each operand by the irreps of the labels that earlier operands fix
+    seen, groups = set(), []
+    for labels, operand in zip(inputs, operands):
+        bound = [position for position, label in enumerate(labels) if label in seen]
+        group = {}
+        for key, block in operand.blocks.items():
+            group.setdefault(tuple(key[position] for position in bound), []).append((key, block))
+        groups.append((labels, bound, group))
+        seen.update(labels)
+
+    result = {}
+
+    def contract(n, assignment, blocks):
+        if n == len(operands):
+            key = tuple(assignment[label] for label in output)
+            value = np.einsum(subscripts, *blocks, **kwargs)
+            if key in result:
+                result[key] = result[key] + value
+            else:
+                result[key] = value
+            return
+
+        # blocks of the next operand whose irreps agree with the labels assigned so far
+        labels, bound, group = groups[n]
+        for key, block in group.get(tuple(assignment[labels[position]] for position in bound), ()):
+            extended = dict(assignment)
+            for label, irrep in zip(labels, key):
+                if extended.setdefault(label, irrep) != irrep:
+                    break
+            else:
+                contract(n + 1, extended, blocks + [block])
+
+    contract(0, {}, [])
+
+    if not output:
+        return float(sum(result.values()))
+
+    symmetry = reduce(lambda x, y: x ^ y, (operand.symmetry for operand in operands), 0)
+    return IrrepTensor(''.join(spaces[label] for label in output), operands[0].irreps, symmetry, result)
+
+
+def from_blocks(blocks, irreps, symmetry=0):
+    """
+    Block a dictionary of dense tensors, such as f or eri for pq_graph code
+
+    :param blocks: dictionary of dense tensors keyed by their spaces (e.g. "oovv" or "abab_oovv")
+    :param irreps: dictionary of the irrep of each orbital in each space
+    :param symmetry: irrep of the tensors (default: 0)
+    :return: dictionary of IrrepTensors with the same keys
+    """
+    return {name: IrrepTensor.from_dense(array, name.split('_')[-1], irreps, symmetry)
+            for name, array in blocks.items()}
+
+
+class _IrrepNumpy:
+    """numpy, with the einsum of this module"""
+
+    einsum = staticmethod(einsum)
+
+    def __getattr__(self, name):
+        return getattr(np, name)
+
+
+def irrep_namespace():
+    """
+    Globals for running pq_graph python code on IrrepTensors
+
+    :return: dictionary with np and einsum
+    """
+    return {"np": _IrrepNumpy(), "einsum": einsum}
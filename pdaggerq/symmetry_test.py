@@ -0,0 +1,101 @@
+#
+# pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
+# Copyright (C) 2020 A. Eugene DePrince III
+#
+# This file is part of the pdaggerq package.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import re
+
+import numpy as np
+
+import pdaggerq
+from pdaggerq.symmetry import IrrepTensor, einsum, from_blocks, irrep_namespace
+
+# C2v: four irreps, orbitals deliberately not sorted by irrep
+IRREPS = {'o': [0, 2, 0, 3, 1], 'v': [1, 0, 3, 0, 2, 1, 3]}
+
+
+def test_einsum():
+    rng = np.random.default_rng(3)
+    a = IrrepTensor.from_dense(rng.standard_normal((5, 7)), "ov", IRREPS)
+    b = IrrepTensor.from_dense(rng.standard_normal((7, 7, 5, 5)), "vvoo", IRREPS, symmetry=2)
+
+    # forbidden blocks are dropped on the way in
+    assert len(a.blocks) < 16
+    assert np.allclose(IrrepTensor.from_dense(a.to_dense(), "ov", IRREPS).to_dense(), a.to_dense())
+
+    c = einsum('ia,abij->bj', a, b)
+    assert c.spaces == "vo" and c.symmetry == 2
+    assert np.allclose(c.to_dense(), np.einsum('ia,abij->bj', a.to_dense(), b.to_dense()))
+    assert np.isclose(einsum('ia,ia->', a, a), np.sum(a.to_dense() ** 2))
+
+    # more than two operands are contracted pairwise, including through a scalar
+    e = einsum('ia,ia,bj->jb', a, a, c, optimize='optimal')
+    assert np.allclose(e.to_dense(), np.einsum('ia,ia,bj->jb', a.to_dense(), a.to_dense(), c.to_dense()))
+
+    d = 2.0 * c - c.copy()
+    d += c
+    assert np.allclose(np.asarray(d), 2.0 * c.to_dense())
+
+
+def test_dense_dtype():
+    rng = np.random.default_rng(5)
+    dense = rng.standard_normal((5, 7)) + 1j * rng.standard_normal((5, 7))
+
+    # complex and single-precision blocks keep their dtype
+    z = IrrepTensor.from_dense(dense, "ov", IRREPS)
+    assert z.to_dense().dtype == np.complex128
+    assert np.allclose(z.to_dense(), IrrepTensor.from_dense(dense.real, "ov", IRREPS).to_dense()
+                       + 1j * IrrepTensor.from_dense(dense.imag, "ov", IRREPS).to_dense())
+    assert IrrepTensor.zeros("ov", IRREPS, dtype=np.float32).to_dense().dtype == np.float32
+    assert np.asarray(z, dtype=np.complex64).dtype == np.complex64
+
+
+def test_ccsd_residuals():
+    graph = pdaggerq.pq_graph({'print_level': 0})
+    for name, proj in [('singles_resid', [['e1(i,a)']]), ('doubles_resid', [['e2(i,j,b,a)']])]:
+        pq = pdaggerq.pq_helper('fermi')
+        pq.set_print_level(0)
+        pq.set_left_operators(proj)
+        pq.add_st_operator(1.0, ['f'], ['t1', 't2'])
+        pq.add_st_operator(1.0, ['v'], ['t1', 't2'])
+        pq.simplify()
+        graph.add(pq, name, ['a', 'b', 'i', 'j'])
+    graph.optimize()
+    code = graph.str("python")
+
+    # random totally symmetric inputs
+    rng = np.random.default_rng(5)
+    dims = {space: len(irreps) for space, irreps in IRREPS.items()}
+    def random_tensor(spaces):
+        array = rng.standard_normal(tuple(dims[space] for space in spaces))
+        return IrrepTensor.from_dense(array, spaces, IRREPS).to_dense()
+    dense = {'t1': random_tensor('vo'), 't2': random_tensor('vvoo'),
+             'f': {block: random_tensor(block) for block in set(re.findall(r'f\["(\w+)"\]', code))},
+             'eri': {block: random_tensor(block) for block in set(re.findall(r'eri\["(\w+)"\]', code))}}
+    blocked = {'t1': IrrepTensor.from_dense(dense['t1'], "vo", IRREPS),
+               't2': IrrepTensor.from_dense(dense['t2'], "vvoo", IRREPS),
+               'f': from_blocks(dense['f'], IRREPS), 'eri': from_blocks(dense['eri'], IRREPS)}
+
+    def evaluate(namespace, inputs):
+        scope = {**namespace, 'tmps_': {}, 'scalars_': {}, 'reused_': {}, **inputs}
+        exec("def evaluate_equations():\n" + code + "\n    return locals()\n", scope)
+        return scope['evaluate_equations']()
+
+    reference = evaluate({'np': np, 'einsum': np.einsum}, dense)
+    residuals = evaluate(irrep_namespace(), blocked)
+    for name in ['singles_resid', 'doubles_resid']:
+        assert isinstance(residuals[name], IrrepTensor)
+        assert np.allclose(residuals[name].to_dense(), reference[name])
@@ -1,9 +1,10 @@
-def get_spin_labels(ops):
+def get_spin_labels(ops, closed_shell=False):
     """
     Get spin labels for the given operators.
 
     Args:
         ops (list): List of operators.
+        closed_shell (bool): Keep only the spin blocks that are unique for a closed-shell reference.
 
     Returns:
         dict: Dictionary mapping spin types to label-spin mappings.
@@ -40,6 +41,12 @@ def get_spin_labels(ops):
         )
     )
 
+    # for a closed-shell reference, the aa and abab blocks determine all others
+    if closed_shell:
+        if len(labels) not in (1, 2, 4):
+            raise ValueError("Closed-shell spin blocking only supports one- and two-body equations")
+        spin_types = [spin for spin in spin_types if spin in ("a", "aa", "abab")]
+
     # create a mapping of labels to spins for each spin type
     for spin in spin_types:
         if len(labels) != len(spin):
@@ -49,7 +56,7 @@ def get_spin_labels(ops):
 
     return spin_map
 
-def block_by_spin(pq, eqname, ops, eqs):
+def block_by_spin(pq, eqname, ops, eqs, closed_shell=False):
     """
     Block the equation by spin and store the result in the equations dictionary.
 
@@ -58,8 +65,11 @@ def block_by_spin(pq, eqname, ops, eqs):
         eqname (str): Name of the equation.
         ops (list): List of operators.
         eqs (dict): Dictionary to store the derived equations.
+        closed_shell (bool): Assume a closed-shell reference. Only the unique spin block is kept, and it is
+            stored under eqname in terms of spatial orbitals (see pq_helper.set_closed_shell).
     """
-    spin_map = get_spin_labels(ops)
+    spin_map = get_spin_labels(ops, closed_shell)
+    pq.set_closed_shell(closed_shell)
 
     # print the blocking by spin
     print("Blocking by spin:", flush=True)
@@ -67,15 +77,15 @@ def block_by_spin(pq, eqname, ops, eqs):
         print(f"{spins} ->", ", ".join(f"{label} -> {spin}" for label, spin in label_to_spin.items()), flush=True)
     print()
 
-    # create equations for each spin block
-    for spins, label_to_spin in spin_map.items():
-        spin_eqname = eqname if spins == "" else eqname + "_" + spins
-        pq.block_by_spin(label_to_spin)
+    # create equations for all spin blocks in one pass over the strings
+    spin_cases = pq.block_by_spin_all(list(spin_map.values()))
+    for spins, spin_case in zip(spin_map, spin_cases):
+        spin_eqname = eqname if spins == "" or closed_shell else eqname + "_" + spins
 
         # store the equation in the dictionary
-        eqs[spin_eqname] = pq.clone()
+        eqs[spin_eqname] = spin_case
 
         # print the fully contracted strings
         print(f"Equation {spin_eqname}:", flush=True)
-        for term in pq.strings():
+        for term in spin_case.strings():
             print(term, flush=True)
@@ -403,7 +403,7 @@ def residuals(t1, t2, f, eri):
     return rt1, rt2
 
 def kernel(t1, t2, fock, g, o, v, e_ai, e_abij, max_iter=100, stopping_eps=1.0E-12,
-           diis_size=None, diis_start_cycle=4):
+           diis_size=None, diis_start_cycle=4, precision=None):
 
     # initialize diis if diis_size is not None
     # else normal scf iterate
@@ -418,12 +418,22 @@ def kernel(t1, t2, fock, g, o, v, e_ai, e_abij, max_iter=100, stopping_eps=1.0E-
     old_energy = ccsd_energy(t1, t2, fock, g, o, v)
     f_map, g_map = integral_maps(fock, g, o, v)
 
+    # residuals are evaluated in the precision of the policy (a pdaggerq.precision.MixedPrecision;
+    # float64 throughout by default); the amplitudes, energies, and diis vectors stay in float64
+    f_map_p, g_map_p = (f_map, g_map) if precision is None else precision.cast(f_map, g_map)
+
     for idx in range(max_iter):
 
-        singles_res, doubles_res = residuals(t1, t2, f_map, g_map)
+        t1_p, t2_p = (t1, t2) if precision is None else precision.cast(t1, t2)
+        singles_res, doubles_res = residuals(t1_p, t2_p, f_map_p, g_map_p)
+        if precision is not None and precision.update(np.linalg.norm(singles_res) + np.linalg.norm(doubles_res)):
+            f_map_p, g_map_p = precision.cast(f_map, g_map)
+            if diis_size is not None:
+                diis_update.reset()
 
-        singles_res += fock_e_ai * t1
-        doubles_res += fock_e_abij * t2
+        # not in place, so float32 residuals are promoted to the float64 amplitudes
+        singles_res = singles_res + fock_e_ai * t1
+        doubles_res = doubles_res + fock_e_abij * t2
 
         new_singles = singles_res * e_ai
         new_doubles = doubles_res * e_abij
@@ -442,7 +452,7 @@ def kernel(t1, t2, fock, g, o, v, e_ai, e_abij, max_iter=100, stopping_eps=1.0E-
         current_energy = ccsd_energy(new_singles, new_doubles, fock, g, o, v)
         delta_e = np.abs(old_energy - current_energy)
 
-        if delta_e < stopping_eps:
+        if delta_e < stopping_eps and (precision is None or precision.high_precision):
             return new_singles, new_doubles
         else:
             t1 = new_singles
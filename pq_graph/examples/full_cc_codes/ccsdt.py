@@ -947,7 +947,7 @@ def integral_maps(f, eri, o, v):
 
 
 def kernel(t1, t2, t3, fock, g, o, v, e_ai, e_abij, e_abcijk, hf_energy, max_iter=100,
-           stopping_eps=1.0E-8, diis_size=None, diis_start_cycle=4):
+           stopping_eps=1.0E-8, diis_size=None, diis_start_cycle=4, precision=None):
     """
 
     :param t1: spin-orbital t1 amplitudes (nvirt x nocc)
@@ -965,6 +965,7 @@ def kernel(t1, t2, t3, fock, g, o, v, e_ai, e_abij, e_abcijk, hf_energy, max_ite
     :param hf_energy: the hartree-fock energy
     :param max_iter: Total number of CC iterations allowed
     :param stopping_eps: stopping criteria for residual l2-norm
+    :param precision: pdaggerq.precision.MixedPrecision policy for the residuals (default: float64)
     """
 
     # initialize diis if diis_size is not None
@@ -982,14 +983,23 @@ def kernel(t1, t2, t3, fock, g, o, v, e_ai, e_abij, e_abcijk, hf_energy, max_ite
     old_energy = cc_energy(t1, t2, fock, g, o, v)
     f_map, g_map = integral_maps(fock, g, o, v)
 
+    # residuals are evaluated in the precision of the policy (a pdaggerq.precision.MixedPrecision;
+    # float64 throughout by default); the amplitudes, energies, and diis vectors stay in float64
+    f_map_p, g_map_p = (f_map, g_map) if precision is None else precision.cast(f_map, g_map)
+
     print("    ==> CCSDT amplitude equations <==")
     print("")
     print("     Iter               Energy                 |dE|                 |dT|")
     for idx in range(max_iter):
 
-        residual_singles, residual_doubles, residual_triples = residuals(t1, t2, t3, f_map, g_map)
+        t1_p, t2_p, t3_p = (t1, t2, t3) if precision is None else precision.cast(t1, t2, t3)
+        residual_singles, residual_doubles, residual_triples = residuals(t1_p, t2_p, t3_p, f_map_p, g_map_p)
 
         res_norm = np.linalg.norm(residual_singles) + np.linalg.norm(residual_doubles) + np.linalg.norm(residual_triples)
+        if precision is not None and precision.update(res_norm):
+            f_map_p, g_map_p = precision.cast(f_map, g_map)
+            if diis_size is not None:
+                diis_update.reset()
         singles_res = residual_singles + fock_e_ai * t1
         doubles_res = residual_doubles + fock_e_abij * t2
         triples_res = residual_triples + fock_e_abcijk * t3
@@ -1014,7 +1024,7 @@ def kernel(t1, t2, t3, fock, g, o, v, e_ai, e_abij, e_abcijk, hf_energy, max_ite
         delta_e = np.abs(old_energy - current_energy)
 
         print("    {: 5d} {: 20.12f} {: 20.12f} {: 20.12f}".format(idx, current_energy - hf_energy, delta_e, res_norm))
-        if delta_e < stopping_eps and res_norm < stopping_eps:
+        if delta_e < stopping_eps and res_norm < stopping_eps and (precision is None or precision.high_precision):
             # assign t1 and t2 variables for future use before breaking
             t1 = new_singles
             t2 = new_doubles
@@ -35,9 +35,6 @@ using std::endl;
 
 namespace pdaggerq {
 
-    struct TermHash;
-    struct TermEqual;
-
     /**
      * Equation class
      * Represents an equation in the form of a vector of terms
@@ -54,6 +51,9 @@ namespace pdaggerq {
         scaling_map flop_map_; // map of flop scaling with linkage occurrence in equation
         scaling_map mem_map_; // map of memory scaling with linkage occurrence in equation
 
+        friend struct graph_writer; // PQGraph::save
+        friend struct graph_reader; // PQGraph::load
+
     public:
         static inline size_t nthreads_ = 1; // number of threads to use when substituting
         static inline bool permuted_merge_ = false; // whether to merge terms with permutations
@@ -273,13 +273,13 @@ namespace pdaggerq {
         void insert(const Term& term, int index = 0);
 
         /**
-         * This finds terms that have the same rhs and merges them
+         * This finds terms that have the same rhs up to the names of their summed indices and merges
+         * them. Each term gets a canonical key with the summed indices relabeled in order of appearance
+         * (built in parallel over terms), and terms with equal keys are merged into the first of them.
+         * @return number of terms removed
          */
         size_t merge_terms();
 
-        // data structure that maps terms to their count_, comments, and net coefficient using a hash table
-        typedef unordered_map<Term, pair<size_t, pair<string, double>>, TermHash, TermEqual> merge_map_type;
-
         /**
          * Gets pointer to terms that contain a given linkage
          * @param linkage linkage to search for
@@ -288,8 +288,8 @@ namespace pdaggerq {
         set<Term *> get_temp_terms(const LinkagePtr& linkage);
 
         /**
-         * Make a deep copy of the equation, making new shared pointers for vertices and linkages
-         * @return deep copy of the equation
+         * Copy the equation. The terms are copied, but their vertices and linkages are shared with this equation
+         * @return copy of the equation
          */
         Equation clone() const;
 
@@ -28,10 +28,13 @@
 #include <unordered_set>
 #include <memory>
 #include <mutex>
+#include <atomic>
+#include <functional>
 #include <utility>
 
 #include "vertex.h"
 #include "scaling_map.hpp"
+#include "linkage_cache.hpp"
 
 using std::ostream;
 using std::string;
@@ -107,6 +110,9 @@ namespace pdaggerq {
         mutable vertex_vector link_vector_; // all non-intermediate vertices from linkages
         mutable linkage_vector permutations_; // all permutations of the linkage
 
+        friend struct graph_writer; // PQGraph::save
+        friend struct graph_reader; // PQGraph::load
+
     public:
         long id_ = -1; // id of the linkage (default to -1 if not set)
         size_t depth_{}; // number of vertices in the linkage
@@ -374,11 +380,23 @@ namespace pdaggerq {
          * @return vector of permutations
          */
          static inline bool low_memory_ = false; // whether to store permutations in memory for lazy evaluation
+         static inline std::atomic<size_t> cache_hits_{0}; // lookups of permutations / link vectors served from memory
+         static inline std::atomic<size_t> cache_misses_{0}; // lookups of permutations / link vectors that were generated
         linkage_vector permutations(bool regenerate = false) const;
 
+        /// best orders of linkages, kept on disk between runs (see the 'cache' option of pq_graph)
+        static inline linkage_cache order_cache_;
+
+        /**
+         * fingerprint of the rules used to find the best permutation. Cache files with another fingerprint are ignored.
+         * @return fingerprint string
+         */
+        static string order_fingerprint();
+
         /**
          * Return the best permutation of the linkage that minimizes the number of contractions and memory
          * @return best permutation of the linkage
+         * @note the best order is looked up in order_cache_ first if it is enabled
          */
         LinkagePtr best_permutation() const;
 
@@ -389,6 +407,14 @@ namespace pdaggerq {
          */
         linkage_vector subgraphs(size_t max_depth) const;
 
+        /**
+         * Visit each unique subgraph of the linkage, one at a time. Only the path to the current subgraph and the
+         * addresses of the subgraphs already visited are kept, so no more than one candidate is alive at once.
+         * @param max_depth maximum depth of subgraphs visited
+         * @param visit function called with a shallow copy of each subgraph
+         */
+        void subgraphs(size_t max_depth, const std::function<void(const LinkagePtr &)> &visit) const;
+
         /**
          * find all linked scalars within the linkage
          * @return vector of all linked scalars within the linkage
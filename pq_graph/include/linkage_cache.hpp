@@ -0,0 +1,241 @@
+//
+// pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
+// Filename: linkage_cache.hpp
+// Copyright (C) 2020 A. Eugene DePrince III
+//
+// Author: A. Eugene DePrince III <adeprince@fsu.edu>
+// Maintainer: DePrince group
+//
+// This file is part of the pdaggerq package.
+//
+//  Licensed under the Apache License, Version 2.0 (the "License");
+//  you may not use this file except in compliance with the License.
+//  You may obtain a copy of the License at
+//
+//      http://www.apache.org/licenses/LICENSE-2.0
+//
+//  Unless required by applicable law or agreed to in writing, software
+//  distributed under the License is distributed on an "AS IS" BASIS,
+//  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//  See the License for the specific language governing permissions and
+//  limitations under the License.
+//
+
+#ifndef PDAGGERQ_LINKAGE_CACHE_HPP
+#define PDAGGERQ_LINKAGE_CACHE_HPP
+
+#include <atomic>
+#include <cstdint>
+#include <cstdio>
+#include <fstream>
+#include <list>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+namespace pdaggerq {
+
+    /**
+     * Least-recently-used cache of the best contraction order of linkages, kept on disk between runs.
+     * Keys describe the vertices of a linkage in their current order; values are the permutation of those vertices
+     * found by Linkage::best_permutation (empty if the current order is already the best).
+     * A cache file written with a different fingerprint (version or options) is ignored.
+     */
+    class linkage_cache {
+
+    public:
+        typedef std::vector<uint8_t> order_type;
+
+    private:
+        typedef std::list<std::pair<std::string, order_type>> entry_list;
+
+        mutable std::mutex mtx_; // mutex for thread safety
+        entry_list entries_; // entries from most to least recently used
+        std::unordered_map<std::string, entry_list::iterator> index_; // map of keys to entries
+        size_t capacity_ = 100000; // maximum number of entries
+        std::string filename_; // file the cache is loaded from and saved to (disabled if empty)
+
+        /// drop least recently used entries beyond the capacity
+        void evict() {
+            while (entries_.size() > capacity_) {
+                index_.erase(entries_.back().first);
+                entries_.pop_back();
+            }
+        }
+
+        template<typename T>
+        static void write(std::ofstream &out, const T &value) {
+            out.write(reinterpret_cast<const char *>(&value), sizeof(T));
+        }
+
+        template<typename T>
+        static void read(std::ifstream &in, T &value) {
+            in.read(reinterpret_cast<char *>(&value), sizeof(T));
+        }
+
+        static void write(std::ofstream &out, const std::string &value) {
+            write(out, value.size());
+            out.write(value.data(), (std::streamsize) value.size());
+        }
+
+        static void read(std::ifstream &in, std::string &value) {
+            size_t size = 0;
+            read(in, size);
+            value.resize(size);
+            in.read(value.data(), (std::streamsize) size);
+        }
+
+    public:
+
+        std::atomic<size_t> hits_{0}; // lookups served from the cache
+        std::atomic<size_t> misses_{0}; // lookups of linkages not in the cache
+
+        /**
+         * whether a cache file is in use
+         */
+        bool enabled() const { return !filename_.empty(); }
+
+        /**
+         * number of entries in the cache
+         */
+        size_t size() const {
+            std::lock_guard<std::mutex> lock(mtx_);
+            return entries_.size();
+        }
+
+        /**
+         * maximum number of entries
+         */
+        size_t capacity() const {
+            std::lock_guard<std::mutex> lock(mtx_);
+            return capacity_;
+        }
+
+        /**
+         * set the maximum number of entries
+         * @param capacity maximum number of entries
+         */
+        void set_capacity(size_t capacity) {
+            std::lock_guard<std::mutex> lock(mtx_);
+            capacity_ = capacity;
+            evict();
+        }
+
+        /**
+         * find the order stored for a key and mark it as most recently used
+         * @param key key of the linkage
+         * @param order order of the vertices (set if found)
+         * @return whether the key was found
+         */
+        bool find(const std::string &key, order_type &order) {
+            std::lock_guard<std::mutex> lock(mtx_);
+            auto it = index_.find(key);
+            if (it == index_.end()) {
+                ++misses_;
+                return false;
+            }
+            entries_.splice(entries_.begin(), entries_, it->second);
+            order = it->second->second;
+            ++hits_;
+            return true;
+        }
+
+        /**
+         * store the order for a key as the most recently used entry
+         * @param key key of the linkage
+         * @param order order of the vertices
+         */
+        void insert(const std::string &key, const order_type &order) {
+            std::lock_guard<std::mutex> lock(mtx_);
+            auto it = index_.find(key);
+            if (it != index_.end()) {
+                it->second->second = order;
+                entries_.splice(entries_.begin(), entries_, it->second);
+                return;
+            }
+            entries_.emplace_front(key, order);
+            index_[key] = entries_.begin();
+            evict();
+        }
+
+        /**
+         * clear all entries
+         */
+        void clear() {
+            std::lock_guard<std::mutex> lock(mtx_);
+            entries_.clear();
+            index_.clear();
+        }
+
+        /**
+         * use a cache file, loading its entries if it exists and matches the fingerprint
+         * @param filename name of the cache file
+         * @param fingerprint version and options the entries depend on
+         * @return number of entries loaded
+         */
+        size_t open(const std::string &filename, const std::string &fingerprint) {
+            std::lock_guard<std::mutex> lock(mtx_);
+            filename_ = filename;
+
+            std::ifstream in(filename, std::ios::binary);
+            if (!in) return 0; // no cache yet
+
+            std::string file_fingerprint;
+            read(in, file_fingerprint);
+            if (!in || file_fingerprint != fingerprint) return 0; // stale cache; overwritten on save
+
+            size_t num_entries = 0, num_loaded = 0;
+            read(in, num_entries);
+            for (size_t i = 0; i < num_entries && in; ++i) {
+                std::string key;
+                read(in, key);
+                size_t order_size = 0;
+                read(in, order_size);
+                order_type order(order_size);
+                in.read(reinterpret_cast<char *>(order.data()), (std::streamsize) order_size);
+                if (!in) break;
+
+                // entries are stored from most to least recently used; keep entries already in memory
+                if (index_.find(key) != index_.end()) continue;
+                entries_.emplace_back(std::move(key), std::move(order));
+                index_[entries_.back().first] = std::prev(entries_.end());
+                ++num_loaded;
+            }
+            evict();
+            return num_loaded;
+        }
+
+        /**
+         * write the entries to the cache file (a partially written file never replaces the last one)
+         * @param fingerprint version and options the entries depend on
+         */
+        void save(const std::string &fingerprint) const {
+            std::lock_guard<std::mutex> lock(mtx_);
+            if (filename_.empty()) return;
+
+            std::string tmp_file = filename_ + ".tmp";
+            {
+                std::ofstream out(tmp_file, std::ios::binary | std::ios::trunc);
+                if (!out) throw std::invalid_argument("could not open '" + tmp_file + "' for writing");
+
+                write(out, fingerprint);
+                write(out, entries_.size());
+                for (const auto &[key, order] : entries_) {
+                    write(out, key);
+                    write(out, order.size());
+                    out.write(reinterpret_cast<const char *>(order.data()), (std::streamsize) order.size());
+                }
+                if (!out) throw std::invalid_argument("could not write '" + tmp_file + "'");
+            }
+            if (std::rename(tmp_file.c_str(), filename_.c_str()) != 0)
+                throw std::invalid_argument("could not write linkage cache '" + filename_ + "'");
+        }
+
+    }; // class linkage_cache
+
+} // pdaggerq
+
+#endif //PDAGGERQ_LINKAGE_CACHE_HPP
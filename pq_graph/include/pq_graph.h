@@ -33,11 +33,13 @@
 #include <string>
 #include <vector>
 #include <fstream>
+#include <functional>
+#include <chrono>
 #include <fcntl.h>
 
 #include "../../pdaggerq/pq_helper.h"
 #include "equation.h"
-#include "timer.h"
+#include "../../pdaggerq/pq_timer.h"
 
 using std::ofstream;
 
@@ -74,16 +76,24 @@ namespace pdaggerq {
         Timer substitute_timer; // timer for the substitute function
 
         Timer update_timer; // timer for updating equations
+        Timer merge_timer; // timer for merging terms
+        Timer fusion_timer; // timer for fusing intermediates
+        Timer prune_timer; // timer for pruning intermediates
+
+        /// counters for stats()
+        size_t num_candidates_ = 0; // number of candidate linkages tested for substitution
+        size_t num_substitutions_ = 0; // number of substitutions applied to terms
+        size_t num_merged_ = 0; // number of terms merged
+        size_t num_fused_ = 0; // number of terms removed by fusion of intermediates
+        size_t num_pruned_ = 0; // number of intermediates removed by pruning
+
+        /// function called with the name of each completed pass and this pq_graph
+        std::function<void(const string &, const PQGraph &)> stats_callback_;
 
         /// scaling of the equations
         scaling_map flop_map_; // map of flop scaling with linkage occurrence in all equations
         scaling_map mem_map_; // map of memory scaling with linkage occurrence in all equations
 
-        // TODO: replace with pointers to copies of the PQGraph
-        shared_ptr<PQGraph> original_; // original pq_graph before optimization
-        shared_ptr<PQGraph> reordered_; // pq_graph after reordering
-        shared_ptr<PQGraph> optimized_; // pq_graph after optimization (should be this pq_graph)
-
         scaling_map flop_map_init_; // map of flop scaling before reordering
         scaling_map mem_map_init_; // map of memory scaling before reordering
         size_t num_terms_init_ = 0; // number of terms before optimization
@@ -130,9 +140,35 @@ namespace pdaggerq {
         /// whether to use density fitted integrals
         bool use_density_fitting_ = false;
 
+        /// whether python contractions over density-fitting lines are accumulated in batches of 'q_batch_'
+        bool batch_density_ = false;
+
         /// whether the equations have any sigma vectors
         bool has_sigma_vecs_ = false;
 
+        /**
+         * minimum fraction of contractions a round of fusion must remove for fusion to continue
+         *   0.0 (default): fuse until no more terms can be fused
+         */
+        double fusion_threshold_ = 0.0;
+
+        /// file for checkpoints written by optimize() (no checkpoints if empty)
+        string checkpoint_file_;
+
+        /// minimum number of seconds between checkpoints within a substitution pass
+        double checkpoint_interval_ = 600.0;
+        std::chrono::steady_clock::time_point last_checkpoint_; // time of the last checkpoint
+
+        /**
+         * last completed pass of optimize()
+         *     0: none
+         *     1: merging and reordering
+         *     2: substitution of scalars
+         *     3: substitution of intermediates (or separation of reusable intermediates with separate_sigma)
+         *     4: substitution of all intermediates (only with separate_sigma)
+         */
+        size_t optimize_stage_ = 0;
+
     public:
 
         // default constructor
@@ -144,6 +180,9 @@ namespace pdaggerq {
             reorder_timer.precision_    = 2;
             build_timer.precision_      = 2;
             update_timer.precision_     = 2;
+            merge_timer.precision_      = 2;
+            fusion_timer.precision_     = 2;
+            prune_timer.precision_      = 2;
 
             set_options(options);
         }
@@ -195,7 +234,50 @@ namespace pdaggerq {
          * clears everything in the builder
          */
         void clear() {
+            auto callback = stats_callback_;
             *this = PQGraph();   // reset the builder
+            stats_callback_ = callback;
+        }
+
+        /**
+         * timings and counters of each pass as a python dictionary
+         * @note the cache counters are shared by all linkages in the process
+         * @return dictionary of stats
+         */
+        pybind11::dict stats() const;
+
+        /**
+         * write the equations, intermediates, temp counters and options to a binary file
+         * @param filename name of the file
+         */
+        void save(const string &filename) const;
+
+        /**
+         * read a pq_graph written by save(). optimize() resumes a partially optimized graph after its last completed pass
+         * @param filename name of the file
+         */
+        void load(const string &filename);
+
+        /**
+         * save to the checkpoint file (if any)
+         * @param force whether to save even if checkpoint_interval has not elapsed since the last checkpoint
+         */
+        void checkpoint(bool force);
+
+        /**
+         * set a function to be called whenever a pass completes
+         * @param callback function called with the name of the pass and this pq_graph (empty to disable)
+         */
+        void set_stats_callback(std::function<void(const string &, const PQGraph &)> callback) {
+            stats_callback_ = std::move(callback);
+        }
+
+        /**
+         * call the stats callback (if any) for a completed pass
+         * @param pass name of the pass
+         */
+        void report_stats(const string &pass) const {
+            if (stats_callback_) stats_callback_(pass, *this);
         }
 
         /**
@@ -228,7 +310,9 @@ namespace pdaggerq {
         size_t merge_terms();
 
         /**
-         * factor intermediate terms with the same rhs
+         * factor intermediate terms with the same rhs. Rounds of fusion are repeated until no more terms fuse
+         * or a round removes less than fusion_threshold_ of the contractions.
+         * @return number of terms removed by fusion
          */
         size_t merge_intermediates();
 
@@ -276,7 +360,7 @@ namespace pdaggerq {
 
         /**
          * turn pq_graph into a string
-         * @param print_type type of print (c++ or python)
+         * @param print_type type of print (c++, python, or native for c++ with the pq_graph runtime)
          * @return string representation of the pq_graph
          */
         string str(const string &print_type) const;
@@ -330,8 +414,8 @@ namespace pdaggerq {
         void reindex();
 
         /**
-         * deep copy of the pq_graph
-         * @return deep copy of the pq_graph
+         * copy of the pq_graph that shares its vertices and linkages with this one
+         * @return copy of the pq_graph
          */
         PQGraph clone() const;
 
@@ -68,6 +68,9 @@ namespace pdaggerq {
         perm_list term_perms_; // list of permutation indices
         size_t perm_type_ = 0; // default is no permutation
 
+        friend struct graph_writer; // PQGraph::save
+        friend struct graph_reader; // PQGraph::load
+
     public:
 
         bool is_optimal_ = false; // flag for if term has optimal linkages (default is false)
@@ -78,6 +81,8 @@ namespace pdaggerq {
 
         static inline size_t max_depth_ = -1; // maximum number of rhs in a linkage (no limit by default)
         static inline shape max_shape_; // maximum shape of a linkage
+        static inline bool batch_density_ = false; // tile python contractions over density-fitting lines (q_batch_);
+                                                   // set from the graph option only while PQGraph::str prints
 
         typedef map<string, vector<string>> condition_map;
         static inline condition_map mapped_conditions_{}; // map of conditionals to their relevant operators
@@ -425,6 +430,12 @@ namespace pdaggerq {
         string str() const;
         string einsum_str() const;
 
+        /**
+         * Find the density-fitting line that is summed over in this term and that can be sliced into batches
+         * @return label of the line, or '\0' if the term cannot be batched
+         */
+        char batched_den_label() const;
+
         string operator+(const string &other) const{ return str() + other; }
         friend string operator+(const string &other, const Term &term){ return other + term.str(); }
         friend ostream &operator<<(ostream &os, const Term &term){
@@ -93,6 +93,8 @@ namespace pdaggerq {
         static inline bool use_trial_index = false;
         static inline bool permute_eri_ = true;
         static inline string print_type_ = "c++"; // default print type is c++
+        static inline bool native_runtime_ = false; // c++ output targets pq_runtime.hpp instead of TiledArray
+        static inline char batched_den_ = '\0'; // density-fitting line sliced by 'qb_' when printing (none by default)
 
         /****** Constructors ******/
 
@@ -0,0 +1,678 @@
+//
+// pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
+// Filename: pq_runtime.hpp
+// Copyright (C) 2020 A. Eugene DePrince III
+//
+// Author: A. Eugene DePrince III <adeprince@fsu.edu>
+// Maintainer: DePrince group
+//
+// This file is part of the pdaggerq package.
+//
+//  Licensed under the Apache License, Version 2.0 (the "License");
+//  you may not use this file except in compliance with the License.
+//  You may obtain a copy of the License at
+//
+//      http://www.apache.org/licenses/LICENSE-2.0
+//
+//  Unless required by applicable law or agreed to in writing, software
+//  distributed under the License is distributed on an "AS IS" BASIS,
+//  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//  See the License for the specific language governing permissions and
+//  limitations under the License.
+//
+
+#ifndef PDAGGERQ_PQ_RUNTIME_HPP
+#define PDAGGERQ_PQ_RUNTIME_HPP
+
+/**
+ * Header-only runtime for the C++ code printed by PQGraph::str("native").
+ *
+ * Tensors are dense, row-major, and indexed by comma-separated labels as in the TiledArray output:
+ *     X("a,b,i,j") += 0.5 * eri["vvvv"]("a,b,c,d") * t2("c,d,i,j");
+ * Products are evaluated pairwise, cheapest pair first, with parenthesized operands evaluated by themselves. Each pair
+ * is permuted to [shared, free, contracted] blocks and multiplied with cblas_dgemm. Define PQ_RUNTIME_NO_BLAS to use a
+ * plain loop instead of CBLAS.
+ *
+ * Storage is drawn from a pool of buffers, so intermediates released with Tensor::release() are reused by later
+ * intermediates of the same size.
+ */
+
+#include <algorithm>
+#include <cstring>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+#ifndef PQ_RUNTIME_NO_BLAS
+#include <cblas.h>
+#endif
+
+namespace pdaggerq::runtime {
+
+    typedef std::vector<std::string> label_vector;
+
+    /**
+     * Pool of tensor buffers, grouped by size
+     */
+    class buffer_pool {
+
+        std::mutex mtx_; // mutex for thread safety
+        std::unordered_map<size_t, std::vector<double *>> free_; // released buffers by size
+        size_t pooled_ = 0; // number of doubles held by released buffers
+
+        buffer_pool() = default;
+
+    public:
+
+        buffer_pool(const buffer_pool &) = delete;
+        buffer_pool &operator=(const buffer_pool &) = delete;
+
+        /**
+         * the pool shared by all tensors (never destroyed, so tensors may outlive static objects)
+         */
+        static buffer_pool &instance() {
+            static auto *pool = new buffer_pool();
+            return *pool;
+        }
+
+        /**
+         * get a buffer, reusing a released buffer of the same size if there is one
+         * @param size number of doubles
+         * @return uninitialized buffer
+         */
+        double *acquire(size_t size) {
+            {
+                std::lock_guard<std::mutex> lock(mtx_);
+                auto it = free_.find(size);
+                if (it != free_.end() && !it->second.empty()) {
+                    double *data = it->second.back();
+                    it->second.pop_back();
+                    pooled_ -= size;
+                    return data;
+                }
+            }
+            return new double[std::max<size_t>(size, 1)];
+        }
+
+        /**
+         * return a buffer to the pool
+         * @param data buffer from acquire
+         * @param size number of doubles
+         */
+        void release(double *data, size_t size) {
+            if (data == nullptr) return;
+            std::lock_guard<std::mutex> lock(mtx_);
+            free_[size].push_back(data);
+            pooled_ += size;
+        }
+
+        /**
+         * number of doubles held by released buffers
+         */
+        size_t pooled() {
+            std::lock_guard<std::mutex> lock(mtx_);
+            return pooled_;
+        }
+
+        /**
+         * free all released buffers
+         */
+        void clear() {
+            std::lock_guard<std::mutex> lock(mtx_);
+            for (auto &[size, buffers] : free_)
+                for (double *data : buffers) delete[] data;
+            free_.clear();
+            pooled_ = 0;
+        }
+
+    }; // class buffer_pool
+
+    class Tensor;
+    struct Expr;
+
+    /**
+     * A tensor with labels for its indices; the target or an operand of an expression
+     */
+    struct Labeled {
+        Tensor *tensor;
+        label_vector labels;
+
+        Labeled &operator=(const Expr &expr);
+        Labeled &operator=(const Labeled &other);
+        Labeled &operator+=(const Expr &expr);
+        Labeled &operator-=(const Expr &expr);
+    };
+
+    /**
+     * Dense row-major tensor
+     */
+    class Tensor {
+
+        std::vector<size_t> shape_; // extent of each index
+        size_t size_ = 0; // number of elements
+        double *data_ = nullptr; // elements (nullptr if not allocated)
+
+    public:
+
+        Tensor() = default;
+
+        /**
+         * allocate a tensor filled with zeros
+         * @param shape extent of each index
+         */
+        explicit Tensor(std::vector<size_t> shape) : shape_(std::move(shape)) {
+            size_ = 1;
+            for (size_t extent : shape_) size_ *= extent;
+            data_ = buffer_pool::instance().acquire(size_);
+            std::fill(data_, data_ + size_, 0.0);
+        }
+
+        /**
+         * allocate a tensor and copy its elements
+         * @param shape extent of each index
+         * @param values row-major elements
+         */
+        Tensor(std::vector<size_t> shape, const double *values) : Tensor(std::move(shape)) {
+            std::copy(values, values + size_, data_);
+        }
+
+        Tensor(const Tensor &other) : shape_(other.shape_), size_(other.size_) {
+            if (other.data_ == nullptr) return;
+            data_ = buffer_pool::instance().acquire(size_);
+            std::copy(other.data_, other.data_ + size_, data_);
+        }
+
+        Tensor(Tensor &&other) noexcept : shape_(std::move(other.shape_)), size_(other.size_), data_(other.data_) {
+            other.shape_.clear(); other.size_ = 0; other.data_ = nullptr;
+        }
+
+        Tensor &operator=(const Tensor &other) {
+            if (this != &other) *this = Tensor(other);
+            return *this;
+        }
+
+        Tensor &operator=(Tensor &&other) noexcept {
+            if (this == &other) return *this;
+            release();
+            shape_ = std::move(other.shape_); size_ = other.size_; data_ = other.data_;
+            other.shape_.clear(); other.size_ = 0; other.data_ = nullptr;
+            return *this;
+        }
+
+        ~Tensor() { release(); }
+
+        /**
+         * return the storage to the buffer pool; the tensor is empty until it is assigned again
+         */
+        void release() {
+            buffer_pool::instance().release(data_, size_);
+            shape_.clear(); size_ = 0; data_ = nullptr;
+        }
+
+        bool empty() const { return data_ == nullptr; }
+        size_t rank() const { return shape_.size(); }
+        size_t size() const { return size_; }
+        const std::vector<size_t> &shape() const { return shape_; }
+        double *data() { return data_; }
+        const double *data() const { return data_; }
+
+        /**
+         * label the indices of the tensor for use in an expression
+         * @param labels comma-separated labels, one per index
+         */
+        Labeled operator()(const std::string &labels) {
+            label_vector split;
+            size_t start = 0;
+            while (start <= labels.size()) {
+                size_t end = labels.find(',', start);
+                if (end == std::string::npos) end = labels.size();
+                if (end > start) split.push_back(labels.substr(start, end - start));
+                start = end + 1;
+            }
+            return {this, split};
+        }
+
+    }; // class Tensor
+
+    typedef std::map<std::string, Tensor> tensor_map;
+    typedef std::map<std::string, double> scalar_map;
+
+    /**
+     * operand of a product: a labeled tensor or a parenthesized expression
+     */
+    struct Factor {
+        Tensor *tensor = nullptr;
+        label_vector labels;
+        std::shared_ptr<const Expr> nested;
+    };
+
+    /**
+     * scaled product of factors
+     */
+    struct Product {
+        double coefficient = 1.0;
+        std::vector<Factor> factors;
+    };
+
+    /**
+     * sum of products
+     */
+    struct Expr {
+        std::vector<Product> products;
+
+        Expr() = default;
+        Expr(const Labeled &labeled) { // NOLINT(google-explicit-constructor): allows X("i") = Y("i")
+            products.push_back({1.0, {{labeled.tensor, labeled.labels, nullptr}}});
+        }
+    };
+
+    inline Expr operator*(double scale, const Expr &expr) {
+        Expr scaled = expr;
+        for (auto &product : scaled.products) product.coefficient *= scale;
+        return scaled;
+    }
+
+    inline Expr operator*(const Expr &expr, double scale) { return scale * expr; }
+
+    inline Expr operator*(const Expr &left, const Expr &right) {
+        // C++ multiplies from the left, so the left operand extends the chain of factors; a sum, or a product on the
+        // right (parenthesized), is evaluated by itself
+        auto nest = [](const Expr &expr) -> Product {
+            return {1.0, {{nullptr, {}, std::make_shared<const Expr>(expr)}}};
+        };
+        bool single_right = right.products.size() == 1 && right.products.front().factors.size() == 1;
+
+        Product product = left.products.size() == 1 ? left.products.front() : nest(left);
+        Product right_product = single_right ? right.products.front() : nest(right);
+        product.coefficient *= right_product.coefficient;
+        product.factors.insert(product.factors.end(), right_product.factors.begin(), right_product.factors.end());
+
+        Expr result;
+        result.products.push_back(std::move(product));
+        return result;
+    }
+
+    inline Expr operator+(const Expr &left, const Expr &right) {
+        Expr sum = left;
+        sum.products.insert(sum.products.end(), right.products.begin(), right.products.end());
+        return sum;
+    }
+
+    inline Expr operator-(const Expr &expr) { return -1.0 * expr; }
+    inline Expr operator-(const Expr &left, const Expr &right) { return left + (-1.0 * right); }
+
+    namespace detail {
+
+        typedef std::map<std::string, size_t> extent_map;
+
+        inline bool contains(const label_vector &labels, const std::string &label) {
+            return std::find(labels.begin(), labels.end(), label) != labels.end();
+        }
+
+        /// labels of an expression in order of first appearance
+        inline label_vector labels_of(const Expr &expr) {
+            label_vector labels;
+            for (const auto &product : expr.products) {
+                for (const auto &factor : product.factors) {
+                    label_vector factor_labels = factor.nested ? labels_of(*factor.nested) : factor.labels;
+                    for (const auto &label : factor_labels)
+                        if (!contains(labels, label)) labels.push_back(label);
+                }
+            }
+            return labels;
+        }
+
+        inline label_vector free_labels(const Expr &expr);
+
+        /// labels of a factor seen from outside of it (the free labels of a parenthesized expression)
+        inline label_vector labels_of(const Factor &factor) {
+            return factor.nested ? free_labels(*factor.nested) : factor.labels;
+        }
+
+        /// labels that are in exactly one factor of a product of the expression
+        inline label_vector free_labels(const Expr &expr) {
+            label_vector labels;
+            for (const auto &product : expr.products) {
+                std::map<std::string, size_t> counts;
+                label_vector order;
+                for (const auto &factor : product.factors) {
+                    for (const auto &label : labels_of(factor)) {
+                        if (counts[label]++ == 0) order.push_back(label);
+                    }
+                }
+                for (const auto &label : order)
+                    if (counts[label] == 1 && !contains(labels, label)) labels.push_back(label);
+            }
+            return labels;
+        }
+
+        /// record the extent of each label and check the operands
+        inline void collect_extents(const Expr &expr, extent_map &extents) {
+            for (const auto &product : expr.products) {
+                for (const auto &factor : product.factors) {
+                    if (factor.nested) { collect_extents(*factor.nested, extents); continue; }
+
+                    const Tensor &tensor = *factor.tensor;
+                    if (tensor.empty())
+                        throw std::invalid_argument("pq_runtime: a tensor is used before it is assigned");
+                    if (tensor.rank() != factor.labels.size())
+                        throw std::invalid_argument("pq_runtime: a tensor of rank " + std::to_string(tensor.rank())
+                                                    + " is labeled with " + std::to_string(factor.labels.size())
+                                                    + " indices");
+
+                    for (size_t i = 0; i < factor.labels.size(); ++i) {
+                        const std::string &label = factor.labels[i];
+                        if (std::count(factor.labels.begin(), factor.labels.end(), label) > 1)
+                            throw std::invalid_argument("pq_runtime: repeated label '" + label + "' in a tensor");
+
+                        auto [it, inserted] = extents.emplace(label, tensor.shape()[i]);
+                        if (!inserted && it->second != tensor.shape()[i])
+                            throw std::invalid_argument("pq_runtime: label '" + label + "' has extents "
+                                                        + std::to_string(it->second) + " and "
+                                                        + std::to_string(tensor.shape()[i]));
+                    }
+                }
+            }
+        }
+
+        /// shape of a tensor with the given labels
+        inline std::vector<size_t> shape_of(const label_vector &labels, const extent_map &extents) {
+            std::vector<size_t> shape;
+            for (const auto &label : labels) {
+                auto it = extents.find(label);
+                if (it == extents.end())
+                    throw std::invalid_argument("pq_runtime: label '" + label + "' is not in the expression");
+                shape.push_back(it->second);
+            }
+            return shape;
+        }
+
+        /// row-major strides of a shape
+        inline std::vector<size_t> strides_of(const std::vector<size_t> &shape) {
+            std::vector<size_t> strides(shape.size(), 1);
+            for (size_t i = shape.size(); i-- > 1;)
+                strides[i - 1] = strides[i] * shape[i];
+            return strides;
+        }
+
+        /**
+         * an intermediate result: either a borrowed input tensor or an owned tensor
+         */
+        struct Operand {
+            const Tensor *borrowed = nullptr;
+            Tensor owned;
+            label_vector labels;
+
+            const Tensor &tensor() const { return borrowed ? *borrowed : owned; }
+        };
+
+        /**
+         * sum the elements of a tensor into a tensor with a subset (and order) of its labels
+         * @param in tensor to transpose or reduce
+         * @param in_labels labels of in
+         * @param out_labels labels of the result (a subset of in_labels)
+         * @return tensor with the indices of out_labels
+         */
+        inline Tensor transpose(const Tensor &in, const label_vector &in_labels, const label_vector &out_labels) {
+            std::vector<size_t> in_strides = strides_of(in.shape());
+
+            std::vector<size_t> out_shape;
+            std::vector<size_t> out_strides_in; // stride in `in` of each output index
+            for (const auto &label : out_labels) {
+                size_t pos = std::find(in_labels.begin(), in_labels.end(), label) - in_labels.begin();
+                out_shape.push_back(in.shape()[pos]);
+                out_strides_in.push_back(in_strides[pos]);
+            }
+
+            // summed indices are iterated outside of the output indices
+            std::vector<size_t> sum_shape, sum_strides;
+            for (size_t i = 0; i < in_labels.size(); ++i) {
+                if (contains(out_labels, in_labels[i])) continue;
+                sum_shape.push_back(in.shape()[i]);
+                sum_strides.push_back(in_strides[i]);
+            }
+
+            Tensor out(out_shape);
+            if (out.size() == 0 || in.size() == 0) return out;
+
+            // iterate over an index space and call visit with the offset into `in`
+            auto odometer = [](const std::vector<size_t> &shape, const std::vector<size_t> &strides, auto &&visit) {
+                std::vector<size_t> index(shape.size(), 0);
+                size_t offset = 0;
+                while (true) {
+                    visit(offset);
+                    size_t d = shape.size();
+                    while (d > 0) {
+                        --d;
+                        if (++index[d] < shape[d]) { offset += strides[d]; break; }
+                        offset -= strides[d] * (shape[d] - 1);
+                        index[d] = 0;
+                        if (d == 0) return;
+                    }
+                    if (shape.empty()) return;
+                }
+            };
+
+            const double *in_data = in.data();
+            double *out_data = out.data();
+            odometer(sum_shape, sum_strides, [&](size_t sum_offset) {
+                size_t out_pos = 0;
+                odometer(out_shape, out_strides_in, [&](size_t offset) {
+                    out_data[out_pos++] += in_data[sum_offset + offset];
+                });
+            });
+            return out;
+        }
+
+        /// C[b] = A[b] * B[b] for row-major (m x k) A[b] and (k x n) B[b], optionally transposed
+        inline void batched_gemm(size_t batch, size_t m, size_t n, size_t k,
+                                 const double *a, bool trans_a, const double *b, bool trans_b, double *c) {
+            for (size_t p = 0; p < batch; ++p) {
+                const double *ap = a + p * m * k, *bp = b + p * k * n;
+                double *cp = c + p * m * n;
+#ifndef PQ_RUNTIME_NO_BLAS
+                cblas_dgemm(CblasRowMajor, trans_a ? CblasTrans : CblasNoTrans, trans_b ? CblasTrans : CblasNoTrans,
+                            (int) m, (int) n, (int) k, 1.0,
+                            ap, (int) std::max<size_t>(1, trans_a ? m : k),
+                            bp, (int) std::max<size_t>(1, trans_b ? k : n),
+                            0.0, cp, (int) std::max<size_t>(1, n));
+#else
+                std::fill(cp, cp + m * n, 0.0);
+                for (size_t i = 0; i < m; ++i) {
+                    for (size_t l = 0; l < k; ++l) {
+                        double ail = trans_a ? ap[l * m + i] : ap[i * k + l];
+                        for (size_t j = 0; j < n; ++j)
+                            cp[i * n + j] += ail * (trans_b ? bp[j * k + l] : bp[l * n + j]);
+                    }
+                }
+#endif
+            }
+        }
+
+        /**
+         * contract two operands, keeping the labels in keep
+         * @return operand with labels ordered as [shared, free left, free right]
+         */
+        inline Operand contract(const Operand &left, const Operand &right, const label_vector &keep,
+                                const extent_map &extents) {
+            label_vector batch, free_left, free_right, summed;
+            for (const auto &label : left.labels) {
+                bool shared = contains(right.labels, label), kept = contains(keep, label);
+                if (shared && kept) batch.push_back(label);
+                else if (shared) summed.push_back(label);
+                else if (kept) free_left.push_back(label);
+            }
+            for (const auto &label : right.labels)
+                if (!contains(left.labels, label) && contains(keep, label)) free_right.push_back(label);
+
+            auto concat = [](std::initializer_list<const label_vector *> parts) {
+                label_vector labels;
+                for (const auto *part : parts) labels.insert(labels.end(), part->begin(), part->end());
+                return labels;
+            };
+            auto extent = [&extents](const label_vector &labels) {
+                size_t size = 1;
+                for (const auto &label : labels) size *= extents.at(label);
+                return size;
+            };
+
+            // use the operand in place if it is already a (possibly transposed) matrix of each batch; else permute
+            auto arrange = [&](const Operand &operand, const label_vector &normal, const label_vector &transposed,
+                               Tensor &storage, bool &trans) -> const double * {
+                trans = false;
+                if (operand.labels == normal) return operand.tensor().data();
+                if (operand.labels == transposed) { trans = true; return operand.tensor().data(); }
+                storage = transpose(operand.tensor(), operand.labels, normal);
+                return storage.data();
+            };
+
+            Tensor left_storage, right_storage;
+            bool trans_left, trans_right;
+            const double *a = arrange(left, concat({&batch, &free_left, &summed}),
+                                      concat({&batch, &summed, &free_left}), left_storage, trans_left);
+            const double *b = arrange(right, concat({&batch, &summed, &free_right}),
+                                      concat({&batch, &free_right, &summed}), right_storage, trans_right);
+
+            Operand result;
+            result.labels = concat({&batch, &free_left, &free_right});
+            result.owned = Tensor(shape_of(result.labels, extents));
+
+            size_t m = extent(free_left), n = extent(free_right), k = extent(summed);
+            if (result.owned.size() > 0 && k > 0)
+                batched_gemm(extent(batch), m, n, k, a, trans_left, b, trans_right, result.owned.data());
+            return result;
+        }
+
+        inline Tensor evaluate(const Expr &expr, const label_vector &target, const extent_map &extents);
+
+        /// evaluate a product into a tensor with the target labels
+        inline Tensor evaluate(const Product &product, const label_vector &target, const extent_map &extents) {
+            const auto &factors = product.factors;
+
+            // labels of each factor
+            std::vector<label_vector> factor_labels;
+            for (const auto &factor : factors)
+                factor_labels.push_back(labels_of(factor));
+
+            auto operand = [&](size_t i) {
+                Operand op;
+                if (!factors[i].nested) {
+                    op.borrowed = factors[i].tensor;
+                    op.labels = factors[i].labels;
+                    return op;
+                }
+
+                // a parenthesized expression keeps its free labels and any label of the target
+                op.labels = factor_labels[i];
+                for (const auto &label : labels_of(*factors[i].nested))
+                    if (contains(target, label) && !contains(op.labels, label)) op.labels.push_back(label);
+                op.owned = evaluate(*factors[i].nested, op.labels, extents);
+                return op;
+            };
+
+            std::vector<Operand> operands;
+            for (size_t i = 0; i < factors.size(); ++i)
+                operands.push_back(operand(i));
+
+            // contract the cheapest pair until one operand is left; like np.einsum(optimize=...) for the python
+            // output, the order of a chain of three or more operands is left to the runtime
+            while (operands.size() > 1) {
+                size_t best_i = 0, best_j = 1;
+                double best_cost = -1.0;
+                for (size_t i = 0; i < operands.size(); ++i) {
+                    for (size_t j = i + 1; j < operands.size(); ++j) {
+                        label_vector pair_labels = operands[i].labels;
+                        for (const auto &label : operands[j].labels)
+                            if (!contains(pair_labels, label)) pair_labels.push_back(label);
+
+                        double cost = 1.0;
+                        for (const auto &label : pair_labels) cost *= (double) extents.at(label);
+                        if (best_cost < 0.0 || cost < best_cost) {
+                            best_cost = cost; best_i = i; best_j = j;
+                        }
+                    }
+                }
+
+                // keep the labels of the target and of the other operands
+                label_vector keep = target;
+                for (size_t k = 0; k < operands.size(); ++k) {
+                    if (k == best_i || k == best_j) continue;
+                    for (const auto &label : operands[k].labels)
+                        if (!contains(keep, label)) keep.push_back(label);
+                }
+
+                Operand contracted = contract(operands[best_i], operands[best_j], keep, extents);
+                operands.erase(operands.begin() + (long) best_j);
+                operands[best_i] = std::move(contracted);
+            }
+            Operand &result = operands.front();
+
+            for (const auto &label : target)
+                if (!contains(result.labels, label))
+                    throw std::invalid_argument("pq_runtime: label '" + label + "' of the target is not in a term");
+
+            Tensor out = result.labels == target && !result.borrowed
+                         ? std::move(result.owned)
+                         : transpose(result.tensor(), result.labels, target);
+            if (product.coefficient != 1.0)
+                for (size_t i = 0; i < out.size(); ++i) out.data()[i] *= product.coefficient;
+            return out;
+        }
+
+        /// evaluate a sum of products into a tensor with the target labels
+        inline Tensor evaluate(const Expr &expr, const label_vector &target, const extent_map &extents) {
+            Tensor out;
+            for (const auto &product : expr.products) {
+                Tensor term = evaluate(product, target, extents);
+                if (out.empty()) { out = std::move(term); continue; }
+                for (size_t i = 0; i < out.size(); ++i) out.data()[i] += term.data()[i];
+            }
+            return out;
+        }
+
+        /// evaluate an expression into the labeled target, scaled and added to it if accumulate
+        inline void assign(const Labeled &target, const Expr &expr, double scale, bool accumulate) {
+            extent_map extents;
+            collect_extents(expr, extents);
+            std::vector<size_t> shape = shape_of(target.labels, extents);
+
+            // evaluate into a new tensor first, so the target may also appear in the expression
+            Tensor result = evaluate(expr, target.labels, extents);
+            Tensor &tensor = *target.tensor;
+            if (!accumulate || tensor.empty()) {
+                if (scale != 1.0)
+                    for (size_t i = 0; i < result.size(); ++i) result.data()[i] *= scale;
+                tensor = std::move(result);
+                return;
+            }
+
+            if (tensor.shape() != shape)
+                throw std::invalid_argument("pq_runtime: the shape of the target does not match the expression");
+            for (size_t i = 0; i < tensor.size(); ++i) tensor.data()[i] += scale * result.data()[i];
+        }
+
+    } // namespace detail
+
+    inline Labeled &Labeled::operator=(const Expr &expr) { detail::assign(*this, expr, 1.0, false); return *this; }
+    inline Labeled &Labeled::operator=(const Labeled &other) { return *this = Expr(other); }
+    inline Labeled &Labeled::operator+=(const Expr &expr) { detail::assign(*this, expr, 1.0, true); return *this; }
+    inline Labeled &Labeled::operator-=(const Expr &expr) { detail::assign(*this, expr, -1.0, true); return *this; }
+
+    /**
+     * full contraction of two expressions
+     */
+    inline double dot(const Expr &left, const Expr &right) {
+        Expr product = left * right;
+        detail::extent_map extents;
+        detail::collect_extents(product, extents);
+        return detail::evaluate(product, {}, extents).data()[0];
+    }
+
+} // namespace pdaggerq::runtime
+
+#endif //PDAGGERQ_PQ_RUNTIME_HPP
@@ -195,6 +195,7 @@ void PQGraph::substitute(bool format_sigma, bool only_scalars) {
         makeSub = false; // reset flag
         bool allow_equality = true; // flag to allow equality in flop map
         size_t n_linkages = test_linkages.size(); // get number of linkages
+        num_candidates_ += n_linkages;
         MutableLinkagePtr link_to_sub; // best linkage to substitute
 
         // populate with pairs of flop maps with linkage for each equation
@@ -401,6 +402,7 @@ void PQGraph::substitute(bool format_sigma, bool only_scalars) {
                     }
                 }
                 totalSubs += num_subs; // add number of substitutions to total
+                num_substitutions_ += num_subs;
 
                 // add linkage to ignore linkages
                 link_to_sub->forget(true); // clear linkage history
@@ -468,6 +470,9 @@ void PQGraph::substitute(bool format_sigma, bool only_scalars) {
             update_timer.stop();
         }
 
+        // save progress within long substitution passes
+        if (makeSub) checkpoint(false);
+
         update_timer.start();
 
         // remove all prior substituted linkages
@@ -594,6 +599,7 @@ void PQGraph::substitute(bool format_sigma, bool only_scalars) {
 
     if (!found_any) {
         cout << "No substitutions found." << endl << endl;
+        report_stats("substitute");
         return;
     }
 
@@ -619,32 +625,13 @@ void PQGraph::substitute(bool format_sigma, bool only_scalars) {
     cout << " ===================================================="  << endl << endl;
 
     total_timer.stop();
+    report_stats("substitute");
 }
 
 PQGraph PQGraph::clone() const {
-    // make initial copy
-    PQGraph copy = *this;
-
-    // copy equations and make deep copies of terms
-    map<string, Equation> copy_equations;
-    for (auto & [name, eq] : equations_) {
-        copy_equations[name] = eq.clone();
-    }
-    copy.equations_ = copy_equations;
-
-    // copy all linkages
-    map<string, linkage_set> copy_saved_linkages;
-    for (const auto & [type, linkages] : saved_linkages_) {
-        linkage_set new_linkages;
-        for (const auto & linkage : linkages) {
-            LinkagePtr link = as_link(linkage->clone());
-            new_linkages.insert(link) ;
-        }
-        copy_saved_linkages[type] = new_linkages;
-    }
-    copy.saved_linkages_ = copy_saved_linkages;
-
-    return copy;
+    // vertices and linkages are never modified in place (a pass replaces them), so the copy shares them with this
+    // pq_graph. Only the lists of terms are copied, and each pass of the copy replaces what it changes.
+    return *this;
 }
 
 void PQGraph::reindex() {
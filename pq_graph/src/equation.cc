@@ -114,16 +114,33 @@ namespace pdaggerq {
         flop_map_.clear(); // clear flop scaling map
         mem_map_.clear(); // clear memory scaling map
 
-        for (auto & term : terms_) { // iterate over terms
-            // compute scaling from term
-            term.compute_scaling(regenerate);
-
-            // collect scaling of terms
-            scaling_map term_flop_map = term.flop_map(),
-                        term_mem_map  = term.mem_map();
+        // compute the scaling of every term and sum it per thread; the counts are integers, so the merged
+        // maps do not depend on the order the threads finish in
+        size_t terms_size = terms_.size();
+        vector<scaling_map> thread_flop_maps(omp_get_max_threads()),
+                            thread_mem_maps(omp_get_max_threads());
+
+#pragma omp parallel default(none) shared(terms_, terms_size, regenerate, thread_flop_maps, thread_mem_maps)
+        {
+            scaling_map &local_flop_map = thread_flop_maps[omp_get_thread_num()],
+                        &local_mem_map  = thread_mem_maps[omp_get_thread_num()];
+
+#pragma omp for schedule(guided) nowait
+            for (size_t i = 0; i < terms_size; i++) {
+                Term &term = terms_[i];
+
+                // compute scaling from term
+                term.compute_scaling(regenerate);
+
+                local_flop_map += term.flop_map(); // add flop scaling map
+                local_mem_map  += term.mem_map(); // add memory scaling map
+            }
+        }
 
-            flop_map_ += term_flop_map; // add flop scaling map
-            mem_map_  += term_mem_map; // add memory scaling map
+        // collect scaling of terms
+        for (size_t thread = 0; thread < thread_flop_maps.size(); thread++) {
+            flop_map_ += thread_flop_maps[thread];
+            mem_map_  += thread_mem_maps[thread];
         }
 
         vertex_vector all_term_linkages;
@@ -150,77 +167,115 @@ namespace pdaggerq {
         terms_.insert(terms_.begin() + index, term); // add term to index of terms
     }
 
-    struct TermHash { // hash functor for finding similar terms
-        size_t operator()(const Term& term) const {
-            constexpr LinkageHash link_hasher;
-            VertexPtr total_representation = term.lhs() + term.term_linkage();
+    /**
+     * appends the canonical form of a vertex to key. Every line is written as its properties and
+     * the order in which its label first appears (names), so the key does not depend on the names
+     * of the summed indices. Intermediates are written as their own canonical form followed by
+     * their lines, which keeps their internal labels apart from the labels of the term.
+     */
+    static void append_canonical(const VertexPtr &vertex, unordered_map<string, size_t> &names, string &key) {
+        auto append_lines = [&names, &key](const line_vector &lines) {
+            key += '(';
+            for (const Line &line : lines) {
+                key += (char) ('a' + (line.o_ | line.a_ << 1 | line.sig_ << 2 | line.den_ << 3));
+                key += to_string(names.emplace(line.label_, names.size()).first->second) + ',';
+            }
+            key += ')';
+        };
 
-            return link_hasher(as_link(total_representation));
+        if (!vertex->is_linked()) {
+            key += vertex->base_name();
+            append_lines(vertex->lines());
+            return;
         }
-    };
 
-    struct TermEqual { // predicate functor for finding similar terms
-        bool operator()(const Term& term1, const Term& term2) const {
-            // determine if permutation is the same
-            if (term1.perm_type()  != term2.perm_type()) return false;
-            if (term1.term_perms() != term2.term_perms()) return false;
+        const LinkagePtr link = as_link(vertex);
+        if (link->is_temp()) {
+            // the external lines of an intermediate are numbered in the order it stores them
+            unordered_map<string, size_t> temp_names;
+            for (const Line &line : link->lines())
+                temp_names.emplace(line.label_, temp_names.size());
+
+            key += '[';
+            append_canonical(link->left(), temp_names, key);
+            key += link->is_addition() ? '+' : '*';
+            append_canonical(link->right(), temp_names, key);
+            key += ']';
+            append_lines(link->lines());
+            return;
+        }
 
-            // compare term linkages
-            LinkagePtr total_representation1 = as_link(term1.lhs() + term1.term_linkage(true));
-            LinkagePtr total_representation2 = as_link(term2.lhs() + term2.term_linkage(true));
+        key += '{';
+        append_canonical(link->left(), names, key);
+        key += link->is_addition() ? '+' : '*';
+        append_canonical(link->right(), names, key);
+        key += '}';
+    }
 
-            return *total_representation1 == *total_representation2;
-        }
-    };
+    /**
+     * canonical form of a term: its permutations and its full representation (lhs and contraction
+     * order of the rhs) with the summed indices relabeled in order of appearance. Terms have the same
+     * key exactly when they are equal up to the names of their summed indices.
+     */
+    static string canonical_key(const Term &term, const LinkagePtr &total_representation) {
+        string key = to_string(term.perm_type());
+        for (const auto &[first, second] : term.term_perms())
+            key += ' ' + first + '/' + second;
+        key += ';';
+
+        unordered_map<string, size_t> names;
+        append_canonical(total_representation, names, key);
+        return key;
+    }
 
     size_t Equation::merge_terms() {
         if (is_temp_equation_) return 0; // don't merge temporary equations
 
         size_t terms_size = terms_.size(); // number of terms before merging
-        vector<Term> new_terms; // new terms
 
-
-        // iterate over the map, adding each term to the new_terms vector
-        // map of terms to their associated coefficients
-        std::unordered_map<Term, double, TermHash, TermEqual> term_count;
-        for (auto &term : terms_) {
-            string term_str = term.str(); // get term string
-            // check if term is in map
-            auto it = term_count.find(term);
-            if (it != term_count.end()) {
-                string unique_term_str = it->first.str(); // get unique term string
-                // if term is in map, increment coefficient
-                it->second += term.coefficient_;
-
-                // add original pq to unique term
-                if (Vertex::print_type_ == "python")
-                    it->first.original_pq_ += "\n    # ";
-                else if (Vertex::print_type_ == "c++")
-                    it->first.original_pq_ += "\n    // ";
-
-                it->first.original_pq_ += string(term.lhs()->name().size(), ' ');
-                it->first.original_pq_ += " += " + term.original_pq_;
-            } else {
-                // if term is not in map, add term to map
-                term_count[term] = term.coefficient_;
-            }
+        // build the canonical key of every term
+        vector<string> keys(terms_size);
+#pragma omp parallel for schedule(guided) default(none) shared(terms_, keys, terms_size)
+        for (size_t i = 0; i < terms_size; i++) {
+            const Term &term = terms_[i];
+            keys[i] = canonical_key(term, as_link(term.lhs() + term.term_linkage(true)));
         }
 
+        // terms with the same key are equal; merged[i] is the first term equal to term i
+        vector<size_t> merged(terms_size);
+        std::unordered_map<string, size_t> first_term;
+        for (size_t i = 0; i < terms_size; i++)
+            merged[i] = first_term.emplace(keys[i], i).first->second;
+
+        // sum the coefficients of equal terms into the first of them
+        vector<double> coefficients(terms_size, 0.0);
+        for (size_t i = 0; i < terms_size; i++) {
+            Term &term = terms_[i];
+            size_t j = merged[i];
+            coefficients[j] += term.coefficient_;
+            if (j == i) continue;
+
+            // add original pq to unique term (comments are converted for python when printed)
+            Term &unique_term = terms_[j];
+            unique_term.original_pq_ += "\n    // ";
+
+            unique_term.original_pq_ += string(term.lhs()->name().size(), ' ');
+            unique_term.original_pq_ += " += " + term.original_pq_;
+        }
 
-        for (auto &[unique_term, coeff] : term_count) {
-
-            Term new_term = unique_term; // copy term
-            new_term.coefficient_ = coeff; // set coefficient
+        // keep the unique terms with nonzero coefficients, in their original order
+        vector<Term> new_terms; // new terms
+        for (size_t i = 0; i < terms_size; i++) {
+            if (merged[i] != i) continue;
 
             // skip terms with zero coefficients
-            if (fabs(new_term.coefficient_) <= 1e-12)
+            if (fabs(coefficients[i]) <= 1e-12)
                 continue;
 
-            // add term to new_terms
-            new_terms.push_back(new_term);
+            new_terms.push_back(terms_[i]);
+            new_terms.back().coefficient_ = coefficients[i];
         }
 
-
         terms_ = new_terms;
         collect_scaling(true);
 
@@ -248,17 +303,8 @@ namespace pdaggerq {
     }
 
     Equation Equation::clone() const {
-        Equation copy = *this;
-        if (assignment_vertex_) copy.assignment_vertex_ = assignment_vertex_->clone(); // deep copy assignment vertex
-
-        // deep copy terms
-        copy.terms_.clear();
-
-        for (const auto &term : terms_) {
-            copy.terms_.push_back(term.clone());
-        }
-
-        return copy;
+        // terms are copied; their vertices and linkages are shared since they are never modified in place
+        return *this;
     }
 
     void Equation::sort_tmp_type(vector<Term> &terms, const string &type) {
@@ -31,6 +31,7 @@
 #include <omp.h>
 #else
 #define omp_get_max_threads() 1
+#define omp_get_thread_num() 0
 #define omp_set_num_threads(n) 1
 #endif
 
@@ -46,31 +47,61 @@ struct LinkInfo {
     Term trunc_term;
 };
 
+/// the parts of a term its trunc terms are built from (vertices are immutable, so their pointers identify them)
+struct TermKey {
+    VertexPtr lhs, eq;
+    vertex_vector rhs;
+    double coefficient;
+    size_t perm_type;
+    perm_list term_perms;
+    bool is_assignment;
+    string original_pq;
+
+    explicit TermKey(const Term &term) : lhs(term.lhs()), eq(term.eq()), rhs(term.rhs()),
+                                         coefficient(term.coefficient_), perm_type(term.perm_type()),
+                                         term_perms(term.term_perms()), is_assignment(term.is_assignment_),
+                                         original_pq(term.original_pq_) {}
+
+    bool operator==(const TermKey &other) const {
+        return lhs == other.lhs && eq == other.eq && rhs == other.rhs && coefficient == other.coefficient
+            && perm_type == other.perm_type && term_perms == other.term_perms
+            && is_assignment == other.is_assignment && original_pq == other.original_pq;
+    }
+};
+
+struct TermKeyHash {
+    size_t operator()(const TermKey &key) const {
+        size_t seed = std::hash<const Vertex*>()(key.lhs.get());
+        for (const auto &vertex: key.rhs)
+            seed ^= std::hash<const Vertex*>()(vertex.get()) + 0x9e3779b9 + (seed << 6) + (seed >> 2);
+        seed ^= std::hash<double>()(key.coefficient) + 0x9e3779b9 + (seed << 6) + (seed >> 2);
+        return seed;
+    }
+};
+
+typedef vector<pair<LinkagePtr, Term>> trunc_vector; // temps of a term paired with the term without that temp
+
 struct LinkTracker {
     linkage_map<vector<LinkInfo>> link_track_map_{}; // map of linkages to terms and trunc terms
     linkage_map<set<Term*>> link_declare_map_{}; // map of linkages to their declarations
     map<string, long> max_ids_;
 
+    // trunc terms of every term seen in the last call to populate(). Terms left untouched by a round of fusion
+    // are found here instead of being truncated again; terms that are gone are dropped.
+    unordered_map<TermKey, trunc_vector, TermKeyHash> trunc_cache_{};
+
     LinkTracker(){
         // reserve bins for the link maps
         link_track_map_.reserve(1024);
         link_declare_map_.reserve(1024);
     }
 
-    void insert(Term* term) {
-
-        // if lhs is a declaration, store that separately
-        if (term->lhs()->is_temp()) {
-            auto link = as_link(term->lhs()->shallow());
-            max_ids_[link->type()] = std::max(max_ids_[link->type()], link->id());
-            link->forget(true); // forget the link history for memory efficiency
-            link_declare_map_[link].insert(term);
-            return;
-        }
+    static trunc_vector truncate(const Term &term) {
 
         // extract all linkages within the term
+        trunc_vector truncs;
         VertexPtr dummy = 0.0 * std::make_shared<Vertex>("dummy");
-        for (auto &vertex: term->rhs()) {
+        for (auto &vertex: term.rhs()) {
 
             // vertex in term is fusable only if it is linked. if linked, it must be a temp or not an addition
             bool fusable = vertex->has_any_temp();
@@ -78,16 +109,10 @@ struct LinkTracker {
                 auto all_temps = as_link(vertex)->get_temps();
                 for (auto &temp: all_temps) {
                     LinkagePtr temp_link = as_link(temp);
-                    max_ids_[temp_link->type()] = max(max_ids_[temp_link->type()], temp_link->id());
-                    
-                    // create a new link info
-                    LinkInfo link_info;
-                    link_info.link = temp_link;
-                    link_info.link->forget(true); // forget the link history for memory efficiency
-                    link_info.term = term;
+                    temp_link->forget(true); // forget the link history for memory efficiency
 
                     // create a term without the link
-                    Term trunc_term = *term;
+                    Term trunc_term = term;
                     trunc_term.term_linkage() = nullptr;
                     vertex_vector trunc_rhs;
                     for (auto &other_vertex: trunc_term.rhs()) {
@@ -104,23 +129,54 @@ struct LinkTracker {
                     trunc_term.rhs() = trunc_rhs;
                     trunc_term.compute_scaling(true);
                     trunc_term.term_linkage()->forget(true); // forget the link history for memory efficiency
-                    
-                    link_info.trunc_term = trunc_term;
 
-                    // insert the trunc term into the trunc map
-                    link_track_map_[link_info.link].push_back(link_info);
+                    truncs.emplace_back(temp_link, trunc_term);
                 }
             }
         }
+        return truncs;
+    }
+
+    void insert(Term* term, unordered_map<TermKey, trunc_vector, TermKeyHash> &next_cache) {
+
+        // if lhs is a declaration, store that separately
+        if (term->lhs()->is_temp()) {
+            auto link = as_link(term->lhs()->shallow());
+            max_ids_[link->type()] = std::max(max_ids_[link->type()], link->id());
+            link->forget(true); // forget the link history for memory efficiency
+            link_declare_map_[link].insert(term);
+            return;
+        }
+
+        // reuse the trunc terms if the term is unchanged since the last call (or repeated in this one)
+        TermKey key(*term);
+        auto seen = next_cache.find(key);
+        if (seen == next_cache.end()) {
+            auto cached = trunc_cache_.find(key);
+            trunc_vector truncs = cached != trunc_cache_.end() ? std::move(cached->second) : truncate(*term);
+            seen = next_cache.emplace(std::move(key), std::move(truncs)).first;
+        }
+
+        for (auto &[temp_link, trunc_term]: seen->second) {
+            max_ids_[temp_link->type()] = max(max_ids_[temp_link->type()], temp_link->id());
+
+            // insert the trunc term into the trunc map
+            link_track_map_[temp_link].push_back({temp_link, term, trunc_term});
+        }
     }
 
     void populate(PQGraph& pq_graph) {
         clear();
+        max_ids_.clear();
+
+        unordered_map<TermKey, trunc_vector, TermKeyHash> next_cache;
+        next_cache.reserve(trunc_cache_.size());
         for (auto & [name, eq] : pq_graph.equations()) {
             for (auto &term : eq.terms()) {
-                insert(&term);
+                insert(&term, next_cache);
             }
         }
+        trunc_cache_ = std::move(next_cache);
 
         auto redundant_idxs = [](const vector<LinkInfo> &vec) {
             set<size_t, std::greater<>> idxs;
@@ -209,11 +265,14 @@ struct LinkMerger {
 
     explicit LinkMerger(PQGraph& pq_graph) : pq_graph_(pq_graph){
         link_merge_map_.reserve(10 * pq_graph_.saved_linkages().size());
-        link_tracker_.populate(pq_graph_);
-        link_tracker_.prune();
     }
 
     void populate() {
+        // bring the tracked terms up to date with the equations
+        link_merge_map_.clear();
+        link_tracker_.populate(pq_graph_);
+        link_tracker_.prune();
+
         // find all linkages that can be merged (same connectivity with all trunc terms)
         VertexPtr dummy = 0.0 * std::make_shared<Vertex>("dummy");
 
@@ -228,7 +287,10 @@ struct LinkMerger {
             }
         }
 
-        #pragma omp parallel for schedule(guided) default(none) shared(all_links, all_infos, link_merge_map_, dummy)
+        // each thread collects the pairs it finds; the pairs are merged after the search
+        vector<vector<pair<size_t, size_t>>> thread_pairs(omp_get_max_threads());
+
+        #pragma omp parallel for schedule(guided) default(none) shared(all_links, all_infos, thread_pairs, dummy)
         for (size_t k = 0; k < all_links.size(); k++) {
             auto &link1 = all_links[k];
             auto &link1_info = all_infos[k];
@@ -325,17 +387,22 @@ struct LinkMerger {
 
                 }
 
-                if (!same_connectivity) continue;
-                else {
-                    #pragma omp critical
-                    {
-                        link1->forget(true); // forget the link history for memory efficiency
-                        link2->forget(true); // forget the link history for memory efficiency
-                        link_merge_map_[link1].push_back(link2); 
-                    }
-                }
+                if (same_connectivity)
+                    thread_pairs[omp_get_thread_num()].emplace_back(k, l);
             }
         }
+
+        // merge in the order of a serial search, so the fused terms do not depend on the schedule
+        vector<pair<size_t, size_t>> fusable_pairs;
+        for (auto &pairs: thread_pairs)
+            fusable_pairs.insert(fusable_pairs.end(), pairs.begin(), pairs.end());
+        std::sort(fusable_pairs.begin(), fusable_pairs.end());
+
+        for (auto &[k, l]: fusable_pairs) {
+            all_links[k]->forget(true); // forget the link history for memory efficiency
+            all_links[l]->forget(true); // forget the link history for memory efficiency
+            link_merge_map_[all_links[k]].push_back(all_links[l]);
+        }
     }
 
     set<Term *> extract_terms(const LinkagePtr& target_link) {// add the track terms to the visited terms
@@ -571,10 +638,12 @@ struct LinkMerger {
 
             // merge the trunc terms
             vector<Term> new_terms(target_infos.size());
+            linkage_vector merged_links(target_infos.size());
+            vector<long> merged_ids(target_infos.size());
             MutableVertexPtr merged_vertex_init;
             string link_type = target_infos[0].link->type();
 
-            #pragma omp parallel for default(none) shared(target_infos, merge_infos, new_terms, merged_vertex_init, link_type, target_link)
+            #pragma omp parallel for default(none) shared(target_infos, merge_infos, new_terms, merged_links, merged_ids, merged_vertex_init, link_type, target_link)
             for (size_t i = 0; i < target_infos.size(); i++) {
                 // build merged vertex
                 MutableVertexPtr merged_vertex = target_infos[i].link->shallow();
@@ -594,9 +663,8 @@ struct LinkMerger {
                     else merged_vertex = merged_vertex + target_vertex;
 
                     // add the pq string to track evaluation
-                    // add original pq to unique term
-                    if (Vertex::print_type_ == "python")   merged_pq += "\n    # ";
-                    else if (Vertex::print_type_ == "c++") merged_pq += "\n    // ";
+                    // add original pq to unique term (comments are converted for python when printed)
+                    merged_pq += "\n    // ";
                     merged_pq += string(merge_term->lhs()->name().size(), ' ');
                     merged_pq += " += " + merge_term->original_pq_;
                 }
@@ -630,12 +698,14 @@ struct LinkMerger {
                 new_term.reorder();
                 new_terms[i] = new_term.shallow();
 
-                // add merged vertex to saved linkages
-                pq_graph_.saved_linkages()[link_type].insert(as_link(merged_vertex));
-                #pragma omp critical
-                {
-                    pq_graph_.temp_counts()[link_type] = std::max(pq_graph_.temp_counts()[link_type], max_id);
-                }
+                merged_links[i] = as_link(merged_vertex);
+                merged_ids[i] = max_id;
+            }
+
+            // add merged vertices to saved linkages
+            for (size_t i = 0; i < target_infos.size(); i++) {
+                pq_graph_.saved_linkages()[link_type].insert(merged_links[i]);
+                pq_graph_.temp_counts()[link_type] = std::max(pq_graph_.temp_counts()[link_type], merged_ids[i]);
             }
 
             // overwrite the target terms with the new terms
@@ -704,6 +774,7 @@ struct LinkMerger {
 
     void clear() {
         link_tracker_.clear();
+        link_tracker_.trunc_cache_.clear();
         link_merge_map_.clear();
     }
 
@@ -719,25 +790,48 @@ size_t PQGraph::merge_intermediates(){
         guard.lock();
     }
 
-    // count terms in pq_graph
-    size_t num_terms = get_num_terms();
+    fusion_timer.start();
+
+    // number of contractions in all terms
+    auto num_flops = [this]() {
+        long num = 0;
+        for (auto & [name, eq] : equations_)
+            for (auto &term : eq.terms())
+                num += term.flop_map().total();
+        return num;
+    };
 
+    // the merger is kept between rounds, so terms left untouched by a round are not truncated again
     LinkMerger link_merger(*this);
-    link_merger.populate();
-    link_merger.prune();
-    link_merger.print();
-    link_merger.merge();
-    link_merger.clear();
 
-    size_t fused_terms = get_num_terms();
-    fused_terms = num_terms - fused_terms;
-    collect_scaling();
+    size_t num_fused_total = 0;
+    long last_flops = num_flops();
+    while (true) {
+        // count terms in pq_graph
+        size_t num_terms = get_num_terms();
+
+        link_merger.populate();
+        link_merger.prune();
+        link_merger.print();
+        link_merger.merge();
 
-    size_t num_fused_total = fused_terms;
-    while (fused_terms > 0) {
-        fused_terms = merge_intermediates(); // recursively merge intermediates until no more terms are fused
+        size_t fused_terms = num_terms - get_num_terms();
         num_fused_total += fused_terms;
+        collect_scaling();
+
+        // merge intermediates until no more terms are fused or a round removes too few contractions
+        if (fused_terms == 0) break;
+
+        long flops = num_flops();
+        double gain = last_flops > 0 ? (double) (last_flops - flops) / (double) last_flops : 0.0;
+        last_flops = flops;
+        if (fusion_threshold_ > 0.0 && gain < fusion_threshold_) break;
     }
+    link_merger.clear();
+
+    num_fused_ += num_fused_total;
+    fusion_timer.stop();
+    report_stats("fusion");
 
     return num_fused_total;
 }
@@ -752,6 +846,10 @@ size_t PQGraph::prune(bool keep_single_use) {
         guard.lock();
     }
 
+    // only time and report the outermost call
+    bool outermost = !prune_timer.running();
+    if (outermost) prune_timer.start();
+
     // remove unused contractions (only used in one term and its assignment)
 
     // get all temps in the equations
@@ -952,6 +1050,12 @@ size_t PQGraph::prune(bool keep_single_use) {
         num_removed_total += num_removed;
     }
 
+    if (outermost) {
+        num_pruned_ += num_removed_total;
+        prune_timer.stop();
+        report_stats("prune");
+    }
+
     return num_removed_total;
 }
 
@@ -998,10 +1102,11 @@ size_t PQGraph::merge_terms() {
         guard.lock();
     }
 
-    // iterate over equations and merge terms
+    merge_timer.start();
+
+    // iterate over equations and merge terms (each equation merges its terms in parallel)
     size_t num_merged = 0;
     vector<string> eq_keys = get_equation_keys();
-#pragma omp parallel for reduction(+:num_merged) default(none) shared(equations_, eq_keys)
     for (const auto &key: eq_keys) {
         Equation &eq = equations_[key];
         if (eq.is_temp_equation_) continue; // skip tmps equation
@@ -1012,6 +1117,10 @@ size_t PQGraph::merge_terms() {
 
     if (num_merged > 0) cout << "Merged " << num_merged << " terms" << endl;
 
+    num_merged_ += num_merged;
+    merge_timer.stop();
+    report_stats("merge");
+
     return num_merged;
 }
 
@@ -46,6 +46,26 @@ using std::ostream, std::string, std::vector, std::map, std::unordered_map, std:
 
 namespace pdaggerq {
 
+    namespace {
+        /**
+         * sets a static printing option for the lifetime of the guard. the old value is restored when the guard
+         * goes out of scope, so an early return or an exception cannot leak the option into the next print.
+         */
+        template <typename T>
+        class scoped_option {
+        public:
+            scoped_option(T &option, T value) : option_(option), old_value_(option) { option_ = value; }
+            ~scoped_option() { option_ = old_value_; }
+
+            scoped_option(const scoped_option &) = delete;
+            scoped_option &operator=(const scoped_option &) = delete;
+
+        private:
+            T &option_;
+            T old_value_;
+        };
+    }
+
     string PQGraph::str(const string &print_type) const {
 
         constexpr auto to_lower = [](string str) {
@@ -69,15 +89,26 @@ namespace pdaggerq {
 
         Vertex::print_type_ = to_lower(print_type);
 
+        // the native runtime only applies to the code printed by this call
+        scoped_option<bool> native_runtime(Vertex::native_runtime_, Vertex::print_type_ == "native");
+
+        // contractions are only batched in the code printed by this call
+        scoped_option<bool> batch_density(Term::batch_density_, batch_density_);
+
         if (Vertex::print_type_ == "python" || Vertex::print_type_ == "einsum") {
             Vertex::print_type_ = "python";
             cout << "Formatting equations for python" << endl;
         } else if (Vertex::print_type_ == "c++" || Vertex::print_type_ == "cpp") {
             Vertex::print_type_ = "c++";
             cout << "Formatting equations for c++" << endl;
+        } else if (Vertex::native_runtime_) {
+            // same expressions as the TiledArray output, evaluated by pq_graph/runtime/pq_runtime.hpp
+            Vertex::print_type_ = "c++";
+            cout << "Formatting equations for c++ with the pq_graph runtime" << endl;
         } else {
-            cout << "WARNING: output must be one of: python, einsum, c++, or cpp" << endl;
+            cout << "WARNING: output must be one of: python, einsum, c++, cpp, or native" << endl;
             cout << "         Setting output to c++" << endl;
+            Vertex::print_type_ = "c++";
         }
         cout << endl;
 
@@ -146,24 +177,28 @@ namespace pdaggerq {
             terms[0].is_assignment_ = true;
 
             for (auto &term : terms) {
-                    all_terms.push_back(term.clone());
+                    all_terms.push_back(term);
             }
         }
 
         // make set of all unique base names (ignore linkages and scalars)
         set<string> names;
+        set<string> scalar_names; // names printed without indices
+        auto add_name = [&names, &scalar_names](const VertexPtr &vertex) {
+            if (vertex->is_linked() || vertex->is_constant()) return;
+            names.insert(vertex->name());
+            if (vertex->line_str().empty())
+                scalar_names.insert(vertex->name());
+        };
         for (const auto &term: all_terms) {
-            VertexPtr lhs = term.lhs();
-            if (!lhs->is_linked() && !lhs->is_constant())
-                names.insert(lhs->name());
+            add_name(term.lhs());
             for (const auto &op: term.rhs()) {
                 if (!op->is_linked() && !op->is_constant())
-                    names.insert(op->name());
+                    add_name(op);
                 else {
                     vertex_vector vertices = as_link(op)->vertices();
                     for (const auto &vertex: vertices)
-                        if (!vertex->is_linked() && !vertex->is_constant())
-                            names.insert(vertex->name());
+                        add_name(vertex);
                 }
             }
         }
@@ -172,15 +207,55 @@ namespace pdaggerq {
         names.insert("perm_tmps");
         names.insert("tmps");
 
+        // batch size of the auxiliary index for density-fitted contractions
+        if (Term::batch_density_ && use_density_fitting_ && Vertex::print_type_ == "python")
+            names.insert("q_batch_");
+
+        if (Vertex::native_runtime_) {
+            sout << "#include \"pq_runtime.hpp\"" << endl;
+            sout << "using namespace pdaggerq::runtime;" << endl << endl;
+        }
+
         // declare a map for each base name
         sout << h2 << " Declarations " << h2 << endl << endl;
-        for (const auto &name: names) {
-            if (Vertex::print_type_ == "c++")
-                 sout << "// initialize -> ";
-            else if (Vertex::print_type_ == "python") 
-                sout << "## initialize -> ";
-            
-            sout << name << ";" << endl;
+        if (Vertex::native_runtime_) {
+            // the native output is a function of the declared tensors; blocks (e.g. eri["oovv"]) are passed as maps
+            vector<string> arguments;
+            set<string> maps;
+            for (const auto &name: names) {
+                if (name == "perm_tmps" || name == "tmps") continue; // declared in the function
+                size_t bracket = name.find('[');
+                if (bracket != string::npos) {
+                    string base = name.substr(0, bracket);
+                    if (maps.insert(base).second)
+                        arguments.push_back("tensor_map &" + base);
+                } else if (scalar_names.count(name))
+                    arguments.push_back("double &" + name);
+                else arguments.push_back("Tensor &" + name);
+            }
+
+            bool has_conditions = false;
+            for (const auto &[eq_name, equation] : copy.equations_)
+                for (const auto &term : equation.terms())
+                    has_conditions |= !term.conditions().empty();
+            if (has_conditions)
+                arguments.emplace_back("const std::map<std::string, bool> &includes_");
+
+            sout << "void evaluate_equations(";
+            for (size_t i = 0; i < arguments.size(); ++i)
+                sout << (i > 0 ? ", " : "") << arguments[i];
+            sout << ") {" << endl << endl;
+            sout << "    tensor_map tmps_, reused_;" << endl;
+            sout << "    scalar_map scalars_;" << endl;
+        } else {
+            for (const auto &name: names) {
+                if (Vertex::print_type_ == "c++")
+                     sout << "// initialize -> ";
+                else if (Vertex::print_type_ == "python")
+                    sout << "## initialize -> ";
+
+                sout << name << ";" << endl;
+            }
         }
         sout << endl;
 
@@ -300,6 +375,8 @@ namespace pdaggerq {
 
             if (Vertex::print_type_ == "python")
                 newname = "del " + lhs_name;
+            else if (Vertex::native_runtime_)
+                newname = lhs_name + ".release();"; // returns the buffer to the runtime's pool
             else if (Vertex::print_type_ == "c++")
                 newname = lhs_name + ".~TArrayD();";
 
@@ -398,6 +475,9 @@ namespace pdaggerq {
         // stream merged equation as string
         sout << merged_eq << endl;
 
+        if (Vertex::native_runtime_)
+            sout << "}" << endl << endl; // close evaluate_equations
+
         // add closing banner
         sout << h1 << h1 << h1 << endl << endl;
 
@@ -613,7 +693,9 @@ namespace pdaggerq {
             // if an intermediate vertex was created, delete it
             if (!perm_as_rhs) {
                 // delete the permutation vertex
-                if (Vertex::print_type_ == "c++")
+                if (Vertex::native_runtime_)
+                    output += perm_vertex->name() + ".release();";
+                else if (Vertex::print_type_ == "c++")
                     output += perm_vertex->name() + ".~TArrayD();";
                 else if (Vertex::print_type_ == "python")
                     output += "del " + perm_vertex->name();
@@ -699,76 +781,145 @@ namespace pdaggerq {
         return output;
     }
 
+    char Term::batched_den_label() const {
+        if (rhs_.empty()) return '\0';
+
+        // intermediates and single tensors are printed by name; there is no contraction to batch
+        const LinkagePtr &term_link = term_linkage(true);
+        if (term_link->is_temp() || term_link->left()->empty() || term_link->right()->empty())
+            return '\0';
+
+        // density-fitting lines that are kept in the result cannot be summed in batches
+        std::set<char> external;
+        for (const auto &line : lhs_->lines())
+            if (line.den_) external.insert(line.label_[0]);
+
+        char label = '\0';
+        for (const auto &op : term_link->link_vector()) {
+            for (const auto &line : op->lines()) {
+                if (!line.den_ || external.count(line.label_[0])) continue;
+                if (label == '\0') label = line.label_[0];
+            }
+        }
+        if (label == '\0') return label;
+
+        // every tensor with the line must carry it as the leading dimension so that it can be sliced
+        for (const auto &op : term_link->link_vector()) {
+            const line_vector &lines = op->lines();
+            for (size_t i = 1; i < lines.size(); ++i)
+                if (lines[i].den_ && lines[i].label_[0] == label) return '\0';
+        }
+        return label;
+    }
+
     string Term::einsum_str() const {
-        string output;
 
-        // get left hand side vertex name
-        if (lhs_->is_linked())
-             output = as_link(lhs_)->str(true, false);
-        else output = lhs_->name();
+        // contract over batches of the density-fitting line if requested
+        char den_label = batch_density_ ? batched_den_label() : '\0';
 
-        // get sign of coefficient
-        bool is_negative = coefficient_ < 0;
-        if (is_assignment_) output += "  = ";
-        else if (is_negative) output += " -= ";
-        else output += " += ";
+        auto make_line = [this](bool is_assignment) {
+            string output;
 
-        // get absolute value of coefficient
-        double abs_coeff = fabs(coefficient_);
+            // get left hand side vertex name
+            if (lhs_->is_linked())
+                 output = as_link(lhs_)->str(true, false);
+            else output = lhs_->name();
 
-        // if the coefficient is not 1, add it to the string
-        bool needs_coeff = fabs(abs_coeff - 1) >= 1e-8 || rhs_.empty() || is_assignment_;
+            // get sign of coefficient
+            bool is_negative = coefficient_ < 0;
+            if (is_assignment) output += "  = ";
+            else if (is_negative) output += " -= ";
+            else output += " += ";
 
-        if (needs_coeff) {
-            // add coefficient to string
-            if (is_assignment_ && is_negative)
-                output += "-";
+            // get absolute value of coefficient
+            double abs_coeff = fabs(coefficient_);
 
-            int precision = minimum_precision(abs_coeff);
-            output += to_string_with_precision(abs_coeff, precision);
+            // if the coefficient is not 1, add it to the string
+            bool needs_coeff = fabs(abs_coeff - 1) >= 1e-8 || rhs_.empty() || is_assignment;
 
-            // add multiplication sign if there are rhs vertices
-            if (!rhs_.empty())
-                output += " * ";
-        }
+            if (needs_coeff) {
+                // add coefficient to string
+                if (is_assignment && is_negative)
+                    output += "-";
 
-        // get string of lines
-        line_vector link_lines;
-        string lhs_string;
+                int precision = minimum_precision(abs_coeff);
+                output += to_string_with_precision(abs_coeff, precision);
 
-        // get string of lines from lhs vertex
-        for (auto & line : lhs_->lines())
-            if (line.sig_ && !Vertex::use_trial_index) continue;
-            else lhs_string += line.label_.front();
+                // add multiplication sign if there are rhs vertices
+                if (!rhs_.empty())
+                    output += " * ";
+            }
 
-        string rhs_string;
+            // get string of lines
+            line_vector link_lines;
+            string lhs_string;
 
-        // get string of lines from the term linkage
-        for (auto & line : term_linkage(true)->lines())
-            if (line.sig_ && !Vertex::use_trial_index) continue;
-            else rhs_string += line.label_.front();
+            // get string of lines from lhs vertex
+            for (auto & line : lhs_->lines())
+                if (line.sig_ && !Vertex::use_trial_index) continue;
+                else lhs_string += line.label_.front();
 
-        // make einsum string
-        string einsum_string;
+            string rhs_string;
 
-        // get einsum string from term linkage
-        einsum_string = term_linkage(true)->str();
+            // get string of lines from the term linkage
+            for (auto & line : term_linkage(true)->lines())
+                if (line.sig_ && !Vertex::use_trial_index) continue;
+                else rhs_string += line.label_.front();
 
-        // permute tensors if needed
-        if (lhs_string != rhs_string) {
-            einsum_string = "einsum('" + rhs_string + "->" + lhs_string + "', " + einsum_string + " )";
-        }
-        output += einsum_string;
+            // make einsum string
+            string einsum_string;
 
-        // formatting issue needs to replace "* 1.00 *" with "*"
-        size_t pos = 0;
-        while (pos != string::npos) {
-            pos = output.find("* 1.00 *", pos);
-            if (pos != string::npos) {
-                output = output.replace(pos, 8, "*");
-                pos += 1;
+            // get einsum string from term linkage
+            einsum_string = term_linkage(true)->str();
+
+            // permute tensors if needed
+            if (lhs_string != rhs_string) {
+                einsum_string = "einsum('" + rhs_string + "->" + lhs_string + "', " + einsum_string + " )";
             }
+            output += einsum_string;
+
+            // formatting issue needs to replace "* 1.00 *" with "*"
+            size_t pos = 0;
+            while (pos != string::npos) {
+                pos = output.find("* 1.00 *", pos);
+                if (pos != string::npos) {
+                    output = output.replace(pos, 8, "*");
+                    pos += 1;
+                }
+            }
+
+            return output;
+        };
+
+        if (den_label == '\0')
+            return make_line(is_assignment_);
+
+        // size of the batched line from the first tensor that carries it
+        string aux_size;
+        for (const auto &op : term_linkage()->link_vector()) {
+            const line_vector &lines = op->lines();
+            if (!lines.empty() && lines[0].den_ && lines[0].label_[0] == den_label) {
+                if (op->is_addition() && !op->is_temp()) continue;
+                aux_size = op->str() + ".shape[0]";
+                break;
+            }
+        }
+
+        if (aux_size.empty())
+            return make_line(is_assignment_);
+
+        // accumulate the contraction in place over slices of q_batch_ auxiliary functions
+        scoped_option<char> batched_den(Vertex::batched_den_, den_label);
+        string output;
+        string first_batch = "0";
+        if (is_assignment_) {
+            output += "qb_ = slice(0, q_batch_)\n";
+            output += make_line(true) + "\n";
+            first_batch = "q_batch_";
         }
+        output += "for q0_ in range(" + first_batch + ", " + aux_size + ", q_batch_):\n";
+        output += "    qb_ = slice(q0_, q0_ + q_batch_)\n";
+        output += "    " + make_line(false);
 
         return output;
     }
@@ -112,8 +112,11 @@ namespace pdaggerq {
         }
 
         // if the link vector is already generated and does not need to be regenerated, return it
-        if (!regenerate && !result.empty())
+        if (!regenerate && !result.empty()) {
+            cache_hits_.fetch_add(1, std::memory_order_relaxed);
             return result;
+        }
+        cache_misses_.fetch_add(1, std::memory_order_relaxed);
 
         // else regenerate the result vector
         result.clear();
@@ -428,8 +431,11 @@ namespace pdaggerq {
         }
 
         // if the result vector is already generated and does not need to be regenerated, return it
-        if (!regenerate && !result.empty())
+        if (!regenerate && !result.empty()) {
+            cache_hits_.fetch_add(1, std::memory_order_relaxed);
             return result;
+        }
+        cache_misses_.fetch_add(1, std::memory_order_relaxed);
 
         if (empty()) {
             result.clear();
@@ -519,20 +525,76 @@ namespace pdaggerq {
 
     }
 
+    string Linkage::order_fingerprint() {
+        // bump the version when the rules of best_permutation change
+        string fingerprint = "pq_graph_order:1";
+        for (const auto &labels : {Line::occ_labels_, Line::virt_labels_, Line::sig_labels_, Line::den_labels_}) {
+            fingerprint += '|';
+            for (char label : labels)
+                if (label != '\0') fingerprint += label;
+        }
+        return fingerprint;
+    }
+
+    /**
+     * key of a linkage in the order cache: the vertices being permuted, in order, with their lines
+     * @param link_vec vertices of the linkage
+     * @return cache key
+     * @note ties in best_permutation are broken by name, which follows the print type
+     */
+    static string order_key(const vertex_vector &link_vec) {
+        string key = Vertex::print_type_ + ':';
+        for (const auto &vertex : link_vec) {
+            key += vertex->name();
+            key += '(';
+            for (const Line &line : vertex->lines()) {
+                key += line.label_;
+                key += line.o_ ? 'o' : line.sig_ ? 's' : line.den_ ? 'd' : 'v';
+                key += line.a_ ? 'a' : 'b';
+                if (line.blk_type_ != '\0') key += line.blk_type_;
+                key += ',';
+            }
+            key += ')';
+        }
+        return key;
+    }
+
     LinkagePtr Linkage::best_permutation() const {
 
         // initialize the best permutation as the current linkage
         LinkagePtr best_perm = as_link(shallow());
 
+        // the order of contractions (but not additions or temps) is stored in the order cache
+        bool use_cache = order_cache_.enabled() && !empty() && !is_temp() && !is_addition()
+                         && !left_->empty() && !right_->empty();
+        string key;
+        if (use_cache) {
+            const vertex_vector &link_vec = link_vector();
+            key = order_key(link_vec);
+
+            linkage_cache::order_type order;
+            if (order_cache_.find(key, order)) {
+                if (order.empty()) return best_perm; // the current order is the best
+
+                vertex_vector link_perm(order.size());
+                std::transform(order.begin(), order.end(), link_perm.begin(), [&link_vec](uint8_t i) {
+                    return link_vec[i];
+                });
+                return link(link_perm);
+            }
+        }
+
         // generate every permutation
         const linkage_vector &all_perms = permutations();
         if (all_perms.size() <= 1) {
             // if no permutations, return this as the best permutation
+            if (use_cache) order_cache_.insert(key, {});
             return best_perm;
         }
 
         // test scaling of each permutation
         auto [best_flops, best_mems] = best_perm->netscales();
+        size_t best_idx = 0, perm_idx = 0;
         for (const auto &perm : all_perms) {
             auto [flops, mems] = perm->netscales();
 
@@ -560,7 +622,21 @@ namespace pdaggerq {
                 best_flops = flops;
                 best_mems = mems;
                 best_perm = perm;
+                best_idx = perm_idx;
             }
+            ++perm_idx;
+        }
+
+        if (use_cache) {
+            // permutations after the first follow lexicographic order of the link vector
+            linkage_cache::order_type order;
+            if (best_idx > 0) {
+                order.resize(link_vector().size());
+                std::iota(order.begin(), order.end(), 0);
+                for (size_t i = 0; i < best_idx; ++i)
+                    std::next_permutation(order.begin(), order.end());
+            }
+            order_cache_.insert(key, order);
         }
 
         // return the best permutation
@@ -568,35 +644,44 @@ namespace pdaggerq {
     }
 
     linkage_vector Linkage::subgraphs(size_t max_depth) const {
+        linkage_vector all_subgraphs;
+        subgraphs(max_depth, [&all_subgraphs](const LinkagePtr &subgraph) { all_subgraphs.push_back(subgraph); });
+        return all_subgraphs;
+    }
 
-        if (is_temp()) { // do not generate subgraphs for temps
-            return {as_link(shallow())};
-        }
-        if (empty()) { // return an empty vector if the linkage is empty
-            return {};
-        }
-
-        // build permutations of root vertex
-        linkage_vector top_perms = {as_link(shallow())};
-        linkage_set unique_subgraphs; unique_subgraphs.reserve(4 * (depth_+1));
+    void Linkage::subgraphs(size_t max_depth, const std::function<void(const LinkagePtr &)> &visit) const {
+
+        // subgraphs already visited. Equal subgraphs are found by value, but only their addresses within this
+        // linkage are stored.
+        struct node_hash {
+            size_t operator()(const Linkage *link) const { return std::hash<string>()(link->base_name()); }
+        };
+        struct node_equal {
+            bool operator()(const Linkage *lhs, const Linkage *rhs) const { return *lhs == *rhs; }
+        };
+        unordered_set<const Linkage *, node_hash, node_equal> visited;
+
+        // depth-first walk of the binary tree
+        vector<const Linkage *> stack = {this};
+        while (!stack.empty()) {
+            const Linkage *link = stack.back();
+            stack.pop_back();
+
+            if (link->empty()) continue; // skip empty vertices
+
+            if (link->is_temp() || link->depth() <= max_depth) {
+                // the subgraphs of a repeated subgraph have been visited already
+                if (!visited.insert(link).second) continue;
+                visit(as_link(link->shallow()));
+            }
 
-        // now add the subgraphs of the left and right vertices
-        for (const auto &perm : top_perms) {
-            if (perm->empty()) continue; // skip empty vertices
-            if (perm->depth() <= max_depth)
-                unique_subgraphs.insert(perm);
+            if (link->is_temp()) continue; // do not generate subgraphs for temps
 
-            if (perm->left_->is_linked() && !perm->left_->empty()) {
-                auto left_perms = as_link(perm->left_)->subgraphs(max_depth);
-                unique_subgraphs.insert(left_perms.begin(), left_perms.end());
-            }
-            if (perm->right_->is_linked() && !perm->right_->empty()) {
-                auto right_perms = as_link(perm->right_)->subgraphs(max_depth);
-                unique_subgraphs.insert(right_perms.begin(), right_perms.end());
-            }
+            // now visit the subgraphs of the left and right vertices
+            if (link->right_->is_linked() && !link->right_->empty())
+                stack.push_back(as_link(link->right_).get());
+            if (link->left_->is_linked() && !link->left_->empty())
+                stack.push_back(as_link(link->left_).get());
         }
-
-        // copy the unique subgraphs as a vector and return it
-        return {unique_subgraphs.begin(), unique_subgraphs.end()};
     }
 }
\ No newline at end of file
@@ -30,9 +30,11 @@
     #include <omp.h>
 #else
     #define omp_get_max_threads() 1
+    #define omp_get_thread_num() 0
     #define omp_set_num_threads(n) 1
 #endif
 #include <memory>
+#include <iterator>
 
 namespace py = pybind11;
 using namespace pybind11::literals;
@@ -64,6 +66,9 @@ namespace pdaggerq {
                 .def("assemble", &pdaggerq::PQGraph::assemble)
                 .def("analysis", &pdaggerq::PQGraph::analysis)
                 .def("clear", &pdaggerq::PQGraph::clear)
+                .def("clone", &pdaggerq::PQGraph::clone)
+                .def("save", &pdaggerq::PQGraph::save)
+                .def("load", &pdaggerq::PQGraph::load)
                 .def("write_dot", &pdaggerq::PQGraph::write_dot)
                 .def("reorder", [](PQGraph& self) {
                     bool old_opt_level = self.opt_level_; self.opt_level_ = 1;
@@ -89,7 +94,49 @@ namespace pdaggerq {
                     bool old_opt_level = self.opt_level_; self.opt_level_ = 6;
                     self.merge_intermediates();           self.opt_level_ = old_opt_level;
                 })
-                .def("optimize", &pdaggerq::PQGraph::optimize);
+                .def("optimize", &pdaggerq::PQGraph::optimize)
+                .def("stats", &pdaggerq::PQGraph::stats)
+                .def("set_stats_callback", [](PQGraph& self, const py::object &callback) {
+                    if (callback.is_none()) {
+                        self.set_stats_callback(nullptr);
+                        return;
+                    }
+                    self.set_stats_callback([callback](const string &pass, const PQGraph &graph) {
+                        callback(pass, graph.stats());
+                    });
+                }, py::arg("callback") = py::none());
+    }
+
+    py::dict PQGraph::stats() const {
+
+        py::dict time, calls;
+        const map<string, const Timer*> timers = {
+                {"total", &total_timer}, {"build", &build_timer}, {"reorder", &reorder_timer},
+                {"substitute", &substitute_timer}, {"update", &update_timer}, {"merge", &merge_timer},
+                {"fusion", &fusion_timer}, {"prune", &prune_timer}
+        };
+        for (const auto &[name, timer] : timers) {
+            time[name.c_str()]  = (double) timer->get_runtime();
+            calls[name.c_str()] = timer->count();
+        }
+
+        size_t hits = Linkage::cache_hits_.load(), misses = Linkage::cache_misses_.load();
+        double hit_rate = hits + misses > 0 ? (double) hits / (double) (hits + misses) : 0.0;
+
+        return py::dict("time"_a = time,
+                        "calls"_a = calls,
+                        "candidates_evaluated"_a = num_candidates_,
+                        "substitutions"_a = num_substitutions_,
+                        "terms_merged"_a = num_merged_,
+                        "terms_fused"_a = num_fused_,
+                        "temps_pruned"_a = num_pruned_,
+                        "temps"_a = temp_counts_,
+                        "terms"_a = get_num_terms(),
+                        "contractions"_a = flop_map_.total(),
+                        "cache"_a = py::dict("hits"_a = hits, "misses"_a = misses, "hit_rate"_a = hit_rate),
+                        "order_cache"_a = py::dict("hits"_a = Linkage::order_cache_.hits_.load(),
+                                                   "misses"_a = Linkage::order_cache_.misses_.load(),
+                                                   "size"_a = Linkage::order_cache_.size()));
     }
 
     void PQGraph::set_options(const pybind11::dict& options) {
@@ -140,6 +187,9 @@ namespace pdaggerq {
         if (options.contains("density_fitting"))
             use_density_fitting_ = options["density_fitting"].cast<bool>();
 
+        if (options.contains("batch_density"))
+            batch_density_ = options["batch_density"].cast<bool>();
+
         if (options.contains("no_scalars")) {
             Equation::no_scalars_ = options["no_scalars"].cast<bool>();
             if (Equation::no_scalars_)
@@ -284,6 +334,37 @@ namespace pdaggerq {
         if (options.contains("separate_sigma"))
             separate_sigma_ = options["separate_sigma"].cast<bool>();
 
+        if (options.contains("fusion_threshold")) {
+            fusion_threshold_ = options["fusion_threshold"].cast<double>();
+            if (fusion_threshold_ < 0.0) {
+                cout << "WARNING: fusion_threshold must be non-negative. Setting to 0." << endl;
+                fusion_threshold_ = 0.0;
+            }
+        }
+
+        if (options.contains("cache_size")) {
+            long cache_size = options["cache_size"].cast<long>();
+            Linkage::order_cache_.set_capacity(cache_size < 0 ? static_cast<size_t>(-1l) : (size_t) cache_size);
+        }
+
+        if (options.contains("cache")) {
+            auto cache_file = options["cache"].cast<string>();
+            size_t num_loaded = Linkage::order_cache_.open(cache_file, Linkage::order_fingerprint());
+            if (!cache_file.empty()) // an empty name turns the cache off
+                cout << "Loaded " << num_loaded << " cached contraction orders from '" << cache_file << "'" << endl;
+        }
+
+        if (options.contains("checkpoint"))
+            checkpoint_file_ = options["checkpoint"].cast<string>();
+
+        if (options.contains("checkpoint_interval")) {
+            checkpoint_interval_ = options["checkpoint_interval"].cast<double>();
+            if (checkpoint_interval_ < 0.0) {
+                cout << "WARNING: checkpoint_interval must be non-negative. Setting to 0." << endl;
+                checkpoint_interval_ = 0.0;
+            }
+        }
+
         cout << "Options:" << endl;
         cout << "--------" << endl;
         cout << "    print_level: " << print_level_
@@ -303,6 +384,10 @@ namespace pdaggerq {
              << "tensors in a sigma-vector build (default: false)" << endl;
         cout << "    separate_sigma: " << (separate_sigma_ ? "true" : "false")
                 << "  // whether to separate reusable intermediates for sigma-vector build (default: false)" << endl;
+        cout << "    density_fitting: " << (use_density_fitting_ ? "true" : "false")
+             << "  // whether to factorize two-electron integrals as B(Q,p,r) B(Q,q,s) (default: false)" << endl;
+        cout << "    batch_density: " << (batch_density_ ? "true" : "false")
+             << "  // whether python contractions over Q are accumulated in batches of 'q_batch_' (default: false)" << endl;
         cout << "    opt_level: " << opt_level_
              << "  // optimization level:" << endl;
         cout << "                  // 0: no optimization" << endl;
@@ -333,6 +418,21 @@ namespace pdaggerq {
              << "  // whether to recompute or save all possible permutations of each term in memory (default: false)" << endl
              << "                       // if true, permutations are recomputed on the fly. Recommended if memory runs out." << endl;
 
+        cout << "    fusion_threshold: " << fusion_threshold_
+             << "  // minimum fraction of contractions removed by a round of fusion to keep fusing (default: 0)" << endl;
+
+        cout << "    cache: " << (Linkage::order_cache_.enabled() ? "enabled" : "none")
+             << "  // file of best contraction orders shared between runs (default: none)" << endl;
+
+        cout << "    cache_size: " << (long) Linkage::order_cache_.capacity()
+             << "  // maximum number of contraction orders kept in the cache (default: 100000; -1 for no limit)" << endl;
+
+        cout << "    checkpoint: " << (checkpoint_file_.empty() ? "none" : checkpoint_file_)
+             << "  // file saved after each pass of optimize() and resumed with load() (default: none)" << endl;
+
+        cout << "    checkpoint_interval: " << checkpoint_interval_
+             << "  // minimum seconds between checkpoints within a substitution pass (default: 600)" << endl;
+
         cout << "    nthreads: " << nthreads_
              << "  // number of threads to use (default: OMP_NUM_THREADS | available: "
              << omp_get_max_threads() << ")" << endl;
@@ -435,62 +535,86 @@ namespace pdaggerq {
         };
 
 
-        // loop over each pq_string
-        for (const auto& pq_string : ordered) {
-
-            // skip if pq_string is empty
-            if (pq_string->skip)
-                continue;
-
-            Term term;
-            if (name_is_formatted) {
-                // create term from string
-                term = Term(equation_name, pq_string);
-            } else {
-                // create term with an empty string
-                term = Term("", pq_string);
-            }
+        // convert each pq_string to terms in parallel. Every thread fills its own buffer from a contiguous
+        // block of strings (static schedule), so concatenating the buffers by thread keeps the input order.
+        size_t num_strings = ordered.size();
+        bool density_fitting = use_density_fitting_;
+        bool has_sigma = false;
+        vector<vector<Term>> thread_terms(omp_get_max_threads());
+
+        #pragma omp parallel default(none) reduction(||:has_sigma) \
+                shared(ordered, num_strings, thread_terms, name_is_formatted, equation_name, assigment_name, \
+                       reorder_labels, density_fitting)
+        {
+            vector<Term> &local_terms = thread_terms[omp_get_thread_num()];
+
+            #pragma omp for schedule(static) nowait
+            for (size_t i = 0; i < num_strings; ++i) {
+                const auto &pq_string = ordered[i];
+
+                // skip if pq_string is empty
+                if (pq_string->skip)
+                    continue;
+
+                Term term;
+                if (name_is_formatted) {
+                    // create term from string
+                    term = Term(equation_name, pq_string);
+                } else {
+                    // create term with an empty string
+                    term = Term("", pq_string);
+                }
 
-            // format self-contractions
-            bool has_self_link = term.apply_self_links();
+                // format self-contractions
+                bool has_self_link = term.apply_self_links();
 
-            // skip term if it has a self-link and scalars are not allowed
-            if (has_self_link && Equation::no_scalars_)
-                continue;
+                // skip term if it has a self-link and scalars are not allowed
+                if (has_self_link && Equation::no_scalars_)
+                    continue;
 
-            // use the term to build the assignment vertex
-            MutableVertexPtr assignment;
-            if (!name_is_formatted || equation_name.empty())
-                 assignment = make_shared<Vertex>(*term.term_linkage()->shallow());
-            else assignment = term.lhs()->clone();
+                // use the term to build the assignment vertex
+                MutableVertexPtr assignment;
+                if (!name_is_formatted || equation_name.empty())
+                     assignment = make_shared<Vertex>(*term.term_linkage()->shallow());
+                else assignment = term.lhs()->clone();
 
-            reorder_labels(assignment);
+                reorder_labels(assignment);
 
-            // update name of assignment vertex
-            assignment->vertex_type_ = '\0'; // prevents printing as a map
-            assignment->update_name(assigment_name);
+                // update name of assignment vertex
+                assignment->vertex_type_ = '\0'; // prevents printing as a map
+                assignment->update_name(assigment_name);
 
-            // update term with assignment vertex
-            term.lhs() = assignment;
-            term.eq()  = assignment;
+                // update term with assignment vertex
+                term.lhs() = assignment;
+                term.eq()  = assignment;
 
 
-            // check if any operator in term is a sigma operator
-            for (const auto &op : term.rhs()) {
-                if (op->is_sigma_) {
-                    // mark that this equation has sigma vectors
-                    has_sigma_vecs_ = true; break;
+                // check if any operator in term is a sigma operator
+                for (const auto &op : term.rhs()) {
+                    if (op->is_sigma_) {
+                        // mark that this equation has sigma vectors
+                        has_sigma = true; break;
+                    }
                 }
-            }
 
-            if (use_density_fitting_){
-                vector<Term> density_fitted_terms = term.density_fitting();
-                terms.insert(terms.end(), density_fitted_terms.begin(), density_fitted_terms.end());
-            } else {
-                terms.push_back(term);
+                if (density_fitting){
+                    vector<Term> density_fitted_terms = term.density_fitting();
+                    local_terms.insert(local_terms.end(), density_fitted_terms.begin(), density_fitted_terms.end());
+                } else {
+                    local_terms.push_back(std::move(term));
+                }
             }
         }
 
+        // concatenate the thread buffers in input order
+        size_t num_terms = 0;
+        for (const auto &local_terms : thread_terms)
+            num_terms += local_terms.size();
+        terms.reserve(num_terms);
+        for (auto &local_terms : thread_terms)
+            std::move(local_terms.begin(), local_terms.end(), std::back_inserter(terms));
+
+        if (has_sigma) has_sigma_vecs_ = true;
 
         // build equation
         Equation& new_equation = equations_[assigment_name];
@@ -517,6 +641,7 @@ namespace pdaggerq {
 
         build_timer.stop(); // stop timer
         total_timer.stop(); // stop timer
+        report_stats("add");
     }
 
     void PQGraph::collect_scaling(bool recompute, bool include_reuse) {
@@ -612,6 +737,7 @@ namespace pdaggerq {
             mem_map_pre_ = mem_map_;
         }
         total_timer.stop();
+        report_stats("reorder");
     }
 
     void PQGraph::analysis() const {
@@ -722,35 +848,56 @@ namespace pdaggerq {
         if (!is_assembled_)
             assemble();
 
-        // merge similar terms
-        merge_terms();
+        // passes completed before a checkpoint was saved are skipped when resuming
+        if (optimize_stage_ > 0)
+            cout << "Resuming optimization after pass " << optimize_stage_ << endl;
+        last_checkpoint_ = std::chrono::steady_clock::now();
 
-        // reorder contractions in equations
-        reorder();
+        if (optimize_stage_ < 1) {
+            // merge similar terms
+            merge_terms();
 
-        // save scaling after reorder
-        flop_map_pre_ = flop_map_;
-        mem_map_pre_ = mem_map_;
+            // reorder contractions in equations
+            reorder();
+
+            // save scaling after reorder
+            flop_map_pre_ = flop_map_;
+            mem_map_pre_ = mem_map_;
+
+            optimize_stage_ = 1;
+            checkpoint(true);
+        }
 
         // substitute scalars first
-        if (opt_level_ >= 1) {
+        if (opt_level_ >= 1 && optimize_stage_ < 2) {
             cout << "----- Substituting scalars -----" << endl;
             substitute(false, true);
+
+            optimize_stage_ = 2;
+            checkpoint(true);
         }
 
         if (opt_level_ >= 2) {
 
             // find and substitute intermediate contractions
-            if (separate_sigma_)
-                cout << "----- Separating Intermediates for sigma-vector build -----" << endl;
-            else cout << "----- Substituting intermediates -----" << endl;
+            if (optimize_stage_ < 3) {
+                if (separate_sigma_)
+                    cout << "----- Separating Intermediates for sigma-vector build -----" << endl;
+                else cout << "----- Substituting intermediates -----" << endl;
 
-            substitute(separate_sigma_, false);
+                substitute(separate_sigma_, false);
 
-            if (separate_sigma_) {
+                optimize_stage_ = 3;
+                checkpoint(true);
+            }
+
+            if (separate_sigma_ && optimize_stage_ < 4) {
                 // apply substitutions again without separating intermediates
                 cout << "----- Substituting all intermediates -----" << endl;
                 substitute(false, false);
+
+                optimize_stage_ = 4;
+                checkpoint(true);
             }
         }
 
@@ -769,6 +916,14 @@ namespace pdaggerq {
         // analyze equations
         analysis();
 
+        checkpoint(true);
+
+        // keep the best contraction orders for later runs
+        if (Linkage::order_cache_.enabled()) {
+            Linkage::order_cache_.save(Linkage::order_fingerprint());
+            cout << "Saved " << Linkage::order_cache_.size() << " contraction orders to the cache" << endl;
+        }
+        report_stats("optimize");
     }
 
 } // pdaggerq
@@ -0,0 +1,484 @@
+//
+// pdaggerq - A code for bringing strings of creation / annihilation operators to normal order.
+// Filename: serialize.cc
+// Copyright (C) 2020 A. Eugene DePrince III
+//
+// Author: A. Eugene DePrince III <adeprince@fsu.edu>
+// Maintainer: DePrince group
+//
+// This file is part of the pdaggerq package.
+//
+//  Licensed under the Apache License, Version 2.0 (the "License");
+//  you may not use this file except in compliance with the License.
+//  You may obtain a copy of the License at
+//
+//      http://www.apache.org/licenses/LICENSE-2.0
+//
+//  Unless required by applicable law or agreed to in writing, software
+//  distributed under the License is distributed on an "AS IS" BASIS,
+//  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//  See the License for the specific language governing permissions and
+//  limitations under the License.
+//
+
+#include <memory>
+#include <cstdio>
+#include <fstream>
+#include <iostream>
+#include <unordered_map>
+
+#include "../include/pq_graph.h"
+
+using std::string, std::vector, std::map, std::unordered_map, std::shared_ptr, std::make_shared,
+      std::invalid_argument, std::cout, std::endl;
+
+namespace pdaggerq {
+
+    // identifies the file format and its version
+    static const string graph_file_tag = "pq_graph:1";
+
+    // tags for each vertex pointer in the file
+    enum : char { null_vertex = 0, seen_vertex = 1, leaf_vertex = 2, link_vertex = 3 };
+
+    /**
+     * writes the pieces of a pq_graph in binary.
+     * vertices are written once; later occurrences of the same pointer refer back to the first, so the
+     * intermediates shared by terms, equations and saved linkages are shared again when loaded.
+     */
+    struct graph_writer {
+
+        std::ofstream buffer;
+        unordered_map<const Vertex*, size_t> written; // index of each vertex already in the file
+
+        explicit graph_writer(const string &filename) : buffer(filename, std::ios::binary | std::ios::out) {
+            if (!buffer.is_open())
+                throw invalid_argument("could not open file '" + filename + "'");
+        }
+
+        template <typename T>
+        void primitive(const T &p) {
+            static_assert(std::is_trivially_copyable_v<T>, "only trivially copyable types are written directly");
+            buffer.write(reinterpret_cast<const char*>(&p), sizeof(p));
+        }
+
+        void str(const string &s) {
+            primitive(s.size());
+            buffer.write(s.data(), (std::streamsize) s.size());
+        }
+
+        void strings(const vector<string> &strs) {
+            primitive(strs.size());
+            for (const auto &s : strs) str(s);
+        }
+
+        void scaling(const scaling_map &scales) {
+            primitive(scales.map_.size());
+            for (const auto &[shape, count] : scales.map_) {
+                primitive(shape);
+                primitive(count);
+            }
+        }
+
+        void vertex(const VertexPtr &vert) {
+            if (vert == nullptr) { primitive(null_vertex); return; }
+
+            auto found = written.find(vert.get());
+            if (found != written.end()) {
+                primitive(seen_vertex);
+                primitive(found->second);
+                return;
+            }
+
+            const Linkage *link = vert->is_linked() ? dynamic_cast<const Linkage*>(vert.get()) : nullptr;
+            if (link != nullptr) {
+                primitive(link_vertex);
+                vertex(link->left_);
+                vertex(link->right_);
+            } else primitive(leaf_vertex);
+
+            str(vert->name_);
+            str(vert->base_name_);
+            primitive(vert->lines_.size());
+            for (const Line &line : vert->lines_) {
+                str(line.label_);
+                primitive(line.o_);
+                primitive(line.a_);
+                primitive(line.blk_type_);
+                primitive(line.sig_);
+                primitive(line.den_);
+            }
+            primitive(vert->rank_);
+            primitive(vert->shape_);
+            primitive(vert->vertex_type_);
+            primitive(vert->has_blk_);
+            primitive(vert->is_sigma_);
+            primitive(vert->is_den_);
+
+            if (link != nullptr) {
+                primitive(link->flop_scale_);
+                primitive(link->mem_scale_);
+                primitive(link->id_);
+                primitive(link->depth_);
+                primitive(link->addition_);
+                primitive(link->reused_);
+                primitive(link->connec_map_.size());
+                for (const auto &connec : link->connec_map_) primitive(connec);
+            }
+
+            // index after the children, in the same order the reader creates them
+            size_t index = written.size();
+            written[vert.get()] = index;
+        }
+
+        void term(const Term &term) {
+            vertex(term.lhs_);
+            vertex(term.eq_);
+            primitive(term.rhs_.size());
+            for (const auto &op : term.rhs_) vertex(op);
+
+            strings(term.comments_);
+            primitive(term.term_perms_.size());
+            for (const auto &[first, second] : term.term_perms_) {
+                str(first);
+                str(second);
+            }
+            primitive(term.perm_type_);
+
+            primitive(term.is_optimal_);
+            primitive(term.needs_update_);
+            primitive(term.generated_linkages_);
+            primitive(term.is_assignment_);
+            str(term.print_override_);
+            str(term.original_pq_);
+            primitive(term.coefficient_);
+        }
+
+        void equation(const Equation &equation) {
+            str(equation.name_);
+            vertex(equation.assignment_vertex_);
+            primitive(equation.terms_.size());
+            for (const auto &term : equation.terms_) this->term(term);
+            primitive(equation.is_temp_equation_);
+            primitive(equation.allow_substitution_);
+        }
+    };
+
+    /**
+     * reads the pieces of a pq_graph written by graph_writer
+     */
+    struct graph_reader {
+
+        std::ifstream buffer;
+        vector<VertexPtr> read; // vertices in the order they were written
+
+        explicit graph_reader(const string &filename) : buffer(filename, std::ios::binary | std::ios::in) {
+            if (!buffer.is_open())
+                throw invalid_argument("could not open file '" + filename + "'");
+        }
+
+        template <typename T>
+        void primitive(T &p) {
+            static_assert(std::is_trivially_copyable_v<T>, "only trivially copyable types are read directly");
+            buffer.read(reinterpret_cast<char*>(&p), sizeof(p));
+            if (!buffer) throw invalid_argument("unexpected end of pq_graph file");
+        }
+
+        template <typename T>
+        T primitive() { T p{}; primitive(p); return p; }
+
+        void str(string &s) {
+            s.resize(primitive<size_t>());
+            buffer.read(s.data(), (std::streamsize) s.size());
+            if (!buffer) throw invalid_argument("unexpected end of pq_graph file");
+        }
+
+        string str() { string s; str(s); return s; }
+
+        void strings(vector<string> &strs) {
+            strs.resize(primitive<size_t>());
+            for (auto &s : strs) str(s);
+        }
+
+        void scaling(scaling_map &scales) {
+            scales.clear();
+            size_t size = primitive<size_t>();
+            for (size_t i = 0; i < size; ++i) {
+                auto shape = primitive<struct shape>();
+                scales.map_[shape] = primitive<long>();
+            }
+        }
+
+        VertexPtr vertex() {
+            char tag = primitive<char>();
+            if (tag == null_vertex) return nullptr;
+            if (tag == seen_vertex) {
+                size_t index = primitive<size_t>();
+                if (index >= read.size()) throw invalid_argument("corrupt vertex reference in pq_graph file");
+                return read[index];
+            }
+            if (tag != leaf_vertex && tag != link_vertex)
+                throw invalid_argument("corrupt vertex in pq_graph file");
+
+            // restore the linkage as it was built rather than rebuilding its connections
+            MutableLinkagePtr link;
+            MutableVertexPtr vert;
+            if (tag == link_vertex) {
+                link = make_shared<Linkage>();
+                link->left_ = vertex();
+                link->right_ = vertex();
+                vert = link;
+            } else vert = make_shared<Vertex>();
+
+            str(vert->name_);
+            str(vert->base_name_);
+            vert->lines_.resize(primitive<size_t>());
+            for (Line &line : vert->lines_) {
+                str(line.label_);
+                primitive(line.o_);
+                primitive(line.a_);
+                primitive(line.blk_type_);
+                primitive(line.sig_);
+                primitive(line.den_);
+            }
+            primitive(vert->rank_);
+            primitive(vert->shape_);
+            primitive(vert->vertex_type_);
+            primitive(vert->has_blk_);
+            primitive(vert->is_sigma_);
+            primitive(vert->is_den_);
+
+            if (link != nullptr) {
+                primitive(link->flop_scale_);
+                primitive(link->mem_scale_);
+                primitive(link->id_);
+                primitive(link->depth_);
+                primitive(link->addition_);
+                primitive(link->reused_);
+                link->connec_map_.resize(primitive<size_t>());
+                for (auto &connec : link->connec_map_) primitive(connec);
+            }
+
+            read.push_back(vert);
+            return vert;
+        }
+
+        void term(Term &term) {
+            term.lhs_ = vertex();
+            term.eq_ = vertex();
+            term.rhs_.resize(primitive<size_t>());
+            for (auto &op : term.rhs_) op = vertex();
+
+            strings(term.comments_);
+            term.term_perms_.resize(primitive<size_t>());
+            for (auto &[first, second] : term.term_perms_) {
+                str(first);
+                str(second);
+            }
+            primitive(term.perm_type_);
+
+            primitive(term.is_optimal_);
+            primitive(term.needs_update_);
+            primitive(term.generated_linkages_);
+            primitive(term.is_assignment_);
+            str(term.print_override_);
+            str(term.original_pq_);
+            primitive(term.coefficient_);
+        }
+
+        void equation(Equation &equation) {
+            str(equation.name_);
+            equation.assignment_vertex_ = vertex();
+            equation.terms_.resize(primitive<size_t>());
+            for (auto &term : equation.terms_) this->term(term);
+            primitive(equation.is_temp_equation_);
+            primitive(equation.allow_substitution_);
+        }
+    };
+
+    void PQGraph::save(const string &filename) const {
+
+        graph_writer out(filename);
+        out.str(graph_file_tag);
+
+        /// options (the number of threads belongs to the machine, not the graph)
+        out.primitive(print_level_);
+        out.primitive(opt_level_);
+        out.primitive(batched_);
+        out.primitive(batch_size_);
+        out.primitive(max_temps_);
+        out.primitive(use_density_fitting_);
+        out.primitive(has_sigma_vecs_);
+        out.primitive(separate_sigma_);
+        out.primitive(fusion_threshold_);
+
+        /// static options
+        out.primitive(Term::max_depth_);
+        out.primitive(Term::max_shape_);
+        out.primitive(batch_density_); // a graph option, only made static while printing
+        out.primitive(Term::mapped_conditions_.size());
+        for (const auto &[condition, restrict_ops] : Term::mapped_conditions_) {
+            out.str(condition);
+            out.strings(restrict_ops);
+        }
+        out.primitive(Vertex::allow_permute_);
+        out.primitive(Vertex::use_trial_index);
+        out.primitive(Vertex::permute_eri_);
+        out.primitive(Vertex::batched_den_);
+        out.primitive(Equation::permuted_merge_);
+        out.primitive(Equation::separate_conditions_);
+        out.primitive(Equation::no_scalars_);
+        out.primitive(Linkage::low_memory_);
+        out.primitive(Line::occ_labels_);
+        out.primitive(Line::virt_labels_);
+        out.primitive(Line::sig_labels_);
+        out.primitive(Line::den_labels_);
+
+        /// state of the optimization
+        out.primitive(is_assembled_);
+        out.primitive(is_reordered_);
+        out.primitive(is_optimized_);
+        out.primitive(optimize_stage_);
+        out.primitive(num_terms_init_);
+        out.scaling(flop_map_init_);
+        out.scaling(mem_map_init_);
+        out.scaling(flop_map_pre_);
+        out.scaling(mem_map_pre_);
+        out.primitive(num_candidates_);
+        out.primitive(num_substitutions_);
+        out.primitive(num_merged_);
+        out.primitive(num_fused_);
+        out.primitive(num_pruned_);
+
+        /// temp counters and saved linkages
+        out.primitive(temp_counts_.size());
+        for (const auto &[type, count] : temp_counts_) {
+            out.str(type);
+            out.primitive(count);
+        }
+
+        out.primitive(saved_linkages_.size());
+        for (const auto &[type, linkages] : saved_linkages_) {
+            out.str(type);
+            out.primitive(linkages.size());
+            for (const auto &linkage : linkages)
+                out.vertex(linkage);
+        }
+
+        /// equations
+        out.primitive(equations_.size());
+        for (const auto &[name, equation] : equations_) {
+            out.str(name);
+            out.equation(equation);
+        }
+
+        if (!out.buffer)
+            throw invalid_argument("could not write pq_graph to '" + filename + "'");
+    }
+
+    void PQGraph::load(const string &filename) {
+
+        graph_reader in(filename);
+        if (in.str() != graph_file_tag)
+            throw invalid_argument("'" + filename + "' is not a pq_graph file");
+
+        /// options
+        in.primitive(print_level_);
+        in.primitive(opt_level_);
+        in.primitive(batched_);
+        in.primitive(batch_size_);
+        in.primitive(max_temps_);
+        in.primitive(use_density_fitting_);
+        in.primitive(has_sigma_vecs_);
+        in.primitive(separate_sigma_);
+        in.primitive(fusion_threshold_);
+
+        /// static options
+        in.primitive(Term::max_depth_);
+        in.primitive(Term::max_shape_);
+        in.primitive(batch_density_);
+        Term::mapped_conditions_.clear();
+        size_t num_conditions = in.primitive<size_t>();
+        for (size_t i = 0; i < num_conditions; ++i) {
+            string condition = in.str();
+            in.strings(Term::mapped_conditions_[condition]);
+        }
+        in.primitive(Vertex::allow_permute_);
+        in.primitive(Vertex::use_trial_index);
+        in.primitive(Vertex::permute_eri_);
+        in.primitive(Vertex::batched_den_);
+        in.primitive(Equation::permuted_merge_);
+        in.primitive(Equation::separate_conditions_);
+        in.primitive(Equation::no_scalars_);
+        in.primitive(Linkage::low_memory_);
+        in.primitive(Line::occ_labels_);
+        in.primitive(Line::virt_labels_);
+        in.primitive(Line::sig_labels_);
+        in.primitive(Line::den_labels_);
+
+        /// state of the optimization
+        in.primitive(is_assembled_);
+        in.primitive(is_reordered_);
+        in.primitive(is_optimized_);
+        in.primitive(optimize_stage_);
+        in.primitive(num_terms_init_);
+        in.scaling(flop_map_init_);
+        in.scaling(mem_map_init_);
+        in.scaling(flop_map_pre_);
+        in.scaling(mem_map_pre_);
+        in.primitive(num_candidates_);
+        in.primitive(num_substitutions_);
+        in.primitive(num_merged_);
+        in.primitive(num_fused_);
+        in.primitive(num_pruned_);
+
+        /// temp counters and saved linkages
+        temp_counts_.clear();
+        size_t num_counts = in.primitive<size_t>();
+        for (size_t i = 0; i < num_counts; ++i) {
+            string type = in.str();
+            in.primitive(temp_counts_[type]);
+        }
+
+        saved_linkages_.clear();
+        size_t num_types = in.primitive<size_t>();
+        for (size_t i = 0; i < num_types; ++i) {
+            string type = in.str();
+            size_t num_linkages = in.primitive<size_t>();
+            linkage_set &linkages = saved_linkages_.emplace(type, linkage_set(std::max(num_linkages, 256ul))).first->second;
+            for (size_t j = 0; j < num_linkages; ++j)
+                linkages.insert(in.vertex());
+        }
+
+        /// equations
+        equations_.clear();
+        size_t num_equations = in.primitive<size_t>();
+        for (size_t i = 0; i < num_equations; ++i) {
+            string name = in.str();
+            in.equation(equations_[name]);
+        }
+
+        // candidate linkages are regenerated by the next substitution
+        all_links_.clear();
+
+        // scaling of terms and equations is derived from their linkages
+        collect_scaling(true, true);
+    }
+
+    void PQGraph::checkpoint(bool force) {
+        if (checkpoint_file_.empty()) return;
+
+        auto now = std::chrono::steady_clock::now();
+        if (!force && std::chrono::duration<double>(now - last_checkpoint_).count() < checkpoint_interval_)
+            return;
+
+        // write to a temporary file first so an interrupted save never replaces a good checkpoint
+        string tmp_file = checkpoint_file_ + ".tmp";
+        save(tmp_file);
+        if (std::rename(tmp_file.c_str(), checkpoint_file_.c_str()) != 0)
+            throw invalid_argument("could not write checkpoint '" + checkpoint_file_ + "'");
+
+        last_checkpoint_ = now;
+        cout << "Checkpoint saved to '" << checkpoint_file_ << "' (pass " << optimize_stage_ << " complete)" << endl;
+    }
+
+} // pdaggerq
@@ -73,14 +73,11 @@ linkage_set Term::make_all_links() const {
 
     if (term_linkage()->is_temp()) return {}; // the term_linkage is already a temp, no need to test it.
 
-    // generate all subgraphs of the term
-    auto subgraphs = term_linkage()->subgraphs(Term::max_depth_);
-
-    // insert all subgraphs of a given deoth into the set of linkages
-    for (const auto &subgraph : subgraphs) {
-        if (subgraph->shape_ > Term::max_shape_) continue; // skip if subgraph shape is too large
-        if (subgraph->empty()) continue; // skip if subgraph is empty
-        if (subgraph->is_temp()) continue; // the subgraph is already a temp, no need to test it.
+    // walk the subgraphs of the term and insert the best permutation of each into the set of linkages
+    term_linkage()->subgraphs(Term::max_depth_, [&linkages](const LinkagePtr &subgraph) {
+        if (subgraph->shape_ > Term::max_shape_) return; // skip if subgraph shape is too large
+        if (subgraph->empty()) return; // skip if subgraph is empty
+        if (subgraph->is_temp()) return; // the subgraph is already a temp, no need to test it.
 
         // get best permutation of subgraph and relabel with generic lines
         LinkagePtr best_perm = as_link(subgraph->best_permutation()->relabel());
@@ -89,7 +86,7 @@ linkage_set Term::make_all_links() const {
 
         // insert the best subperm into the set of linkages
         linkages.insert(best_perm);
-    }
+    });
 
     return linkages;
 }
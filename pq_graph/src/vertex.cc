@@ -73,6 +73,7 @@ namespace pdaggerq {
         // set base name
         if (type == "two_body")  base_name_ = "g";
         else if (type == "eri")  base_name_ = "eri";
+        else if (type == "spatial_eri") base_name_ = "V";
         else if (type == "core") base_name_ = "h";
         else if (type == "fock") base_name_ = "f";
         else if (type == "d+" || type == "d-" )
@@ -162,6 +163,9 @@ namespace pdaggerq {
             if (is_eri){ // if it has '<', then vertex_string is <p,q||r,s> with name = eri and line = p,q,r,s
                 base_name_ = "eri";
 
+                // coulomb integrals of a closed-shell reference are <p,q|r,s> with name = V
+                if (vertex_string.find("||") == string::npos)
+                    base_name_ = "V";
 
                 // remove '<' and '>'
                 size_t langel_idx = vertex_string.find('<');
@@ -171,9 +175,9 @@ namespace pdaggerq {
                 // append text after '>' to line_string
                 if (rangel_idx+1 < vertex_string.size()) line_string += vertex_string.substr(rangel_idx+1);
 
-                // remove '||' and replace with ','
-                size_t vline_idx = line_string.find("||");
-                line_string.replace(vline_idx, 2, ",");
+                // remove '||' (or '|') and replace with ','
+                size_t vline_idx = line_string.find('|');
+                line_string.replace(vline_idx, base_name_ == "eri" ? 2 : 1, ",");
 
             } else {
                 size_t index = vertex_string.find('('); // index of '('
@@ -329,10 +329,24 @@ namespace pdaggerq {
                     string tensor_str = tensor->str();
                     if (tensor->is_addition() && !tensor->is_temp())
                         tensor_str = "(" + tensor_str + ")";
+
+                    // take the current batch of the density-fitting line (always the leading dimension)
+                    const line_vector &tensor_lines = tensor->lines();
+                    if (batched_den_ != '\0' && !tensor_lines.empty() && tensor_lines[0].den_
+                        && tensor_lines[0].label_[0] == batched_den_)
+                        tensor_str += "[qb_]";
+
                     output += tensor_str + ",";
                 }
 
-                if (tensors.size() > 2)
+                // with a trial index, let numpy hand pairwise contractions to tensordot (GEMM over all trial vectors)
+                bool has_trial = false;
+                if (Vertex::use_trial_index && tensors.size() == 2) {
+                    for (const auto &tensor: tensors)
+                        has_trial |= tensor->is_sigma_;
+                }
+
+                if (tensors.size() > 2 || has_trial)
                     output += "optimize='optimal'";
                 else output.pop_back();
 
@@ -1,9 +1,10 @@
-def get_spin_labels(ops):
+def get_spin_labels(ops, closed_shell=False):
     """
     Get spin labels for the given operators.
 
     Args:
         ops (list): List of operators.
+        closed_shell (bool): Keep only the spin blocks that are unique for a closed-shell reference.
 
     Returns:
         dict: Dictionary mapping spin types to label-spin mappings.
@@ -47,6 +48,12 @@ def get_spin_labels(ops):
     if spin_types == [] and len(labels) != 0:
         raise ValueError("Invalid number of labels for spin blocking")
 
+    # for a closed-shell reference, the aa and abab blocks determine all others
+    if closed_shell:
+        if len(labels) not in (1, 2, 4):
+            raise ValueError("Closed-shell spin blocking only supports one- and two-body equations")
+        spin_types = [spin for spin in spin_types if spin in ("a", "aa", "abab")]
+
     # create a mapping of labels to spins for each spin type
     for spin in spin_types:
         if len(labels) != len(spin):
@@ -56,7 +63,7 @@ def get_spin_labels(ops):
 
     return spin_map
 
-def block_by_spin(pq, eqname, ops, eqs):
+def block_by_spin(pq, eqname, ops, eqs, closed_shell=False):
     """
     Block the equation by spin and store the result in the equations dictionary.
 
@@ -65,8 +72,11 @@ def block_by_spin(pq, eqname, ops, eqs):
         eqname (str): Name of the equation.
         ops (list): List of operators.
         eqs (dict): Dictionary to store the derived equations.
+        closed_shell (bool): Assume a closed-shell reference. Only the unique spin block is kept, and it is
+            stored under eqname in terms of spatial orbitals (see pq_helper.set_closed_shell).
     """
-    spin_map = get_spin_labels(ops)
+    spin_map = get_spin_labels(ops, closed_shell)
+    pq.set_closed_shell(closed_shell)
 
     # print the blocking by spin
     print("Blocking by spin:", flush=True)
@@ -76,7 +86,7 @@ def block_by_spin(pq, eqname, ops, eqs):
 
     # create equations for each spin block
     for spins, label_to_spin in spin_map.items():
-        spin_eqname = eqname if spins == "" else eqname + "_" + spins
+        spin_eqname = eqname if spins == "" or closed_shell else eqname + "_" + spins
         pq.block_by_spin(label_to_spin)
 
         # store the equation in the dictionary
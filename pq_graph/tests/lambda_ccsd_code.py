@@ -0,0 +1,1889 @@
+#!/usr/bin/env python3
+"""
+A full working spin-orbital lambda-CCSD code generated with pdaggerq
+
+If you want to run the example here you should install pyscf openfermion and openfermion-pyscf
+The actual CCSD code (ccsd_energy, singles_residual, doubles_residual, kernel)
+do not depend on those packages but you gotta get integrals frome somehwere.
+
+We also check the code by using pyscfs functionality for generating spin-orbital
+t-amplitudes from RCCSD.  the main() function is fairly straightforward.
+"""
+# set allow numpy built with MKL to consume more threads for tensordot
+import os
+os.environ["MKL_NUM_THREADS"] = "{}".format(os.cpu_count() - 1)
+
+import numpy as np
+from numpy import einsum
+
+
+def lagrangian_energy(t1, t2, l1, l2, f, g, o, v):
+    """
+    L(t1, t2, l1, l2) = <0|e(-T)H e(T)|0> + \sum_{i}l_{i}<i|e(-T)H e(T)|0>
+
+    :param t1: spin-orbital t1 amplitudes (nvirt x nocc)
+    :param t2: spin-orbital t2 amplitudes (nvirt x nvirt x nocc x nocc)
+    :param l1: lagrange multiplier for singles (nocc x nvirt)
+    :param l2: lagrange multiplier for doubles (nocc x nocc x nvirt x nvirt)
+    :param f: fock operator defined as soei + np.einsum('piiq->pq', astei[:, o, o, :])
+              where soei is 1 electron integrals (spinorb) and astei is
+              antisymmetric 2 electron integrals in openfermion format
+              <12|21>.  <ij|kl> - <ij|lk>
+    :param g: antisymmetric 2 electron integrals. See fock input.
+    :param o: slice(None, occ) where occ is number of occupied spin-orbitals
+    :param v: slice(occ, None) whwere occ is number of occupied spin-orbitals
+    """
+    l_energy = ccsd_energy(t1, t2, f, g, o, v)
+    l_energy += np.einsum('me,em', l1, singles_residual(t1, t2, f, g, o, v))
+    l_energy += np.einsum('mnef,efmn', l2, doubles_residual(t1, t2, f, g, o, v))
+    return l_energy
+
+def integral_maps(fock, g, o, v):
+    eri = {}
+    eri["oooo"] = g[o,o,o,o]
+    eri["oovo"] = g[o,o,v,o]
+    eri["oovv"] = g[o,o,v,v]
+    eri["vooo"] = g[v,o,o,o]
+    eri["vovo"] = g[v,o,v,o]
+    eri["vovv"] = g[v,o,v,v]
+    eri["vvoo"] = g[v,v,o,o]
+    eri["vvvo"] = g[v,v,v,o]
+    eri["vvvv"] = g[v,v,v,v]
+
+    f = {}
+    f["oo"] = fock[o,o]
+    f["ov"] = fock[o,v]
+    f["vo"] = fock[v,o]
+    f["vv"] = fock[v,v]
+
+    Id = {}
+    Id["oo"] = np.zeros_like(f["oo"])
+    Id["vv"] = np.zeros_like(f["vv"])
+    np.fill_diagonal(Id["oo"], 1.0)
+    np.fill_diagonal(Id["vv"], 1.0)
+
+    return f, eri, Id
+
+def lambda_eval(t1, t2, l1, l2, fock, g, o, v):
+    f, eri, Id = integral_maps(fock, g, o, v)
+    tmps_ = {}
+
+#################### PQ GRAPH Output ####################
+
+##### Declarations #####
+
+## initialize -> eri["oooo"];
+## initialize -> eri["oovo"];
+## initialize -> eri["oovv"];
+## initialize -> eri["vooo"];
+## initialize -> eri["vovo"];
+## initialize -> eri["vovv"];
+## initialize -> eri["vvvo"];
+## initialize -> eri["vvvv"];
+## initialize -> f["oo"];
+## initialize -> f["ov"];
+## initialize -> f["vv"];
+## initialize -> l1;
+## initialize -> l2;
+## initialize -> ldoubles;
+## initialize -> lsingles;
+## initialize -> perm_tmps;
+## initialize -> t1;
+## initialize -> t2;
+## initialize -> tmps;
+
+#################### Evaluate Equations ####################
+
+    
+    # ldoubles  = +1.00 <m,n||e,f> 
+    ldoubles  = 1.00 * np.einsum('mnef->mnef',eri["oovv"])
+    
+    # lsingles  = +1.00 f(m,e) 
+    lsingles  = 1.00 * np.einsum('me->me',f["ov"])
+    
+    # ldoubles += -1.00 P(m,n) P(e,f) f(n,e) l1(m,f) 
+    # flops: o2v2L1 += o2v2L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('nemf->efmn', np.einsum('ne,mf->nemf',f["ov"],l1) )
+    ldoubles -= einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('efnm->mnef', np.einsum('efnm->efnm',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    ldoubles -= einsum('fenm->mnef', np.einsum('fenm->fenm',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # ldoubles += -1.00 P(m,n) f(n,i) l2(m,i,e,f) 
+    # flops: o2v2L1 += o3v2L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('nmef->efmn', np.einsum('ni,mief->nmef',f["oo"],l2) )
+    ldoubles -= einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('efnm->mnef', np.einsum('efnm->efnm',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # ldoubles += -1.00 P(e,f) <m,n||e,i> l1(i,f) 
+    # flops: o2v2L1 += o3v2L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('mnef->efmn', np.einsum('mnei,if->mnef',eri["oovo"],l1) )
+    ldoubles -= einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # ldoubles += +1.00 P(e,f) f(a,e) l2(m,n,a,f) 
+    # flops: o2v2L1 += o2v3L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('emnf->efmn', np.einsum('ae,mnaf->emnf',f["vv"],l2) )
+    ldoubles += einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles -= einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # ldoubles += -1.00 P(m,n) <n,a||e,f> l1(m,a) 
+    # flops: o2v2L1 += o2v3L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('nefm->efmn', np.einsum('anef,ma->nefm',eri["vovv"],l1) )
+    ldoubles += einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles -= einsum('efnm->mnef', np.einsum('efnm->efnm',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # ldoubles += +0.50 <m,n||i,j> l2(i,j,e,f) 
+    # flops: o2v2L1 += o4v2L1
+    #  mems: o2v2L1 += o2v2L1
+    ldoubles += 0.50 * np.einsum('mnij,ijef->mnef',eri["oooo"],l2)
+    
+    # lsingles += -1.00 f(m,i) l1(i,e) 
+    # flops: o1v1L1 += o2v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= np.einsum('mi,ie->me',f["oo"],l1)
+    
+    # lsingles += +1.00 f(a,e) l1(m,a) 
+    # flops: o1v1L1 += o1v2L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles += einsum('em->me', np.einsum('ae,ma->em',f["vv"],l1) )
+    
+    # lsingles += +1.00 <m,a||e,i> l1(i,a) 
+    # flops: o1v1L1 += o2v2L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= np.einsum('amei,ia->me',eri["vovo"],l1)
+    
+    # lsingles += +0.50 <m,a||i,j> l2(i,j,a,e) 
+    # flops: o1v1L1 += o3v2L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= 0.50 * np.einsum('amij,ijae->me',eri["vooo"],l2)
+    
+    # lsingles += +0.50 <b,a||e,i> l2(m,i,b,a) 
+    # flops: o1v1L1 += o2v3L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= 0.50 * einsum('em->me', np.einsum('abei,miba->em',eri["vvvo"],l2) )
+    
+    # lsingles += -1.00 <k,m||b,j> t2(b,a,i,k) l2(i,j,e,a) 
+    # flops: o1v1L1 += o4v2 o3v2L1
+    #  mems: o1v1L1 += o3v1 o1v1L1
+    lsingles -= np.einsum('kmbj,baik,ijea->me',eri["oovo"],t2,l2,optimize='optimal')
+    
+    # lsingles += +0.250 <m,a||b,c> t2(b,c,i,j) l2(i,j,a,e) 
+    # flops: o1v1L1 += o3v3 o3v2L1
+    #  mems: o1v1L1 += o3v1 o1v1L1
+    lsingles -= 0.250 * np.einsum('ambc,bcij,ijae->me',eri["vovv"],t2,l2,optimize='optimal')
+    
+    # lsingles += -1.00 <j,b||e,c> t2(c,a,i,j) l2(i,m,b,a) 
+    # flops: o1v1L1 += o2v4 o2v3L1
+    #  mems: o1v1L1 += o1v3 o1v1L1
+    lsingles -= einsum('em->me', np.einsum('bjce,caij,imba->em',eri["vovv"],t2,l2,optimize='optimal') )
+    
+    # lsingles += +1.00 <k,j||e,c> t2(c,a,i,k) t1(b,j) l2(i,m,b,a) 
+    # flops: o1v1L1 += o3v3 o2v3 o2v3L1
+    #  mems: o1v1L1 += o2v2 o1v3 o1v1L1
+    lsingles += einsum('em->me', np.einsum('jkce,caik,bj,imba->em',eri["oovv"],t2,t1,l2,optimize='optimal') )
+    
+    # flops: o2v2L1  = o2v4L1
+    #  mems: o2v2L1  = o2v2L1
+    tmps_["1_Lvvoo"]  = 1.00 * np.einsum('cdab,ijdc->abij',eri["vvvv"],l2)
+    
+    # ldoubles += +0.50 <b,a||e,f> l2(m,n,b,a) 
+    ldoubles -= 0.50 * einsum('efmn->mnef', tmps_["1_Lvvoo"] )
+    
+    # lsingles += -0.50 <b,a||e,c> t1(c,i) l2(i,m,b,a) 
+    # flops: o1v1L1 += o2v2L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= 0.50 * einsum('em->me', np.einsum('ci,ceim->em',t1,tmps_["1_Lvvoo"]) )
+    del tmps_["1_Lvvoo"]
+    
+    # flops: o2v2L1  = o3v3L1
+    #  mems: o2v2L1  = o2v2L1
+    tmps_["2_Lovov"]  = 1.00 * np.einsum('ciak,jkcb->iajb',eri["vovo"],l2)
+    
+    # ldoubles += +1.00 P(m,n) P(e,f) <n,a||e,i> l2(m,i,a,f) 
+    ldoubles -= einsum('nemf->mnef', tmps_["2_Lovov"] )
+    ldoubles += einsum('menf->mnef', tmps_["2_Lovov"] )
+    ldoubles += einsum('nfme->mnef', tmps_["2_Lovov"] )
+    ldoubles -= einsum('mfne->mnef', tmps_["2_Lovov"] )
+    
+    # lsingles += +1.00 <m,a||b,j> t1(b,i) l2(i,j,a,e) 
+    # flops: o1v1L1 += o2v2L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= np.einsum('bi,mbie->me',t1,tmps_["2_Lovov"])
+    del tmps_["2_Lovov"]
+    
+    # flops: o2v2  = o3v3
+    #  mems: o2v2  = o2v2
+    tmps_["3_voov"]  = 1.00 * np.einsum('caik,kjcb->aijb',t2,eri["oovv"])
+    
+    # ldoubles += +1.00 P(m,n) P(e,f) <j,n||e,b> t2(b,a,i,j) l2(i,m,f,a) 
+    # flops: o2v2L1 += o3v3L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('mfne->efmn', np.einsum('imfa,aine->mfne',l2,tmps_["3_voov"]) )
+    ldoubles -= einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('efnm->mnef', np.einsum('efnm->efnm',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    ldoubles -= einsum('fenm->mnef', np.einsum('fenm->fenm',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # lsingles += +1.00 <j,m||e,b> t2(b,a,i,j) l1(i,a) 
+    # flops: o1v1L1 += o2v2L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= np.einsum('ia,aime->me',l1,tmps_["3_voov"])
+    del tmps_["3_voov"]
+    
+    # flops: o0v2  = o2v3
+    #  mems: o0v2  = o0v2
+    tmps_["4_vv"]  = 1.00 * np.einsum('caij,jicb->ab',t2,eri["oovv"])
+    
+    # ldoubles += -0.50 P(e,f) <j,i||e,b> t2(b,a,j,i) l2(m,n,f,a) 
+    # flops: o2v2L1 += o2v3L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 0.50 * einsum('emnf->efmn', np.einsum('ae,mnfa->emnf',tmps_["4_vv"],l2) )
+    ldoubles -= einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # lsingles += +0.50 <j,i||e,b> t2(b,a,j,i) l1(m,a) 
+    # flops: o1v1L1 += o1v2L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles += 0.50 * einsum('em->me', np.einsum('ae,ma->em',tmps_["4_vv"],l1) )
+    del tmps_["4_vv"]
+    
+    # flops: o0v2  = o1v3
+    #  mems: o0v2  = o0v2
+    tmps_["5_vv"]  = 1.00 * np.einsum('aicb,ci->ab',eri["vovv"],t1)
+    
+    # ldoubles += -1.00 P(e,f) <i,a||e,b> t1(b,i) l2(m,n,a,f) 
+    # flops: o2v2L1 += o2v3L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('emnf->efmn', np.einsum('ae,mnaf->emnf',tmps_["5_vv"],l2) )
+    ldoubles -= einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # lsingles += -1.00 <i,a||e,b> t1(b,i) l1(m,a) 
+    # flops: o1v1L1 += o1v2L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= einsum('em->me', np.einsum('ae,ma->em',tmps_["5_vv"],l1) )
+    del tmps_["5_vv"]
+    
+    # flops: o2v0  = o3v1
+    #  mems: o2v0  = o2v0
+    tmps_["6_oo"]  = 1.00 * np.einsum('kiaj,ak->ij',eri["oovo"],t1)
+    
+    # ldoubles += -1.00 P(m,n) <j,n||a,i> t1(a,j) l2(m,i,e,f) 
+    # flops: o2v2L1 += o3v2L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('mefn->efmn', np.einsum('mief,ni->mefn',l2,tmps_["6_oo"]) )
+    ldoubles -= einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('efnm->mnef', np.einsum('efnm->efnm',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # lsingles += -1.00 <j,m||a,i> t1(a,j) l1(i,e) 
+    # flops: o1v1L1 += o2v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= einsum('em->me', np.einsum('ie,mi->em',l1,tmps_["6_oo"]) )
+    del tmps_["6_oo"]
+    
+    # flops: o2v2  = o2v3
+    #  mems: o2v2  = o2v2
+    tmps_["7_vovo"]  = 1.00 * np.einsum('aicb,cj->aibj',eri["vovv"],t1)
+    
+    # ldoubles += -1.00 P(m,n) P(e,f) <n,a||e,b> t1(b,i) l2(i,m,a,f) 
+    # flops: o2v2L1 += o3v3L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('mfne->efmn', np.einsum('imaf,anei->mfne',l2,tmps_["7_vovo"]) )
+    ldoubles -= einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('efnm->mnef', np.einsum('efnm->efnm',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    ldoubles -= einsum('fenm->mnef', np.einsum('fenm->fenm',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # lsingles += +1.00 <m,a||e,b> t1(b,i) l1(i,a) 
+    # flops: o1v1L1 += o2v2L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles += np.einsum('ia,amei->me',l1,tmps_["7_vovo"])
+    
+    # lsingles += -0.50 <m,a||b,c> t1(b,j) t1(c,i) l2(i,j,a,e) 
+    # flops: o1v1L1 += o3v2 o3v2L1
+    #  mems: o1v1L1 += o3v1 o1v1L1
+    lsingles += 0.50 * np.einsum('ci,amcj,ijae->me',t1,tmps_["7_vovo"],l2,optimize='optimal')
+    
+    # flops: o3v1L1  = o3v2L1
+    #  mems: o3v1L1  = o3v1L1
+    tmps_["9_Loovo"]  = 1.00 * np.einsum('ijab,bk->ijak',l2,t1)
+    
+    # ldoubles += +1.00 P(e,f) f(i,e) t1(a,i) l2(m,n,f,a) 
+    # flops: o2v2L1 += o3v2L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('emnf->efmn', np.einsum('ie,mnfi->emnf',f["ov"],tmps_["9_Loovo"]) )
+    ldoubles += einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles -= einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # ldoubles += -1.00 P(m,n) P(e,f) <j,n||e,i> t1(a,j) l2(m,i,f,a) 
+    # flops: o2v2L1 += o4v2L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('mfne->efmn', np.einsum('mifj,jnei->mfne',tmps_["9_Loovo"],eri["oovo"]) )
+    ldoubles -= einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('efnm->mnef', np.einsum('efnm->efnm',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    ldoubles -= einsum('fenm->mnef', np.einsum('fenm->fenm',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # ldoubles += +1.00 <i,b||e,f> t1(a,i) l2(m,n,b,a) 
+    # flops: o2v2L1 += o3v3L1
+    #  mems: o2v2L1 += o2v2L1
+    ldoubles -= einsum('efmn->mnef', np.einsum('bief,mnbi->efmn',eri["vovv"],tmps_["9_Loovo"]) )
+    
+    # lsingles += -1.00 <j,b||e,c> t1(a,j) t1(c,i) l2(i,m,b,a) 
+    # flops: o1v1L1 += o3v2L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= einsum('em->me', np.einsum('bjei,imbj->em',tmps_["7_vovo"],tmps_["9_Loovo"]) )
+    del tmps_["7_vovo"]
+    
+    # lsingles += -0.50 <k,m||i,j> t1(a,k) l2(i,j,e,a) 
+    # flops: o1v1L1 += o4v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= 0.50 * einsum('em->me', np.einsum('ijek,kmij->em',tmps_["9_Loovo"],eri["oooo"]) )
+    
+    # lsingles += +1.00 <j,b||e,i> t1(a,j) l2(m,i,b,a) 
+    # flops: o1v1L1 += o3v2L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= einsum('em->me', np.einsum('bjei,mibj->em',eri["vovo"],tmps_["9_Loovo"]) )
+    
+    # flops: o4v0L1  = o4v1L1
+    #  mems: o4v0L1  = o4v0L1
+    tmps_["10_Loooo"]  = 1.00 * einsum('lijk->ijkl', np.einsum('al,ijak->lijk',t1,tmps_["9_Loovo"]) )
+    
+    # flops: o4v0L1  = o4v2L1
+    #  mems: o4v0L1  = o4v0L1
+    tmps_["8_Loooo"]  = 1.00 * np.einsum('abij,klab->ijkl',t2,l2)
+    
+    # flops: o4v0L1  = o4v0L1
+    #  mems: o4v0L1  = o4v0L1
+    tmps_["11_Loooo"]  = 1.00 * tmps_["8_Loooo"]
+    tmps_["11_Loooo"] -= 2.00 * einsum('klij->ijkl', tmps_["10_Loooo"] )
+    del tmps_["10_Loooo"]
+    del tmps_["8_Loooo"]
+    
+    # ldoubles += +0.250 <j,i||e,f> t2(b,a,j,i) l2(m,n,b,a) 
+    #          += -0.50 <j,i||e,f> t1(a,j) t1(b,i) l2(m,n,b,a) 
+    # flops: o2v2L1 += o4v2L1
+    #  mems: o2v2L1 += o2v2L1
+    ldoubles -= 0.250 * einsum('efmn->mnef', np.einsum('ijef,jimn->efmn',eri["oovv"],tmps_["11_Loooo"]) )
+    
+    # lsingles += +0.250 <k,j||e,i> t2(b,a,k,j) l2(m,i,b,a) 
+    #          += -0.50 <k,j||e,i> t1(a,k) t1(b,j) l2(m,i,b,a) 
+    # flops: o1v1L1 += o4v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= 0.250 * einsum('em->me', np.einsum('jkei,kjmi->em',eri["oovo"],tmps_["11_Loooo"]) )
+    
+    # flops: o3v1  = o3v2
+    #  mems: o3v1  = o3v1
+    tmps_["15_ooov"]  = 1.00 * np.einsum('bi,jkba->ijka',t1,eri["oovv"])
+    
+    # lsingles += -0.250 <k,j||e,c> t2(b,a,k,j) t1(c,i) l2(i,m,b,a) 
+    #          += +0.50 <k,j||e,c> t1(a,k) t1(b,j) t1(c,i) l2(i,m,b,a) 
+    # flops: o1v1L1 += o4v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= 0.250 * einsum('em->me', np.einsum('ijke,kjim->em',tmps_["15_ooov"],tmps_["11_Loooo"]) )
+    del tmps_["11_Loooo"]
+    
+    # ldoubles += -1.00 P(e,f) <m,n||e,a> t1(a,i) l1(i,f) 
+    # flops: o2v2L1 += o3v2L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('fmne->efmn', np.einsum('if,imne->fmne',l1,tmps_["15_ooov"]) )
+    ldoubles += einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles -= einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # lsingles += +1.00 <k,m||b,c> t2(c,a,i,k) t1(b,j) l2(i,j,e,a) 
+    # flops: o1v1L1 += o4v2 o3v2L1
+    #  mems: o1v1L1 += o3v1 o1v1L1
+    lsingles += np.einsum('caik,jkmc,ijea->me',t2,tmps_["15_ooov"],l2,optimize='optimal')
+    
+    # ldoubles += +1.00 P(m,n) P(e,f) <j,n||e,b> t1(a,j) t1(b,i) l2(i,m,f,a) 
+    # flops: o2v2L1 += o4v2L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('mfne->efmn', np.einsum('imfj,ijne->mfne',tmps_["9_Loovo"],tmps_["15_ooov"]) )
+    ldoubles -= einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('efnm->mnef', np.einsum('efnm->efnm',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    ldoubles -= einsum('fenm->mnef', np.einsum('fenm->fenm',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # flops: o4v0  = o4v1
+    #  mems: o4v0  = o4v0
+    tmps_["16_oooo"]  = 1.00 * np.einsum('ai,jkla->ijkl',t1,tmps_["15_ooov"])
+    
+    # flops: o4v0  = o4v1
+    #  mems: o4v0  = o4v0
+    tmps_["13_oooo"]  = 1.00 * np.einsum('ai,jkal->ijkl',t1,eri["oovo"])
+    
+    # flops: o4v0  = o4v2
+    #  mems: o4v0  = o4v0
+    tmps_["12_oooo"]  = 1.00 * np.einsum('abij,klab->ijkl',t2,eri["oovv"])
+    
+    # flops: o4v0  = o4v0
+    #  mems: o4v0  = o4v0
+    tmps_["14_oooo"]  = 4.00 * einsum('iklj->ijkl', tmps_["13_oooo"] )
+    tmps_["14_oooo"] += tmps_["12_oooo"]
+    del tmps_["13_oooo"]
+    del tmps_["12_oooo"]
+    
+    # flops: o4v0  = o4v0
+    #  mems: o4v0  = o4v0
+    tmps_["17_oooo"]  = -0.50 * tmps_["14_oooo"]
+    tmps_["17_oooo"] += tmps_["16_oooo"]
+    del tmps_["16_oooo"]
+    del tmps_["14_oooo"]
+    
+    # lsingles += +0.50 <k,m||b,c> t1(a,k) t1(b,j) t1(c,i) l2(i,j,e,a) 
+    #          += -0.250 <k,m||b,c> t1(a,k) t2(b,c,i,j) l2(i,j,e,a) 
+    #          += -1.00 <k,m||b,j> t1(a,k) t1(b,i) l2(i,j,e,a) 
+    # flops: o1v1L1 += o4v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles += 0.50 * einsum('em->me', np.einsum('ijek,ijkm->em',tmps_["9_Loovo"],tmps_["17_oooo"]) )
+    
+    # ldoubles += -0.50 <m,n||a,b> t1(a,j) t1(b,i) l2(i,j,e,f) 
+    #          += +0.250 <m,n||a,b> t2(a,b,i,j) l2(i,j,e,f) 
+    #          += +1.00 <m,n||a,j> t1(a,i) l2(i,j,e,f) 
+    # flops: o2v2L1 += o4v2L1
+    #  mems: o2v2L1 += o2v2L1
+    ldoubles -= 0.50 * einsum('efmn->mnef', np.einsum('ijef,ijmn->efmn',l2,tmps_["17_oooo"]) )
+    del tmps_["17_oooo"]
+    
+    # flops: o2v0L1  = o3v2L1
+    #  mems: o2v0L1  = o2v0L1
+    tmps_["18_Loo"]  = 1.00 * np.einsum('kiab,abkj->ij',l2,t2)
+    
+    # ldoubles += -0.50 P(m,n) <j,n||e,f> t2(b,a,i,j) l2(i,m,b,a) 
+    # flops: o2v2L1 += o3v2L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 0.50 * einsum('mnef->efmn', np.einsum('mj,jnef->mnef',tmps_["18_Loo"],eri["oovv"]) )
+    ldoubles -= einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('efnm->mnef', np.einsum('efnm->efnm',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # lsingles += -0.50 f(j,e) t2(b,a,i,j) l2(i,m,b,a) 
+    # flops: o1v1L1 += o2v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= 0.50 * einsum('em->me', np.einsum('je,mj->em',f["ov"],tmps_["18_Loo"]) )
+    
+    # lsingles += +0.50 <k,m||e,c> t2(b,a,i,k) t1(c,j) l2(i,j,b,a) 
+    # flops: o1v1L1 += o3v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= 0.50 * np.einsum('jk,jkme->me',tmps_["18_Loo"],tmps_["15_ooov"])
+    
+    # lsingles += +0.50 <k,m||e,j> t2(b,a,i,k) l2(i,j,b,a) 
+    # flops: o1v1L1 += o3v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles += 0.50 * np.einsum('kmej,jk->me',eri["oovo"],tmps_["18_Loo"])
+    
+    # flops: o2v0L1  = o2v1L1
+    #  mems: o2v0L1  = o2v0L1
+    tmps_["19_Loo"]  = 1.00 * np.einsum('ai,ja->ij',t1,l1)
+    
+    # ldoubles += -1.00 P(m,n) <i,n||e,f> t1(a,i) l1(m,a) 
+    # flops: o2v2L1 += o3v2L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('mnef->efmn', np.einsum('im,inef->mnef',tmps_["19_Loo"],eri["oovv"]) )
+    ldoubles -= einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('efnm->mnef', np.einsum('efnm->efnm',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # lsingles += -1.00 f(i,e) t1(a,i) l1(m,a) 
+    # flops: o1v1L1 += o2v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= einsum('em->me', np.einsum('ie,im->em',f["ov"],tmps_["19_Loo"]) )
+    
+    # lsingles += +1.00 <j,m||e,i> t1(a,j) l1(i,a) 
+    # flops: o1v1L1 += o3v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles += np.einsum('jmei,ji->me',eri["oovo"],tmps_["19_Loo"])
+    
+    # lsingles += +1.00 <j,m||e,b> t1(a,j) t1(b,i) l1(i,a) 
+    # flops: o1v1L1 += o3v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= np.einsum('ji,ijme->me',tmps_["19_Loo"],tmps_["15_ooov"])
+    del tmps_["15_ooov"]
+    
+    # flops: o0v2L1  = o2v3L1
+    #  mems: o0v2L1  = o0v2L1
+    tmps_["20_Lvv"]  = 1.00 * np.einsum('ijac,bcij->ab',l2,t2)
+    
+    # ldoubles += -0.50 P(e,f) <m,n||e,b> t2(b,a,i,j) l2(i,j,f,a) 
+    # flops: o2v2L1 += o2v3L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 0.50 * einsum('fmne->efmn', np.einsum('fb,mnbe->fmne',tmps_["20_Lvv"],eri["oovv"]) )
+    ldoubles += einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles -= einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # lsingles += -0.50 f(m,b) t2(b,a,i,j) l2(i,j,e,a) 
+    # flops: o1v1L1 += o1v2L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= 0.50 * einsum('em->me', np.einsum('eb,mb->em',tmps_["20_Lvv"],f["ov"]) )
+    
+    # lsingles += +0.50 <m,b||e,c> t2(c,a,i,j) l2(i,j,b,a) 
+    # flops: o1v1L1 += o1v3L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles += 0.50 * np.einsum('bmce,bc->me',eri["vovv"],tmps_["20_Lvv"])
+    
+    # lsingles += +0.50 <k,m||e,c> t2(c,a,i,j) t1(b,k) l2(i,j,b,a) 
+    # flops: o1v1L1 += o1v2L1 o2v2L1
+    #  mems: o1v1L1 += o1v1L1 o1v1L1
+    lsingles -= 0.50 * np.einsum('bk,bc,kmce->me',t1,tmps_["20_Lvv"],eri["oovv"],optimize='optimal')
+    
+    # flops: o1v1  = o2v2
+    #  mems: o1v1  = o1v1
+    tmps_["22_ov"]  = 1.00 * np.einsum('jiba,bj->ia',eri["oovv"],t1)
+    
+    # ldoubles += +1.00 P(e,f) <j,i||e,b> t1(a,j) t1(b,i) l2(m,n,f,a) 
+    # flops: o2v2L1 += o3v2L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('emnf->efmn', np.einsum('je,mnfj->emnf',tmps_["22_ov"],tmps_["9_Loovo"]) )
+    ldoubles += einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles -= einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    del tmps_["9_Loovo"]
+    
+    # lsingles += -0.50 <k,m||b,c> t2(c,a,i,j) t1(b,k) l2(i,j,e,a) 
+    # flops: o1v1L1 += o1v2L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= 0.50 * np.einsum('mc,ec->me',tmps_["22_ov"],tmps_["20_Lvv"])
+    del tmps_["20_Lvv"]
+    
+    # lsingles += -1.00 <j,i||e,b> t1(a,j) t1(b,i) l1(m,a) 
+    # flops: o1v1L1 += o2v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= einsum('em->me', np.einsum('je,jm->em',tmps_["22_ov"],tmps_["19_Loo"]) )
+    del tmps_["19_Loo"]
+    
+    # lsingles += -0.50 <k,j||e,c> t2(b,a,i,k) t1(c,j) l2(i,m,b,a) 
+    # flops: o1v1L1 += o2v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= 0.50 * einsum('em->me', np.einsum('ke,mk->em',tmps_["22_ov"],tmps_["18_Loo"]) )
+    del tmps_["18_Loo"]
+    
+    # ldoubles += +1.00 P(m,n) P(e,f) <i,n||e,a> t1(a,i) l1(m,f) 
+    # flops: o2v2L1 += o2v2L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('mfne->efmn', np.einsum('mf,ne->mfne',l1,tmps_["22_ov"]) )
+    ldoubles -= einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('efnm->mnef', np.einsum('efnm->efnm',tmps_["perm_Lvvoo"]) )
+    ldoubles += einsum('femn->mnef', np.einsum('femn->femn',tmps_["perm_Lvvoo"]) )
+    ldoubles -= einsum('fenm->mnef', np.einsum('fenm->fenm',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # lsingles += -1.00 <i,m||e,a> t1(a,i) 
+    lsingles += tmps_["22_ov"]
+    
+    # flops: o2v0  = o2v1
+    #  mems: o2v0  = o2v0
+    tmps_["25_oo"]  = 1.00 * np.einsum('ai,ja->ij',t1,tmps_["22_ov"])
+    del tmps_["22_ov"]
+    
+    # flops: o2v0  = o2v1
+    #  mems: o2v0  = o2v0
+    tmps_["23_oo"]  = 1.00 * np.einsum('ai,ja->ij',t1,f["ov"])
+    
+    # flops: o2v0  = o3v2
+    #  mems: o2v0  = o2v0
+    tmps_["21_oo"]  = 1.00 * np.einsum('abik,kjab->ij',t2,eri["oovv"])
+    
+    # flops: o2v0  = o2v0
+    #  mems: o2v0  = o2v0
+    tmps_["24_oo"]  = -0.50 * tmps_["21_oo"]
+    tmps_["24_oo"] += tmps_["23_oo"]
+    del tmps_["23_oo"]
+    del tmps_["21_oo"]
+    
+    # flops: o2v0  = o2v0
+    #  mems: o2v0  = o2v0
+    tmps_["26_oo"]  = 1.00 * tmps_["24_oo"]
+    tmps_["26_oo"] += tmps_["25_oo"]
+    del tmps_["25_oo"]
+    del tmps_["24_oo"]
+    
+    # ldoubles += +1.00 P(m,n) <j,n||a,b> t1(a,j) t1(b,i) l2(i,m,e,f) 
+    #          += +1.00 P(m,n) f(n,a) t1(a,i) l2(i,m,e,f) 
+    #          += -0.50 P(m,n) <j,n||a,b> t2(a,b,i,j) l2(i,m,e,f) 
+    # flops: o2v2L1 += o3v2L1
+    #  mems: o2v2L1 += o2v2L1
+    tmps_["perm_Lvvoo"]  = 1.00 * einsum('mefn->efmn', np.einsum('imef,in->mefn',l2,tmps_["26_oo"]) )
+    ldoubles += einsum('efmn->mnef', np.einsum('efmn->efmn',tmps_["perm_Lvvoo"]) )
+    ldoubles -= einsum('efnm->mnef', np.einsum('efnm->efnm',tmps_["perm_Lvvoo"]) )
+    del tmps_["perm_Lvvoo"]
+    
+    # lsingles += -1.00 <j,m||a,b> t1(a,j) t1(b,i) l1(i,e) 
+    #          += -1.00 f(m,a) t1(a,i) l1(i,e) 
+    #          += +0.50 <j,m||a,b> t2(a,b,i,j) l1(i,e) 
+    # flops: o1v1L1 += o2v1L1
+    #  mems: o1v1L1 += o1v1L1
+    lsingles -= einsum('em->me', np.einsum('ie,im->em',l1,tmps_["26_oo"]) )
+    del tmps_["26_oo"]
+
+############################################################
+
+
+    return lsingles, ldoubles
+
+
+def ccsd_energy(t1, t2, f, g, o, v):
+    """
+    < 0 | e(-T) H e(T) | 0> :
+
+
+    :param t1: spin-orbital t1 amplitudes (nvirt x nocc)
+    :param t2: spin-orbital t2 amplitudes (nvirt x nvirt x nocc x nocc)
+    :param f: fock operator defined as soei + np.einsum('piiq->pq', astei[:, o, o, :])
+              where soei is 1 electron integrals (spinorb) and astei is
+              antisymmetric 2 electron integrals in openfermion format
+              <12|21>.  <ij|kl> - <ij|lk>
+    :param g: antisymmetric 2 electron integrals. See fock input.
+    :param o: slice(None, occ) where occ is number of occupied spin-orbitals
+    :param v: slice(occ, None) whwere occ is number of occupied spin-orbitals
+    """
+
+    #	  1.0000 f(i,i)
+    energy = 1.0 * einsum('ii', f[o, o])
+
+    #	  1.0000 f(i,a)*t1(a,i)
+    energy += 1.0 * einsum('ia,ai', f[o, v], t1)
+
+    #	 -0.5000 <j,i||j,i>
+    energy += -0.5 * einsum('jiji', g[o, o, o, o])
+
+    #	  0.2500 <j,i||a,b>*t2(a,b,j,i)
+    energy += 0.25 * einsum('jiab,abji', g[o, o, v, v], t2)
+
+    #	 -0.5000 <j,i||a,b>*t1(a,i)*t1(b,j)
+    energy += -0.5 * einsum('jiab,ai,bj', g[o, o, v, v], t1, t1,
+                            optimize=['einsum_path', (0, 1), (0, 1)])
+
+    return energy
+
+
+def singles_residual(t1, t2, f, g, o, v):
+    """
+    < 0 | m* e e(-T) H e(T) | 0>
+
+    :param t1: spin-orbital t1 amplitudes (nvirt x nocc)
+    :param t2: spin-orbital t2 amplitudes (nvirt x nvirt x nocc x nocc)
+    :param f: fock operator defined as soei + np.einsum('piiq->pq', astei[:, o, o, :])
+              where soei is 1 electron integrals (spinorb) and astei is
+              antisymmetric 2 electron integrals in openfermion format
+              <12|21>.  <ij|kl> - <ij|lk>
+    :param g: antisymmetric 2 electron integrals. See fock input.
+    :param o: slice(None, occ) where occ is number of occupied spin-orbitals
+    :param v: slice(occ, None) whwere occ is number of occupied spin-orbitals
+    """
+    #	  1.0000 f(e,m)
+    singles_res = 1.0 * einsum('em->em', f[v, o])
+
+    #	 -1.0000 f(i,m)*t1(e,i)
+    singles_res += -1.0 * einsum('im,ei->em', f[o, o], t1)
+
+    #	  1.0000 f(e,a)*t1(a,m)
+    singles_res += 1.0 * einsum('ea,am->em', f[v, v], t1)
+
+    #	 -1.0000 f(i,a)*t2(a,e,m,i)
+    singles_res += -1.0 * einsum('ia,aemi->em', f[o, v], t2)
+
+    #	 -1.0000 f(i,a)*t1(a,m)*t1(e,i)
+    singles_res += -1.0 * einsum('ia,am,ei->em', f[o, v], t1, t1,
+                                 optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <i,e||a,m>*t1(a,i)
+    singles_res += 1.0 * einsum('ieam,ai->em', g[o, v, v, o], t1)
+
+    #	 -0.5000 <j,i||a,m>*t2(a,e,j,i)
+    singles_res += -0.5 * einsum('jiam,aeji->em', g[o, o, v, o], t2)
+
+    #	 -0.5000 <i,e||a,b>*t2(a,b,m,i)
+    singles_res += -0.5 * einsum('ieab,abmi->em', g[o, v, v, v], t2)
+
+    #	  1.0000 <j,i||a,m>*t1(a,i)*t1(e,j)
+    singles_res += 1.0 * einsum('jiam,ai,ej->em', g[o, o, v, o], t1, t1,
+                                optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <i,e||a,b>*t1(a,i)*t1(b,m)
+    singles_res += 1.0 * einsum('ieab,ai,bm->em', g[o, v, v, v], t1, t1,
+                                optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 <j,i||a,b>*t1(a,i)*t2(b,e,m,j)
+    singles_res += 1.0 * einsum('jiab,ai,bemj->em', g[o, o, v, v], t1, t2,
+                                optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  0.5000 <j,i||a,b>*t1(a,m)*t2(b,e,j,i)
+    singles_res += 0.5 * einsum('jiab,am,beji->em', g[o, o, v, v], t1, t2,
+                                optimize=['einsum_path', (0, 2), (0, 1)])
+
+    #	  0.5000 <j,i||a,b>*t1(e,i)*t2(a,b,m,j)
+    singles_res += 0.5 * einsum('jiab,ei,abmj->em', g[o, o, v, v], t1, t2,
+                                optimize=['einsum_path', (0, 2), (0, 1)])
+
+    #	  1.0000 <j,i||a,b>*t1(a,i)*t1(b,m)*t1(e,j)
+    singles_res += 1.0 * einsum('jiab,ai,bm,ej->em', g[o, o, v, v], t1, t1, t1,
+                                optimize=['einsum_path', (0, 1), (0, 2),
+                                          (0, 1)])
+    return singles_res
+
+
+def doubles_residual(t1, t2, f, g, o, v):
+    """
+     < 0 | m* n* f e e(-T) H e(T) | 0>
+
+    :param t1: spin-orbital t1 amplitudes (nvirt x nocc)
+    :param t2: spin-orbital t2 amplitudes (nvirt x nvirt x nocc x nocc)
+    :param f: fock operator defined as soei + np.einsum('piiq->pq', astei[:, o, o, :])
+              where soei is 1 electron integrals (spinorb) and astei is
+              antisymmetric 2 electron integrals in openfermion format
+              <12|21>.  <ij|kl> - <ij|lk>
+    :param g: antisymmetric 2 electron integrals. See fock input.
+    :param o: slice(None, occ) where occ is number of occupied spin-orbitals
+    :param v: slice(occ, None) whwere occ is number of occupied spin-orbitals
+    """
+    #	 -1.0000 P(m,n)f(i,n)*t2(e,f,m,i)
+    contracted_intermediate = -1.0 * einsum('in,efmi->efmn', f[o, o], t2)
+    doubles_res = 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate)
+
+    #	  1.0000 P(e,f)f(e,a)*t2(a,f,m,n)
+    contracted_intermediate = 1.0 * einsum('ea,afmn->efmn', f[v, v], t2)
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->femn', contracted_intermediate)
+
+    #	 -1.0000 P(m,n)f(i,a)*t1(a,n)*t2(e,f,m,i)
+    contracted_intermediate = -1.0 * einsum('ia,an,efmi->efmn', f[o, v], t1, t2,
+                                            optimize=['einsum_path', (0, 1),
+                                                      (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate)
+
+    #	 -1.0000 P(e,f)f(i,a)*t1(e,i)*t2(a,f,m,n)
+    contracted_intermediate = -1.0 * einsum('ia,ei,afmn->efmn', f[o, v], t1, t2,
+                                            optimize=['einsum_path', (0, 1),
+                                                      (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->femn', contracted_intermediate)
+
+    #	  1.0000 <e,f||m,n>
+    doubles_res += 1.0 * einsum('efmn->efmn', g[v, v, o, o])
+
+    #	  1.0000 P(e,f)<i,e||m,n>*t1(f,i)
+    contracted_intermediate = 1.0 * einsum('iemn,fi->efmn', g[o, v, o, o], t1)
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->femn', contracted_intermediate)
+
+    #	  1.0000 P(m,n)<e,f||a,n>*t1(a,m)
+    contracted_intermediate = 1.0 * einsum('efan,am->efmn', g[v, v, v, o], t1)
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate)
+
+    #	  0.5000 <j,i||m,n>*t2(e,f,j,i)
+    doubles_res += 0.5 * einsum('jimn,efji->efmn', g[o, o, o, o], t2)
+
+    #	  1.0000 P(m,n)*P(e,f)<i,e||a,n>*t2(a,f,m,i)
+    contracted_intermediate = 1.0 * einsum('iean,afmi->efmn', g[o, v, v, o], t2)
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate) + -1.00000 * einsum('efmn->femn',
+                                                                   contracted_intermediate) + 1.00000 * einsum(
+        'efmn->fenm', contracted_intermediate)
+
+    #	  0.5000 <e,f||a,b>*t2(a,b,m,n)
+    doubles_res += 0.5 * einsum('efab,abmn->efmn', g[v, v, v, v], t2)
+
+    #	 -1.0000 <j,i||m,n>*t1(e,i)*t1(f,j)
+    doubles_res += -1.0 * einsum('jimn,ei,fj->efmn', g[o, o, o, o], t1, t1,
+                                 optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 P(m,n)*P(e,f)<i,e||a,n>*t1(a,m)*t1(f,i)
+    contracted_intermediate = 1.0 * einsum('iean,am,fi->efmn', g[o, v, v, o],
+                                           t1, t1,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate) + -1.00000 * einsum('efmn->femn',
+                                                                   contracted_intermediate) + 1.00000 * einsum(
+        'efmn->fenm', contracted_intermediate)
+
+    #	 -1.0000 <e,f||a,b>*t1(a,n)*t1(b,m)
+    doubles_res += -1.0 * einsum('efab,an,bm->efmn', g[v, v, v, v], t1, t1,
+                                 optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 P(m,n)<j,i||a,n>*t1(a,i)*t2(e,f,m,j)
+    contracted_intermediate = 1.0 * einsum('jian,ai,efmj->efmn', g[o, o, v, o],
+                                           t1, t2,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate)
+
+    #	  0.5000 P(m,n)<j,i||a,n>*t1(a,m)*t2(e,f,j,i)
+    contracted_intermediate = 0.5 * einsum('jian,am,efji->efmn', g[o, o, v, o],
+                                           t1, t2,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate)
+
+    #	 -1.0000 P(m,n)*P(e,f)<j,i||a,n>*t1(e,i)*t2(a,f,m,j)
+    contracted_intermediate = -1.0 * einsum('jian,ei,afmj->efmn', g[o, o, v, o],
+                                            t1, t2,
+                                            optimize=['einsum_path', (0, 1),
+                                                      (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate) + -1.00000 * einsum('efmn->femn',
+                                                                   contracted_intermediate) + 1.00000 * einsum(
+        'efmn->fenm', contracted_intermediate)
+
+    #	  1.0000 P(e,f)<i,e||a,b>*t1(a,i)*t2(b,f,m,n)
+    contracted_intermediate = 1.0 * einsum('ieab,ai,bfmn->efmn', g[o, v, v, v],
+                                           t1, t2,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->femn', contracted_intermediate)
+
+    #	 -1.0000 P(m,n)*P(e,f)<i,e||a,b>*t1(a,n)*t2(b,f,m,i)
+    contracted_intermediate = -1.0 * einsum('ieab,an,bfmi->efmn', g[o, v, v, v],
+                                            t1, t2,
+                                            optimize=['einsum_path', (0, 1),
+                                                      (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate) + -1.00000 * einsum('efmn->femn',
+                                                                   contracted_intermediate) + 1.00000 * einsum(
+        'efmn->fenm', contracted_intermediate)
+
+    #	  0.5000 P(e,f)<i,e||a,b>*t1(f,i)*t2(a,b,m,n)
+    contracted_intermediate = 0.5 * einsum('ieab,fi,abmn->efmn', g[o, v, v, v],
+                                           t1, t2,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->femn', contracted_intermediate)
+
+    #	 -0.5000 P(m,n)<j,i||a,b>*t2(a,b,n,i)*t2(e,f,m,j)
+    contracted_intermediate = -0.5 * einsum('jiab,abni,efmj->efmn',
+                                            g[o, o, v, v], t2, t2,
+                                            optimize=['einsum_path', (0, 1),
+                                                      (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate)
+
+    #	  0.2500 <j,i||a,b>*t2(a,b,m,n)*t2(e,f,j,i)
+    doubles_res += 0.25 * einsum('jiab,abmn,efji->efmn', g[o, o, v, v], t2, t2,
+                                 optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -0.5000 <j,i||a,b>*t2(a,e,j,i)*t2(b,f,m,n)
+    doubles_res += -0.5 * einsum('jiab,aeji,bfmn->efmn', g[o, o, v, v], t2, t2,
+                                 optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 P(m,n)<j,i||a,b>*t2(a,e,n,i)*t2(b,f,m,j)
+    contracted_intermediate = 1.0 * einsum('jiab,aeni,bfmj->efmn',
+                                           g[o, o, v, v], t2, t2,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate)
+
+    #	 -0.5000 <j,i||a,b>*t2(a,e,m,n)*t2(b,f,j,i)
+    doubles_res += -0.5 * einsum('jiab,aemn,bfji->efmn', g[o, o, v, v], t2, t2,
+                                 optimize=['einsum_path', (0, 2), (0, 1)])
+
+    #	 -1.0000 P(m,n)<j,i||a,n>*t1(a,m)*t1(e,i)*t1(f,j)
+    contracted_intermediate = -1.0 * einsum('jian,am,ei,fj->efmn',
+                                            g[o, o, v, o], t1, t1, t1,
+                                            optimize=['einsum_path', (0, 1),
+                                                      (0, 2), (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate)
+
+    #	 -1.0000 P(e,f)<i,e||a,b>*t1(a,n)*t1(b,m)*t1(f,i)
+    contracted_intermediate = -1.0 * einsum('ieab,an,bm,fi->efmn',
+                                            g[o, v, v, v], t1, t1, t1,
+                                            optimize=['einsum_path', (0, 1),
+                                                      (0, 2), (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->femn', contracted_intermediate)
+
+    #	  1.0000 P(m,n)<j,i||a,b>*t1(a,i)*t1(b,n)*t2(e,f,m,j)
+    contracted_intermediate = 1.0 * einsum('jiab,ai,bn,efmj->efmn',
+                                           g[o, o, v, v], t1, t1, t2,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 2), (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate)
+
+    #	  1.0000 P(e,f)<j,i||a,b>*t1(a,i)*t1(e,j)*t2(b,f,m,n)
+    contracted_intermediate = 1.0 * einsum('jiab,ai,ej,bfmn->efmn',
+                                           g[o, o, v, v], t1, t1, t2,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 2), (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->femn', contracted_intermediate)
+
+    #	 -0.5000 <j,i||a,b>*t1(a,n)*t1(b,m)*t2(e,f,j,i)
+    doubles_res += -0.5 * einsum('jiab,an,bm,efji->efmn', g[o, o, v, v], t1, t1,
+                                 t2, optimize=['einsum_path', (0, 1), (0, 2),
+                                               (0, 1)])
+
+    #	  1.0000 P(m,n)*P(e,f)<j,i||a,b>*t1(a,n)*t1(e,i)*t2(b,f,m,j)
+    contracted_intermediate = 1.0 * einsum('jiab,an,ei,bfmj->efmn',
+                                           g[o, o, v, v], t1, t1, t2,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 2), (0, 1)])
+    doubles_res += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'efmn->efnm', contracted_intermediate) + -1.00000 * einsum('efmn->femn',
+                                                                   contracted_intermediate) + 1.00000 * einsum(
+        'efmn->fenm', contracted_intermediate)
+
+    #	 -0.5000 <j,i||a,b>*t1(e,i)*t1(f,j)*t2(a,b,m,n)
+    doubles_res += -0.5 * einsum('jiab,ei,fj,abmn->efmn', g[o, o, v, v], t1, t1,
+                                 t2, optimize=['einsum_path', (0, 1), (0, 2),
+                                               (0, 1)])
+
+    #	  1.0000 <j,i||a,b>*t1(a,n)*t1(b,m)*t1(e,i)*t1(f,j)
+    doubles_res += 1.0 * einsum('jiab,an,bm,ei,fj->efmn', g[o, o, v, v], t1, t1,
+                                t1, t1,
+                                optimize=['einsum_path', (0, 1), (0, 3), (0, 2),
+                                          (0, 1)])
+
+    return doubles_res
+
+
+def kernel(t1, t2, fock, g, o, v, e_ai, e_abij, max_iter=100,
+           stopping_eps=1.0E-8, diis_size=None, diis_start_cycle=4):
+    """
+
+    :param t1: spin-orbital t1 amplitudes (nvirt x nocc)
+    :param t2: spin-orbital t2 amplitudes (nvirt x nvirt x nocc x nocc)
+    :param fock: fock operator defined as soei + np.einsum('piiq->pq', astei[:, o, o, :])
+              where soei is 1 electron integrals (spinorb) and astei is
+              antisymmetric 2 electron integrals in openfermion format
+              <12|21>.  <ij|kl> - <ij|lk>
+    :param g: antisymmetric 2 electron integrals. See fock input.
+    :param o: slice(None, occ) where occ is number of occupied spin-orbitals
+    :param v: slice(occ, None) whwere occ is number of occupied spin-orbitals
+    :param e_ai: 1 / (-eps[v, n] + eps[n, o])
+    :param e_abij: 1 / (-eps[v, n, n, n] - eps[n, v, n, n] + eps[n, n, o, n] + eps[n, n, n, o])
+    :param max_iter: Total number of CC iterations allowed
+    :param stopping_eps: stopping criteria for residual l2-norm
+    """
+
+    # initialize diis if diis_size is not None
+    # else normal scf iterate
+    if diis_size is not None:
+        from diis import DIIS
+        diis_update = DIIS(diis_size, start_iter=diis_start_cycle)
+        t1_dim = t1.size
+        old_vec = np.hstack((t1.flatten(), t2.flatten()))
+
+    fock_e_ai = np.reciprocal(e_ai)
+    fock_e_abij = np.reciprocal(e_abij)
+    old_energy = ccsd_energy(t1, t2, fock, g, o, v)
+
+    print("\tSolving T-quations")
+    print("\tIteration num \t\tenergy\t\t\t\t\t\t|dE|\t\t\t||residual||")
+    for idx in range(max_iter):
+
+        residual_singles = singles_residual(t1, t2, fock, g, o, v)
+        residual_doubles = doubles_residual(t1, t2, fock, g, o, v)
+
+        res_norm = np.linalg.norm(residual_singles) + np.linalg.norm(residual_doubles)
+        singles_res = residual_singles + fock_e_ai * t1
+        doubles_res = residual_doubles + fock_e_abij * t2
+
+        new_singles = singles_res * e_ai
+        new_doubles = doubles_res * e_abij
+
+        # diis update
+        if diis_size is not None:
+            vectorized_iterate = np.hstack(
+                (new_singles.flatten(), new_doubles.flatten()))
+            error_vec = old_vec - vectorized_iterate
+            new_vectorized_iterate = diis_update.compute_new_vec(vectorized_iterate,
+                                                                 error_vec)
+            new_singles = new_vectorized_iterate[:t1_dim].reshape(t1.shape)
+            new_doubles = new_vectorized_iterate[t1_dim:].reshape(t2.shape)
+            old_vec = new_vectorized_iterate
+
+        current_energy = ccsd_energy(new_singles, new_doubles, fock, g, o, v)
+        delta_e = np.abs(old_energy - current_energy)
+
+        if delta_e < stopping_eps and res_norm < stopping_eps:
+            # assign t1 and t2 variables for future use before breaking
+            t1 = new_singles
+            t2 = new_doubles
+            break
+        else:
+            # assign t1 and t2 and old_energy for next iteration
+            t1 = new_singles
+            t2 = new_doubles
+            old_energy = current_energy
+            print("\tIteration {: 5d}\t{: 5.15f}\t{: 5.15f}\t{: 5.15f}".format(idx, old_energy, delta_e, res_norm))
+    else:
+        raise ValueError("Did not converge")
+
+    print("\n\tSolving lambda-quations\n")
+    print("\tIteration num \t\tenergy\t\t\t\t\t\t|dE|\t\t\t||residual||\t\t Pseudo-Energy")
+
+
+    # inverse diagonal fock should be rearranged for lambdas
+    lfock_e_ai = fock_e_ai.transpose(1, 0)
+    lfock_e_abij = fock_e_abij.transpose(2, 3, 0, 1)
+    # diagonal fock should be rearranged for lambda
+    le_ai = e_ai.transpose(1, 0)
+    le_abij = e_abij.transpose(2, 3, 0, 1)
+
+    l1 = t1.transpose(1, 0)
+    l2 = t2.transpose(2, 3, 0, 1)
+    # set old energy with initial l1 and l2
+    old_energy = lagrangian_energy(t1, t2, l1, l2, fock, g, o, v)
+
+    if diis_size is not None:
+        from diis import DIIS
+        diis_update = DIIS(diis_size, start_iter=diis_start_cycle)
+        l1_dim = l1.size
+        old_vec = np.hstack((l1.flatten(), l2.flatten()))
+
+    # now solve for lambdas!
+    for idx in range(max_iter):
+
+        lsingles, ldoubles = lambda_eval(t1, t2, l1, l2, fock, g, o, v)
+
+        total_lambda_res = np.linalg.norm(lsingles) + np.linalg.norm(ldoubles)
+        lsingles_res = lsingles + lfock_e_ai * l1
+        ldoubles_res = ldoubles + lfock_e_abij * l2
+
+        lnew_singles = lsingles_res * le_ai
+        lnew_doubles = ldoubles_res * le_abij
+
+        # diis update
+        if diis_size is not None:
+            vectorized_iterate = np.hstack(
+                (lnew_singles.flatten(), lnew_doubles.flatten()))
+            error_vec = old_vec - vectorized_iterate
+            new_vectorized_iterate = diis_update.compute_new_vec(vectorized_iterate,
+                                                                 error_vec)
+            lnew_singles = new_vectorized_iterate[:l1_dim].reshape(l1.shape)
+            lnew_doubles = new_vectorized_iterate[l1_dim:].reshape(l2.shape)
+            old_vec = new_vectorized_iterate
+
+
+        current_energy = lagrangian_energy(t1, t2, lnew_singles, lnew_doubles, fock, g, o, v)
+        pseudo_energy = 0.25 * einsum('jiab,jiab', g[o, o, v, v], l2)
+
+        delta_e = np.abs(old_energy - current_energy)
+
+        if delta_e < stopping_eps and total_lambda_res < stopping_eps:
+            l1 = lnew_singles
+            l2 = lnew_doubles
+            break
+        else:
+            l1 = lnew_singles
+            l2 = lnew_doubles
+            old_energy = current_energy
+            print("\tIteration {: 5d}\t{: 5.15f}\t{: 5.15f}\t{: 5.15f}\t{: 5.15f}".format(
+                idx, old_energy, delta_e,
+                np.linalg.norm(lsingles) +
+                np.linalg.norm(ldoubles),
+                pseudo_energy
+            ))
+    else:
+        raise ValueError("Did not converge")
+
+    return t1, t2, l1, l2
+
+
+def ccsd_d1(t1, t2, l1, l2, kd, o, v):
+    """
+    Compute CCSD 1-RDM
+
+    :param t1: spin-orbital t1 amplitudes (nvirt x nocc)
+    :param t2: spin-orbital t2 amplitudes (nvirt x nvirt x nocc x nocc)
+    :param l1: lagrange multiplier for singles (nocc x nvirt)
+    :param l2: lagrange multiplier for doubles (nocc x nocc x nvirt x nvirt)
+    :param kd: identity matrix (|spin-orb| x |spin-orb|)
+    :param o: slice(None, occ) where occ is number of occupied spin-orbitals
+    :param v: slice(occ, None) whwere occ is number of occupied spin-orbitals
+    """
+    opdm = np.zeros_like(kd)
+
+    #    D1(m,n):
+    # 	  1.0000 d(m,n)
+    # 	 ['+1.000000', 'd(m,n)']
+    opdm[o, o] += 1.0 * einsum('mn->mn', kd[o, o])
+
+    # 	 -1.0000 l1(n,a)*t1(a,m)
+    # 	 ['-1.000000', 'l1(n,a)', 't1(a,m)']
+    opdm[o, o] += -1.0 * einsum('na,am->mn', l1, t1)
+
+    # 	 -0.5000 l2(i,n,b,a)*t2(b,a,i,m)
+    # 	 ['-0.500000', 'l2(i,n,b,a)', 't2(b,a,i,m)']
+    opdm[o, o] += -0.5 * einsum('inba,baim->mn', l2, t2)
+
+    #    D1(e,f):
+
+    #	  1.0000 l1(i,e)*t1(f,i)
+    #	 ['+1.000000', 'l1(i,e)', 't1(f,i)']
+    opdm[v, v] += 1.0 * einsum('ie,fi->ef', l1, t1)
+
+    #	  0.5000 l2(i,j,e,a)*t2(f,a,i,j)
+    #	 ['+0.500000', 'l2(i,j,e,a)', 't2(f,a,i,j)']
+    opdm[v, v] += 0.5 * einsum('ijea,faij->ef', l2, t2)
+
+    #    D1(e,m):
+
+    #	  1.0000 l1(m,e)
+    #	 ['+1.000000', 'l1(m,e)']
+    opdm[v, o] += 1.0 * einsum('me->em', l1)
+
+    #    D1(m,e):
+
+    #	  1.0000 t1(e,m)
+    #	 ['+1.000000', 't1(e,m)']
+    opdm[o, v] += 1.0 * einsum('em->me', t1)
+
+    #	 -1.0000 l1(i,a)*t2(e,a,i,m)
+    #	 ['-1.000000', 'l1(i,a)', 't2(e,a,i,m)']
+    opdm[o, v] += -1.0 * einsum('ia,eaim->me', l1, t2)
+
+    #	 -1.0000 l1(i,a)*t1(e,i)*t1(a,m)
+    #	 ['-1.000000', 'l1(i,a)', 't1(e,i)', 't1(a,m)']
+    opdm[o, v] += -1.0 * einsum('ia,ei,am->me', l1, t1, t1,
+                                optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -0.5000 l2(i,j,b,a)*t1(e,j)*t2(b,a,i,m)
+    #	 ['-0.500000', 'l2(i,j,b,a)', 't1(e,j)', 't2(b,a,i,m)']
+    opdm[o, v] += -0.5 * einsum('ijba,ej,baim->me', l2, t1, t2,
+                                optimize=['einsum_path', (0, 2), (0, 1)])
+
+    #	 -0.5000 l2(i,j,b,a)*t1(b,m)*t2(e,a,i,j)
+    #	 ['-0.500000', 'l2(i,j,b,a)', 't1(b,m)', 't2(e,a,i,j)']
+    opdm[o, v] += -0.5 * einsum('ijba,bm,eaij->me', l2, t1, t2,
+                                optimize=['einsum_path', (0, 2), (0, 1)])
+
+    return opdm
+
+
+def ccsd_d2(t1, t2, l1, l2, kd, o, v):
+    """
+    Compute CCSD 2-RDM
+
+    :param t1: spin-orbital t1 amplitudes (nvirt x nocc)
+    :param t2: spin-orbital t2 amplitudes (nvirt x nvirt x nocc x nocc)
+    :param l1: lagrange multiplier for singles (nocc x nvirt)
+    :param l2: lagrange multiplier for doubles (nocc x nocc x nvirt x nvirt)
+    :param kd: identity matrix (|spin-orb| x |spin-orb|)
+    :param o: slice(None, occ) where occ is number of occupied spin-orbitals
+    :param v: slice(occ, None) whwere occ is number of occupied spin-orbitals
+    """
+    nso = kd.shape[0]
+    tpdm = np.zeros((nso, nso, nso, nso))
+    #    D2(i,j,k,l):
+
+    #	 ['+1.000000', 'd(j,l)', 'd(i,k)']
+    #	  1.0000 d(j,l)*d(i,k)
+    tpdm[o, o, o, o] += 1.0 * einsum('jl,ik->ijkl', kd[o, o], kd[o, o])
+
+    #	 ['-1.000000', 'd(i,l)', 'd(j,k)']
+    #	 -1.0000 d(i,l)*d(j,k)
+    tpdm[o, o, o, o] += -1.0 * einsum('il,jk->ijkl', kd[o, o], kd[o, o])
+
+    #	 ['-1.000000', 'd(j,l)', 'l1(k,a)', 't1(a,i)']
+    #	 -1.0000 d(j,l)*l1(k,a)*t1(a,i)
+    tpdm[o, o, o, o] += -1.0 * einsum('jl,ka,ai->ijkl', kd[o, o], l1, t1,
+                                      optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 ['+1.000000', 'd(i,l)', 'l1(k,a)', 't1(a,j)']
+    #	  1.0000 d(i,l)*l1(k,a)*t1(a,j)
+    tpdm[o, o, o, o] += 1.0 * einsum('il,ka,aj->ijkl', kd[o, o], l1, t1,
+                                     optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 ['+1.000000', 'd(j,k)', 'l1(l,a)', 't1(a,i)']
+    #	  1.0000 d(j,k)*l1(l,a)*t1(a,i)
+    tpdm[o, o, o, o] += 1.0 * einsum('jk,la,ai->ijkl', kd[o, o], l1, t1,
+                                     optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 ['-1.000000', 'd(i,k)', 'l1(l,a)', 't1(a,j)']
+    #	 -1.0000 d(i,k)*l1(l,a)*t1(a,j)
+    tpdm[o, o, o, o] += -1.0 * einsum('ik,la,aj->ijkl', kd[o, o], l1, t1,
+                                      optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 ['-0.500000', 'd(j,l)', 'l2(m,k,b,a)', 't2(b,a,m,i)']
+    #	 -0.5000 d(j,l)*l2(m,k,b,a)*t2(b,a,m,i)
+    tpdm[o, o, o, o] += -0.5 * einsum('jl,mkba,bami->ijkl', kd[o, o], l2, t2,
+                                      optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 ['+0.500000', 'd(i,l)', 'l2(m,k,b,a)', 't2(b,a,m,j)']
+    #	  0.5000 d(i,l)*l2(m,k,b,a)*t2(b,a,m,j)
+    tpdm[o, o, o, o] += 0.5 * einsum('il,mkba,bamj->ijkl', kd[o, o], l2, t2,
+                                     optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 ['+0.500000', 'd(j,k)', 'l2(m,l,b,a)', 't2(b,a,m,i)']
+    #	  0.5000 d(j,k)*l2(m,l,b,a)*t2(b,a,m,i)
+    tpdm[o, o, o, o] += 0.5 * einsum('jk,mlba,bami->ijkl', kd[o, o], l2, t2,
+                                     optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 ['-0.500000', 'd(i,k)', 'l2(m,l,b,a)', 't2(b,a,m,j)']
+    #	 -0.5000 d(i,k)*l2(m,l,b,a)*t2(b,a,m,j)
+    tpdm[o, o, o, o] += -0.5 * einsum('ik,mlba,bamj->ijkl', kd[o, o], l2, t2,
+                                      optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 ['+0.500000', 'l2(k,l,b,a)', 't2(b,a,i,j)']
+    #	  0.5000 l2(k,l,b,a)*t2(b,a,i,j)
+    tpdm[o, o, o, o] += 0.5 * einsum('klba,baij->ijkl', l2, t2)
+
+    #	 ['-1.000000', 'l2(k,l,b,a)', 't1(b,j)', 't1(a,i)']
+    #	 -1.0000 l2(k,l,b,a)*t1(b,j)*t1(a,i)
+    tpdm[o, o, o, o] += -1.0 * einsum('klba,bj,ai->ijkl', l2, t1, t1,
+                                      optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #    D2(i,j,k,a):
+
+    #	 -1.0000 d(j,k)*t1(a,i)
+    tpdm[o, o, o, v] += -1.0 * einsum('jk,ai->ijka', kd[o, o], t1)
+
+    #	  1.0000 d(i,k)*t1(a,j)
+    tpdm[o, o, o, v] += 1.0 * einsum('ik,aj->ijka', kd[o, o], t1)
+
+    #	  1.0000 d(j,k)*l1(l,b)*t2(a,b,l,i)
+    tpdm[o, o, o, v] += 1.0 * einsum('jk,lb,abli->ijka', kd[o, o], l1, t2,
+                                     optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 -1.0000 d(i,k)*l1(l,b)*t2(a,b,l,j)
+    tpdm[o, o, o, v] += -1.0 * einsum('ik,lb,ablj->ijka', kd[o, o], l1, t2,
+                                      optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	  1.0000 l1(k,b)*t2(a,b,i,j)
+    tpdm[o, o, o, v] += 1.0 * einsum('kb,abij->ijka', l1, t2)
+
+    #	  1.0000 d(j,k)*l1(l,b)*t1(a,l)*t1(b,i)
+    tpdm[o, o, o, v] += 1.0 * einsum('jk,lb,al,bi->ijka', kd[o, o], l1, t1, t1,
+                                     optimize=['einsum_path', (1, 2), (1, 2),
+                                               (0, 1)])
+
+    #	 -1.0000 d(i,k)*l1(l,b)*t1(a,l)*t1(b,j)
+    tpdm[o, o, o, v] += -1.0 * einsum('ik,lb,al,bj->ijka', kd[o, o], l1, t1, t1,
+                                      optimize=['einsum_path', (1, 2), (1, 2),
+                                                (0, 1)])
+
+    #	 -1.0000 P(i,j)l1(k,b)*t1(a,j)*t1(b,i)
+    contracted_intermediate = -1.0 * einsum('kb,aj,bi->ijka', l1, t1, t1,
+                                            optimize=['einsum_path', (0, 2),
+                                                      (0, 1)])
+    tpdm[o, o, o, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijka->jika', contracted_intermediate)
+
+    #	  0.5000 d(j,k)*l2(l,m,c,b)*t1(a,m)*t2(c,b,l,i)
+    tpdm[o, o, o, v] += 0.5 * einsum('jk,lmcb,am,cbli->ijka', kd[o, o], l2, t1,
+                                     t2,
+                                     optimize=['einsum_path', (1, 3), (1, 2),
+                                               (0, 1)])
+
+    #	  0.5000 d(j,k)*l2(l,m,c,b)*t1(c,i)*t2(a,b,l,m)
+    tpdm[o, o, o, v] += 0.5 * einsum('jk,lmcb,ci,ablm->ijka', kd[o, o], l2, t1,
+                                     t2,
+                                     optimize=['einsum_path', (1, 3), (1, 2),
+                                               (0, 1)])
+
+    #	 -0.5000 d(i,k)*l2(l,m,c,b)*t1(a,m)*t2(c,b,l,j)
+    tpdm[o, o, o, v] += -0.5 * einsum('ik,lmcb,am,cblj->ijka', kd[o, o], l2, t1,
+                                      t2,
+                                      optimize=['einsum_path', (1, 3), (1, 2),
+                                                (0, 1)])
+
+    #	 -0.5000 d(i,k)*l2(l,m,c,b)*t1(c,j)*t2(a,b,l,m)
+    tpdm[o, o, o, v] += -0.5 * einsum('ik,lmcb,cj,ablm->ijka', kd[o, o], l2, t1,
+                                      t2,
+                                      optimize=['einsum_path', (1, 3), (1, 2),
+                                                (0, 1)])
+
+    #	 -0.5000 P(i,j)l2(l,k,c,b)*t1(a,j)*t2(c,b,l,i)
+    contracted_intermediate = -0.5 * einsum('lkcb,aj,cbli->ijka', l2, t1, t2,
+                                            optimize=['einsum_path', (0, 2),
+                                                      (0, 1)])
+    tpdm[o, o, o, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijka->jika', contracted_intermediate)
+
+    #	 -0.5000 l2(l,k,c,b)*t1(a,l)*t2(c,b,i,j)
+    tpdm[o, o, o, v] += -0.5 * einsum('lkcb,al,cbij->ijka', l2, t1, t2,
+                                      optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 P(i,j)l2(l,k,c,b)*t1(c,j)*t2(a,b,l,i)
+    contracted_intermediate = 1.0 * einsum('lkcb,cj,abli->ijka', l2, t1, t2,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 1)])
+    tpdm[o, o, o, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijka->jika', contracted_intermediate)
+
+    #	  1.0000 l2(l,k,c,b)*t1(a,l)*t1(c,j)*t1(b,i)
+    tpdm[o, o, o, v] += 1.0 * einsum('lkcb,al,cj,bi->ijka', l2, t1, t1, t1,
+                                     optimize=['einsum_path', (0, 1), (0, 2),
+                                               (0, 1)])
+
+    #    D2(i,j,a,l):
+
+    #	  1.0000 d(j,l)*t1(a,i)
+    tpdm[o, o, v, o] += 1.0 * einsum('jl,ai->ijal', kd[o, o], t1)
+
+    #	 -1.0000 d(i,l)*t1(a,j)
+    tpdm[o, o, v, o] += -1.0 * einsum('il,aj->ijal', kd[o, o], t1)
+
+    #	 -1.0000 d(j,l)*l1(k,b)*t2(a,b,k,i)
+    tpdm[o, o, v, o] += -1.0 * einsum('jl,kb,abki->ijal', kd[o, o], l1, t2,
+                                      optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	  1.0000 d(i,l)*l1(k,b)*t2(a,b,k,j)
+    tpdm[o, o, v, o] += 1.0 * einsum('il,kb,abkj->ijal', kd[o, o], l1, t2,
+                                     optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 -1.0000 l1(l,b)*t2(a,b,i,j)
+    tpdm[o, o, v, o] += -1.0 * einsum('lb,abij->ijal', l1, t2)
+
+    #	 -1.0000 d(j,l)*l1(k,b)*t1(a,k)*t1(b,i)
+    tpdm[o, o, v, o] += -1.0 * einsum('jl,kb,ak,bi->ijal', kd[o, o], l1, t1, t1,
+                                      optimize=['einsum_path', (1, 2), (1, 2),
+                                                (0, 1)])
+
+    #	  1.0000 d(i,l)*l1(k,b)*t1(a,k)*t1(b,j)
+    tpdm[o, o, v, o] += 1.0 * einsum('il,kb,ak,bj->ijal', kd[o, o], l1, t1, t1,
+                                     optimize=['einsum_path', (1, 2), (1, 2),
+                                               (0, 1)])
+
+    #	  1.0000 P(i,j)l1(l,b)*t1(a,j)*t1(b,i)
+    contracted_intermediate = 1.0 * einsum('lb,aj,bi->ijal', l1, t1, t1,
+                                           optimize=['einsum_path', (0, 2),
+                                                     (0, 1)])
+    tpdm[o, o, v, o] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijal->jial', contracted_intermediate)
+
+    #	 -0.5000 d(j,l)*l2(k,m,c,b)*t1(a,m)*t2(c,b,k,i)
+    tpdm[o, o, v, o] += -0.5 * einsum('jl,kmcb,am,cbki->ijal', kd[o, o], l2, t1,
+                                      t2,
+                                      optimize=['einsum_path', (1, 3), (1, 2),
+                                                (0, 1)])
+
+    #	 -0.5000 d(j,l)*l2(k,m,c,b)*t1(c,i)*t2(a,b,k,m)
+    tpdm[o, o, v, o] += -0.5 * einsum('jl,kmcb,ci,abkm->ijal', kd[o, o], l2, t1,
+                                      t2,
+                                      optimize=['einsum_path', (1, 3), (1, 2),
+                                                (0, 1)])
+
+    #	  0.5000 d(i,l)*l2(k,m,c,b)*t1(a,m)*t2(c,b,k,j)
+    tpdm[o, o, v, o] += 0.5 * einsum('il,kmcb,am,cbkj->ijal', kd[o, o], l2, t1,
+                                     t2,
+                                     optimize=['einsum_path', (1, 3), (1, 2),
+                                               (0, 1)])
+
+    #	  0.5000 d(i,l)*l2(k,m,c,b)*t1(c,j)*t2(a,b,k,m)
+    tpdm[o, o, v, o] += 0.5 * einsum('il,kmcb,cj,abkm->ijal', kd[o, o], l2, t1,
+                                     t2,
+                                     optimize=['einsum_path', (1, 3), (1, 2),
+                                               (0, 1)])
+
+    #	  0.5000 P(i,j)l2(k,l,c,b)*t1(a,j)*t2(c,b,k,i)
+    contracted_intermediate = 0.5 * einsum('klcb,aj,cbki->ijal', l2, t1, t2,
+                                           optimize=['einsum_path', (0, 2),
+                                                     (0, 1)])
+    tpdm[o, o, v, o] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijal->jial', contracted_intermediate)
+
+    #	  0.5000 l2(k,l,c,b)*t1(a,k)*t2(c,b,i,j)
+    tpdm[o, o, v, o] += 0.5 * einsum('klcb,ak,cbij->ijal', l2, t1, t2,
+                                     optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 P(i,j)l2(k,l,c,b)*t1(c,j)*t2(a,b,k,i)
+    contracted_intermediate = -1.0 * einsum('klcb,cj,abki->ijal', l2, t1, t2,
+                                            optimize=['einsum_path', (0, 1),
+                                                      (0, 1)])
+    tpdm[o, o, v, o] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijal->jial', contracted_intermediate)
+
+    #	 -1.0000 l2(k,l,c,b)*t1(a,k)*t1(c,j)*t1(b,i)
+    tpdm[o, o, v, o] += -1.0 * einsum('klcb,ak,cj,bi->ijal', l2, t1, t1, t1,
+                                      optimize=['einsum_path', (0, 1), (0, 2),
+                                                (0, 1)])
+
+    #    D2(i,a,k,l):
+
+    #	 -1.0000 d(i,l)*l1(k,a)
+    tpdm[o, v, o, o] += -1.0 * einsum('il,ka->iakl', kd[o, o], l1)
+
+    #	  1.0000 d(i,k)*l1(l,a)
+    tpdm[o, v, o, o] += 1.0 * einsum('ik,la->iakl', kd[o, o], l1)
+
+    #	  1.0000 l2(k,l,a,b)*t1(b,i)
+    tpdm[o, v, o, o] += 1.0 * einsum('klab,bi->iakl', l2, t1)
+
+    #    D2(a,j,k,l):
+
+    #	  1.0000 d(j,l)*l1(k,a)
+    tpdm[v, o, o, o] += 1.0 * einsum('jl,ka->ajkl', kd[o, o], l1)
+
+    #	 -1.0000 d(j,k)*l1(l,a)
+    tpdm[v, o, o, o] += -1.0 * einsum('jk,la->ajkl', kd[o, o], l1)
+
+    #	 -1.0000 l2(k,l,a,b)*t1(b,j)
+    tpdm[v, o, o, o] += -1.0 * einsum('klab,bj->ajkl', l2, t1)
+
+    #    D2(a,b,c,d):
+
+    #	  0.5000 l2(i,j,a,b)*t2(c,d,i,j)
+    tpdm[v, v, v, v] += 0.5 * einsum('ijab,cdij->abcd', l2, t2)
+
+    #	 -1.0000 l2(i,j,a,b)*t1(c,j)*t1(d,i)
+    tpdm[v, v, v, v] += -1.0 * einsum('ijab,cj,di->abcd', l2, t1, t1,
+                                      optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #    D2(a,b,c,i):
+
+    #	  1.0000 l2(j,i,a,b)*t1(c,j)
+    tpdm[v, v, v, o] += 1.0 * einsum('jiab,cj->abci', l2, t1)
+
+    #    D2(a,b,i,d):
+
+    #	 -1.0000 l2(j,i,a,b)*t1(d,j)
+    tpdm[v, v, o, v] += -1.0 * einsum('jiab,dj->abid', l2, t1)
+
+    #    D2(i,b,c,d):
+
+    #	 -1.0000 l1(j,b)*t2(c,d,j,i)
+    tpdm[o, v, v, v] += -1.0 * einsum('jb,cdji->ibcd', l1, t2)
+
+    #	  1.0000 P(c,d)l1(j,b)*t1(c,i)*t1(d,j)
+    contracted_intermediate = 1.0 * einsum('jb,ci,dj->ibcd', l1, t1, t1,
+                                           optimize=['einsum_path', (0, 2),
+                                                     (0, 1)])
+    tpdm[o, v, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ibcd->ibdc', contracted_intermediate)
+
+    #	  0.5000 P(c,d)l2(j,k,b,a)*t1(c,i)*t2(d,a,j,k)
+    contracted_intermediate = 0.5 * einsum('jkba,ci,dajk->ibcd', l2, t1, t2,
+                                           optimize=['einsum_path', (0, 2),
+                                                     (0, 1)])
+    tpdm[o, v, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ibcd->ibdc', contracted_intermediate)
+
+    #	 -1.0000 P(c,d)l2(j,k,b,a)*t1(c,k)*t2(d,a,j,i)
+    contracted_intermediate = -1.0 * einsum('jkba,ck,daji->ibcd', l2, t1, t2,
+                                            optimize=['einsum_path', (0, 1),
+                                                      (0, 1)])
+    tpdm[o, v, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ibcd->ibdc', contracted_intermediate)
+
+    #	  0.5000 l2(j,k,b,a)*t1(a,i)*t2(c,d,j,k)
+    tpdm[o, v, v, v] += 0.5 * einsum('jkba,ai,cdjk->ibcd', l2, t1, t2,
+                                     optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -1.0000 l2(j,k,b,a)*t1(c,k)*t1(d,j)*t1(a,i)
+    tpdm[o, v, v, v] += -1.0 * einsum('jkba,ck,dj,ai->ibcd', l2, t1, t1, t1,
+                                      optimize=['einsum_path', (0, 1), (0, 2),
+                                                (0, 1)])
+
+    #    D2(a,i,c,d):
+
+    #	  1.0000 l1(j,a)*t2(c,d,j,i)
+    tpdm[v, o, v, v] += 1.0 * einsum('ja,cdji->aicd', l1, t2)
+
+    #	 -1.0000 P(c,d)l1(j,a)*t1(c,i)*t1(d,j)
+    contracted_intermediate = -1.0 * einsum('ja,ci,dj->aicd', l1, t1, t1,
+                                            optimize=['einsum_path', (0, 2),
+                                                      (0, 1)])
+    tpdm[v, o, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'aicd->aidc', contracted_intermediate)
+
+    #	 -0.5000 P(c,d)l2(j,k,a,b)*t1(c,i)*t2(d,b,j,k)
+    contracted_intermediate = -0.5 * einsum('jkab,ci,dbjk->aicd', l2, t1, t2,
+                                            optimize=['einsum_path', (0, 2),
+                                                      (0, 1)])
+    tpdm[v, o, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'aicd->aidc', contracted_intermediate)
+
+    #	  1.0000 P(c,d)l2(j,k,a,b)*t1(c,k)*t2(d,b,j,i)
+    contracted_intermediate = 1.0 * einsum('jkab,ck,dbji->aicd', l2, t1, t2,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 1)])
+    tpdm[v, o, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'aicd->aidc', contracted_intermediate)
+
+    #	 -0.5000 l2(j,k,a,b)*t1(b,i)*t2(c,d,j,k)
+    tpdm[v, o, v, v] += -0.5 * einsum('jkab,bi,cdjk->aicd', l2, t1, t2,
+                                      optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 l2(j,k,a,b)*t1(c,k)*t1(d,j)*t1(b,i)
+    tpdm[v, o, v, v] += 1.0 * einsum('jkab,ck,dj,bi->aicd', l2, t1, t1, t1,
+                                     optimize=['einsum_path', (0, 1), (0, 2),
+                                               (0, 1)])
+
+    #    D2(i,j,a,b):
+
+    #	  1.0000 t2(a,b,i,j)
+    tpdm[o, o, v, v] += 1.0 * einsum('abij->ijab', t2)
+
+    #	 -1.0000 P(i,j)t1(a,j)*t1(b,i)
+    contracted_intermediate = -1.0 * einsum('aj,bi->ijab', t1, t1)
+    tpdm[o, o, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijab->jiab', contracted_intermediate)
+
+    #	  1.0000 P(i,j)*P(a,b)l1(k,c)*t1(a,j)*t2(b,c,k,i)
+    contracted_intermediate = 1.0 * einsum('kc,aj,bcki->ijab', l1, t1, t2,
+                                           optimize=['einsum_path', (0, 2),
+                                                     (0, 1)])
+    tpdm[o, o, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijab->jiab', contracted_intermediate) + -1.00000 * einsum('ijab->ijba',
+                                                                   contracted_intermediate) + 1.00000 * einsum(
+        'ijab->jiba', contracted_intermediate)
+
+    #	  1.0000 P(a,b)l1(k,c)*t1(a,k)*t2(b,c,i,j)
+    contracted_intermediate = 1.0 * einsum('kc,ak,bcij->ijab', l1, t1, t2,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 1)])
+    tpdm[o, o, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijab->ijba', contracted_intermediate)
+
+    #	  1.0000 P(i,j)l1(k,c)*t1(c,j)*t2(a,b,k,i)
+    contracted_intermediate = 1.0 * einsum('kc,cj,abki->ijab', l1, t1, t2,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 1)])
+    tpdm[o, o, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijab->jiab', contracted_intermediate)
+
+    #	 -0.5000 P(i,j)l2(k,l,d,c)*t2(a,b,l,j)*t2(d,c,k,i)
+    contracted_intermediate = -0.5 * einsum('kldc,ablj,dcki->ijab', l2, t2, t2,
+                                            optimize=['einsum_path', (0, 2),
+                                                      (0, 1)])
+    tpdm[o, o, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijab->jiab', contracted_intermediate)
+
+    #	  0.2500 l2(k,l,d,c)*t2(a,b,k,l)*t2(d,c,i,j)
+    tpdm[o, o, v, v] += 0.25 * einsum('kldc,abkl,dcij->ijab', l2, t2, t2,
+                                      optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	 -0.5000 l2(k,l,d,c)*t2(a,d,i,j)*t2(b,c,k,l)
+    tpdm[o, o, v, v] += -0.5 * einsum('kldc,adij,bckl->ijab', l2, t2, t2,
+                                      optimize=['einsum_path', (0, 2), (0, 1)])
+
+    #	  1.0000 P(i,j)l2(k,l,d,c)*t2(a,d,l,j)*t2(b,c,k,i)
+    contracted_intermediate = 1.0 * einsum('kldc,adlj,bcki->ijab', l2, t2, t2,
+                                           optimize=['einsum_path', (0, 1),
+                                                     (0, 1)])
+    tpdm[o, o, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijab->jiab', contracted_intermediate)
+
+    #	 -0.5000 l2(k,l,d,c)*t2(a,d,k,l)*t2(b,c,i,j)
+    tpdm[o, o, v, v] += -0.5 * einsum('kldc,adkl,bcij->ijab', l2, t2, t2,
+                                      optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #	  1.0000 P(i,j)*P(a,b)l1(k,c)*t1(a,j)*t1(b,k)*t1(c,i)
+    contracted_intermediate = 1.0 * einsum('kc,aj,bk,ci->ijab', l1, t1, t1, t1,
+                                           optimize=['einsum_path', (0, 2),
+                                                     (1, 2), (0, 1)])
+    tpdm[o, o, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijab->jiab', contracted_intermediate) + -1.00000 * einsum('ijab->ijba',
+                                                                   contracted_intermediate) + 1.00000 * einsum(
+        'ijab->jiba', contracted_intermediate)
+
+    #	  0.5000 P(i,j)*P(a,b)l2(k,l,d,c)*t1(a,j)*t1(b,l)*t2(d,c,k,i)
+    contracted_intermediate = 0.5 * einsum('kldc,aj,bl,dcki->ijab', l2, t1, t1,
+                                           t2, optimize=['einsum_path', (0, 3),
+                                                         (1, 2), (0, 1)])
+    tpdm[o, o, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijab->jiab', contracted_intermediate) + -1.00000 * einsum('ijab->ijba',
+                                                                   contracted_intermediate) + 1.00000 * einsum(
+        'ijab->jiba', contracted_intermediate)
+
+    #	  0.5000 P(i,j)*P(a,b)l2(k,l,d,c)*t1(a,j)*t1(d,i)*t2(b,c,k,l)
+    contracted_intermediate = 0.5 * einsum('kldc,aj,di,bckl->ijab', l2, t1, t1,
+                                           t2, optimize=['einsum_path', (0, 3),
+                                                         (1, 2), (0, 1)])
+    tpdm[o, o, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijab->jiab', contracted_intermediate) + -1.00000 * einsum('ijab->ijba',
+                                                                   contracted_intermediate) + 1.00000 * einsum(
+        'ijab->jiba', contracted_intermediate)
+
+    #	 -0.5000 l2(k,l,d,c)*t1(a,l)*t1(b,k)*t2(d,c,i,j)
+    tpdm[o, o, v, v] += -0.5 * einsum('kldc,al,bk,dcij->ijab', l2, t1, t1, t2,
+                                      optimize=['einsum_path', (0, 1), (0, 2),
+                                                (0, 1)])
+
+    #	  1.0000 P(i,j)*P(a,b)l2(k,l,d,c)*t1(a,l)*t1(d,j)*t2(b,c,k,i)
+    contracted_intermediate = 1.0 * einsum('kldc,al,dj,bcki->ijab', l2, t1, t1,
+                                           t2, optimize=['einsum_path', (0, 1),
+                                                         (0, 2), (0, 1)])
+    tpdm[o, o, v, v] += 1.00000 * contracted_intermediate + -1.00000 * einsum(
+        'ijab->jiab', contracted_intermediate) + -1.00000 * einsum('ijab->ijba',
+                                                                   contracted_intermediate) + 1.00000 * einsum(
+        'ijab->jiba', contracted_intermediate)
+
+    #	 -0.5000 l2(k,l,d,c)*t1(d,j)*t1(c,i)*t2(a,b,k,l)
+    tpdm[o, o, v, v] += -0.5 * einsum('kldc,dj,ci,abkl->ijab', l2, t1, t1, t2,
+                                      optimize=['einsum_path', (0, 1), (0, 2),
+                                                (0, 1)])
+
+    #	  1.0000 l2(k,l,d,c)*t1(a,l)*t1(b,k)*t1(d,j)*t1(c,i)
+    tpdm[o, o, v, v] += 1.0 * einsum('kldc,al,bk,dj,ci->ijab', l2, t1, t1, t1,
+                                     t1,
+                                     optimize=['einsum_path', (0, 1), (0, 3),
+                                               (0, 2), (0, 1)])
+
+    #    D2(a,b,i,j):
+
+    #	  1.0000 l2(i,j,a,b)
+    tpdm[v, v, o, o] += 1.0 * einsum('ijab->abij', l2)
+
+    #    D2(i,a,j,b):
+
+    #	  1.0000 d(i,j)*l1(k,a)*t1(b,k)
+    tpdm[o, v, o, v] += 1.0 * einsum('ij,ka,bk->iajb', kd[o, o], l1, t1,
+                                     optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 -1.0000 l1(j,a)*t1(b,i)
+    tpdm[o, v, o, v] += -1.0 * einsum('ja,bi->iajb', l1, t1)
+
+    #	  0.5000 d(i,j)*l2(k,l,a,c)*t2(b,c,k,l)
+    tpdm[o, v, o, v] += 0.5 * einsum('ij,klac,bckl->iajb', kd[o, o], l2, t2,
+                                     optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 -1.0000 l2(k,j,a,c)*t2(b,c,k,i)
+    tpdm[o, v, o, v] += -1.0 * einsum('kjac,bcki->iajb', l2, t2)
+
+    #	 -1.0000 l2(k,j,a,c)*t1(b,k)*t1(c,i)
+    tpdm[o, v, o, v] += -1.0 * einsum('kjac,bk,ci->iajb', l2, t1, t1,
+                                      optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #    D2(a,i,j,b):
+
+    #	 -1.0000 d(i,j)*l1(k,a)*t1(b,k)
+    tpdm[v, o, o, v] += -1.0 * einsum('ij,ka,bk->aijb', kd[o, o], l1, t1,
+                                      optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	  1.0000 l1(j,a)*t1(b,i)
+    tpdm[v, o, o, v] += 1.0 * einsum('ja,bi->aijb', l1, t1)
+
+    #	 -0.5000 d(i,j)*l2(k,l,a,c)*t2(b,c,k,l)
+    tpdm[v, o, o, v] += -0.5 * einsum('ij,klac,bckl->aijb', kd[o, o], l2, t2,
+                                      optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	  1.0000 l2(k,j,a,c)*t2(b,c,k,i)
+    tpdm[v, o, o, v] += 1.0 * einsum('kjac,bcki->aijb', l2, t2)
+
+    #	  1.0000 l2(k,j,a,c)*t1(b,k)*t1(c,i)
+    tpdm[v, o, o, v] += 1.0 * einsum('kjac,bk,ci->aijb', l2, t1, t1,
+                                     optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #    D2(i,a,b,j):
+
+    #	 -1.0000 d(i,j)*l1(k,a)*t1(b,k)
+    tpdm[o, v, v, o] += -1.0 * einsum('ij,ka,bk->iabj', kd[o, o], l1, t1,
+                                      optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	  1.0000 l1(j,a)*t1(b,i)
+    tpdm[o, v, v, o] += 1.0 * einsum('ja,bi->iabj', l1, t1)
+
+    #	 -0.5000 d(i,j)*l2(k,l,a,c)*t2(b,c,k,l)
+    tpdm[o, v, v, o] += -0.5 * einsum('ij,klac,bckl->iabj', kd[o, o], l2, t2,
+                                      optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	  1.0000 l2(k,j,a,c)*t2(b,c,k,i)
+    tpdm[o, v, v, o] += 1.0 * einsum('kjac,bcki->iabj', l2, t2)
+
+    #	  1.0000 l2(k,j,a,c)*t1(b,k)*t1(c,i)
+    tpdm[o, v, v, o] += 1.0 * einsum('kjac,bk,ci->iabj', l2, t1, t1,
+                                     optimize=['einsum_path', (0, 1), (0, 1)])
+
+    #    D2(a,i,b,j):
+
+    #	  1.0000 d(i,j)*l1(k,a)*t1(b,k)
+    tpdm[v, o, v, o] += 1.0 * einsum('ij,ka,bk->aibj', kd[o, o], l1, t1,
+                                     optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 -1.0000 l1(j,a)*t1(b,i)
+    tpdm[v, o, v, o] += -1.0 * einsum('ja,bi->aibj', l1, t1)
+
+    #	  0.5000 d(i,j)*l2(k,l,a,c)*t2(b,c,k,l)
+    tpdm[v, o, v, o] += 0.5 * einsum('ij,klac,bckl->aibj', kd[o, o], l2, t2,
+                                     optimize=['einsum_path', (1, 2), (0, 1)])
+
+    #	 -1.0000 l2(k,j,a,c)*t2(b,c,k,i)
+    tpdm[v, o, v, o] += -1.0 * einsum('kjac,bcki->aibj', l2, t2)
+
+    #	 -1.0000 l2(k,j,a,c)*t1(b,k)*t1(c,i)
+    tpdm[v, o, v, o] += -1.0 * einsum('kjac,bk,ci->aibj', l2, t1, t1,
+                                      optimize=['einsum_path', (0, 1), (0, 1)])
+
+    return tpdm
+
+
+def main():
+    """
+    Example for solving CC-Lagrangian and then computing 1-RDM and 2-RDM
+    """
+    import pyscf
+    import openfermion as of
+    from openfermion.chem.molecular_data import spinorb_from_spatial
+    from openfermionpyscf import run_pyscf
+    from pyscf.cc.addons import spatial2spin
+    from pyscf import cc
+    import numpy as np
+
+    np.set_printoptions(linewidth=500)
+    basis = 'cc-pvdz'
+    mol = pyscf.M(
+        atom='H 0 0 0; F 0 0 {}'.format(1.6),
+        basis=basis)
+
+    mf = mol.RHF()
+    mf.verbose = 3
+    mf.run()
+
+    mycc = mf.CCSD()
+    mycc.conv_tol = 1.0E-12
+    ecc, pyscf_t1, pyscf_t2 = mycc.kernel()
+    print('CCSD correlation energy', mycc.e_corr)
+    from functools import reduce
+    from pyscf import ao2mo
+
+    eris = mycc.ao2mo()
+    conv, pyscf_l1, pyscf_l2 = cc.ccsd_lambda.kernel(mycc, eris, pyscf_t1, pyscf_t2, tol=mycc.conv_tol)
+    pyscf_sopdm = cc.ccsd_rdm.make_rdm1(mycc, pyscf_t1, pyscf_t2, pyscf_l1, pyscf_l2)
+    pyscf_stpdm = cc.ccsd_rdm.make_rdm2(mycc, pyscf_t1, pyscf_t2, pyscf_l1, pyscf_l2)
+
+    pyscf_t1s = spatial2spin(mycc.t1)
+    pyscf_t2s = spatial2spin(mycc.t2)
+    t1 = pyscf_t1s.transpose(1, 0)
+    t2 = pyscf_t2s.transpose(2, 3, 0, 1)
+    l1 = spatial2spin(pyscf_l1)
+    l2 = spatial2spin(pyscf_l2)
+
+    h1 = reduce(np.dot, (mf.mo_coeff.T, mf.get_hcore(), mf.mo_coeff))
+    eri = ao2mo.full(mf._eri, mf.mo_coeff)
+    eri = ao2mo.restore(1, eri, h1.shape[0]).reshape((h1.shape[0],) * 4)
+    e1 = np.einsum('pq,pq', h1, pyscf_sopdm)
+    e2 = np.einsum('pqrs,pqrs', eri, pyscf_stpdm) * .5
+    print(e1 + e2 + mol.energy_nuc() - mf.e_tot - ecc)
+    print(e1 + e2 - mf.e_tot + mol.energy_nuc())
+
+
+    molecule = of.MolecularData(geometry=[['H', (0, 0, 0)], ['F', (0, 0, 1.6)]],
+                                basis=basis, charge=0, multiplicity=1)
+    molecule = run_pyscf(molecule, run_ccsd=True)
+    # oei, tei = molecule.get_integrals()
+    oei, tei = h1, eri.transpose(0, 2, 3, 1)
+    occ = mf.mo_occ
+    nele = int(sum(occ))
+    nocc = nele // 2
+    norbs = oei.shape[0]
+    nsvirt = 2 * (norbs - nocc)
+    nsocc = 2 * nocc
+    assert np.allclose(np.transpose(mycc.t2, [1, 0, 3, 2]), mycc.t2)
+
+
+    soei, stei = spinorb_from_spatial(oei, tei)
+    astei = np.einsum('ijkl', stei) - np.einsum('ijlk', stei)
+    gtei = astei.transpose(0, 1, 3, 2)
+
+    d1hf = np.diag([1.] * nsocc + [0.] * nsvirt)
+    opdm = d1hf
+    tpdm_wedge = 2 * of.wedge(opdm, opdm, (1, 1), (1, 1))
+    rdm_energy = np.einsum('ij,ij', soei, opdm.real) + 0.25 * np.einsum('ijkl,ijkl', tpdm_wedge.real, astei)
+    print(rdm_energy + mol.energy_nuc(), mf.e_tot)
+    assert np.allclose(rdm_energy + mol.energy_nuc(), mf.e_tot)
+
+    eps = np.kron(molecule.orbital_energies, np.ones(2))
+    n = np.newaxis
+    o = slice(None, nsocc)
+    v = slice(nsocc, None)
+
+    e_abij = 1 / (-eps[v, n, n, n] - eps[n, v, n, n] + eps[n, n, o, n] + eps[
+        n, n, n, o])
+    e_ai = 1 / (-eps[v, n] + eps[n, o])
+
+    fock = soei + np.einsum('piiq->pq', astei[:, o, o, :])
+    hf_energy = 0.5 * np.einsum('ii', (fock + soei)[o, o])
+    hf_energy_test = 1.0 * einsum('ii', fock[o, o]) -0.5 * einsum('ijij', gtei[o, o, o, o])
+    print("HF energies")
+    print(hf_energy, rdm_energy)
+    assert np.isclose(hf_energy, mf.e_tot - molecule.nuclear_repulsion)
+    assert np.isclose(hf_energy_test, hf_energy)
+
+    g = gtei
+
+    print("T1/2 from pyscf")
+    print(np.linalg.norm(singles_residual(t1, t2, fock, g, o, v)))
+    print(np.linalg.norm(doubles_residual(t1, t2, fock, g, o, v)))
+
+    print("l1/2 from pyscf")
+    lsingles, ldoubles = lambda_eval(t1, t2, l1, l2, fock, g, o, v)
+    print(np.linalg.norm(lsingles))
+    print(np.linalg.norm(ldoubles))
+
+    ncr_opdm = ccsd_d1(t1, t2, l1, l2, np.eye(2 * h1.shape[0]), o, v)
+    opdm_a = ncr_opdm[::2, ::2]
+    opdm_b = ncr_opdm[1::2, 1::2]
+    opdm_s = (opdm_a + opdm_b + opdm_a.T + opdm_b.T) / 2
+    print(opdm_s)
+    print()
+    print(pyscf_sopdm)
+    print("1-RDM symm norm diff ", np.linalg.norm(opdm_s - pyscf_sopdm))
+
+    t1z, t2z = np.zeros((nsvirt, nsocc)), np.zeros((nsvirt, nsvirt, nsocc, nsocc))
+
+    t1f, t2f, l1f, l2f = kernel(t1z, t2z, fock, g, o, v, e_ai, e_abij,
+                                stopping_eps=mycc.conv_tol,
+                                diis_size=8)
+
+    psuedo_energy = lagrangian_energy(t1f, t2f, l1f, l2f, fock, g, o, v)
+
+    print("Final Correlation Energy")
+    print(ccsd_energy(t1f, t2f, fock, g, o, v) - hf_energy)
+    print("Lagrangian Energy - HF")
+    print(psuedo_energy - hf_energy)
+
+
+
+    print("diff from pyscf t1/t2", np.linalg.norm(t1f - t1), np.linalg.norm(t2f - t2))
+    print("diff from pyscf l1/l2", np.linalg.norm(l1f - l1), np.linalg.norm(l2f - l2))
+
+
+    d1hf = np.eye(2 * norbs)
+    opdm = ccsd_d1(t1, t2, l1, l2, d1hf, o, v)
+    tpdm = ccsd_d2(t1, t2, l1, l2, d1hf, o, v)
+    tpdm = tpdm.transpose(0, 1, 3, 2) # openfermion ordering
+
+    opdm_a = opdm[::2, ::2]
+    opdm_b = opdm[1::2, 1::2]
+    opdm_s = (opdm_a + opdm_b + opdm_a.T + opdm_b.T) / 2
+    print(opdm_s)
+    print()
+    print(pyscf_sopdm)
+    print("1-RDM symm norm diff ", np.linalg.norm(opdm_s - pyscf_sopdm))
+
+    rdm_energy = np.einsum('ij,ij', soei, opdm) + 0.25 * np.einsum('ijkl,ijkl', tpdm, astei)
+    print("Correlation Energy from RDMs")
+    print(rdm_energy - hf_energy)
+
+    assert np.allclose(rdm_energy, psuedo_energy, atol=1E-6)
+
+
+
+
+if __name__ == "__main__":
+    main()
+
+